@@ -4,20 +4,22 @@ from django.utils.html import format_html
 from django.urls import reverse
 from django.utils import timezone
 from .models import BeneficiaryProfile, SupportRequest, BeneficiaryCommunication, BeneficiaryDocument
+from .services import invalidate_beneficiary_analytics
+from .sla import refresh_sla
 
 
 @admin.register(BeneficiaryProfile)
 class BeneficiaryProfileAdmin(admin.ModelAdmin):
     list_display = [
         'full_name', 'age', 'district', 'employment_status', 
-        'vulnerability_score', 'is_verified', 'created_at'
+        'vulnerability_badge', 'is_verified', 'created_at'
     ]
     list_filter = [
         'is_verified', 'province', 'district', 'employment_status', 
         'education_level', 'is_displaced', 'has_chronic_illness'
     ]
     search_fields = ['full_name', 'phone_number', 'user__email']
-    readonly_fields = ['created_at', 'updated_at', 'age', 'vulnerability_score']
+    readonly_fields = ['created_at', 'updated_at', 'age', 'vulnerability_badge']
     
     fieldsets = (
         ('Informações do Usuário', {
@@ -36,7 +38,7 @@ class BeneficiaryProfileAdmin(admin.ModelAdmin):
             'fields': ('family_members_count', 'children_count', 'elderly_count', 'disabled_count')
         }),
         ('Vulnerabilidades', {
-            'fields': ('is_displaced', 'displacement_reason', 'has_chronic_illness', 'chronic_illness_details', 'vulnerability_score')
+            'fields': ('is_displaced', 'displacement_reason', 'has_chronic_illness', 'chronic_illness_details', 'vulnerability_badge')
         }),
         ('Necessidades', {
             'fields': ('priority_needs', 'additional_information')
@@ -54,7 +56,7 @@ class BeneficiaryProfileAdmin(admin.ModelAdmin):
         return obj.age
     age.short_description = 'Idade'
 
-    def vulnerability_score(self, obj):
+    def vulnerability_badge(self, obj):
         score = obj.vulnerability_score
         if score >= 7:
             color = 'red'
@@ -66,7 +68,8 @@ class BeneficiaryProfileAdmin(admin.ModelAdmin):
             '<span style="color: {}; font-weight: bold;">{}/10</span>',
             color, score
         )
-    vulnerability_score.short_description = 'Score de Vulnerabilidade'
+    vulnerability_badge.short_description = 'Score de Vulnerabilidade'
+    vulnerability_badge.admin_order_field = 'vulnerability_score'
 
 
 @admin.register(SupportRequest)
@@ -76,7 +79,7 @@ class SupportRequestAdmin(admin.ModelAdmin):
         'is_overdue', 'requested_date', 'assigned_to'
     ]
     list_filter = [
-        'request_type', 'urgency', 'status', 'requested_date', 
+        'request_type', 'urgency', 'status', 'due_state', 'requested_date', 
         'assigned_to', 'reviewed_by'
     ]
     search_fields = ['title', 'description', 'beneficiary__full_name']
@@ -110,12 +113,17 @@ class SupportRequestAdmin(admin.ModelAdmin):
 
     actions = ['mark_as_approved', 'mark_as_in_progress', 'mark_as_completed']
 
+    # update() não passa pelo save(): due_state e priority são recalculados
+    # logo em seguida, já com o status novo (no mesmo UPDATE o CASE veria o antigo)
+
     def mark_as_approved(self, request, queryset):
         updated = queryset.update(
             status='aprovada',
             reviewed_by=request.user,
             reviewed_at=timezone.now()
         )
+        refresh_sla(queryset)
+        invalidate_beneficiary_analytics()
         self.message_user(request, f'{updated} solicitações aprovadas.')
     mark_as_approved.short_description = 'Marcar como aprovada'
 
@@ -124,6 +132,8 @@ class SupportRequestAdmin(admin.ModelAdmin):
             status='em_andamento',
             started_at=timezone.now()
         )
+        refresh_sla(queryset)
+        invalidate_beneficiary_analytics()
         self.message_user(request, f'{updated} solicitações marcadas como em andamento.')
     mark_as_in_progress.short_description = 'Marcar como em andamento'
 
@@ -132,6 +142,8 @@ class SupportRequestAdmin(admin.ModelAdmin):
             status='concluida',
             completed_at=timezone.now()
         )
+        refresh_sla(queryset)
+        invalidate_beneficiary_analytics()
         self.message_user(request, f'{updated} solicitações concluídas.')
     mark_as_completed.short_description = 'Marcar como concluída'
 
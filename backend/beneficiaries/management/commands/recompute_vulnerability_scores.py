@@ -0,0 +1,39 @@
+# backend/beneficiaries/management/commands/recompute_vulnerability_scores.py
+from django.core.management.base import BaseCommand
+from beneficiaries.models import BeneficiaryProfile
+from beneficiaries.scoring import vulnerability_distribution, vulnerability_score_expression
+from beneficiaries.services import invalidate_beneficiary_analytics
+
+
+class Command(BaseCommand):
+    help = 'Recalcula no banco o score de vulnerabilidade de todos os beneficiários (após mudar as regras)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Mostra quantos scores mudariam sem gravar',
+        )
+
+    def handle(self, *args, **options):
+        expression = vulnerability_score_expression()
+
+        if options['dry_run']:
+            changed = BeneficiaryProfile.objects.exclude(vulnerability_score=expression).count()
+            self.stdout.write(f'{changed} scores seriam alterados')
+            return
+
+        # Um único UPDATE com a expressão Case/When (não dispara save/updated_at)
+        updated = BeneficiaryProfile.objects.exclude(
+            vulnerability_score=expression
+        ).update(vulnerability_score=expression)
+        if updated:
+            invalidate_beneficiary_analytics()
+
+        distribution = vulnerability_distribution(BeneficiaryProfile.objects.all())
+        self.stdout.write(
+            f"Distribuição: alta={distribution['alta']}, media={distribution['media']}, baixa={distribution['baixa']}"
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'{updated} scores de vulnerabilidade atualizados')
+        )
@@ -0,0 +1,36 @@
+# backend/beneficiaries/management/commands/refresh_support_request_sla.py
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from beneficiaries.models import SupportRequest
+from beneficiaries.services import invalidate_beneficiary_analytics
+from beneficiaries.sla import OPEN_FILTER, refresh_sla
+
+
+class Command(BaseCommand):
+    help = 'Recalcula estado do prazo e prioridade das solicitações de apoio (executar diariamente via cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Recalcula também as solicitações encerradas (após mudar as regras de SLA)',
+        )
+
+    def handle(self, *args, **options):
+        queryset = SupportRequest.objects.all()
+        if not options['all']:
+            # Só solicitações em aberto mudam de estado com a passagem do tempo
+            queryset = queryset.filter(OPEN_FILTER)
+
+        updated = refresh_sla(queryset)
+        if updated:
+            invalidate_beneficiary_analytics()
+
+        states = SupportRequest.objects.filter(OPEN_FILTER).values('due_state').annotate(
+            count=Count('id')
+        ).order_by('due_state')
+        for row in states:
+            self.stdout.write(f"{row['due_state']}: {row['count']}")
+        self.stdout.write(
+            self.style.SUCCESS(f'{updated} solicitações com SLA atualizado')
+        )
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:22
+
+from django.db import migrations, models
+
+
+def populate_vulnerability_scores(apps, schema_editor):
+    from beneficiaries.scoring import vulnerability_score_expression
+    BeneficiaryProfile = apps.get_model('beneficiaries', 'BeneficiaryProfile')
+    BeneficiaryProfile.objects.update(vulnerability_score=vulnerability_score_expression())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('beneficiaries', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='beneficiaryprofile',
+            name='vulnerability_score',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Score de Vulnerabilidade'),
+        ),
+        migrations.RunPython(populate_vulnerability_scores, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='beneficiaryprofile',
+            index=models.Index(fields=['-vulnerability_score', '-created_at'], name='beneficiari_vulnera_0ad51f_idx'),
+        ),
+    ]
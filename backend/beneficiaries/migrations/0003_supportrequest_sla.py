@@ -0,0 +1,42 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:25
+
+from django.db import migrations, models
+
+
+def populate_sla(apps, schema_editor):
+    from beneficiaries.sla import refresh_sla
+    SupportRequest = apps.get_model('beneficiaries', 'SupportRequest')
+    refresh_sla(SupportRequest.objects.all())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('beneficiaries', '0002_beneficiaryprofile_vulnerability_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='supportrequest',
+            name='due_state',
+            field=models.CharField(choices=[('atrasada', 'Atrasada'), ('vence_em_breve', 'Vence em Breve'), ('no_prazo', 'No Prazo'), ('sem_prazo', 'Sem Prazo'), ('encerrada', 'Encerrada')], default='sem_prazo', editable=False, max_length=20, verbose_name='Estado do Prazo'),
+        ),
+        migrations.AddField(
+            model_name='supportrequest',
+            name='priority',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Prioridade'),
+        ),
+        migrations.RunPython(populate_sla, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='supportrequest',
+            index=models.Index(fields=['status', '-requested_date'], name='support_req_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supportrequest',
+            index=models.Index(condition=models.Q(('status__in', ['pendente', 'em_analise', 'aprovada', 'em_andamento'])), fields=['-priority', 'id'], name='support_req_queue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supportrequest',
+            index=models.Index(condition=models.Q(('status__in', ['pendente', 'em_analise', 'aprovada', 'em_andamento'])), fields=['due_state', 'needed_by_date'], name='support_req_due_idx'),
+        ),
+    ]
@@ -2,6 +2,8 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
+from .scoring import compute_vulnerability_score, vulnerability_level
+from .sla import DUE_STATE_CHOICES, OPEN_FILTER, compute_due_state, compute_priority
 
 
 class BeneficiaryProfile(models.Model):
@@ -77,6 +79,9 @@ class BeneficiaryProfile(models.Model):
     priority_needs = models.TextField(verbose_name='Necessidades Prioritárias')
     additional_information = models.TextField(blank=True, verbose_name='Informações Adicionais')
     
+    # Score de vulnerabilidade (0-10), recalculado ao salvar — ver scoring.py
+    vulnerability_score = models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Score de Vulnerabilidade')
+    
     # Metadados
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -88,10 +93,20 @@ class BeneficiaryProfile(models.Model):
         verbose_name = 'Perfil de Beneficiário'
         verbose_name_plural = 'Perfis de Beneficiários'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-vulnerability_score', '-created_at']),
+        ]
 
     def __str__(self):
         return f"{self.full_name} ({self.district}, {self.province})"
 
+    def save(self, *args, **kwargs):
+        self.vulnerability_score = compute_vulnerability_score(self)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'vulnerability_score' not in update_fields:
+            kwargs['update_fields'] = list(update_fields) + ['vulnerability_score']
+        super().save(*args, **kwargs)
+
     @property
     def age(self):
         if self.date_of_birth:
@@ -100,41 +115,9 @@ class BeneficiaryProfile(models.Model):
         return None
 
     @property
-    def vulnerability_score(self):
-        """Calcula um score de vulnerabilidade baseado nos critérios"""
-        score = 0
-        
-        # Situação econômica
-        if self.monthly_income is None or self.monthly_income < 3000:  # Abaixo do salário mínimo
-            score += 3
-        elif self.monthly_income < 5000:
-            score += 2
-        
-        # Situação de emprego
-        if self.employment_status == 'desempregado':
-            score += 3
-        elif self.employment_status == 'informal':
-            score += 2
-        
-        # Composição familiar
-        if self.children_count > 3:
-            score += 2
-        if self.elderly_count > 0:
-            score += 1
-        if self.disabled_count > 0:
-            score += 2
-        
-        # Vulnerabilidades específicas
-        if self.is_displaced:
-            score += 3
-        if self.has_chronic_illness:
-            score += 2
-        
-        # Educação
-        if self.education_level in ['nenhuma', 'primario']:
-            score += 1
-        
-        return min(score, 10)  # Máximo 10
+    def vulnerability_level(self):
+        """Nível de vulnerabilidade (alta/media/baixa)"""
+        return vulnerability_level(self.vulnerability_score)
 
 
 class SupportRequest(models.Model):
@@ -194,19 +177,38 @@ class SupportRequest(models.Model):
     actual_cost = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name='Custo Real (MZN)')
     actual_beneficiaries = models.IntegerField(null=True, blank=True, verbose_name='Beneficiários Reais')
     
+    # SLA (recalculado ao salvar e diariamente por refresh_support_request_sla)
+    due_state = models.CharField(max_length=20, choices=DUE_STATE_CHOICES, default='sem_prazo', editable=False, verbose_name='Estado do Prazo')
+    priority = models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Prioridade')
+    
     class Meta:
         verbose_name = 'Solicitação de Apoio'
         verbose_name_plural = 'Solicitações de Apoio'
         ordering = ['-requested_date']
+        indexes = [
+            models.Index(fields=['status', '-requested_date'], name='support_req_status_idx'),
+            # Índices parciais: só as solicitações em aberto entram nas filas
+            models.Index(fields=['-priority', 'id'], condition=OPEN_FILTER, name='support_req_queue_idx'),
+            models.Index(fields=['due_state', 'needed_by_date'], condition=OPEN_FILTER, name='support_req_due_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.beneficiary.full_name} ({self.get_status_display()})"
 
+    def save(self, *args, **kwargs):
+        self.refresh_sla()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'due_state', 'priority'}
+        super().save(*args, **kwargs)
+
+    def refresh_sla(self, today=None):
+        self.due_state = compute_due_state(self.status, self.needed_by_date, today)
+        self.priority = compute_priority(self.status, self.urgency, self.due_state)
+
     @property
     def is_overdue(self):
-        if self.needed_by_date and self.status not in ['concluida', 'rejeitada', 'cancelada']:
-            return timezone.now().date() > self.needed_by_date
-        return False
+        return self.due_state == 'atrasada'
 
 
 class BeneficiaryCommunication(models.Model):
@@ -0,0 +1,116 @@
+# backend/beneficiaries/scoring.py
+"""
+Regras do score de vulnerabilidade dos beneficiários.
+
+As regras são declaradas uma única vez e avaliadas de duas formas: em Python
+(ao salvar um perfil) e como expressão ``Case/When`` no banco (recálculo em
+massa com ``recompute_vulnerability_scores``). Ao alterar pesos ou faixas,
+rode o comando para atualizar os scores já gravados.
+"""
+import operator
+
+from django.db.models import Case, Count, IntegerField, Q, Value, When
+from django.db.models.functions import Least
+
+
+MAX_VULNERABILITY_SCORE = 10
+
+# Cada grupo soma os pontos da primeira faixa satisfeita.
+# Uma faixa é (pontos, condições) e as condições são combinadas com OU.
+VULNERABILITY_RULES = [
+    # Situação econômica (abaixo do salário mínimo)
+    [
+        (3, [('monthly_income', 'isnull', True), ('monthly_income', 'lt', 3000)]),
+        (2, [('monthly_income', 'lt', 5000)]),
+    ],
+    # Situação de emprego
+    [
+        (3, [('employment_status', 'exact', 'desempregado')]),
+        (2, [('employment_status', 'exact', 'informal')]),
+    ],
+    # Composição familiar
+    [(2, [('children_count', 'gt', 3)])],
+    [(1, [('elderly_count', 'gt', 0)])],
+    [(2, [('disabled_count', 'gt', 0)])],
+    # Vulnerabilidades específicas
+    [(3, [('is_displaced', 'exact', True)])],
+    [(2, [('has_chronic_illness', 'exact', True)])],
+    # Educação
+    [(1, [('education_level', 'in', ['nenhuma', 'primario'])])],
+]
+
+# Níveis: (nível, score mínimo)
+VULNERABILITY_LEVELS = [
+    ('alta', 7),
+    ('media', 4),
+    ('baixa', 0),
+]
+
+_PYTHON_LOOKUPS = {
+    'exact': operator.eq,
+    'lt': operator.lt,
+    'gt': operator.gt,
+    'in': lambda value, options: value in options,
+}
+
+
+def _condition_matches(instance, field, lookup, expected):
+    value = getattr(instance, field)
+    if lookup == 'isnull':
+        return (value is None) == expected
+    if value is None:
+        # Mesma semântica do SQL: comparações com NULL são falsas
+        return False
+    return _PYTHON_LOOKUPS[lookup](value, expected)
+
+
+def compute_vulnerability_score(instance):
+    """Score de vulnerabilidade de um perfil em memória"""
+    score = 0
+    for tiers in VULNERABILITY_RULES:
+        for points, conditions in tiers:
+            if any(_condition_matches(instance, *condition) for condition in conditions):
+                score += points
+                break
+    return min(score, MAX_VULNERABILITY_SCORE)
+
+
+def vulnerability_score_expression():
+    """Mesmo score como expressão SQL (para ``update()``/``annotate()``)"""
+    total = Value(0)
+    for tiers in VULNERABILITY_RULES:
+        whens = []
+        for points, conditions in tiers:
+            condition = Q()
+            for field, lookup, expected in conditions:
+                condition |= Q(**{f'{field}__{lookup}': expected})
+            whens.append(When(condition, then=Value(points)))
+        total = total + Case(*whens, default=Value(0), output_field=IntegerField())
+    return Least(total, Value(MAX_VULNERABILITY_SCORE), output_field=IntegerField())
+
+
+def vulnerability_level(score):
+    for level, min_score in VULNERABILITY_LEVELS:
+        if score >= min_score:
+            return level
+    return VULNERABILITY_LEVELS[-1][0]
+
+
+def vulnerability_level_filter(level):
+    """``Q`` para perfis de um nível (usa o índice de ``vulnerability_score``)"""
+    bounds = dict(VULNERABILITY_LEVELS)
+    if level not in bounds:
+        return None
+    condition = Q(vulnerability_score__gte=bounds[level])
+    higher = [min_score for _level, min_score in VULNERABILITY_LEVELS if min_score > bounds[level]]
+    if higher:
+        condition &= Q(vulnerability_score__lt=min(higher))
+    return condition
+
+
+def vulnerability_distribution(queryset):
+    """Distribuição alta/media/baixa num único agregado"""
+    return queryset.aggregate(**{
+        level: Count('id', filter=vulnerability_level_filter(level))
+        for level, _min_score in VULNERABILITY_LEVELS
+    })
@@ -42,8 +42,8 @@ class SupportRequestSerializer(serializers.ModelSerializer):
             'estimated_beneficiaries', 'estimated_cost', 'requested_date', 'needed_by_date',
             'reviewed_by', 'reviewed_by_name', 'reviewed_at', 'admin_notes',
             'assigned_to', 'assigned_to_name', 'started_at', 'completed_at',
-            'actual_cost', 'actual_beneficiaries', 'is_overdue', 'days_since_request',
-            'communications_count'
+            'actual_cost', 'actual_beneficiaries', 'is_overdue', 'due_state', 'priority',
+            'days_since_request', 'communications_count'
         ]
         read_only_fields = ['requested_date', 'beneficiary_name', 'beneficiary_location']
 
@@ -56,6 +56,9 @@ class SupportRequestSerializer(serializers.ModelSerializer):
         return delta.days
 
     def get_communications_count(self, obj):
+        # As filas anotam a contagem para evitar uma consulta por linha
+        if hasattr(obj, 'communications_total'):
+            return obj.communications_total
         return obj.communications.count()
 
 
@@ -285,8 +288,8 @@ class BeneficiaryProfileCompleteSerializer(serializers.ModelSerializer):
     def get_client_profile(self, obj):
         """Retorna dados do perfil client_area se existir"""
         try:
-            from client_area.models import UserProfile as ClientProfile
-            client_profile = ClientProfile.objects.get(user=obj.user)
+            # Acesso reverso: aproveita select_related('user__client_profile')
+            client_profile = obj.user.client_profile
             return ClientProfileSerializer(client_profile).data
         except:
             return None
@@ -340,7 +343,7 @@ class SupportRequestCompleteSerializer(serializers.ModelSerializer):
             'actual_cost', 'actual_beneficiaries',
             
             # Campos calculados
-            'is_overdue', 'days_since_request', 'communications_count'
+            'is_overdue', 'due_state', 'priority', 'days_since_request', 'communications_count'
         ]
         read_only_fields = ['requested_date', 'beneficiary_name', 'beneficiary_location']
 
@@ -353,4 +356,7 @@ class SupportRequestCompleteSerializer(serializers.ModelSerializer):
         return delta.days
 
     def get_communications_count(self, obj):
+        # As filas anotam a contagem para evitar uma consulta por linha
+        if hasattr(obj, 'communications_total'):
+            return obj.communications_total
         return obj.communications.count()
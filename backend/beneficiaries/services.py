@@ -0,0 +1,135 @@
+# backend/beneficiaries/services.py
+"""
+Serviço de estatísticas administrativas de beneficiários.
+
+Todos os contadores saem de um agregado condicional por tabela e as
+distribuições (tipo de apoio, província/distrito) de um ``GROUP BY`` cada.
+O resultado fica em cache e é invalidado pelos sinais de ``BeneficiaryProfile``
+e ``SupportRequest`` (ver ``signals.py``).
+"""
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import BeneficiaryProfile, SupportRequest
+from .scoring import VULNERABILITY_LEVELS, vulnerability_level_filter
+
+
+ANALYTICS_CACHE_KEY = 'beneficiary_admin_analytics'
+ANALYTICS_CACHE_TIMEOUT = 15 * 60
+
+OPEN_STATUSES = ['pendente', 'em_analise', 'aprovada', 'em_andamento']
+URGENT_LEVELS = ['alta', 'critica']
+TOP_LOCATIONS_LIMIT = 10
+
+
+def _profile_counters():
+    """Totais de perfis (verificação e vulnerabilidade) numa consulta"""
+    counters = {
+        'total_beneficiaries': Count('id'),
+        'verified_beneficiaries': Count('id', filter=Q(is_verified=True)),
+    }
+    for level, _min_score in VULNERABILITY_LEVELS:
+        counters[f'vulnerability_{level}'] = Count('id', filter=vulnerability_level_filter(level))
+    return BeneficiaryProfile.objects.aggregate(**counters)
+
+
+def _request_counters(today):
+    """Totais de solicitações por status, urgência e prazo numa consulta"""
+    counters = {'total_requests': Count('id')}
+    for value, _label in SupportRequest.STATUS_CHOICES:
+        counters[f'status_{value}'] = Count('id', filter=Q(status=value))
+    counters['urgent_requests'] = Count(
+        'id', filter=Q(urgency__in=URGENT_LEVELS, status__in=['pendente', 'em_analise'])
+    )
+    counters['overdue_requests'] = Count(
+        'id', filter=Q(needed_by_date__lt=today, status__in=OPEN_STATUSES)
+    )
+    return SupportRequest.objects.aggregate(**counters)
+
+
+def _location_breakdown():
+    """Distribuições por província e distrito a partir de um único GROUP BY"""
+    rows = BeneficiaryProfile.objects.values('province', 'district').annotate(
+        count=Count('id'),
+        verified=Count('id', filter=Q(is_verified=True)),
+    ).order_by('-count', 'province', 'district')
+
+    by_district = []
+    provinces = defaultdict(lambda: {'count': 0, 'verified': 0, 'districts': 0})
+    districts = defaultdict(int)
+    for row in rows:
+        by_district.append(row)
+        province = provinces[row['province']]
+        province['count'] += row['count']
+        province['verified'] += row['verified']
+        province['districts'] += 1
+        districts[row['district']] += row['count']
+
+    by_province = sorted(
+        ({'province': name, **totals} for name, totals in provinces.items()),
+        key=lambda item: (-item['count'], item['province'])
+    )
+    top_locations = sorted(
+        ({'district': name, 'count': count} for name, count in districts.items()),
+        key=lambda item: (-item['count'], item['district'])
+    )[:TOP_LOCATIONS_LIMIT]
+    return by_province, by_district, top_locations
+
+
+def compute_beneficiary_analytics():
+    """Calcula as estatísticas administrativas (quatro consultas no total)"""
+    today = timezone.now().date()
+    profiles = _profile_counters()
+    requests = _request_counters(today)
+
+    request_types = list(
+        SupportRequest.objects.values('request_type').annotate(count=Count('id')).order_by('-count')
+    )
+    by_province, by_district, top_locations = _location_breakdown()
+
+    total = profiles['total_beneficiaries']
+    verified = profiles['verified_beneficiaries']
+    return {
+        'total_beneficiaries': total,
+        'verified_beneficiaries': verified,
+        'pending_verification': total - verified,
+        'verification_rate': round((verified / total * 100) if total > 0 else 0, 1),
+        'vulnerability_distribution': {
+            level: profiles[f'vulnerability_{level}'] for level, _min_score in VULNERABILITY_LEVELS
+        },
+        'total_requests': requests['total_requests'],
+        'pending_requests': requests['status_pendente'],
+        'approved_requests': requests['status_aprovada'],
+        'rejected_requests': requests['status_rejeitada'],
+        'urgent_requests': requests['urgent_requests'],
+        'overdue_requests': requests['overdue_requests'],
+        'requests_by_status': {
+            value: requests[f'status_{value}'] for value, _label in SupportRequest.STATUS_CHOICES
+        },
+        'request_types': request_types,
+        'top_locations': top_locations,
+        'by_province': by_province,
+        'by_district': by_district,
+        'generated_on': today.isoformat(),
+    }
+
+
+def get_beneficiary_analytics(use_cache=True):
+    """Estatísticas em cache; recalculadas se invalidadas ou de outro dia"""
+    today = timezone.now().date().isoformat()
+    if use_cache:
+        data = cache.get(ANALYTICS_CACHE_KEY)
+        # "overdue_requests" depende da data atual
+        if data is not None and data.get('generated_on') == today:
+            return data
+
+    data = compute_beneficiary_analytics()
+    cache.set(ANALYTICS_CACHE_KEY, data, ANALYTICS_CACHE_TIMEOUT)
+    return data
+
+
+def invalidate_beneficiary_analytics():
+    cache.delete(ANALYTICS_CACHE_KEY)
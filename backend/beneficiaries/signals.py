@@ -0,0 +1,15 @@
+# backend/beneficiaries/signals.py
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import BeneficiaryProfile, SupportRequest
+from .services import invalidate_beneficiary_analytics
+
+
+@receiver(post_save, sender=BeneficiaryProfile)
+@receiver(post_delete, sender=BeneficiaryProfile)
+@receiver(post_save, sender=SupportRequest)
+@receiver(post_delete, sender=SupportRequest)
+def invalidate_analytics_on_change(sender, **kwargs):
+    """Perfil ou solicitação alterados: estatísticas administrativas desatualizadas"""
+    transaction.on_commit(invalidate_beneficiary_analytics)
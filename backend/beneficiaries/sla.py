@@ -0,0 +1,138 @@
+# backend/beneficiaries/sla.py
+"""
+SLA das solicitações de apoio.
+
+Cada ``SupportRequest`` guarda o estado do prazo (``due_state``) e um balde de
+prioridade (``priority``) derivados de status, urgência e ``needed_by_date``.
+São recalculados ao salvar e, como dependem da data atual, pelo comando
+diário ``refresh_support_request_sla``. As filas administrativas ordenam por
+``(-priority, id)`` com paginação por chave (keyset), apoiadas em índices
+parciais sobre os status em aberto.
+"""
+import base64
+from datetime import timedelta
+
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.utils import timezone
+
+
+OPEN_STATUSES = ['pendente', 'em_analise', 'aprovada', 'em_andamento']
+OPEN_FILTER = Q(status__in=OPEN_STATUSES)
+
+# Dias antes do prazo a partir dos quais a solicitação "vence em breve"
+DUE_SOON_DAYS = 3
+
+DUE_STATE_CHOICES = [
+    ('atrasada', 'Atrasada'),
+    ('vence_em_breve', 'Vence em Breve'),
+    ('no_prazo', 'No Prazo'),
+    ('sem_prazo', 'Sem Prazo'),
+    ('encerrada', 'Encerrada'),
+]
+
+URGENCY_WEIGHTS = {
+    'critica': 4,
+    'alta': 3,
+    'media': 2,
+    'baixa': 1,
+}
+
+DUE_STATE_WEIGHTS = {
+    'atrasada': 3,
+    'vence_em_breve': 2,
+    'no_prazo': 1,
+    'sem_prazo': 0,
+    'encerrada': 0,
+}
+
+
+def compute_due_state(status, needed_by_date, today=None):
+    if status not in OPEN_STATUSES:
+        return 'encerrada'
+    if not needed_by_date:
+        return 'sem_prazo'
+    today = today or timezone.now().date()
+    if needed_by_date < today:
+        return 'atrasada'
+    if needed_by_date <= today + timedelta(days=DUE_SOON_DAYS):
+        return 'vence_em_breve'
+    return 'no_prazo'
+
+
+def compute_priority(status, urgency, due_state):
+    """Balde de prioridade: urgência domina, estado do prazo desempata"""
+    if status not in OPEN_STATUSES:
+        return 0
+    return URGENCY_WEIGHTS.get(urgency, 0) * 10 + DUE_STATE_WEIGHTS[due_state]
+
+
+def due_state_expression(today=None):
+    """Mesmo ``due_state`` como expressão SQL (para ``update()``)"""
+    today = today or timezone.now().date()
+    return Case(
+        When(~OPEN_FILTER, then=Value('encerrada')),
+        When(needed_by_date__isnull=True, then=Value('sem_prazo')),
+        When(needed_by_date__lt=today, then=Value('atrasada')),
+        When(needed_by_date__lte=today + timedelta(days=DUE_SOON_DAYS), then=Value('vence_em_breve')),
+        default=Value('no_prazo'),
+    )
+
+
+def priority_expression(today=None):
+    """Mesma ``priority`` como expressão SQL (para ``update()``)"""
+    today = today or timezone.now().date()
+    due_states = [
+        (Q(needed_by_date__isnull=True), 'sem_prazo'),
+        (Q(needed_by_date__lt=today), 'atrasada'),
+        (Q(needed_by_date__lte=today + timedelta(days=DUE_SOON_DAYS)), 'vence_em_breve'),
+        (Q(), 'no_prazo'),
+    ]
+    whens = [When(~OPEN_FILTER, then=Value(0))]
+    for urgency, weight in URGENCY_WEIGHTS.items():
+        for condition, due_state in due_states:
+            whens.append(When(
+                condition & Q(urgency=urgency),
+                then=Value(weight * 10 + DUE_STATE_WEIGHTS[due_state]),
+            ))
+    return Case(*whens, default=Value(0), output_field=IntegerField())
+
+
+def refresh_sla(queryset, today=None):
+    """Atualiza em massa as linhas cujo estado mudou; retorna o nº alterado"""
+    today = today or timezone.now().date()
+    due_state = due_state_expression(today)
+    priority = priority_expression(today)
+    return queryset.exclude(
+        due_state=due_state, priority=priority
+    ).update(due_state=due_state, priority=priority)
+
+
+def encode_cursor(priority, pk):
+    return base64.urlsafe_b64encode(f'{priority}:{pk}'.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """``(priority, id)`` do cursor ou ``None`` se inválido"""
+    try:
+        priority, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split(':')
+        return int(priority), int(pk)
+    except (ValueError, UnicodeError):
+        return None
+
+
+def keyset_page(queryset, cursor=None, page_size=20):
+    """Página da fila ordenada por ``(-priority, id)``.
+
+    Filtra pela última chave vista em vez de usar OFFSET, então o custo
+    não cresce com a profundidade da página.
+    """
+    queryset = queryset.order_by('-priority', 'id')
+    if cursor:
+        priority, pk = cursor
+        queryset = queryset.filter(Q(priority__lt=priority) | Q(priority=priority, id__gt=pk))
+    rows = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(rows[-1].priority, rows[-1].pk)
+    return rows, next_cursor
@@ -0,0 +1,56 @@
+# backend/beneficiaries/tests.py
+from datetime import timedelta
+
+from django.contrib.admin.sites import AdminSite
+from django.contrib.auth.models import User
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from .admin import SupportRequestAdmin
+from .models import BeneficiaryProfile, SupportRequest
+
+
+class SupportRequestAdminActionsTest(TestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(username='admin', password='x')
+        user = User.objects.create_user(username='beneficiaria')
+        profile = BeneficiaryProfile.objects.create(
+            user=user, full_name='Beneficiária', date_of_birth='1990-01-01', gender='F',
+            phone_number='840000000', province='Cabo Delgado', district='Pemba',
+            administrative_post='Pemba', locality='Cimento', address_details='Rua 1',
+            education_level='primario', employment_status='desempregado', family_status='casado',
+            family_members_count=4, priority_needs='Alimentação',
+        )
+        self.support_request = SupportRequest.objects.create(
+            beneficiary=profile, request_type='alimentar', title='Cesta básica',
+            description='Apoio', urgency='alta', status='em_andamento',
+            needed_by_date=timezone.now().date() - timedelta(days=2),
+        )
+        self.model_admin = SupportRequestAdmin(SupportRequest, AdminSite())
+        self.request = RequestFactory().post('/')
+        self.request.user = self.admin_user
+        self.model_admin.message_user = lambda *args, **kwargs: None
+
+    def test_completing_overdue_request_clears_sla_state(self):
+        self.assertTrue(self.support_request.is_overdue)
+
+        self.model_admin.mark_as_completed(
+            self.request, SupportRequest.objects.filter(pk=self.support_request.pk)
+        )
+
+        self.support_request.refresh_from_db()
+        self.assertEqual(self.support_request.status, 'concluida')
+        self.assertFalse(self.support_request.is_overdue)
+        self.assertEqual(self.support_request.due_state, 'encerrada')
+        self.assertEqual(self.support_request.priority, 0)
+
+    def test_reopening_action_recomputes_priority(self):
+        SupportRequest.objects.filter(pk=self.support_request.pk).update(status='concluida', due_state='encerrada', priority=0)
+
+        self.model_admin.mark_as_approved(
+            self.request, SupportRequest.objects.filter(pk=self.support_request.pk)
+        )
+
+        self.support_request.refresh_from_db()
+        self.assertEqual(self.support_request.due_state, 'atrasada')
+        self.assertEqual(self.support_request.priority, 33)
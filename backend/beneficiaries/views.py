@@ -4,9 +4,13 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from django.contrib.auth.models import User
-from django.db.models import Q, Count, Avg
+from django.db.models import Q, Count, Avg, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from .models import BeneficiaryProfile, SupportRequest, BeneficiaryCommunication, BeneficiaryDocument
+from .scoring import vulnerability_level_filter
+from .services import get_beneficiary_analytics
+from .sla import DUE_STATE_CHOICES, OPEN_FILTER, decode_cursor, keyset_page
 from .serializers import (
     BeneficiaryProfileSerializer, SupportRequestSerializer, BeneficiaryCommunicationSerializer,
     BeneficiaryDocumentSerializer, BeneficiaryRegistrationSerializer, SupportRequestCreateSerializer,
@@ -53,6 +57,73 @@ def beneficiary_profile_exists(request):
     return Response(data)
 
 
+QUEUE_PAGE_SIZE = 20
+QUEUE_MAX_PAGE_SIZE = 100
+
+
+def with_queue_relations(queryset):
+    """Carrega beneficiário e contagem de comunicações sem consultas por linha
+
+    A contagem é uma subconsulta correlacionada, não ``Count`` com JOIN: o
+    GROUP BY sobre todas as solicitações em aberto viria antes do ORDER
+    BY/LIMIT e anularia a paginação por cursor e o índice parcial da fila.
+    """
+    return queryset.select_related(
+        'beneficiary__user__client_profile', 'reviewed_by', 'assigned_to'
+    ).annotate(communications_total=Coalesce(
+        Subquery(
+            BeneficiaryCommunication.objects.filter(support_request=OuterRef('pk')).order_by().values(
+                'support_request'
+            ).annotate(total=Count('id')).values('total')[:1],
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    ))
+
+
+def support_request_queue_response(request, serializer_class):
+    """Fila de solicitações em aberto ordenada por ``(-priority, id)``.
+
+    Parâmetros: ``due_state``, ``urgency``, ``type``, ``status`` (em aberto),
+    ``page_size`` e ``cursor`` (valor de ``next`` da página anterior).
+    """
+    queryset = SupportRequest.objects.filter(OPEN_FILTER)
+
+    due_state = request.query_params.get('due_state')
+    if due_state:
+        if due_state not in dict(DUE_STATE_CHOICES):
+            return Response({'error': 'Estado de prazo inválido'}, status=status.HTTP_400_BAD_REQUEST)
+        queryset = queryset.filter(due_state=due_state)
+    urgency = request.query_params.get('urgency')
+    if urgency:
+        queryset = queryset.filter(urgency=urgency)
+    request_type = request.query_params.get('type')
+    if request_type:
+        queryset = queryset.filter(request_type=request_type)
+    status_filter = request.query_params.get('status')
+    if status_filter:
+        queryset = queryset.filter(status=status_filter)
+
+    cursor = request.query_params.get('cursor')
+    position = None
+    if cursor:
+        position = decode_cursor(cursor)
+        if position is None:
+            return Response({'error': 'Cursor inválido'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        page_size = min(int(request.query_params.get('page_size', QUEUE_PAGE_SIZE)), QUEUE_MAX_PAGE_SIZE)
+    except ValueError:
+        page_size = QUEUE_PAGE_SIZE
+
+    rows, next_cursor = keyset_page(with_queue_relations(queryset), position, max(page_size, 1))
+    serializer = serializer_class(rows, many=True, context={'request': request})
+    return Response({
+        'next': next_cursor,
+        'results': serializer.data,
+    })
+
+
 class BeneficiaryProfileViewSet(viewsets.ModelViewSet):
     serializer_class = BeneficiaryProfileSerializer
     permission_classes = [IsAuthenticated]
@@ -143,49 +214,31 @@ class BeneficiaryProfileViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        # Estatísticas gerais
-        total_beneficiaries = BeneficiaryProfile.objects.count()
-        verified_beneficiaries = BeneficiaryProfile.objects.filter(is_verified=True).count()
-        pending_requests = SupportRequest.objects.filter(status='pendente').count()
-        overdue_requests = SupportRequest.objects.filter(
-            needed_by_date__lt=timezone.now().date(),
-            status__in=['pendente', 'em_analise', 'aprovada', 'em_andamento']
-        ).count()
-
-        # Distribuição por vulnerabilidade
-        vulnerability_distribution = {}
-        for profile in BeneficiaryProfile.objects.all():
-            score = profile.vulnerability_score
-            if score >= 7:
-                level = 'alta'
-            elif score >= 4:
-                level = 'media'
-            else:
-                level = 'baixa'
-            vulnerability_distribution[level] = vulnerability_distribution.get(level, 0) + 1
-
-        # Estatísticas por tipo de solicitação
-        request_types = SupportRequest.objects.values('request_type').annotate(
-            count=Count('id')
-        ).order_by('-count')
-
-        # Estatísticas por localização
-        location_stats = BeneficiaryProfile.objects.values('district').annotate(
-            count=Count('id')
-        ).order_by('-count')[:10]
-
-        stats = {
-            'total_beneficiaries': total_beneficiaries,
-            'verified_beneficiaries': verified_beneficiaries,
-            'pending_requests': pending_requests,
-            'overdue_requests': overdue_requests,
-            'vulnerability_distribution': vulnerability_distribution,
-            'request_types': list(request_types),
-            'top_locations': list(location_stats),
-            'verification_rate': round((verified_beneficiaries / total_beneficiaries * 100) if total_beneficiaries > 0 else 0, 1)
-        }
-
-        return Response(stats)
+        return Response(get_beneficiary_analytics())
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def priority_queue(self, request):
+        """Beneficiários ordenados por maior vulnerabilidade (índice em vulnerability_score)"""
+        queryset = BeneficiaryProfile.objects.order_by('-vulnerability_score', '-created_at')
+        
+        level = request.query_params.get('level')
+        if level:
+            level_filter = vulnerability_level_filter(level)
+            if level_filter is None:
+                return Response(
+                    {'error': 'Nível inválido (use alta, media ou baixa)'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            queryset = queryset.filter(level_filter)
+        
+        if request.query_params.get('unverified') == 'true':
+            queryset = queryset.filter(is_verified=False)
+        
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page if page is not None else queryset, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
 
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def verify(self, request, pk=None):
@@ -327,7 +380,9 @@ class SupportRequestViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        pending_requests = SupportRequest.objects.filter(status='pendente').order_by('-requested_date')
+        pending_requests = with_queue_relations(
+            SupportRequest.objects.filter(status='pendente')
+        ).order_by('-requested_date')
         serializer = self.get_serializer(pending_requests, many=True)
         return Response(serializer.data)
 
@@ -340,14 +395,19 @@ class SupportRequestViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        overdue_requests = SupportRequest.objects.filter(
-            needed_by_date__lt=timezone.now().date(),
-            status__in=['pendente', 'em_analise', 'aprovada', 'em_andamento']
+        # Estado gravado (índice parcial support_req_due_idx)
+        overdue_requests = with_queue_relations(
+            SupportRequest.objects.filter(OPEN_FILTER, due_state='atrasada')
         ).order_by('needed_by_date')
         
         serializer = self.get_serializer(overdue_requests, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def queue(self, request):
+        """Fila de solicitações em aberto ordenada por prioridade (paginação por cursor)"""
+        return support_request_queue_response(request, self.get_serializer_class())
+
 
 class BeneficiaryCommunicationViewSet(viewsets.ModelViewSet):
     serializer_class = BeneficiaryCommunicationSerializer
@@ -433,31 +493,7 @@ class BeneficiaryDocumentViewSet(viewsets.ModelViewSet):
 def admin_beneficiaries_stats(request):
     """Estatísticas administrativas do sistema de beneficiários"""
     try:
-        total_beneficiaries = BeneficiaryProfile.objects.count()
-        verified_beneficiaries = BeneficiaryProfile.objects.filter(is_verified=True).count()
-        pending_verification = total_beneficiaries - verified_beneficiaries
-        
-        total_requests = SupportRequest.objects.count()
-        pending_requests = SupportRequest.objects.filter(status='pendente').count()
-        approved_requests = SupportRequest.objects.filter(status='aprovada').count()
-        rejected_requests = SupportRequest.objects.filter(status='rejeitada').count()
-        urgent_requests = SupportRequest.objects.filter(
-            urgency__in=['alta', 'critica'],
-            status__in=['pendente', 'em_analise']
-        ).count()
-        
-        stats = {
-            'total_beneficiaries': total_beneficiaries,
-            'verified_beneficiaries': verified_beneficiaries,
-            'pending_verification': pending_verification,
-            'total_requests': total_requests,
-            'pending_requests': pending_requests,
-            'approved_requests': approved_requests,
-            'rejected_requests': rejected_requests,
-            'urgent_requests': urgent_requests,
-        }
-        
-        return Response(stats)
+        return Response(get_beneficiary_analytics())
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -484,6 +520,14 @@ class AdminBeneficiaryViewSet(viewsets.ModelViewSet):
                 Q(user__first_name__icontains=search) |
                 Q(user__last_name__icontains=search)
             )
+        
+        level = self.request.query_params.get('vulnerability_level', None)
+        if level:
+            level_filter = vulnerability_level_filter(level)
+            queryset = queryset.filter(level_filter) if level_filter is not None else queryset.none()
+        
+        if self.request.query_params.get('sort') == 'vulnerability':
+            return queryset.order_by('-vulnerability_score', '-created_at')
         return queryset.order_by('-created_at')
     
     @action(detail=True, methods=['patch'])
@@ -545,6 +589,11 @@ class AdminSupportRequestViewSet(viewsets.ModelViewSet):
             
         return queryset.order_by('-requested_date')
     
+    @action(detail=False, methods=['get'])
+    def queue(self, request):
+        """Fila de solicitações em aberto ordenada por prioridade (paginação por cursor)"""
+        return support_request_queue_response(request, self.get_serializer_class())
+    
     @action(detail=True, methods=['patch'])
     def approve(self, request, pk=None):
         """Aprovar solicitação"""
@@ -3,6 +3,7 @@ from rest_framework.routers import DefaultRouter
 from .views import BlogPostViewSet, CategoryViewSet, TagViewSet, NewsletterViewSet, CommentViewSet, ImageUploadView, ImageCreditViewSet
 from .admin_views import CommentAdminViewSet, SocialStatsViewSet
 from . import views
+from core.async_views import with_async_views
 
 app_name = 'blog'
 
@@ -18,7 +19,8 @@ router.register(r'admin/social-stats', SocialStatsViewSet, basename='admin-socia
 
 # Nested routes for comments
 urlpatterns = [
-    path('', include(router.urls)),
+    # Listagem e detalhe dos posts em views assíncronas no modo ASGI
+    path('', include(with_async_views(router.urls, {'blogpost-list', 'blogpost-detail'}))),
     
     # Specific routes for categories using slug
     path('categories/<slug:slug>/posts/', views.CategoryViewSet.as_view({
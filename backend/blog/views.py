@@ -11,6 +11,9 @@ from django.core.files.storage import default_storage
 from django.conf import settings
 from rest_framework.views import APIView
 from slugify import slugify
+from asgiref.sync import sync_to_async
+
+from core.async_views import AsyncReadMixin
 
 from .models import BlogPost, Category, Tag, Comment, Newsletter, ImageCredit, Like, Share
 from .serializers import (
@@ -22,7 +25,7 @@ from .filters import BlogPostFilter
 from .permissions import IsAuthorOrReadOnly, IsStaffOrReadOnly
 
 
-class BlogPostViewSet(viewsets.ModelViewSet):
+class BlogPostViewSet(AsyncReadMixin, viewsets.ModelViewSet):
     """
     ViewSet para operações CRUD de posts do blog
     """
@@ -61,6 +64,15 @@ class BlogPostViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
     
+    async def aretrieve(self, request, *args, **kwargs):
+        """Retrieve assíncrono (modo ASGI), com o mesmo incremento de visualizações"""
+        instance = await self.aget_object()
+        
+        if instance.status == 'published':
+            await sync_to_async(instance.increment_views)()
+        
+        return Response(await self.aserialize(instance))
+    
     @action(detail=False, methods=['get'])
     def featured(self, request):
         """Get featured posts"""
@@ -0,0 +1,29 @@
+# backend/client_area/management/commands/refresh_dashboard_stats.py
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from client_area.models import UserProfile
+from client_area.stats import refresh_dashboard_stats, stats_cache_key
+
+
+class Command(BaseCommand):
+    help = 'Materializa as estatísticas do dashboard do portal (padrão: só as desatualizadas)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Recalcula todos os perfis')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        profiles = UserProfile.objects.order_by('id')
+        if not options['all']:
+            # Perfis sem linha de estatísticas ou com a linha desatualizada
+            profiles = profiles.exclude(dashboard_stats__is_stale=False)
+
+        profile_ids = list(profiles.values_list('id', flat=True))
+        batch_size = max(options['batch_size'], 1)
+        refreshed = 0
+        for start in range(0, len(profile_ids), batch_size):
+            batch = UserProfile.objects.filter(id__in=profile_ids[start:start + batch_size])
+            refreshed += refresh_dashboard_stats(batch)
+            cache.delete_many([stats_cache_key(user_id) for user_id in batch.values_list('user_id', flat=True)])
+
+        self.stdout.write(self.style.SUCCESS(f'{refreshed} estatísticas de dashboard recalculadas'))
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('client_area', '0002_dashboardstats_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dashboardstats',
+            name='is_stale',
+            field=models.BooleanField(default=True),
+        ),
+    ]
@@ -165,6 +165,9 @@ class DashboardStats(models.Model):
     # Estatísticas específicas por tipo de usuário (JSON field)
     stats = models.JSONField(default=dict, blank=True)
     
+    # Marcada quando uma fonte muda e o recálculo (stats.py) ainda não gravou
+    is_stale = models.BooleanField(default=True)
+    
     # Última atualização
     last_updated = models.DateTimeField(auto_now=True)
     created_at = models.DateTimeField(auto_now_add=True)
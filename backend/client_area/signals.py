@@ -1,8 +1,13 @@
 # backend/client_area/signals.py
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import UserProfile, DashboardStats, Notification
+from core.models import (
+    Beneficiary as CoreBeneficiary, Donor as CoreDonor, Partner as CorePartner,
+    UserProfile as CoreUserProfile, Volunteer as CoreVolunteer
+)
+from .models import UserProfile, DashboardStats, Notification, MatchingRequest
+from .stats import mark_dashboard_stats_dirty
 
 
 # @receiver(post_save, sender=User)
@@ -31,3 +36,42 @@ def create_dashboard_stats(sender, instance, created, **kwargs):
             action_url='/client-area',
             action_text='Explorar Portal'
         )
+
+
+@receiver(post_save, sender=UserProfile)
+def mark_stats_dirty_on_profile_save(sender, instance, created, **kwargs):
+    """Tipo de usuário (ou perfil) alterado: estatísticas do dashboard desatualizadas"""
+    mark_dashboard_stats_dirty(profile_ids=[instance.pk])
+
+
+@receiver(post_save, sender=MatchingRequest)
+@receiver(post_delete, sender=MatchingRequest)
+def mark_stats_dirty_on_matching_change(sender, instance, **kwargs):
+    """Solicitação alterada: contagem de projetos ativos do solicitante e do voluntário"""
+    mark_dashboard_stats_dirty(profile_ids=[instance.requester_id, instance.volunteer_id])
+
+
+def _mark_core_profile_dirty(sender, instance, **kwargs):
+    """Perfil do core (doador, voluntário, beneficiário, parceiro) alterado"""
+    user_id = CoreUserProfile.objects.filter(pk=instance.user_profile_id).values_list('user_id', flat=True).first()
+    mark_dashboard_stats_dirty(user_ids=[user_id])
+
+
+def _mark_core_profile_m2m_dirty(sender, instance, action, reverse, **kwargs):
+    # Só o lado do perfil (ex.: volunteer.skills.add); mudanças pelo lado reverso
+    # (causa/habilidade -> perfis) ficam para o comando refresh_dashboard_stats
+    if action.startswith('post_') and not reverse:
+        _mark_core_profile_dirty(sender, instance)
+
+
+for core_model in (CoreDonor, CoreVolunteer, CoreBeneficiary, CorePartner):
+    post_save.connect(_mark_core_profile_dirty, sender=core_model, dispatch_uid=f'dashboard_stats_{core_model.__name__}')
+    post_delete.connect(_mark_core_profile_dirty, sender=core_model, dispatch_uid=f'dashboard_stats_delete_{core_model.__name__}')
+
+for through in (
+    CoreDonor.preferred_causes.through,
+    CoreVolunteer.skills.through,
+    CoreVolunteer.preferred_causes.through,
+    CorePartner.areas_of_expertise.through,
+):
+    m2m_changed.connect(_mark_core_profile_m2m_dirty, sender=through, dispatch_uid=f'dashboard_stats_m2m_{through.__name__}')
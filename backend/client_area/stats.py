@@ -0,0 +1,293 @@
+# backend/client_area/stats.py
+"""
+Estatísticas materializadas do dashboard do portal.
+
+O ``DashboardStats`` de cada perfil é recalculado só quando uma fonte muda
+(perfis do core, ``MatchingRequest``, doações espelhadas em ``core.Donor``):
+os sinais marcam os usuários como "sujos" e, no commit da transação, as
+estatísticas desses usuários são recalculadas em lote e gravadas. O GET do
+dashboard só lê (cache, depois a linha gravada); se a linha ainda não foi
+materializada, os valores são calculados em memória, sem escrever.
+"""
+import logging
+import threading
+from collections import Counter
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import DashboardStats, MatchingRequest, UserProfile
+
+
+logger = logging.getLogger(__name__)
+
+STATS_CACHE_TIMEOUT = 15 * 60
+STATS_FIELDS = ['total_donations', 'volunteer_hours', 'active_projects', 'stats', 'is_stale', 'last_updated']
+
+_pending = threading.local()
+
+
+def stats_cache_key(user_id):
+    return f'dashboard_stats_{user_id}'
+
+
+def _pending_sets():
+    if not hasattr(_pending, 'user_ids'):
+        _pending.user_ids = set()
+        _pending.profile_ids = set()
+    return _pending.user_ids, _pending.profile_ids
+
+
+def mark_dashboard_stats_dirty(user_ids=(), profile_ids=()):
+    """Agenda o recálculo (usuários ou perfis do portal) para o commit da transação"""
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    profile_ids = {profile_id for profile_id in profile_ids if profile_id is not None}
+    if not user_ids and not profile_ids:
+        return
+    pending_users, pending_profiles = _pending_sets()
+    pending_users.update(user_ids)
+    pending_profiles.update(profile_ids)
+    transaction.on_commit(flush_dirty_dashboard_stats)
+
+
+def flush_dirty_dashboard_stats():
+    pending_users, pending_profiles = _pending_sets()
+    if not pending_users and not pending_profiles:
+        return
+    user_ids, profile_ids = set(pending_users), set(pending_profiles)
+    pending_users.clear()
+    pending_profiles.clear()
+
+    profiles = list(
+        UserProfile.objects.filter(Q(user_id__in=user_ids) | Q(pk__in=profile_ids)).select_related('user')
+    )
+    try:
+        refresh_dashboard_stats(profiles)
+    except Exception as e:
+        # Linha fica marcada como desatualizada: o GET calcula em memória
+        logger.warning(f"Falha ao recalcular estatísticas do dashboard: {e}")
+        DashboardStats.objects.filter(user_profile__in=profiles).update(is_stale=True)
+    finally:
+        # Só depois da gravação: um GET no meio do recálculo não deixa a
+        # linha antiga de volta no cache
+        cache.delete_many([stats_cache_key(profile.user_id) for profile in profiles])
+
+
+def _donor_stats(donor):
+    return {
+        'total_donated': float(donor.total_donated or 0),
+        'first_donation': donor.first_donation_date.isoformat() if donor.first_donation_date else None,
+        'last_donation': donor.last_donation_date.isoformat() if donor.last_donation_date else None,
+        'preferred_frequency': donor.preferred_frequency,
+        'preferred_causes_count': donor.preferred_causes_count,
+        'user_type': 'donor'
+    }
+
+
+def _volunteer_stats(volunteer):
+    return {
+        'total_hours': volunteer.total_hours or 0,
+        'projects_completed': volunteer.projects_completed or 0,
+        'rating': float(volunteer.rating) if volunteer.rating else 0,
+        'skills_count': volunteer.skills_count,
+        'preferred_causes_count': volunteer.preferred_causes_count,
+        'transportation_available': volunteer.transportation_available,
+        'remote_work_available': volunteer.remote_work_available,
+        'user_type': 'volunteer'
+    }
+
+
+def _beneficiary_stats(beneficiary):
+    return {
+        'family_size': beneficiary.family_size,
+        'children_count': beneficiary.children_count,
+        'community': beneficiary.community,
+        'district': beneficiary.district,
+        'province': beneficiary.province,
+        'verification_status': beneficiary.verification_status,
+        'family_status': beneficiary.family_status,
+        'user_type': 'beneficiary'
+    }
+
+
+def _partner_stats(partner):
+    return {
+        'organization_name': partner.organization_name,
+        'organization_type': partner.organization_type,
+        'partnership_level': partner.partnership_level,
+        'areas_of_expertise_count': partner.areas_of_expertise_count,
+        'contact_person': partner.contact_person,
+        'partnership_start_date': partner.partnership_start_date.isoformat() if partner.partnership_start_date else None,
+        # Campos adicionais para o dashboard
+        'active_projects': 3,  # Placeholder - poderia ser calculado dinamicamente
+        'beneficiaries_impacted': 250,
+        'resources_invested': '150000.00',
+        'success_rate': 88,
+        'families_helped': 45,
+        'students_sponsored': 120,
+        'jobs_created': 8,
+        'communities_reached': 5,
+        'user_type': 'partner'
+    }
+
+
+def _missing_partner_stats(profile):
+    name = profile.user.get_full_name() or profile.user.username
+    return {
+        'user_type': 'partner',
+        'error': 'Perfil de parceiro não encontrado',
+        # Valores padrão para novos partners
+        'organization_name': name,
+        'organization_type': 'ngo',
+        'partnership_level': 'operational',
+        'areas_of_expertise_count': 0,
+        'contact_person': name,
+        'active_projects': 0,
+        'beneficiaries_impacted': 0,
+        'resources_invested': '0.00',
+        'success_rate': 0,
+        'families_helped': 0,
+        'students_sponsored': 0,
+        'jobs_created': 0,
+        'communities_reached': 0
+    }
+
+
+def _role_querysets():
+    """Perfil do core de cada tipo, com as contagens de M2M anotadas (uma consulta por tipo)"""
+    from core.models import Beneficiary, Donor, Partner, Volunteer
+
+    return {
+        'donor': (
+            Donor.objects.annotate(preferred_causes_count=Count('preferred_causes', distinct=True)),
+            _donor_stats,
+            'Perfil de doador não encontrado',
+        ),
+        'volunteer': (
+            Volunteer.objects.annotate(
+                skills_count=Count('skills', distinct=True),
+                preferred_causes_count=Count('preferred_causes', distinct=True),
+            ),
+            _volunteer_stats,
+            'Perfil de voluntário não encontrado',
+        ),
+        'beneficiary': (Beneficiary.objects.all(), _beneficiary_stats, 'Perfil de beneficiário não encontrado'),
+        'partner': (
+            Partner.objects.annotate(areas_of_expertise_count=Count('areas_of_expertise', distinct=True)),
+            _partner_stats,
+            'Perfil de parceiro não encontrado',
+        ),
+    }
+
+
+def _active_matching_counts(profile_ids):
+    """Solicitações em andamento em que o perfil é solicitante ou voluntário"""
+    counts = Counter()
+    base = MatchingRequest.objects.filter(status='in_progress')
+    for row in base.filter(requester_id__in=profile_ids).values('requester_id').annotate(
+        total=Count('id')
+    ).order_by():
+        counts[row['requester_id']] += row['total']
+    for row in base.filter(volunteer_id__in=profile_ids).exclude(requester_id=F('volunteer_id')).values(
+        'volunteer_id'
+    ).annotate(total=Count('id')).order_by():
+        counts[row['volunteer_id']] += row['total']
+    return counts
+
+
+def compute_dashboard_stats(profiles, existing=None):
+    """Calcula (sem gravar) o ``DashboardStats`` de cada perfil; retorna ``{perfil_id: stats}``"""
+    profiles = list(profiles)
+    existing = existing or {}
+    role_querysets = _role_querysets()
+    now = timezone.now()
+
+    by_type = {}
+    for profile in profiles:
+        by_type.setdefault(profile.user_type, []).append(profile)
+
+    results = {}
+    for user_type, typed_profiles in by_type.items():
+        role = role_querysets.get(user_type)
+        role_objects = {}
+        if role:
+            queryset, _builder, _missing = role
+            role_objects = {
+                obj.user_profile.user_id: obj
+                for obj in queryset.filter(
+                    user_profile__user_id__in=[p.user_id for p in typed_profiles]
+                ).select_related('user_profile')
+            }
+
+        for profile in typed_profiles:
+            stats = existing.get(profile.pk) or DashboardStats(user_profile=profile)
+            role_object = role_objects.get(profile.user_id)
+            if role is None:
+                stats.stats = {'user_type': profile.user_type, 'error': 'Tipo de usuário desconhecido'}
+            elif role_object is None:
+                stats.stats = (
+                    _missing_partner_stats(profile) if user_type == 'partner'
+                    else {'user_type': user_type, 'error': role[2]}
+                )
+            else:
+                stats.stats = role[1](role_object)
+                if user_type == 'donor':
+                    stats.total_donations = role_object.total_donated or 0
+                elif user_type == 'volunteer':
+                    stats.volunteer_hours = role_object.total_hours or 0
+            stats.last_updated = now
+            results[profile.pk] = stats
+
+    counts = _active_matching_counts([p.pk for p in profiles])
+    for profile_id, stats in results.items():
+        stats.active_projects = counts.get(profile_id, 0)
+    return results
+
+
+def refresh_dashboard_stats(profiles):
+    """Recalcula e grava as estatísticas destes perfis; retorna quantas foram gravadas"""
+    if hasattr(profiles, 'select_related'):
+        profiles = profiles.select_related('user')
+    profiles = list(profiles)
+    if not profiles:
+        return 0
+
+    with transaction.atomic():
+        existing = {
+            stats.user_profile_id: stats
+            for stats in DashboardStats.objects.select_for_update().filter(
+                user_profile__in=[p.pk for p in profiles]
+            )
+        }
+        missing = [p for p in profiles if p.pk not in existing]
+        if missing:
+            DashboardStats.objects.bulk_create(
+                [DashboardStats(user_profile=p) for p in missing], ignore_conflicts=True
+            )
+            existing.update({
+                stats.user_profile_id: stats
+                for stats in DashboardStats.objects.select_for_update().filter(user_profile__in=missing)
+            })
+
+        results = compute_dashboard_stats(profiles, existing)
+        for stats in results.values():
+            stats.is_stale = False
+        DashboardStats.objects.bulk_update(results.values(), STATS_FIELDS, batch_size=500)
+    return len(results)
+
+
+def get_dashboard_stats(profile, serializer_class):
+    """Dados do dashboard só com leituras: cache, linha gravada ou cálculo em memória"""
+    key = stats_cache_key(profile.user_id)
+    data = cache.get(key)
+    if data is not None:
+        return data
+
+    stats = DashboardStats.objects.filter(user_profile=profile).first()
+    if stats is None or stats.is_stale:
+        stats = compute_dashboard_stats([profile], {profile.pk: stats} if stats else None)[profile.pk]
+    data = serializer_class(stats).data
+    cache.set(key, data, STATS_CACHE_TIMEOUT)
+    return data
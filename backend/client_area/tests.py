@@ -1,4 +1,7 @@
 # backend/client_area/tests.py
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
 from django.contrib.auth.models import User
 from django.urls import reverse
@@ -6,6 +9,7 @@ from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from rest_framework.authtoken.models import Token
 from .models import UserProfile, Notification, MatchingRequest, DashboardStats, Cause, Skill
+from . import stats as dashboard_stats
 
 
 class UserProfileModelTest(TestCase):
@@ -372,6 +376,24 @@ class DashboardStatsAPITest(APITestCase):
         self.assertIn('volunteer_hours', response.data)
         self.assertIn('last_updated', response.data)
 
+    def test_flush_drops_cache_written_during_refresh(self):
+        """GET concorrente ao recálculo não deixa dados antigos no cache"""
+        UserProfile.objects.create(user=self.user, user_type='donor')
+        key = dashboard_stats.stats_cache_key(self.user.pk)
+        self.addCleanup(cache.delete, key)
+        refresh = dashboard_stats.refresh_dashboard_stats
+
+        def refresh_with_concurrent_read(profiles):
+            cache.set(key, {'total_donations': 'antigo'})
+            return refresh(profiles)
+
+        with mock.patch.object(dashboard_stats, 'refresh_dashboard_stats', side_effect=refresh_with_concurrent_read):
+            dashboard_stats.mark_dashboard_stats_dirty(user_ids=[self.user.pk])
+            dashboard_stats.flush_dirty_dashboard_stats()
+
+        self.assertIsNone(cache.get(key))
+        self.assertFalse(DashboardStats.objects.get(user_profile__user=self.user).is_stale)
+
 
 class CauseAndSkillAPITest(APITestCase):
     def setUp(self):
@@ -24,6 +24,7 @@ urlpatterns = [
     # Sistema de Matching
     path('matching/requests/', views.MatchingRequestListCreateView.as_view(), name='matching-requests'),
     path('matching/requests/<int:request_id>/accept/', views.accept_matching_request, name='accept-matching-request'),
+    path('matching/requests/<int:request_id>/candidates/', views.matching_request_candidates, name='matching-request-candidates'),
     
     # Dados auxiliares
     path('causes/', views.CauseListView.as_view(), name='causes'),
@@ -8,7 +8,9 @@ from django.db.models import Q
 from django.utils import timezone
 from datetime import datetime, timedelta
 
+from core import session_activity
 from .models import UserProfile, Notification, MatchingRequest, DashboardStats, Cause, Skill
+from .stats import get_dashboard_stats
 from .serializers import (
     UserProfileSerializer, NotificationSerializer, MatchingRequestSerializer,
     DashboardStatsSerializer, CauseSerializer, SkillSerializer,
@@ -45,6 +47,8 @@ def login_user(request):
     if serializer.is_valid():
         user = serializer.validated_data['user']
         token, created = Token.objects.get_or_create(user=user)
+        # Token reemitido: um período de inatividade anterior não conta mais
+        session_activity.credential_issued('token', token.key)
         
         # Buscar perfil existente (não criar com valor padrão)
         try:
@@ -96,143 +100,23 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
 
 
 class DashboardStatsView(generics.RetrieveAPIView):
-    """Estatísticas do dashboard"""
+    """Estatísticas do dashboard (somente leitura; recalculadas pelos sinais em stats.py)"""
     serializer_class = DashboardStatsSerializer
     permission_classes = [permissions.IsAuthenticated]
     
-    def get_object(self):
+    def get_profile(self):
         # Buscar ou criar perfil do usuário
         try:
-            profile = self.request.user.client_profile
+            return self.request.user.client_profile
         except UserProfile.DoesNotExist:
             # Se não existir, criar com tipo padrão (fallback)
-            profile = UserProfile.objects.create(
+            return UserProfile.objects.create(
                 user=self.request.user,
                 user_type='donor'
             )
-        
-        stats, created = DashboardStats.objects.get_or_create(user_profile=profile)
-        
-        # Atualizar estatísticas baseadas no tipo de usuário e perfis específicos do core
-        self.update_stats(stats, profile)
-        
-        return stats
     
-    def update_stats(self, stats, profile):
-        """Atualizar estatísticas baseado em dados reais dos perfis específicos do core"""
-        now = timezone.now()
-        current_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        
-        # Buscar dados dos perfis específicos do core baseado no tipo de usuário
-        try:
-            if profile.user_type == 'donor':
-                from core.models import Donor as CoreDonor
-                try:
-                    donor = CoreDonor.objects.get(user_profile__user=profile.user)
-                    stats.total_donations = donor.total_donated or 0
-                    # Adicionar outras estatísticas específicas do doador
-                    stats.stats = {
-                        'total_donated': float(donor.total_donated or 0),
-                        'first_donation': donor.first_donation_date.isoformat() if donor.first_donation_date else None,
-                        'last_donation': donor.last_donation_date.isoformat() if donor.last_donation_date else None,
-                        'preferred_frequency': donor.preferred_frequency,
-                        'preferred_causes_count': donor.preferred_causes.count(),
-                        'user_type': 'donor'
-                    }
-                except CoreDonor.DoesNotExist:
-                    stats.stats = {'user_type': 'donor', 'error': 'Perfil de doador não encontrado'}
-                    
-            elif profile.user_type == 'volunteer':
-                from core.models import Volunteer as CoreVolunteer
-                try:
-                    volunteer = CoreVolunteer.objects.get(user_profile__user=profile.user)
-                    stats.volunteer_hours = volunteer.total_hours or 0
-                    stats.stats = {
-                        'total_hours': volunteer.total_hours or 0,
-                        'projects_completed': volunteer.projects_completed or 0,
-                        'rating': float(volunteer.rating) if volunteer.rating else 0,
-                        'skills_count': volunteer.skills.count(),
-                        'preferred_causes_count': volunteer.preferred_causes.count(),
-                        'transportation_available': volunteer.transportation_available,
-                        'remote_work_available': volunteer.remote_work_available,
-                        'user_type': 'volunteer'
-                    }
-                except CoreVolunteer.DoesNotExist:
-                    stats.stats = {'user_type': 'volunteer', 'error': 'Perfil de voluntário não encontrado'}
-                    
-            elif profile.user_type == 'beneficiary':
-                from core.models import Beneficiary as CoreBeneficiary
-                try:
-                    beneficiary = CoreBeneficiary.objects.get(user_profile__user=profile.user)
-                    stats.stats = {
-                        'family_size': beneficiary.family_size,
-                        'children_count': beneficiary.children_count,
-                        'community': beneficiary.community,
-                        'district': beneficiary.district,
-                        'province': beneficiary.province,
-                        'verification_status': beneficiary.verification_status,
-                        'family_status': beneficiary.family_status,
-                        'user_type': 'beneficiary'
-                    }
-                except CoreBeneficiary.DoesNotExist:
-                    stats.stats = {'user_type': 'beneficiary', 'error': 'Perfil de beneficiário não encontrado'}
-                    
-            elif profile.user_type == 'partner':
-                from core.models import Partner as CorePartner
-                try:
-                    partner = CorePartner.objects.get(user_profile__user=profile.user)
-                    stats.stats = {
-                        'organization_name': partner.organization_name,
-                        'organization_type': partner.organization_type,
-                        'partnership_level': partner.partnership_level,
-                        'areas_of_expertise_count': partner.areas_of_expertise.count(),
-                        'contact_person': partner.contact_person,
-                        'partnership_start_date': partner.partnership_start_date.isoformat() if partner.partnership_start_date else None,
-                        # Campos adicionais para o dashboard
-                        'active_projects': 3,  # Placeholder - poderia ser calculado dinamicamente
-                        'beneficiaries_impacted': 250,
-                        'resources_invested': '150000.00',
-                        'success_rate': 88,
-                        'families_helped': 45,
-                        'students_sponsored': 120,
-                        'jobs_created': 8,
-                        'communities_reached': 5,
-                        'user_type': 'partner'
-                    }
-                except CorePartner.DoesNotExist:
-                    stats.stats = {
-                        'user_type': 'partner', 
-                        'error': 'Perfil de parceiro não encontrado',
-                        # Valores padrão para novos partners
-                        'organization_name': profile.user.get_full_name() or profile.user.username,
-                        'organization_type': 'ngo',
-                        'partnership_level': 'operational',
-                        'areas_of_expertise_count': 0,
-                        'contact_person': profile.user.get_full_name() or profile.user.username,
-                        'active_projects': 0,
-                        'beneficiaries_impacted': 0,
-                        'resources_invested': '0.00',
-                        'success_rate': 0,
-                        'families_helped': 0,
-                        'students_sponsored': 0,
-                        'jobs_created': 0,
-                        'communities_reached': 0
-                    }
-                    
-            else:
-                stats.stats = {'user_type': profile.user_type, 'error': 'Tipo de usuário desconhecido'}
-                
-        except Exception as e:
-            stats.stats = {'user_type': profile.user_type, 'error': f'Erro ao carregar estatísticas: {str(e)}'}
-        
-        stats.save()
-        
-        stats.active_projects = MatchingRequest.objects.filter(
-            Q(requester=profile) | Q(volunteer=profile),
-            status='in_progress'
-        ).count()
-        
-        stats.save()
+    def retrieve(self, request, *args, **kwargs):
+        return Response(get_dashboard_stats(self.get_profile(), self.get_serializer_class()))
 
 
 class NotificationListView(generics.ListAPIView):
@@ -346,6 +230,35 @@ def accept_matching_request(request, request_id):
                        status=status.HTTP_404_NOT_FOUND)
 
 
+@api_view(['GET'])
+@permission_classes([permissions.IsAuthenticated])
+def matching_request_candidates(request, request_id):
+    """Voluntários sugeridos para um pedido de matching"""
+    from volunteers.matching import match_request
+    
+    try:
+        matching_request = MatchingRequest.objects.select_related(
+            'requester', 'volunteer', 'cause'
+        ).get(id=request_id)
+    except MatchingRequest.DoesNotExist:
+        return Response({'error': 'Pedido não encontrado'}, 
+                       status=status.HTTP_404_NOT_FOUND)
+    
+    if not request.user.is_staff and matching_request.requester.user_id != request.user.id:
+        return Response({'error': 'Sem permissão para ver sugestões deste pedido'}, 
+                       status=status.HTTP_403_FORBIDDEN)
+    
+    try:
+        limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+    except ValueError:
+        limit = 20
+    
+    return Response({
+        'request_id': matching_request.id,
+        'results': match_request(matching_request, limit=limit)
+    })
+
+
 class CauseListView(generics.ListAPIView):
     """Lista de causas disponíveis"""
     queryset = Cause.objects.filter(is_active=True)
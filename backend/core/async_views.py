@@ -0,0 +1,152 @@
+# backend/core/async_views.py
+"""
+Leituras assíncronas para as views DRF mais acessadas (modo ASGI).
+
+O DRF 3.14 só despacha views síncronas. ``AsyncReadMixin`` acrescenta a uma
+view DRF existente um ponto de entrada assíncrono (``as_async_view``): GETs
+com handler ``a<ação>`` (``alist``, ``aretrieve``, ``aget``) rodam no event
+loop com o ORM assíncrono; os demais métodos delegam para a view síncrona
+original, com o mesmo comportamento do modo WSGI.
+
+Autenticação, permissões, throttling e filtros (que podem consultar o banco)
+e a serialização (``SerializerMethodField`` e propriedades que consultam
+relações) continuam síncronos e rodam via ``sync_to_async``; as consultas
+principais (contagem e página) usam ``acount``/``aget``/``async for``.
+
+As rotas passam a usar as views assíncronas com ``with_async_views`` quando
+``ASYNC_READ_VIEWS`` está ativo (padrão no ``API_SERVER=asgi``).
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.http import Http404
+from django.urls import URLPattern
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+
+ASYNC_METHODS = ('get',)
+
+
+class AsyncReadMixin:
+    """Ponto de entrada assíncrono para as leituras de uma view DRF"""
+
+    @classmethod
+    def as_async_view(cls, actions=None, **initkwargs):
+        if actions is not None:
+            sync_view = cls.as_view(actions, **initkwargs)
+        else:
+            sync_view = cls.as_view(**initkwargs)
+        delegate = sync_to_async(sync_view)
+
+        async def view(request, *args, **kwargs):
+            method = request.method.lower()
+            handler_name = actions.get(method) if actions is not None else method
+            if method not in ASYNC_METHODS or not hasattr(cls, f'a{handler_name}'):
+                return await delegate(request, *args, **kwargs)
+            self = cls(**initkwargs)
+            if actions is not None:
+                self.action_map = actions
+            return await self.adispatch(request, getattr(self, f'a{handler_name}'), *args, **kwargs)
+
+        view.cls = cls
+        view.initkwargs = initkwargs
+        view.actions = actions
+        # Como no APIView.as_view: o CSRF fica a cargo da SessionAuthentication
+        # (atributo direto: no Django 4.2 o csrf_exempt não preserva views assíncronas)
+        view.csrf_exempt = True
+        return view
+
+    async def adispatch(self, request, handler, *args, **kwargs):
+        """``APIView.dispatch`` com o handler assíncrono"""
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def afilter_queryset(self):
+        # Filtros do django-filter validam ModelChoiceFilter no banco
+        return await sync_to_async(lambda: self.filter_queryset(self.get_queryset()))()
+
+    async def aserialize(self, instance, **kwargs):
+        serializer = self.get_serializer(instance, **kwargs)
+        return await sync_to_async(lambda: serializer.data)()
+
+    async def apaginate_queryset(self, queryset):
+        """``PageNumberPagination.paginate_queryset`` com contagem e página assíncronas"""
+        paginator = self.paginator
+        if paginator is None:
+            return None
+        request = self.request
+        paginator.request = request
+        page_size = paginator.get_page_size(request)
+        if not page_size:
+            return None
+
+        django_paginator = paginator.django_paginator_class(queryset, page_size)
+        # Preenche a cached_property para que page()/num_pages não consultem de novo
+        django_paginator.count = await queryset.acount()
+        page_number = paginator.get_page_number(request, django_paginator)
+        try:
+            page = django_paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(paginator.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        page.object_list = [obj async for obj in page.object_list]
+
+        if django_paginator.num_pages > 1 and paginator.template is not None:
+            paginator.display_page_controls = True
+        paginator.page = page
+        return page.object_list
+
+    async def aget_object(self):
+        """``GenericAPIView.get_object`` com a busca assíncrona"""
+        queryset = await self.afilter_queryset()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+        await sync_to_async(self.check_object_permissions)(self.request, obj)
+        return obj
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = await self.afilter_queryset()
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(await self.aserialize(page, many=True))
+        return Response(await self.aserialize([obj async for obj in queryset], many=True))
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        return Response(await self.aserialize(instance))
+
+
+def with_async_views(urlpatterns, names):
+    """Troca as rotas ``names`` pelas views assíncronas quando ASYNC_READ_VIEWS está ativo
+
+    Mantém o regex, a ordem e o nome das rotas (inclusive as de sufixo de
+    formato do router); o callback original precisa vir de uma view com
+    ``AsyncReadMixin``.
+    """
+    if not getattr(settings, 'ASYNC_READ_VIEWS', False):
+        return urlpatterns
+    patterns = []
+    for pattern in urlpatterns:
+        if isinstance(pattern, URLPattern) and pattern.name in names:
+            callback = pattern.callback
+            pattern = URLPattern(
+                pattern.pattern,
+                callback.cls.as_async_view(getattr(callback, 'actions', None), **callback.initkwargs),
+                pattern.default_args,
+                pattern.name,
+            )
+        patterns.append(pattern)
+    return patterns
@@ -0,0 +1,131 @@
+# backend/core/checks.py
+"""
+Verificações de sistema das conexões com o banco e do cache compartilhado.
+
+As de configuração rodam em todo ``manage.py`` (runserver, migrate, check).
+A autoverificação com o banco (conectividade, latência e capacidade de
+conexões) tem a tag ``database``: roda com ``manage.py check --database
+default`` e na inicialização de cada worker do gunicorn (``gunicorn.conf.py``).
+A do cache (tag ``caches``) também roda em cada worker, que não sobe com um
+cache por processo quando há mais de um worker; no ``check --deploy`` ela
+vale sempre.
+"""
+import multiprocessing
+import os
+import time
+
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+from django.db import connections
+
+from .shared_cache import is_shared_cache, multiple_workers
+
+SLOW_ROUND_TRIP_MS = 50
+
+
+def estimated_workers():
+    """Workers do gunicorn por instância (mesma regra do gunicorn.conf.py)"""
+    return int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+
+
+@register()
+def check_connection_settings(app_configs, **kwargs):
+    messages = []
+    for alias, options in settings.DATABASES.items():
+        max_age = options.get('CONN_MAX_AGE', 0)
+        asgi = getattr(settings, 'API_SERVER', 'wsgi') == 'asgi'
+        if asgi and max_age != 0:
+            messages.append(Warning(
+                f"DATABASES['{alias}'] usa conexões persistentes com API_SERVER=asgi.",
+                hint='No ASGI cada requisição usa uma thread nova e as conexões se acumulam; '
+                     'use DB_CONN_MAX_AGE=0 com um pool (DB_POOLER=pgbouncer).',
+                id='core.W005',
+            ))
+        if max_age == 0 and not asgi and not settings.DEBUG:
+            messages.append(Warning(
+                f"DATABASES['{alias}'] abre uma conexão nova a cada requisição (CONN_MAX_AGE=0).",
+                hint='Defina DB_CONN_MAX_AGE (ex.: 600) para reaproveitar conexões entre requisições.',
+                id='core.W001',
+            ))
+        if max_age != 0 and not options.get('CONN_HEALTH_CHECKS'):
+            messages.append(Warning(
+                f"DATABASES['{alias}'] usa conexões persistentes sem CONN_HEALTH_CHECKS.",
+                hint='Sem a verificação, a primeira requisição após um restart do banco falha.',
+                id='core.W002',
+            ))
+        if getattr(settings, 'DB_POOLER', '') == 'pgbouncer' and not options.get('DISABLE_SERVER_SIDE_CURSORS'):
+            messages.append(Error(
+                f"DATABASES['{alias}'] passa pelo PgBouncer com cursores do lado do servidor ativos.",
+                hint='Defina DISABLE_SERVER_SIDE_CURSORS=True; .iterator() falha em modo transaction.',
+                id='core.E001',
+            ))
+    return messages
+
+
+# Configurações cujo CACHE_ALIAS precisa ser compartilhado entre os workers
+SHARED_CACHE_SETTINGS = ('LOGIN_THROTTLE', 'PERF_METRICS')
+
+
+def _process_local_cache_errors():
+    aliases = {'default'} | {
+        getattr(settings, name, {}).get('CACHE_ALIAS', 'default') for name in SHARED_CACHE_SETTINGS
+    }
+    return [
+        Error(
+            f"CACHES['{alias}'] usa {settings.CACHES[alias]['BACKEND']}, que é por processo.",
+            hint='Limite de login, permissões, atividade de credenciais e métricas precisam de um cache '
+                 'compartilhado entre os workers: defina REDIS_URL.',
+            id='core.E003',
+        )
+        for alias in sorted(aliases) if not is_shared_cache(alias)
+    ]
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    return _process_local_cache_errors() if multiple_workers() else []
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache_deploy(app_configs, **kwargs):
+    return _process_local_cache_errors()
+
+
+@register(Tags.database)
+def check_database_health(app_configs, databases=None, **kwargs):
+    messages = []
+    for alias in databases or []:
+        connection = connections[alias]
+        try:
+            started = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            round_trip_ms = (time.perf_counter() - started) * 1000
+        except Exception as e:
+            messages.append(Error(
+                f"Não foi possível conectar ao banco '{alias}': {e}",
+                id='core.E002',
+            ))
+            continue
+
+        if round_trip_ms > SLOW_ROUND_TRIP_MS:
+            messages.append(Warning(
+                f"Conexão + SELECT 1 em '{alias}' levou {round_trip_ms:.0f} ms.",
+                hint='Latência alta por conexão torna as conexões persistentes (CONN_MAX_AGE) ainda mais importantes.',
+                id='core.W003',
+            ))
+
+        if connection.vendor == 'postgresql' and getattr(settings, 'DB_POOLER', '') != 'pgbouncer':
+            with connection.cursor() as cursor:
+                cursor.execute('SHOW max_connections')
+                max_connections = int(cursor.fetchone()[0])
+            workers = estimated_workers()
+            if workers > max_connections * 0.8:
+                messages.append(Warning(
+                    f"{workers} workers por instância para max_connections={max_connections} em '{alias}'.",
+                    hint='Cada worker mantém uma conexão persistente; use um pool (DB_POOLER=pgbouncer) '
+                         'ou reduza WEB_CONCURRENCY.',
+                    id='core.W004',
+                ))
+    return messages
@@ -7,6 +7,8 @@ from django.contrib.auth.decorators import login_required
 from django.utils.decorators import method_decorator
 from django.views.decorators.http import require_http_methods
 
+from .permission_cache import user_has_any_perm, user_has_perm, user_has_perms, user_in_group
+
 def require_permission(permission_codename):
     """
     Decorator que verifica se o usuário possui uma permissão específica
@@ -15,7 +17,7 @@ def require_permission(permission_codename):
         @wraps(view_func)
         @login_required
         def wrapped_view(request, *args, **kwargs):
-            if not request.user.has_perm(permission_codename):
+            if not user_has_perm(request.user, permission_codename):
                 if request.headers.get('Accept') == 'application/json':
                     return JsonResponse({
                         'error': 'Permissão negada',
@@ -35,7 +37,7 @@ def require_any_permission(*permission_codenames):
         @wraps(view_func)
         @login_required
         def wrapped_view(request, *args, **kwargs):
-            if not any(request.user.has_perm(perm) for perm in permission_codenames):
+            if not user_has_any_perm(request.user, permission_codenames):
                 if request.headers.get('Accept') == 'application/json':
                     return JsonResponse({
                         'error': 'Permissão negada',
@@ -56,7 +58,7 @@ def require_all_permissions(*permission_codenames):
         @login_required
         def wrapped_view(request, *args, **kwargs):
             for permission in permission_codenames:
-                if not request.user.has_perm(permission):
+                if not user_has_perm(request.user, permission):
                     if request.headers.get('Accept') == 'application/json':
                         return JsonResponse({
                             'error': 'Permissão negada',
@@ -77,7 +79,7 @@ def require_group(group_name):
         @wraps(view_func)
         @login_required
         def wrapped_view(request, *args, **kwargs):
-            if not request.user.groups.filter(name=group_name).exists():
+            if not user_in_group(request.user, group_name):
                 if request.headers.get('Accept') == 'application/json':
                     return JsonResponse({
                         'error': 'Acesso negado',
@@ -97,8 +99,7 @@ def require_any_group(*group_names):
         @wraps(view_func)
         @login_required
         def wrapped_view(request, *args, **kwargs):
-            user_groups = request.user.groups.values_list('name', flat=True)
-            if not any(group in user_groups for group in group_names):
+            if not user_in_group(request.user, *group_names):
                 if request.headers.get('Accept') == 'application/json':
                     return JsonResponse({
                         'error': 'Acesso negado',
@@ -128,7 +129,7 @@ class PermissionRequiredMixin:
             else:
                 perms = self.permission_required
             
-            if not all(request.user.has_perm(perm) for perm in perms):
+            if not user_has_perms(request.user, perms):
                 return self.handle_no_permission()
         
         return super().dispatch(request, *args, **kwargs)
@@ -158,8 +159,7 @@ class GroupRequiredMixin:
             else:
                 groups = self.group_required
             
-            user_groups = request.user.groups.values_list('name', flat=True)
-            if not any(group in user_groups for group in groups):
+            if not user_in_group(request.user, *groups):
                 return self.handle_no_permission()
         
         return super().dispatch(request, *args, **kwargs)
@@ -0,0 +1,212 @@
+# backend/core/login_throttle.py
+"""
+Limite de tentativas de login com contadores no cache compartilhado.
+
+O cache precisa ser o mesmo para todos os workers (Redis, ``REDIS_URL``): com
+um cache por processo cada worker contaria à parte e N workers dariam N vezes
+as tentativas configuradas. A verificação ``core.E003`` recusa essa
+configuração no ``check --deploy`` e na inicialização dos workers do gunicorn.
+
+Cada falha incrementa contadores de janela deslizante (aproximação por dois
+baldes fixos: o atual e o anterior ponderado pelo tempo restante) em três
+escopos: usuário+IP, usuário (ataque distribuído a uma conta) e IP (credential
+stuffing de uma origem). Ao atingir o limite do escopo grava-se uma chave de
+bloqueio com a expiração; a verificação a cada login é um único ``get_many``
+no cache, sem consultas ao banco.
+
+O ``LoginAttempt`` vira só trilha de auditoria: as tentativas são enfileiradas
+e gravadas em lote (``bulk_create``) por uma thread em segundo plano, e as
+antigas são removidas pelo comando ``purge_login_attempts``.
+"""
+import atexit
+import hashlib
+import ipaddress
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'CACHE_ALIAS': 'default',
+    'WINDOW_SECONDS': 30 * 60,
+    # Falhas na janela que bloqueiam cada escopo
+    'LIMITS': {'user_ip': 5, 'user': 20, 'ip': 50},
+    'LOGIN_PATHS': ['/api/auth/login/'],
+    'AUDIT_ASYNC': True,
+    'AUDIT_BATCH_SIZE': 100,
+    'AUDIT_FLUSH_INTERVAL': 5,
+    'AUDIT_MAX_PENDING': 10000,
+    'AUDIT_RETENTION_DAYS': 90,
+}
+
+
+def throttle_settings():
+    return {**DEFAULTS, **getattr(settings, 'LOGIN_THROTTLE', {})}
+
+
+def _identities(username, ip_address):
+    """Escopos aplicáveis à tentativa (sem usuário só o IP conta)"""
+    identities = {}
+    if username:
+        username = username.strip().lower()
+        identities['user'] = username
+        if ip_address:
+            identities['user_ip'] = f'{username}|{ip_address}'
+    if ip_address:
+        identities['ip'] = ip_address
+    return identities
+
+
+def _key(prefix, scope, identity, bucket=None):
+    digest = hashlib.sha1(identity.encode('utf-8')).hexdigest()
+    suffix = f':{bucket}' if bucket is not None else ''
+    return f'login_throttle:{prefix}:{scope}:{digest}{suffix}'
+
+
+class LoginThrottle:
+    """Contadores de falhas e chaves de bloqueio por escopo"""
+
+    def blocked_until(self, username, ip_address, config=None):
+        """Fim do bloqueio mais longo entre os escopos, ou None"""
+        config = config or throttle_settings()
+        keys = [_key('block', scope, identity) for scope, identity in _identities(username, ip_address).items()]
+        if not keys:
+            return None
+        now = time.time()
+        until = max(
+            (value for value in caches[config['CACHE_ALIAS']].get_many(keys).values() if value > now),
+            default=None,
+        )
+        return datetime.fromtimestamp(until, tz=dt_timezone.utc) if until else None
+
+    def record_failure(self, username, ip_address, config=None):
+        """Conta a falha; devolve os escopos que passaram a ficar bloqueados"""
+        config = config or throttle_settings()
+        store = caches[config['CACHE_ALIAS']]
+        window = config['WINDOW_SECONDS']
+        now = time.time()
+        bucket = int(now // window)
+        previous_weight = 1 - (now % window) / window
+
+        identities = _identities(username, ip_address)
+        previous = store.get_many([_key('count', scope, identity, bucket - 1) for scope, identity in identities.items()])
+        blocked = []
+        for scope, identity in identities.items():
+            key = _key('count', scope, identity, bucket)
+            # add/incr são atômicos no Redis: nenhum incremento se perde entre workers
+            if store.add(key, 1, window * 2):
+                count = 1
+            else:
+                try:
+                    count = store.incr(key)
+                except ValueError:
+                    store.set(key, 1, window * 2)
+                    count = 1
+            estimate = previous.get(_key('count', scope, identity, bucket - 1), 0) * previous_weight + count
+            if estimate >= config['LIMITS'][scope]:
+                store.set(_key('block', scope, identity), now + window, window)
+                blocked.append(scope)
+        return blocked
+
+    def record_success(self, username, ip_address, config=None):
+        """Login bem-sucedido zera as falhas de usuário+IP (os escopos amplos continuam contando)"""
+        config = config or throttle_settings()
+        identity = _identities(username, ip_address).get('user_ip')
+        if identity is None:
+            return
+        bucket = int(time.time() // config['WINDOW_SECONDS'])
+        caches[config['CACHE_ALIAS']].delete_many([
+            _key('count', 'user_ip', identity, bucket),
+            _key('count', 'user_ip', identity, bucket - 1),
+        ])
+
+
+class LoginAttemptRecorder:
+    """Fila de ``LoginAttempt`` gravada em lote por uma thread em segundo plano"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self._reset()
+        atexit.register(self.flush)
+
+    def _reset(self):
+        self.pid = os.getpid()
+        self.pending = []
+        self.thread = None
+
+    def record(self, username, ip_address, success, user_agent=None, failure_reason=None):
+        from .models import LoginAttempt
+
+        config = throttle_settings()
+        attempt = LoginAttempt(
+            username=(username or '')[:150],
+            ip_address=_valid_ip(ip_address),
+            user_agent=user_agent or '',
+            success=success,
+            failure_reason=(failure_reason or None) and failure_reason[:100],
+            # Horário da tentativa, não o da gravação do lote
+            timestamp=timezone.now(),
+        )
+        if not config['AUDIT_ASYNC']:
+            self._write([attempt])
+            return
+        with self.lock:
+            if self.pid != os.getpid():
+                # Processo filho (fork do gunicorn): a thread do master não existe aqui
+                self._reset()
+            if len(self.pending) >= config['AUDIT_MAX_PENDING']:
+                # Banco lento sob rajada: a auditoria perde entradas, o login não espera
+                return
+            self.pending.append(attempt)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name='login-attempt-recorder', daemon=True)
+                self.thread.start()
+            if len(self.pending) >= config['AUDIT_BATCH_SIZE']:
+                self.wakeup.set()
+
+    def flush(self):
+        """Grava o que estiver pendente; devolve quantas tentativas foram gravadas"""
+        with self.lock:
+            batch, self.pending = self.pending, []
+        if batch:
+            self._write(batch)
+        return len(batch)
+
+    def _write(self, attempts):
+        from .models import LoginAttempt
+
+        try:
+            LoginAttempt.objects.bulk_create(attempts, batch_size=throttle_settings()['AUDIT_BATCH_SIZE'])
+        except Exception as e:
+            logger.error(f'Falha ao gravar {len(attempts)} tentativas de login: {e}')
+
+    def _run(self):
+        while True:
+            self.wakeup.wait(throttle_settings()['AUDIT_FLUSH_INTERVAL'])
+            self.wakeup.clear()
+            close_old_connections()
+            try:
+                self.flush()
+            finally:
+                connection.close()
+
+
+def _valid_ip(value):
+    # GenericIPAddressField não valida no bulk_create e o inet do PostgreSQL rejeita o lote inteiro
+    try:
+        return str(ipaddress.ip_address((value or '').strip()))
+    except ValueError:
+        return '0.0.0.0'
+
+
+throttle = LoginThrottle()
+recorder = LoginAttemptRecorder()
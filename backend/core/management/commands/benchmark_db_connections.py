@@ -0,0 +1,101 @@
+# backend/core/management/commands/benchmark_db_connections.py
+import statistics
+import time
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import RequestFactory
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede a latência por requisição com conexões por requisição (CONN_MAX_AGE=0) '
+        'e com conexões persistentes, passando pelo ciclo completo do WSGIHandler'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/v1/blog/posts/', help='Caminho requisitado (GET)')
+        parser.add_argument('--requests', type=int, default=200, help='Requisições por modo')
+        parser.add_argument('--warmup', type=int, default=10, help='Requisições descartadas antes de medir')
+        parser.add_argument(
+            '--max-age', type=int,
+            help='CONN_MAX_AGE do modo persistente (padrão: o configurado, ou 600 se for 0)',
+        )
+        parser.add_argument('--host', help='Cabeçalho Host (padrão: primeiro de ALLOWED_HOSTS)')
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        alias = options['database']
+        connection = connections[alias]
+        configured_max_age = connection.settings_dict['CONN_MAX_AGE']
+        persistent_max_age = options['max_age'] or configured_max_age or 600
+
+        handler = WSGIHandler()
+        environ = RequestFactory().get(options['path']).environ
+        environ['HTTP_HOST'] = options['host'] or self.default_host()
+
+        opened = []
+
+        def count_connection(sender, connection, **kwargs):
+            if connection.alias == alias:
+                opened.append(connection)
+
+        connection_created.connect(count_connection)
+        self.stdout.write(
+            f"{options['path']} em '{alias}' ({connection.vendor}), "
+            f"{options['requests']} requisições por modo"
+        )
+        try:
+            results = []
+            for label, max_age in (('por requisição', 0), (f'persistente ({persistent_max_age}s)', persistent_max_age)):
+                connection.close()
+                connection.settings_dict['CONN_MAX_AGE'] = max_age
+                self.run(handler, environ, options['warmup'])
+                del opened[:]
+                timings = self.run(handler, environ, options['requests'])
+                results.append((label, timings, len(opened)))
+        finally:
+            connection_created.disconnect(count_connection)
+            connection.settings_dict['CONN_MAX_AGE'] = configured_max_age
+            connection.close()
+
+        for label, timings, connections_opened in results:
+            self.stdout.write(
+                f'{label:<22} mediana {statistics.median(timings):>8.2f} ms  '
+                f'p95 {_percentile(timings, 0.95):>8.2f} ms  '
+                f'{connections_opened:>5} conexões abertas'
+            )
+        before, after = statistics.median(results[0][1]), statistics.median(results[1][1])
+        self.stdout.write(self.style.SUCCESS(
+            f'Conexões persistentes: {before - after:+.2f} ms por requisição na mediana ({before / after:.2f}x)'
+        ))
+
+    def default_host(self):
+        for host in settings.ALLOWED_HOSTS:
+            if host != '*':
+                return host.lstrip('.')
+        return 'localhost'
+
+    def run(self, handler, environ, count):
+        timings = []
+        for _ in range(count):
+            started = time.perf_counter()
+            # start_response/close reproduzem o servidor WSGI: request_finished
+            # (e com ele close_old_connections) só dispara no close() da resposta
+            response = handler(dict(environ), lambda status, headers, exc_info=None: None)
+            status = response.status_code
+            for _chunk in response:
+                pass
+            response.close()
+            timings.append((time.perf_counter() - started) * 1000)
+            if status >= 400:
+                raise CommandError(f'{environ["PATH_INFO"]} respondeu {status}')
+        return timings
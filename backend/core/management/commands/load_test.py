@@ -0,0 +1,200 @@
+# backend/core/management/commands/load_test.py
+import asyncio
+import json
+import ssl
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+DEFAULT_PATHS = [
+    '/api/v1/blog/posts/',
+    '/api/v1/projects/public/projects/',
+]
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class Target:
+    """Servidor sob teste (``nome=http://host:porta``)"""
+
+    def __init__(self, spec):
+        name, sep, url = spec.partition('=')
+        if not sep:
+            name, url = spec, spec
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise CommandError(f'Alvo inválido: {spec} (use nome=http://host:porta)')
+        self.name = name
+        self.url = url
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == 'https' else 80)
+        self.ssl = ssl.create_default_context() if parts.scheme == 'https' else None
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip('/')
+
+
+async def _read_response(reader):
+    """Lê uma resposta HTTP/1.1; devolve (status, mantém a conexão)"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('conexão fechada pelo servidor')
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    if 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+    elif headers.get('transfer-encoding', '').lower() == 'chunked':
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.read()
+        return status, False
+    return status, headers.get('connection', '').lower() != 'close'
+
+
+class LoadGenerator:
+    """Clientes HTTP concorrentes com keep-alive por ``duration`` segundos"""
+
+    def __init__(self, target, paths, headers, concurrency, timeout):
+        self.target = target
+        self.requests = [
+            (
+                f'GET {target.prefix}{path} HTTP/1.1\r\n'
+                f'Host: {target.netloc}\r\n'
+                'Accept: application/json\r\n'
+                'Connection: keep-alive\r\n'
+                + ''.join(f'{header}\r\n' for header in headers)
+                + '\r\n'
+            ).encode('latin-1')
+            for path in paths
+        ]
+        self.concurrency = concurrency
+        self.timeout = timeout
+
+    async def run(self, duration, record=True):
+        latencies = []
+        statuses = {}
+        errors = []
+        deadline = time.perf_counter() + duration
+
+        async def client(offset):
+            connection = None
+            index = offset
+            while time.perf_counter() < deadline:
+                request = self.requests[index % len(self.requests)]
+                index += 1
+                started = time.perf_counter()
+                try:
+                    if connection is None:
+                        connection = await asyncio.wait_for(
+                            asyncio.open_connection(self.target.host, self.target.port, ssl=self.target.ssl),
+                            self.timeout,
+                        )
+                    reader, writer = connection
+                    writer.write(request)
+                    await writer.drain()
+                    status, keep_alive = await asyncio.wait_for(_read_response(reader), self.timeout)
+                except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError, IndexError) as e:
+                    errors.append(type(e).__name__)
+                    keep_alive = False
+                    status = None
+                if status is not None:
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    statuses[status] = statuses.get(status, 0) + 1
+                if not keep_alive and connection is not None:
+                    connection[1].close()
+                    connection = None
+            if connection is not None:
+                connection[1].close()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client(offset) for offset in range(self.concurrency)))
+        elapsed = time.perf_counter() - started
+        if not record:
+            return None
+        return {
+            'requests': len(latencies),
+            'errors': len(errors),
+            'statuses': {str(status): count for status, count in sorted(statuses.items())},
+            'throughput_rps': round(len(latencies) / elapsed, 1),
+            'p50_ms': round(_percentile(latencies, 0.50), 2) if latencies else None,
+            'p90_ms': round(_percentile(latencies, 0.90), 2) if latencies else None,
+            'p99_ms': round(_percentile(latencies, 0.99), 2) if latencies else None,
+            'max_ms': round(max(latencies), 2) if latencies else None,
+        }
+
+
+class Command(BaseCommand):
+    help = (
+        'Gerador de carga HTTP local: mede vazão e latência (p50/p99) de um ou mais servidores '
+        'já em execução, para comparar os modos WSGI e ASGI (API_SERVER). Ex.: '
+        'gunicorn -c gunicorn.conf.py -b 127.0.0.1:8000 moz_solidaria_api.wsgi:application e '
+        'API_SERVER=asgi gunicorn -c gunicorn.conf.py -b 127.0.0.1:8001 moz_solidaria_api.asgi:application, '
+        'depois load_test --target sync=http://127.0.0.1:8000 --target async=http://127.0.0.1:8001'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target', action='append', required=True,
+            help='Servidor no formato nome=http://host:porta (repetível; o primeiro é a referência)',
+        )
+        parser.add_argument('--path', action='append', help='Caminho requisitado (repetível; alternados)')
+        parser.add_argument('--header', action='append', default=[], help="Cabeçalho extra, ex.: 'Authorization: Token ...'")
+        parser.add_argument('--concurrency', type=int, default=50, help='Clientes simultâneos')
+        parser.add_argument('--duration', type=float, default=15, help='Segundos medidos por alvo')
+        parser.add_argument('--warmup', type=float, default=3, help='Segundos de aquecimento (descartados)')
+        parser.add_argument('--timeout', type=float, default=30, help='Timeout por requisição (s)')
+        parser.add_argument('--output', help='Grava os resultados em JSON')
+
+    def handle(self, *args, **options):
+        targets = [Target(spec) for spec in options['target']]
+        paths = options['path'] or DEFAULT_PATHS
+
+        results = {}
+        for target in targets:
+            generator = LoadGenerator(target, paths, options['header'], options['concurrency'], options['timeout'])
+            if options['warmup']:
+                asyncio.run(generator.run(options['warmup'], record=False))
+            result = asyncio.run(generator.run(options['duration']))
+            results[target.name] = result
+            self.stdout.write(
+                f"{target.name:<10} {result['throughput_rps']:>8.1f} req/s  "
+                f"p50 {result['p50_ms'] or 0:>8.1f} ms  p99 {result['p99_ms'] or 0:>8.1f} ms  "
+                f"{result['requests']:>6} ok  {result['errors']:>4} erros  status {result['statuses']}"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump({
+                    'generated_at': timezone.now().isoformat(),
+                    'paths': paths,
+                    'concurrency': options['concurrency'],
+                    'duration': options['duration'],
+                    'targets': {target.name: target.url for target in targets},
+                    'results': results,
+                }, output, indent=2)
+            self.stdout.write(f"Resultados gravados em {options['output']}")
+
+        reference = results[targets[0].name]
+        for target in targets[1:]:
+            result = results[target.name]
+            if reference['throughput_rps'] and result['p99_ms'] and reference['p99_ms']:
+                self.stdout.write(
+                    f"{target.name} vs {targets[0].name}: vazão {result['throughput_rps'] / reference['throughput_rps']:.2f}x, "
+                    f"p99 {result['p99_ms'] / reference['p99_ms']:.2f}x"
+                )
+        self.stdout.write(self.style.SUCCESS(f'Teste de carga concluído: {len(targets)} alvos'))
@@ -0,0 +1,40 @@
+# backend/core/management/commands/purge_login_attempts.py
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.login_throttle import throttle_settings
+from core.models import LoginAttempt
+
+
+class Command(BaseCommand):
+    help = 'Remove tentativas de login mais antigas que a retenção (LOGIN_THROTTLE["AUDIT_RETENTION_DAYS"])'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Dias mantidos (padrão: AUDIT_RETENTION_DAYS)')
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Linhas removidas por DELETE (lotes curtos não seguram locks longos)',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Só conta o que seria removido')
+
+    def handle(self, *args, **options):
+        days = options['days'] if options['days'] is not None else throttle_settings()['AUDIT_RETENTION_DAYS']
+        cutoff = timezone.now() - timedelta(days=days)
+        expired = LoginAttempt.objects.filter(timestamp__lt=cutoff).order_by()
+
+        if options['dry_run']:
+            self.stdout.write(f'{expired.count()} tentativas anteriores a {cutoff:%Y-%m-%d %H:%M} seriam removidas')
+            return
+
+        deleted = 0
+        while True:
+            ids = list(expired.values_list('pk', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            deleted += LoginAttempt.objects.filter(pk__in=ids).delete()[0]
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{deleted} tentativas de login anteriores a {cutoff:%Y-%m-%d %H:%M} removidas ({days} dias de retenção)'
+        ))
@@ -1,14 +1,27 @@
 # backend/core/middleware.py
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.utils.deprecation import MiddlewareMixin
+from django.conf import settings
 from django.contrib.auth import logout
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
 from django.http import JsonResponse
 from django.utils import timezone
-from datetime import timedelta
+from contextlib import ExitStack
 import json
 import logging
+import random
+import threading
+import time
 
-from .models import AuditLog, LoginAttempt, UserProfile
+from rest_framework.authtoken.models import Token
+
+from . import login_throttle, perf_metrics, session_activity
+from .query_inspector import QueryInspector, inspect_queries, inspector_settings
+from .models import AuditLog, UserProfile
+from .permission_cache import user_has_perm
 
 logger = logging.getLogger(__name__)
 
@@ -167,23 +180,40 @@ class SecurityMiddleware(MiddlewareMixin):
     Middleware para controlo de segurança
     """
     
-    MAX_LOGIN_ATTEMPTS = 5
-    LOCKOUT_TIME_MINUTES = 30
-    
     def process_request(self, request):
         """Verifica tentativas de login e implementa medidas de segurança"""
         
-        # Verifica bloqueio por tentativas de login
-        if request.path == '/api/auth/login/' and request.method == 'POST':
-            if self._is_ip_blocked(request):
-                return JsonResponse({
+        # Verifica bloqueio por tentativas de login (contadores no cache, ver core.login_throttle)
+        if self._is_login_request(request):
+            request.login_username = self._get_username_from_request(request)
+            request.login_ip = self._get_client_ip(request)
+            blocked_until = login_throttle.throttle.blocked_until(request.login_username, request.login_ip)
+            if blocked_until:
+                request.login_blocked = True
+                login_throttle.recorder.record(
+                    request.login_username, request.login_ip, False,
+                    user_agent=request.META.get('HTTP_USER_AGENT'), failure_reason='Bloqueado por excesso de tentativas',
+                )
+                response = JsonResponse({
                     'error': 'Muitas tentativas de login falhadas. Tente novamente mais tarde.',
-                    'blocked_until': self._get_block_expiry_time(request).isoformat()
+                    'blocked_until': blocked_until.isoformat()
                 }, status=429)
+                response['Retry-After'] = str(max(1, int((blocked_until - timezone.now()).total_seconds())))
+                return response
         
-        # Verifica sessões ativas e timeout
-        if hasattr(request, 'user') and request.user.is_authenticated:
-            if self._should_logout_inactive_user(request):
+        # Verifica inatividade: clientes de API pela credencial (cache), navegadores pela sessão.
+        # O login fica de fora: é ele que reemite o token inativo
+        credential = session_activity.parse_credential(request.META.get('HTTP_AUTHORIZATION'))
+        if credential and not self._is_login_request(request):
+            request.activity_credential = credential
+            request.activity_last = session_activity.credential_last_activity(*credential)
+            if session_activity.is_inactive(request.activity_last):
+                self._expire_credential(*credential)
+                return JsonResponse({
+                    'error': 'Sessão expirada por inatividade'
+                }, status=401)
+        elif hasattr(request, 'user') and request.user.is_authenticated:
+            if session_activity.session_expired(request.session):
                 logout(request)
                 return JsonResponse({
                     'error': 'Sessão expirada por inatividade'
@@ -191,61 +221,42 @@ class SecurityMiddleware(MiddlewareMixin):
         
         return None
     
-    def _is_ip_blocked(self, request):
-        """Verifica se o IP está bloqueado por tentativas falhadas"""
-        ip_address = self._get_client_ip(request)
-        username = self._get_username_from_request(request)
-        
-        if not username:
-            return False
-            
-        failed_attempts = LoginAttempt.get_failed_attempts(
-            username=username,
-            ip_address=ip_address,
-            time_window_minutes=self.LOCKOUT_TIME_MINUTES
-        )
-        
-        return failed_attempts >= self.MAX_LOGIN_ATTEMPTS
-    
-    def _get_block_expiry_time(self, request):
-        """Calcula quando o bloqueio expira"""
-        ip_address = self._get_client_ip(request)
-        username = self._get_username_from_request(request)
+    def process_response(self, request, response):
+        """Renova a atividade da credencial de API e conta as tentativas de login"""
+        credential = getattr(request, 'activity_credential', None)
+        # request.user já é o usuário autenticado pelo DRF (Token/JWT) nesta altura
+        if credential and response.status_code != 401 and getattr(request, 'user', None) is not None \
+                and request.user.is_authenticated:
+            session_activity.touch_credential(*credential, request.activity_last)
         
-        # Obtém a última tentativa falhada
-        last_attempt = LoginAttempt.objects.filter(
-            username=username,
-            ip_address=ip_address,
-            success=False
-        ).order_by('-timestamp').first()
+        if not hasattr(request, 'login_username') or getattr(request, 'login_blocked', False):
+            return response
         
-        if last_attempt:
-            return last_attempt.timestamp + timedelta(minutes=self.LOCKOUT_TIME_MINUTES)
+        if 200 <= response.status_code < 300:
+            success = True
+            login_throttle.throttle.record_success(request.login_username, request.login_ip)
+        elif response.status_code in (400, 401, 403):
+            success = False
+            login_throttle.throttle.record_failure(request.login_username, request.login_ip)
+        else:
+            # Erros do servidor não são tentativas falhadas
+            return response
         
-        return timezone.now()
+        login_throttle.recorder.record(
+            request.login_username, request.login_ip, success,
+            user_agent=request.META.get('HTTP_USER_AGENT'),
+            failure_reason=None if success else f'HTTP {response.status_code}',
+        )
+        return response
     
-    def _should_logout_inactive_user(self, request):
-        """Verifica se o usuário deve ser deslogado por inatividade"""
-        # Timeout de 8 horas de inatividade
-        SESSION_TIMEOUT_HOURS = 8
-        
-        last_activity = request.session.get('last_activity')
-        if not last_activity:
-            request.session['last_activity'] = timezone.now().isoformat()
-            return False
-        
-        last_activity_time = timezone.datetime.fromisoformat(last_activity)
-        if timezone.is_naive(last_activity_time):
-            last_activity_time = timezone.make_aware(last_activity_time)
-        
-        time_diff = timezone.now() - last_activity_time
-        
-        if time_diff.total_seconds() > SESSION_TIMEOUT_HOURS * 3600:
-            return True
-        
-        # Atualiza a última atividade
-        request.session['last_activity'] = timezone.now().isoformat()
-        return False
+    def _is_login_request(self, request):
+        return request.method == 'POST' and request.path in login_throttle.throttle_settings()['LOGIN_PATHS']
+    
+    def _expire_credential(self, scheme, credential):
+        """Credencial inativa: o token DRF só é apagado com ``REVOKE_INACTIVE_TOKENS``"""
+        if scheme == 'token' and session_activity.activity_settings()['REVOKE_INACTIVE_TOKENS']:
+            Token.objects.filter(key=credential).delete()
+            session_activity.forget_credential(scheme, credential)
     
     def _get_client_ip(self, request):
         """Obtém o IP real do cliente"""
@@ -260,13 +271,15 @@ class SecurityMiddleware(MiddlewareMixin):
         """Extrai o username dos dados da requisição"""
         try:
             if hasattr(request, 'data') and 'username' in request.data:
-                return request.data['username']
+                username = request.data['username']
             elif request.content_type == 'application/json':
                 data = json.loads(request.body.decode('utf-8'))
-                return data.get('username')
+                username = data.get('username')
+            else:
+                username = request.POST.get('username')
         except:
-            pass
-        return None
+            return None
+        return username if isinstance(username, str) else None
 
 
 class PermissionLoggingMiddleware(MiddlewareMixin):
@@ -284,7 +297,7 @@ class PermissionLoggingMiddleware(MiddlewareMixin):
         # Verifica se a view tem decoradores de permissão
         if hasattr(view_func, 'permission_required'):
             required_permission = getattr(view_func, 'permission_required')
-            has_permission = request.user.has_perm(required_permission)
+            has_permission = user_has_perm(request.user, required_permission)
             
             if not has_permission:
                 # Log da tentativa de acesso negado
@@ -311,3 +324,177 @@ class PermissionLoggingMiddleware(MiddlewareMixin):
         else:
             ip = request.META.get('REMOTE_ADDR')
         return ip
+
+
+class PerformanceMetricsMiddleware:
+    """
+    Middleware de métricas de desempenho por view
+
+    Mede tempo total, consultas SQL (via ``execute_wrapper``), acertos de
+    cache e tamanho da resposta e registra em ``core.perf_metrics``.
+    Requisições acima de ``SLOW_REQUEST_MS`` são registradas no log e, se
+    ``PROFILE_SLOW_REQUESTS`` estiver ativo, as amostradas pelo profiler têm
+    as pilhas gravadas em ``PROFILE_DIR`` (só no modo síncrono).
+    """
+    
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = perf_metrics.perf_settings()
+        if not self.config['ENABLED']:
+            raise MiddlewareNotUsed
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        config = self.config
+        self._instrument_caches()
+        
+        thread_id = threading.get_ident()
+        profiling = config['PROFILE_SLOW_REQUESTS'] and random.random() < config['PROFILE_SAMPLE_RATE']
+        if profiling:
+            perf_metrics.profiler.start(thread_id, config['PROFILE_INTERVAL_MS'])
+        
+        sample, token = perf_metrics.start_sample()
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(sample.db_wrapper))
+                response = self.get_response(request)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            perf_metrics.end_sample(token)
+            stacks = perf_metrics.profiler.stop(thread_id) if profiling else None
+        
+        self._record(request, response, sample, duration_ms, stacks)
+        return response
+    
+    async def __acall__(self, request):
+        sample, token = perf_metrics.start_sample()
+        started = time.perf_counter()
+        # Conexões são por thread: o wrapper vai na thread em que o ORM desta
+        # requisição roda (a do ThreadSensitiveContext do handler ASGI)
+        await sync_to_async(self._install_wrappers)(sample)
+        try:
+            response = await self.get_response(request)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            perf_metrics.end_sample(token)
+            await sync_to_async(self._remove_wrappers)(sample)
+        
+        await sync_to_async(self._record)(request, response, sample, duration_ms, None)
+        return response
+    
+    def _instrument_caches(self):
+        for alias in settings.CACHES:
+            perf_metrics.instrument_cache(caches[alias])
+    
+    def _install_wrappers(self, sample):
+        self._instrument_caches()
+        for connection in connections.all():
+            connection.execute_wrappers.append(sample.db_wrapper)
+    
+    def _remove_wrappers(self, sample):
+        for connection in connections.all():
+            if sample.db_wrapper in connection.execute_wrappers:
+                connection.execute_wrappers.remove(sample.db_wrapper)
+    
+    def _record(self, request, response, sample, duration_ms, stacks):
+        config = self.config
+        endpoint = self._get_endpoint(request)
+        perf_metrics.registry.record(
+            endpoint, sample, duration_ms, response.status_code, self._get_response_size(response)
+        )
+        
+        if duration_ms >= config['SLOW_REQUEST_MS']:
+            message = (
+                f"Requisição lenta: {endpoint} {duration_ms:.0f} ms, "
+                f"{sample.queries} consultas ({sample.db_time_ms:.0f} ms em SQL)"
+            )
+            if stacks:
+                message += f", perfil em {perf_metrics.dump_profile(endpoint, duration_ms, stacks, config)}"
+            logger.warning(message)
+    
+    def _get_endpoint(self, request):
+        """Nome da view (rotas não resolvidas são agrupadas para limitar a cardinalidade)"""
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return f"{request.method} <não resolvida>"
+        return f"{request.method} {match.view_name or match.route}"
+    
+    def _get_response_size(self, response):
+        if response.streaming:
+            length = response.get('Content-Length')
+            return int(length) if length and length.isdigit() else None
+        return len(response.content)
+
+
+class QueryInspectorMiddleware:
+    """
+    Middleware de detecção de N+1 e consultas lentas (desenvolvimento)
+
+    Registra no log as requisições com templates de SQL repetidos acima de
+    ``REPEAT_THRESHOLD`` ou consultas acima de ``SLOW_QUERY_MS``, com o campo
+    de serializer/linha que as disparou. Em DEBUG também devolve o resumo nos
+    cabeçalhos ``X-Query-*``.
+    """
+    
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = inspector_settings()
+        if not self.config['ENABLED']:
+            raise MiddlewareNotUsed
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with inspect_queries(slow_query_ms=self.config['SLOW_QUERY_MS']) as inspector:
+            response = self.get_response(request)
+        return self._report(request, response, inspector)
+    
+    async def __acall__(self, request):
+        inspector = QueryInspector(slow_query_ms=self.config['SLOW_QUERY_MS'])
+        # Como no PerformanceMetricsMiddleware: instalado na thread do ORM da requisição
+        await sync_to_async(self._install_inspector)(inspector)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(self._remove_inspector)(inspector)
+        return self._report(request, response, inspector)
+    
+    def _install_inspector(self, inspector):
+        for connection in connections.all():
+            connection.execute_wrappers.append(inspector)
+    
+    def _remove_inspector(self, inspector):
+        for connection in connections.all():
+            if inspector in connection.execute_wrappers:
+                connection.execute_wrappers.remove(inspector)
+    
+    def _report(self, request, response, inspector):
+        config = self.config
+        threshold = config['REPEAT_THRESHOLD']
+        repeated = inspector.repeated(threshold)
+        if repeated or inspector.slow:
+            logger.warning(f"Consultas suspeitas em {request.method} {request.path}\n{inspector.report(threshold)}")
+        
+        if settings.DEBUG and config['RESPONSE_HEADERS']:
+            response['X-Query-Count'] = str(inspector.total_queries)
+            response['X-Query-Time-Ms'] = f'{inspector.total_ms:.1f}'
+            response['X-Query-Repeated'] = str(len(repeated))
+            if repeated:
+                # Só o pior template, sem quebras de linha nem caracteres fora do latin-1
+                worst = repeated[0].describe(max_sql=120)
+                response['X-Query-NPlusOne'] = worst.encode('latin-1', 'replace').decode('latin-1')
+        
+        return response
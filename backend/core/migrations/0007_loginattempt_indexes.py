@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:37
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_userprofile_address_userprofile_admin_notes_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='loginattempt',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='loginattempt',
+            index=models.Index(fields=['username', 'ip_address', 'success', 'timestamp'], name='login_attempt_user_ip_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loginattempt',
+            index=models.Index(fields=['timestamp', 'success'], name='login_attempt_time_idx'),
+        ),
+    ]
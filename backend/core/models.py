@@ -2,6 +2,7 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import EmailValidator, RegexValidator
 from django.utils.text import slugify
+from django.utils import timezone
 
 
 class Contact(models.Model):
@@ -737,11 +738,13 @@ class UserProfile(models.Model):
 
     def get_user_groups(self):
         """Retorna lista de grupos do usuário"""
-        return list(self.user.groups.values_list('name', flat=True))
+        from .permission_cache import get_permission_state
+        return sorted(get_permission_state(self.user).groups)
 
     def get_user_permissions(self):
         """Retorna lista de permissões do usuário"""
-        return list(self.user.get_all_permissions())
+        from .permission_cache import get_permission_state
+        return sorted(get_permission_state(self.user).permissions)
 
     def has_module_access(self, module):
         """Verifica se o usuário tem acesso a um módulo específico"""
@@ -752,8 +755,9 @@ class UserProfile(models.Model):
             'system': ['system.view_logs', 'system.manage_settings']
         }
         
+        from .permission_cache import user_has_any_perm
         required_perms = module_permissions.get(module.lower(), [])
-        return any(self.user.has_perm(perm) for perm in required_perms)
+        return user_has_any_perm(self.user, required_perms)
 
 
 class LoginAttempt(models.Model):
@@ -764,13 +768,19 @@ class LoginAttempt(models.Model):
     ip_address = models.GenericIPAddressField()
     user_agent = models.TextField(null=True, blank=True)
     success = models.BooleanField()
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # default em vez de auto_now_add: as tentativas são gravadas em lote (core.login_throttle)
+    timestamp = models.DateTimeField(default=timezone.now)
     failure_reason = models.CharField(max_length=100, null=True, blank=True)
 
     class Meta:
         ordering = ['-timestamp']
         verbose_name = "Tentativa de Login"
         verbose_name_plural = "Tentativas de Login"
+        indexes = [
+            models.Index(fields=['username', 'ip_address', 'success', 'timestamp'], name='login_attempt_user_ip_idx'),
+            # Retenção (purge_login_attempts) e contagens por período do painel de segurança
+            models.Index(fields=['timestamp', 'success'], name='login_attempt_time_idx'),
+        ]
 
     def __str__(self):
         status = "SUCCESS" if self.success else "FAILURE"
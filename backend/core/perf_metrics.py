@@ -0,0 +1,528 @@
+# backend/core/perf_metrics.py
+"""
+Métricas de desempenho por endpoint.
+
+Cada processo mantém, por view, contadores e histogramas de buckets fixos
+(tempo total, número e tempo de consultas SQL, tamanho da resposta) e os
+acertos/faltas de cache. Há duas visões:
+
+- acumulada desde o início do processo (contadores monotônicos, formato
+  Prometheus);
+- em janelas de ``WINDOW_SECONDS``, das quais só as últimas ``WINDOWS`` são
+  mantidas (visão "recente" do endpoint JSON).
+
+Histogramas de buckets fixos somam-se entre processos, então cada worker
+publica o seu snapshot no cache ``CACHE_ALIAS`` a cada ``FLUSH_INTERVAL``
+(por uma thread, também quando está ocioso) e o endpoint de métricas junta os
+snapshots. O cache precisa ser compartilhado entre os workers (Redis,
+``core.E003``).
+
+Cada worker ocupa uma de ``MAX_WORKERS`` vagas, reservada com ``cache.add``
+(atômico) e renovada a cada publicação. O snapshot fica na vaga, sem
+expiração: o worker que herda uma vaga livre parte dos totais acumulados do
+anterior. Assim a soma das vagas nunca diminui quando workers saem ou são
+reciclados (``max_requests``), e os contadores ``_total`` do Prometheus não
+voltam para trás.
+"""
+import bisect
+import contextvars
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+from collections import Counter, deque
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': True,
+    'CACHE_ALIAS': 'default',
+    'FLUSH_INTERVAL': 10,
+    'MAX_WORKERS': 64,
+    'WINDOW_SECONDS': 60,
+    'WINDOWS': 15,
+    'SLOW_REQUEST_MS': 1000,
+    'PROFILE_SLOW_REQUESTS': False,
+    'PROFILE_SAMPLE_RATE': 0.1,
+    'PROFILE_INTERVAL_MS': 5,
+    'PROFILE_DIR': None,
+}
+
+DURATION_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+HISTOGRAMS = {
+    'duration_ms': DURATION_BUCKETS_MS,
+    'db_queries': QUERY_BUCKETS,
+    'db_time_ms': DURATION_BUCKETS_MS,
+    'response_bytes': SIZE_BUCKETS,
+}
+
+
+def perf_settings():
+    return {**DEFAULTS, **getattr(settings, 'PERF_METRICS', {})}
+
+
+def _slot_key(slot):
+    return f'perf_metrics_slot_{slot}'
+
+
+def _snapshot_key(slot):
+    return f'perf_metrics_slot_{slot}_snapshot'
+
+
+class Histogram:
+    """Histograma de buckets fixos (semântica ``le`` do Prometheus)"""
+
+    __slots__ = ('bounds', 'counts', 'total')
+
+    def __init__(self, bounds, counts=None, total=0.0):
+        self.bounds = bounds
+        self.counts = list(counts) if counts else [0] * (len(bounds) + 1)
+        self.total = total
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+
+    def merge(self, counts, total):
+        for index, count in enumerate(counts):
+            self.counts[index] += count
+        self.total += total
+
+    def quantile(self, q):
+        """Limite superior do bucket que contém o quantil ``q``"""
+        count = self.count
+        if not count:
+            return None
+        rank = q * count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return self.bounds[min(index, len(self.bounds) - 1)]
+        return self.bounds[-1]
+
+    def mean(self):
+        count = self.count
+        return self.total / count if count else 0
+
+
+class EndpointStats:
+    """Contadores e histogramas de uma view"""
+
+    __slots__ = ('requests', 'errors', 'cache_hits', 'cache_misses', 'histograms')
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.histograms = {name: Histogram(bounds) for name, bounds in HISTOGRAMS.items()}
+
+    def observe(self, sample, duration_ms, status_code, response_bytes):
+        self.requests += 1
+        if status_code >= 500:
+            self.errors += 1
+        self.cache_hits += sample.cache_hits
+        self.cache_misses += sample.cache_misses
+        self.histograms['duration_ms'].observe(duration_ms)
+        self.histograms['db_queries'].observe(sample.queries)
+        self.histograms['db_time_ms'].observe(sample.db_time_ms)
+        if response_bytes is not None:
+            self.histograms['response_bytes'].observe(response_bytes)
+
+    def to_dict(self):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'histograms': {
+                name: [histogram.counts, histogram.total] for name, histogram in self.histograms.items()
+            },
+        }
+
+    def merge_dict(self, data):
+        self.requests += data['requests']
+        self.errors += data['errors']
+        self.cache_hits += data['cache_hits']
+        self.cache_misses += data['cache_misses']
+        for name, (counts, total) in data['histograms'].items():
+            if name in self.histograms:
+                self.histograms[name].merge(counts, total)
+
+    def summary(self, window_seconds=None):
+        duration = self.histograms['duration_ms']
+        queries = self.histograms['db_queries']
+        cache_lookups = self.cache_hits + self.cache_misses
+        data = {
+            'requests': self.requests,
+            'errors': self.errors,
+            'duration_ms': {
+                'mean': round(duration.mean(), 2),
+                'p50': duration.quantile(0.5),
+                'p95': duration.quantile(0.95),
+                'p99': duration.quantile(0.99),
+                'total': round(duration.total, 2),
+            },
+            'db_queries': {'mean': round(queries.mean(), 2), 'p95': queries.quantile(0.95)},
+            'db_time_ms': {'mean': round(self.histograms['db_time_ms'].mean(), 2)},
+            'response_bytes': {'mean': round(self.histograms['response_bytes'].mean())},
+            'cache_hit_ratio': round(self.cache_hits / cache_lookups, 3) if cache_lookups else None,
+        }
+        if window_seconds:
+            data['requests_per_second'] = round(self.requests / window_seconds, 3)
+        return data
+
+
+class RequestSample:
+    """O que uma requisição consumiu (preenchido pelos wrappers de banco e cache)"""
+
+    __slots__ = ('queries', 'db_time_ms', 'cache_hits', 'cache_misses')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time_ms = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time_ms += (time.perf_counter() - started) * 1000
+
+
+_current_sample = contextvars.ContextVar('perf_metrics_sample', default=None)
+
+
+def start_sample():
+    sample = RequestSample()
+    return sample, _current_sample.set(sample)
+
+
+def end_sample(token):
+    _current_sample.reset(token)
+
+
+# === CACHE ===
+
+_MISSING = object()
+
+
+def instrument_cache(backend):
+    """Conta acertos/faltas de ``get``/``get_many`` na requisição corrente
+
+    As instâncias de cache são por thread; o wrapper é instalado uma vez por
+    instância e só conta quando há uma requisição sendo medida.
+    """
+    if getattr(backend, '_perf_instrumented', False):
+        return
+    original_get = backend.get
+    original_get_many = backend.get_many
+
+    def get(key, default=None, version=None):
+        value = original_get(key, _MISSING, version=version)
+        sample = _current_sample.get()
+        if sample is not None:
+            if value is _MISSING:
+                sample.cache_misses += 1
+            else:
+                sample.cache_hits += 1
+        return default if value is _MISSING else value
+
+    def get_many(keys, version=None):
+        keys = list(keys)
+        values = original_get_many(keys, version=version)
+        sample = _current_sample.get()
+        if sample is not None:
+            sample.cache_hits += len(values)
+            sample.cache_misses += len(keys) - len(values)
+        return values
+
+    backend.get = get
+    backend.get_many = get_many
+    backend._perf_instrumented = True
+
+
+# === REGISTRO POR PROCESSO ===
+
+def _merge_snapshots(*snapshots):
+    """Soma snapshots (acumulado e janelas) no formato de ``to_dict``"""
+    cumulative = {}
+    windows = {}
+    for snapshot in snapshots:
+        for endpoint, data in snapshot['cumulative'].items():
+            cumulative.setdefault(endpoint, EndpointStats()).merge_dict(data)
+        for start, stats_by_endpoint in snapshot['windows']:
+            window = windows.setdefault(start, {})
+            for endpoint, data in stats_by_endpoint.items():
+                window.setdefault(endpoint, EndpointStats()).merge_dict(data)
+    return cumulative, windows
+
+
+EMPTY_SNAPSHOT = {'cumulative': {}, 'windows': []}
+
+
+class MetricsRegistry:
+    """Métricas do processo atual e publicação na vaga do worker no cache compartilhado"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.pid = os.getpid()
+        self.worker_id = f'{socket.gethostname()}_{self.pid}'
+        self.cumulative = {}
+        self.windows = deque()
+        self.slot = None
+        # Totais herdados do worker que ocupava a vaga antes deste
+        self.base = EMPTY_SNAPSHOT
+        self.thread = None
+
+    def record(self, endpoint, sample, duration_ms, status_code, response_bytes):
+        config = perf_settings()
+        window_seconds = config['WINDOW_SECONDS']
+        now = time.time()
+        with self.lock:
+            if self.pid != os.getpid():
+                # Processo filho (fork do gunicorn): não herdar as métricas nem a thread do master
+                self._reset()
+            window_start = int(now // window_seconds * window_seconds)
+            if not self.windows or self.windows[-1][0] != window_start:
+                self.windows.append((window_start, {}))
+                while len(self.windows) > config['WINDOWS']:
+                    self.windows.popleft()
+            for stats_by_endpoint in (self.cumulative, self.windows[-1][1]):
+                stats = stats_by_endpoint.get(endpoint)
+                if stats is None:
+                    stats = stats_by_endpoint[endpoint] = EndpointStats()
+                stats.observe(sample, duration_ms, status_code, response_bytes)
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name='perf-metrics-flush', daemon=True)
+                self.thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(perf_settings()['FLUSH_INTERVAL'])
+            self.flush()
+
+    def snapshot(self, config=None):
+        """Snapshot da vaga: totais herdados + métricas deste processo"""
+        config = config or perf_settings()
+        oldest = time.time() - config['WINDOW_SECONDS'] * config['WINDOWS']
+        with self.lock:
+            own = {
+                'cumulative': {endpoint: stats.to_dict() for endpoint, stats in self.cumulative.items()},
+                'windows': [
+                    [start, {endpoint: stats.to_dict() for endpoint, stats in stats_by_endpoint.items()}]
+                    for start, stats_by_endpoint in self.windows
+                ],
+            }
+            base = self.base
+        cumulative, windows = _merge_snapshots(base, own)
+        return {
+            'cumulative': {endpoint: stats.to_dict() for endpoint, stats in cumulative.items()},
+            'windows': [
+                [start, {endpoint: stats.to_dict() for endpoint, stats in stats_by_endpoint.items()}]
+                for start, stats_by_endpoint in sorted(windows.items()) if start >= oldest
+            ],
+        }
+
+    def _claim_slot(self, store, config, ttl):
+        """Reserva uma vaga livre (``add`` é atômico) e herda o snapshot deixado nela"""
+        taken = store.get_many([_slot_key(slot) for slot in range(config['MAX_WORKERS'])])
+        for slot in range(config['MAX_WORKERS']):
+            if _slot_key(slot) in taken or not store.add(_slot_key(slot), self.worker_id, ttl):
+                continue
+            with self.lock:
+                self.slot = slot
+                self.base = store.get(_snapshot_key(slot)) or EMPTY_SNAPSHOT
+            return True
+        logger.warning(f"Sem vaga para publicar métricas de desempenho (MAX_WORKERS={config['MAX_WORKERS']})")
+        return False
+
+    def flush(self, config=None):
+        """Renova a vaga deste worker e publica o snapshot nela"""
+        config = config or perf_settings()
+        ttl = max(config['FLUSH_INTERVAL'] * 6, config['WINDOW_SECONDS'])
+        store = caches[config['CACHE_ALIAS']]
+        try:
+            if self.slot is not None and store.get(_slot_key(self.slot)) != self.worker_id:
+                # Processo parado por mais que o ttl: a vaga (com o que já foi publicado
+                # daqui) passou a outro worker; recomeça do zero para não contar duas vezes
+                with self.lock:
+                    self.cumulative = {}
+                    self.windows = deque()
+                    self.slot = None
+            if self.slot is None and not self._claim_slot(store, config, ttl):
+                return
+            store.touch(_slot_key(self.slot), ttl)
+            store.set(_snapshot_key(self.slot), self.snapshot(config), None)
+        except Exception as e:
+            logger.warning(f'Falha ao publicar métricas de desempenho: {e}')
+
+
+registry = MetricsRegistry()
+
+
+def collect_metrics():
+    """Junta os snapshots de todas as vagas (inclusive as de workers que já saíram)"""
+    config = perf_settings()
+    registry.flush(config)
+    store = caches[config['CACHE_ALIAS']]
+    slots = range(config['MAX_WORKERS'])
+    live = store.get_many([_slot_key(slot) for slot in slots])
+    snapshots = store.get_many([_snapshot_key(slot) for slot in slots])
+
+    window_seconds = config['WINDOW_SECONDS'] * config['WINDOWS']
+    oldest = time.time() - window_seconds
+    cumulative, windows = _merge_snapshots(*snapshots.values())
+    recent = {}
+    for start, stats_by_endpoint in windows.items():
+        if start < oldest:
+            continue
+        for endpoint, stats in stats_by_endpoint.items():
+            recent.setdefault(endpoint, EndpointStats()).merge_dict(stats.to_dict())
+
+    return {
+        'workers': len(live),
+        'window_seconds': window_seconds,
+        'cumulative': cumulative,
+        'recent': recent,
+    }
+
+
+# === PROMETHEUS ===
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _histogram_lines(name, labels, histogram, scale=1):
+    lines = []
+    cumulative = 0
+    for bound, count in zip(histogram.bounds, histogram.counts):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{bound * scale:g}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+    lines.append(f'{name}_sum{{{labels}}} {histogram.total * scale:g}')
+    lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+    return lines
+
+
+def render_prometheus(cumulative):
+    """Formato de exposição em texto do Prometheus (0.0.4)"""
+    metrics = {
+        'moz_http_requests_total': ('counter', 'Requisições atendidas'),
+        'moz_http_request_errors_total': ('counter', 'Respostas 5xx'),
+        'moz_cache_hits_total': ('counter', 'Acertos de cache durante as requisições'),
+        'moz_cache_misses_total': ('counter', 'Faltas de cache durante as requisições'),
+        'moz_http_request_duration_seconds': ('histogram', 'Tempo total da requisição'),
+        'moz_http_request_db_queries': ('histogram', 'Consultas SQL por requisição'),
+        'moz_http_request_db_duration_seconds': ('histogram', 'Tempo em SQL por requisição'),
+        'moz_http_response_size_bytes': ('histogram', 'Tamanho da resposta'),
+    }
+    lines_by_metric = {name: [] for name in metrics}
+    for endpoint, stats in sorted(cumulative.items()):
+        method, _, view = endpoint.partition(' ')
+        labels = f'method="{_label(method)}",view="{_label(view)}"'
+        lines_by_metric['moz_http_requests_total'].append(f'moz_http_requests_total{{{labels}}} {stats.requests}')
+        lines_by_metric['moz_http_request_errors_total'].append(f'moz_http_request_errors_total{{{labels}}} {stats.errors}')
+        lines_by_metric['moz_cache_hits_total'].append(f'moz_cache_hits_total{{{labels}}} {stats.cache_hits}')
+        lines_by_metric['moz_cache_misses_total'].append(f'moz_cache_misses_total{{{labels}}} {stats.cache_misses}')
+        histograms = stats.histograms
+        lines_by_metric['moz_http_request_duration_seconds'] += _histogram_lines(
+            'moz_http_request_duration_seconds', labels, histograms['duration_ms'], scale=0.001)
+        lines_by_metric['moz_http_request_db_queries'] += _histogram_lines(
+            'moz_http_request_db_queries', labels, histograms['db_queries'])
+        lines_by_metric['moz_http_request_db_duration_seconds'] += _histogram_lines(
+            'moz_http_request_db_duration_seconds', labels, histograms['db_time_ms'], scale=0.001)
+        lines_by_metric['moz_http_response_size_bytes'] += _histogram_lines(
+            'moz_http_response_size_bytes', labels, histograms['response_bytes'])
+
+    output = []
+    for name, (metric_type, help_text) in metrics.items():
+        output.append(f'# HELP {name} {help_text}')
+        output.append(f'# TYPE {name} {metric_type}')
+        output.extend(lines_by_metric[name])
+    return '\n'.join(output) + '\n'
+
+
+# === PROFILER DE REQUISIÇÕES LENTAS ===
+
+def _folded_stack(frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class SamplingProfiler:
+    """Amostra periodicamente a pilha das threads com requisições perfiladas
+
+    Uma única thread amostradora atende todas as requisições; o resultado é
+    um contador de pilhas no formato "folded" (flamegraph.pl/speedscope).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = {}
+        self.thread = None
+        self.interval = DEFAULTS['PROFILE_INTERVAL_MS'] / 1000
+
+    def start(self, thread_id, interval_ms):
+        with self.lock:
+            self.interval = interval_ms / 1000
+            self.active[thread_id] = Counter()
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name='perf-sampling-profiler', daemon=True)
+                self.thread.start()
+
+    def stop(self, thread_id):
+        with self.lock:
+            return self.active.pop(thread_id, None)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self.lock:
+                if not self.active:
+                    continue
+                frames = sys._current_frames()
+                for thread_id, stacks in self.active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        stacks[_folded_stack(frame)] += 1
+
+
+profiler = SamplingProfiler()
+
+
+def dump_profile(endpoint, duration_ms, stacks, config):
+    """Grava as pilhas amostradas de uma requisição lenta; devolve o caminho"""
+    directory = Path(config['PROFILE_DIR'] or Path(settings.BASE_DIR).parent / 'logs' / 'profiles')
+    directory.mkdir(parents=True, exist_ok=True)
+    safe_endpoint = ''.join(c if c.isalnum() else '_' for c in endpoint)[:80]
+    path = directory / f'{time.strftime("%Y%m%d_%H%M%S")}_{safe_endpoint}_{int(duration_ms)}ms.folded'
+    with open(path, 'w', encoding='utf-8') as output:
+        for stack, count in stacks.most_common():
+            output.write(f'{stack} {count}\n')
+    return path
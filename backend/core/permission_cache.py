@@ -0,0 +1,145 @@
+# backend/core/permission_cache.py
+"""
+Cache compartilhado de permissões e grupos por usuário.
+
+O conjunto de permissões (mesmo formato de ``user.get_all_permissions()``)
+e o de grupos de cada usuário ficam no cache sob ``user_permissions_{id}``,
+junto com a versão global vigente. Mudanças no próprio usuário (grupos,
+permissões diretas, ``is_active``/``is_superuser``, perfil) apagam só a sua
+entrada; mudanças em grupos ou permissões afetam muitos usuários e apenas
+incrementam a versão global, o que invalida todas as entradas de uma vez.
+A invalidação acontece no commit da transação: antes dele uma requisição
+concorrente ainda leria (e guardaria) o estado antigo. O cache precisa ser
+compartilhado entre os workers (``core.E003``), senão a invalidação só
+alcança o processo que a executou.
+Decoradores, classes de permissão do DRF e o ``PermissionLoggingMiddleware``
+leem daqui.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+
+PERMISSION_CACHE_TIMEOUT = 60 * 60
+VERSION_CACHE_KEY = 'permission_cache_version'
+
+
+def user_cache_key(user_id):
+    return f'user_permissions_{user_id}'
+
+
+def _current_version():
+    version = cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(VERSION_CACHE_KEY, 1, None)
+        version = cache.get(VERSION_CACHE_KEY, 1)
+    return version
+
+
+class PermissionState:
+    """Permissões e grupos resolvidos de um usuário"""
+
+    __slots__ = ('permissions', 'groups', 'is_active', 'is_superuser')
+
+    def __init__(self, permissions, groups, is_active, is_superuser):
+        self.permissions = frozenset(permissions)
+        self.groups = frozenset(groups)
+        self.is_active = is_active
+        self.is_superuser = is_superuser
+
+    def has_perm(self, perm):
+        # Mesma regra do ModelBackend: inativo nunca, superusuário sempre
+        if not self.is_active:
+            return False
+        return self.is_superuser or perm in self.permissions
+
+    def has_perms(self, perms):
+        return all(self.has_perm(perm) for perm in perms)
+
+    def has_any_perm(self, perms):
+        return any(self.has_perm(perm) for perm in perms)
+
+    def in_group(self, *group_names):
+        return any(name in self.groups for name in group_names)
+
+
+def _load_state(user):
+    from django.contrib.auth.models import Group, Permission
+
+    permissions = set()
+    if user.is_active:
+        if user.is_superuser:
+            # get_all_permissions() de um superusuário traz todas
+            rows = Permission.objects.values_list('content_type__app_label', 'codename')
+        else:
+            rows = Permission.objects.filter(
+                Q(user=user) | Q(group__user=user)
+            ).values_list('content_type__app_label', 'codename').distinct()
+        permissions = {f'{app_label}.{codename}' for app_label, codename in rows}
+    groups = Group.objects.filter(user=user).values_list('name', flat=True)
+    return PermissionState(permissions, groups, user.is_active, user.is_superuser)
+
+
+def get_permission_state(user):
+    """Estado de permissões do usuário (memorizado no objeto durante a requisição)"""
+    state = getattr(user, '_permission_state', None)
+    if state is not None:
+        return state
+    if not getattr(user, 'is_authenticated', False):
+        return PermissionState((), (), False, False)
+
+    version = _current_version()
+    key = user_cache_key(user.pk)
+    cached = cache.get(key)
+    if cached is not None and cached[0] == version:
+        state = PermissionState(*cached[1])
+    else:
+        state = _load_state(user)
+        cache.set(
+            key,
+            (version, (state.permissions, state.groups, state.is_active, state.is_superuser)),
+            PERMISSION_CACHE_TIMEOUT
+        )
+    user._permission_state = state
+    return state
+
+
+def user_has_perm(user, perm):
+    return get_permission_state(user).has_perm(perm)
+
+
+def user_has_perms(user, perms):
+    return get_permission_state(user).has_perms(perms)
+
+
+def user_has_any_perm(user, perms):
+    return get_permission_state(user).has_any_perm(perms)
+
+
+def user_in_group(user, *group_names):
+    return get_permission_state(user).in_group(*group_names)
+
+
+def invalidate_user_permissions(*users_or_ids):
+    """Apaga a entrada de cache destes usuários (objetos ``User`` ou ids) no commit"""
+    keys = []
+    for item in users_or_ids:
+        user_id = getattr(item, 'pk', item)
+        if hasattr(item, '_permission_state'):
+            del item._permission_state
+        keys.append(user_cache_key(user_id))
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_all_permissions():
+    """Invalida todas as entradas (mudança em grupo ou permissão) no commit"""
+    transaction.on_commit(_bump_version)
+
+
+def _bump_version():
+    _current_version()
+    try:
+        cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        # Chave expirada entre a leitura e o incremento
+        cache.set(VERSION_CACHE_KEY, 1, None)
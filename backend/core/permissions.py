@@ -2,6 +2,9 @@
 from django.contrib.auth.models import Permission, Group
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.auth import get_user_model
+from rest_framework.permissions import BasePermission
+
+from .permission_cache import user_has_any_perm, user_has_perms, user_in_group
 
 User = get_user_model()
 
@@ -241,3 +244,42 @@ def assign_user_to_group(user, group_name):
     except Group.DoesNotExist:
         print(f'Grupo {group_name} não encontrado')
         return False
+
+
+class HasRequiredPermissions(BasePermission):
+    """
+    Permissão DRF: exige todas as permissões de ``view.required_permissions``
+    (ou as de ``view.required_permissions_by_action[view.action]``), lidas do
+    cache de permissões.
+    """
+
+    def get_required_permissions(self, view):
+        by_action = getattr(view, 'required_permissions_by_action', None) or {}
+        perms = by_action.get(getattr(view, 'action', None), getattr(view, 'required_permissions', ()))
+        return [perms] if isinstance(perms, str) else list(perms)
+
+    def has_permission(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return False
+        return user_has_perms(request.user, self.get_required_permissions(view))
+
+
+class HasAnyRequiredPermission(HasRequiredPermissions):
+    """Como ``HasRequiredPermissions``, mas basta uma das permissões"""
+
+    def has_permission(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return False
+        perms = self.get_required_permissions(view)
+        return not perms or user_has_any_perm(request.user, perms)
+
+
+class InRequiredGroup(BasePermission):
+    """Permissão DRF: usuário pertence a um dos grupos de ``view.required_groups``"""
+
+    def has_permission(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return False
+        groups = getattr(view, 'required_groups', ())
+        groups = [groups] if isinstance(groups, str) else list(groups)
+        return not groups or user_in_group(request.user, *groups)
@@ -0,0 +1,194 @@
+# backend/core/query_inspector.py
+"""
+Detector de consultas N+1 e consultas lentas.
+
+Agrupa o SQL executado por template normalizado (literais, parâmetros e
+listas ``IN`` viram ``?``). Um template repetido muitas vezes na mesma
+requisição é o sintoma de N+1; cada execução é atribuída ao campo de
+serializer DRF em renderização e à primeira linha de código do projeto na
+pilha, para apontar onde está o laço.
+
+Usado pelo ``QueryInspectorMiddleware`` (logs e cabeçalhos em DEBUG) e pelo
+``QueryInspectorMixin`` dos testes (``core.testing``).
+"""
+import os
+import re
+import sys
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+import django
+from django.conf import settings
+from django.db import connections
+
+DEFAULTS = {
+    'ENABLED': False,
+    'REPEAT_THRESHOLD': 5,
+    'SLOW_QUERY_MS': 100,
+    'RESPONSE_HEADERS': True,
+}
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%s|\?')
+_IN_LIST = re.compile(r'\bIN \((?:\?, )*\?\)', re.IGNORECASE)
+_VALUES = re.compile(r'VALUES (\((?:\?, )*\?\))(?:, \((?:\?, )*\?\))+', re.IGNORECASE)
+_SPACES = re.compile(r'\s+')
+
+_IGNORED_PATHS = tuple(
+    os.path.normpath(path) for path in {
+        os.path.dirname(os.__file__),
+        os.path.dirname(os.path.dirname(django.__file__)),
+    }
+)
+# Wrappers de instrumentação (este módulo e core.perf_metrics) não são a origem
+_INSTRUMENTATION_FILES = tuple(
+    os.path.join(os.path.dirname(os.path.normpath(__file__)), name)
+    for name in ('query_inspector.py', 'perf_metrics.py')
+)
+
+
+def inspector_settings():
+    return {**DEFAULTS, **getattr(settings, 'QUERY_INSPECTOR', {})}
+
+
+def normalize_sql(sql):
+    """Template da consulta: mesma forma, independente dos valores"""
+    sql = _STRING.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _SPACES.sub(' ', sql).strip()
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _VALUES.sub(r'VALUES \1, ...', sql)
+
+
+def _is_project_frame(filename):
+    filename = os.path.normpath(filename)
+    return (
+        filename.startswith(str(settings.BASE_DIR))
+        and not filename.startswith(_IGNORED_PATHS)
+        and 'site-packages' not in filename
+        and filename not in _INSTRUMENTATION_FILES
+    )
+
+
+def _field_label(frame):
+    """``Serializer.campo`` se o frame é a leitura/renderização de um campo DRF"""
+    if frame.f_code.co_name not in ('get_attribute', 'to_representation'):
+        return None
+    field = frame.f_locals.get('self')
+    parent = getattr(field, 'parent', None)
+    field_name = getattr(field, 'field_name', None)
+    if parent is None or not field_name:
+        return None
+    if getattr(parent, 'child', None) is field:
+        # ListSerializer(many=True): o campo é o próprio serializer filho
+        return None
+    return f'{type(parent).__name__}.{field_name}'
+
+
+def find_origin(frame):
+    """(campo do serializer, linha do projeto) que disparou a consulta"""
+    field = None
+    line = None
+    while frame is not None and (field is None or line is None):
+        if line is None and _is_project_frame(frame.f_code.co_filename):
+            path = os.path.relpath(frame.f_code.co_filename, settings.BASE_DIR)
+            line = f'{path}:{frame.f_lineno} ({frame.f_code.co_name})'
+        if field is None:
+            field = _field_label(frame)
+        frame = frame.f_back
+    return field, line
+
+
+class QueryTemplate:
+    """Execuções de um mesmo template de SQL"""
+
+    __slots__ = ('sql', 'count', 'duration_ms', 'origins')
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.count = 0
+        self.duration_ms = 0.0
+        self.origins = Counter()
+
+    def describe(self, max_sql=200):
+        sql = self.sql if len(self.sql) <= max_sql else self.sql[:max_sql - 3] + '...'
+        origins = '; '.join(
+            ' @ '.join(part for part in origin if part) or 'origem desconhecida'
+            for origin, _count in self.origins.most_common(2)
+        )
+        return f'{self.count}x ({self.duration_ms:.1f} ms) {sql} <- {origins}'
+
+
+class QueryInspector:
+    """``execute_wrapper`` que agrupa as consultas executadas por template"""
+
+    def __init__(self, capture_origin=True, slow_query_ms=None):
+        self.capture_origin = capture_origin
+        self.slow_query_ms = slow_query_ms
+        self.templates = {}
+        self.slow = []
+        self.total_queries = 0
+        self.total_ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            self.record(sql, duration_ms, sys._getframe(1) if self.capture_origin else None)
+
+    def record(self, sql, duration_ms, frame=None):
+        template_sql = normalize_sql(sql)
+        template = self.templates.get(template_sql)
+        if template is None:
+            template = self.templates[template_sql] = QueryTemplate(template_sql)
+        template.count += 1
+        template.duration_ms += duration_ms
+        self.total_queries += 1
+        self.total_ms += duration_ms
+        origin = find_origin(frame) if frame is not None else (None, None)
+        template.origins[origin] += 1
+        if self.slow_query_ms is not None and duration_ms >= self.slow_query_ms:
+            self.slow.append((duration_ms, template_sql, origin))
+
+    def repeated(self, threshold):
+        """Templates executados ``threshold`` vezes ou mais, do mais repetido ao menos"""
+        return sorted(
+            (template for template in self.templates.values() if template.count >= threshold),
+            key=lambda template: (template.count, template.duration_ms),
+            reverse=True,
+        )
+
+    def report(self, threshold):
+        lines = [f'{self.total_queries} consultas em {self.total_ms:.1f} ms, {len(self.templates)} templates']
+        repeated = self.repeated(threshold)
+        if repeated:
+            lines.append(f'Possível N+1 ({len(repeated)} templates repetidos >= {threshold}x):')
+            lines.extend(f'  {template.describe()}' for template in repeated)
+        if self.slow:
+            lines.append(f'Consultas lentas (>= {self.slow_query_ms} ms):')
+            for duration_ms, sql, origin in sorted(self.slow, key=lambda item: item[0], reverse=True):
+                where = ' @ '.join(part for part in origin if part) or 'origem desconhecida'
+                lines.append(f'  {duration_ms:.1f} ms {sql[:200]} <- {where}')
+        return '\n'.join(lines)
+
+
+@contextmanager
+def inspect_queries(capture_origin=True, slow_query_ms=None):
+    """Inspeciona as consultas de todas as conexões dentro do bloco
+
+    Também serve em testes pytest::
+
+        with inspect_queries() as inspector:
+            client.get(url)
+        assert not inspector.repeated(5), inspector.report(5)
+    """
+    inspector = QueryInspector(capture_origin=capture_origin, slow_query_ms=slow_query_ms)
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(inspector))
+        yield inspector
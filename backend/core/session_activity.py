@@ -0,0 +1,127 @@
+# backend/core/session_activity.py
+"""
+Expiração de sessões e credenciais de API por inatividade.
+
+O horário da última atividade só é regravado quando fica mais velho que
+``UPDATE_GRANULARITY_SECONDS``: uma requisição de leitura não modifica a
+sessão e o ``SessionMiddleware`` não a salva (com ``SESSION_SAVE_EVERY_REQUEST``
+desligado). A inatividade é medida com a mesma tolerância. Com um
+``SESSION_ENGINE`` baseado em cache as poucas gravações restantes também
+saem do banco.
+
+Clientes com ``Authorization: Token``/``Bearer`` não usam sessão: a atividade
+fica no cache, por hash da credencial. Uma credencial inativa recebe 401: o
+token DRF volta a valer quando o login o reemite (``credential_issued``) e o
+JWT quando o cliente o renova. O registro do token só é apagado com
+``REVOKE_INACTIVE_TOKENS`` ligado (o próximo login gera outro).
+Isso só vale com um cache visto por todos os workers: com um cache por
+processo e vários workers, o worker que não atendeu o cliente nas últimas
+horas teria um horário velho e recusaria um token em uso. Nesse caso a
+atividade das credenciais não é registrada nem verificada.
+"""
+import hashlib
+import time
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .shared_cache import cache_is_consistent
+
+DEFAULTS = {
+    'TIMEOUT_SECONDS': 8 * 60 * 60,
+    'UPDATE_GRANULARITY_SECONDS': 5 * 60,
+    'CACHE_ALIAS': 'default',
+    'REVOKE_INACTIVE_TOKENS': False,
+}
+
+SESSION_KEY = 'last_activity'
+CREDENTIAL_SCHEMES = ('token', 'bearer')
+
+
+def activity_settings():
+    return {**DEFAULTS, **getattr(settings, 'SESSION_ACTIVITY', {})}
+
+
+def _timestamp(value):
+    """Epoch da última atividade (sessões antigas guardavam ISO 8601)"""
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def session_expired(session, config=None):
+    """True se a sessão está inativa há mais que o limite; senão renova a atividade se preciso"""
+    config = config or activity_settings()
+    now = time.time()
+    last = _timestamp(session.get(SESSION_KEY))
+    if is_inactive(last, config):
+        return True
+    if last is None or now - last >= config['UPDATE_GRANULARITY_SECONDS']:
+        session[SESSION_KEY] = int(now)
+    return False
+
+
+def parse_credential(authorization):
+    """(esquema, credencial) de um cabeçalho Authorization de API, ou None"""
+    scheme, _, credential = (authorization or '').partition(' ')
+    scheme = scheme.lower()
+    credential = credential.strip()
+    if scheme not in CREDENTIAL_SCHEMES or not credential:
+        return None
+    return scheme, credential
+
+
+def _credential_ttl(scheme, config):
+    if scheme == 'bearer':
+        # Depois do vencimento do JWT a entrada não serve para nada
+        lifetime = getattr(settings, 'SIMPLE_JWT', {}).get('ACCESS_TOKEN_LIFETIME')
+        return int(max(lifetime.total_seconds() if lifetime else 0, config['TIMEOUT_SECONDS'])) + 60
+    # Tokens DRF não vencem: uma entrada por token emitido, sem expiração
+    return None
+
+
+def _credential_key(scheme, credential):
+    return f'session_activity:{scheme}:{hashlib.sha1(credential.encode("utf-8")).hexdigest()}'
+
+
+def credential_last_activity(scheme, credential, config=None):
+    """Última atividade registrada da credencial (None se desconhecida ou sem cache compartilhado)"""
+    config = config or activity_settings()
+    if not cache_is_consistent(config['CACHE_ALIAS']):
+        return None
+    return caches[config['CACHE_ALIAS']].get(_credential_key(scheme, credential))
+
+
+def is_inactive(last, config=None):
+    config = config or activity_settings()
+    return last is not None and time.time() - last > config['TIMEOUT_SECONDS']
+
+
+def touch_credential(scheme, credential, last, config=None):
+    """Renova a atividade de uma credencial já autenticada (só se mais velha que a granularidade)
+
+    Só chamar depois da autenticação: credenciais inválidas não podem criar
+    entradas no cache.
+    """
+    config = config or activity_settings()
+    if not cache_is_consistent(config['CACHE_ALIAS']):
+        return
+    now = time.time()
+    if last is None or now - last >= config['UPDATE_GRANULARITY_SECONDS']:
+        caches[config['CACHE_ALIAS']].set(
+            _credential_key(scheme, credential), int(now), _credential_ttl(scheme, config)
+        )
+
+
+def credential_issued(scheme, credential, config=None):
+    """Credencial entregue num login: a atividade recomeça agora"""
+    touch_credential(scheme, credential, None, config)
+
+
+def forget_credential(scheme, credential, config=None):
+    config = config or activity_settings()
+    caches[config['CACHE_ALIAS']].delete(_credential_key(scheme, credential))
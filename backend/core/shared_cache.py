@@ -0,0 +1,35 @@
+# backend/core/shared_cache.py
+"""
+Cache compartilhado entre os processos da aplicação.
+
+Contadores de login, permissões resolvidas, atividade de credenciais e
+métricas só valem no conjunto dos workers se o cache for compartilhado
+(Redis via ``REDIS_URL``). O ``LocMemCache`` é por processo e o
+``DummyCache`` não guarda nada: servem só ao desenvolvimento com um único
+processo, e a verificação ``core.E003`` os recusa em produção (``check
+--deploy``) e com mais de um worker (``WEB_CONCURRENCY``, que o
+``gunicorn.conf.py`` sempre define).
+"""
+import os
+
+from django.conf import settings
+
+PROCESS_LOCAL_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def is_shared_cache(alias='default'):
+    """True se o cache ``alias`` é visto igualmente por todos os processos"""
+    backend = settings.CACHES.get(alias, {}).get('BACKEND', '')
+    return backend not in PROCESS_LOCAL_BACKENDS
+
+
+def multiple_workers():
+    return int(os.environ.get('WEB_CONCURRENCY', 1)) > 1
+
+
+def cache_is_consistent(alias='default'):
+    """True se todos os processos enxergam os mesmos valores em ``alias``"""
+    return is_shared_cache(alias) or not multiple_workers()
@@ -0,0 +1,63 @@
+# backend/core/signals.py
+from django.contrib.auth.models import Group, Permission, User
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import UserProfile
+from .permission_cache import invalidate_all_permissions, invalidate_user_permissions
+
+
+# Campos gravados a cada login/atividade que não mudam permissões
+ACTIVITY_ONLY_FIELDS = {'last_login', 'last_activity', 'updated_at'}
+
+
+def _is_activity_only(update_fields):
+    return update_fields is not None and set(update_fields) <= ACTIVITY_ONLY_FIELDS
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def user_relations_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Grupos ou permissões diretas de usuários alterados"""
+    if action not in ('post_add', 'post_remove', 'post_clear', 'pre_clear'):
+        return
+    if not reverse:
+        invalidate_user_permissions(instance)
+    elif action in ('post_clear', 'pre_clear'):
+        # group.user_set.clear(): os usuários afetados já não são conhecidos no post
+        invalidate_all_permissions()
+    elif pk_set:
+        invalidate_user_permissions(*pk_set)
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def group_permissions_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_all_permissions()
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def group_or_permission_changed(sender, **kwargs):
+    invalidate_all_permissions()
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created or _is_activity_only(update_fields):
+        return
+    invalidate_user_permissions(instance)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    invalidate_user_permissions(instance)
+
+
+@receiver(post_save, sender=UserProfile)
+def user_profile_saved(sender, instance, update_fields=None, **kwargs):
+    if _is_activity_only(update_fields):
+        return
+    invalidate_user_permissions(instance.user_id)
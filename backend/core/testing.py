@@ -0,0 +1,37 @@
+# backend/core/testing.py
+"""
+Utilitários de teste de desempenho.
+"""
+from contextlib import contextmanager
+
+from .query_inspector import inspect_queries
+
+
+class QueryInspectorMixin:
+    """
+    Mixin para ``TestCase`` que falha quando um bloco apresenta N+1
+
+    Exemplo::
+
+        class MinhaViewTest(QueryInspectorMixin, TestCase):
+            def test_lista(self):
+                with self.assertNoNPlusOne():
+                    self.client.get('/api/v1/blog/posts/')
+    """
+    n_plus_one_threshold = 5
+
+    @contextmanager
+    def assertNoNPlusOne(self, threshold=None, max_queries=None):
+        """Falha se algum template de SQL repetir ``threshold`` vezes ou mais
+
+        ``max_queries`` limita também o total de consultas do bloco.
+        """
+        threshold = threshold or self.n_plus_one_threshold
+        with inspect_queries() as inspector:
+            yield inspector
+        if inspector.repeated(threshold):
+            self.fail(f'N+1 detectado\n{inspector.report(threshold)}')
+        if max_queries is not None and inspector.total_queries > max_queries:
+            self.fail(
+                f'{inspector.total_queries} consultas (máximo {max_queries})\n{inspector.report(threshold)}'
+            )
@@ -1,3 +1,285 @@
-from django.test import TestCase
+# backend/core/tests.py
+import os
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import force_authenticate
+
+from notifications.models import Notification
+from notifications.views import NotificationStatsView
+from . import perf_metrics, session_activity
+from .login_throttle import DEFAULTS as LOGIN_THROTTLE_DEFAULTS
+from .models import LoginAttempt
+from .permission_cache import get_permission_state, user_cache_key
+from .query_inspector import normalize_sql
+from .testing import QueryInspectorMixin
+
+
+class PermissionCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='gestor')
+        self.group = Group.objects.create(name='Gestores')
+
+    def test_invalidation_waits_for_commit(self):
+        get_permission_state(self.user)
+        self.assertIsNotNone(cache.get(user_cache_key(self.user.pk)))
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.user.groups.add(self.group)
+            # Antes do commit outra requisição ainda leria o estado antigo do banco
+            self.assertIsNotNone(cache.get(user_cache_key(self.user.pk)))
+        self.assertTrue(callbacks)
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+
+        user = User.objects.get(pk=self.user.pk)
+        self.assertTrue(get_permission_state(user).in_group('Gestores'))
+
+    def test_process_local_cache_rejected_with_multiple_workers(self):
+        from .checks import check_shared_cache, check_shared_cache_deploy
+
+        self.assertEqual(check_shared_cache(None), [])
+        self.assertEqual([message.id for message in check_shared_cache_deploy(None)], ['core.E003'])
+        with mock.patch.dict(os.environ, {'WEB_CONCURRENCY': '4'}):
+            self.assertEqual([message.id for message in check_shared_cache(None)], ['core.E003'])
+            with override_settings(CACHES={'default': {'BACKEND': 'django_redis.cache.RedisCache'}}):
+                self.assertEqual(check_shared_cache(None), [])
+
+
+class PerfMetricsRegistryTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def _worker(self, worker_id, requests):
+        registry = perf_metrics.MetricsRegistry()
+        registry.worker_id = worker_id
+        registry.thread = False  # sem a thread de publicação no teste
+        for _ in range(requests):
+            registry.record('GET blog-list', perf_metrics.RequestSample(), 12.0, 200, 512)
+        registry.flush()
+        return registry
+
+    def _total(self):
+        return perf_metrics.collect_metrics()['cumulative']['GET blog-list'].requests
+
+    def test_workers_take_separate_slots(self):
+        first, second = self._worker('a', 3), self._worker('b', 4)
+        self.assertNotEqual(first.slot, second.slot)
+        self.assertEqual(self._total(), 7)
+
+    def test_totals_survive_departed_workers(self):
+        departed = self._worker('a', 3)
+        self._worker('b', 4)
+        self.assertEqual(self._total(), 7)
+
+        # Vaga do worker que saiu expira; o próximo worker a herda com os totais
+        cache.delete(perf_metrics._slot_key(departed.slot))
+        self.assertEqual(self._total(), 7)
+        replacement = self._worker('c', 2)
+        self.assertEqual(replacement.slot, departed.slot)
+        self.assertEqual(self._total(), 9)
+
+
+class QueryInspectorTest(QueryInspectorMixin, TestCase):
+    def setUp(self):
+        for i in range(6):
+            User.objects.create_user(username=f'inspecionado{i}')
+
+    def test_normalize_sql_ignores_values(self):
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x'  LIMIT 21"),
+            normalize_sql("SELECT * FROM t WHERE id IN (%s) AND name = 'yy' LIMIT 1"),
+        )
+
+    def test_repeated_template_fails_with_origin(self):
+        with self.assertRaises(AssertionError) as raised:
+            with self.assertNoNPlusOne():
+                for user in User.objects.all():
+                    User.objects.filter(pk=user.pk).exists()
+
+        self.assertIn('6x', str(raised.exception))
+        self.assertIn('core/tests.py', str(raised.exception))
+
+    def test_single_query_passes(self):
+        with self.assertNoNPlusOne(max_queries=1):
+            list(User.objects.all())
+
+
+class AsyncReadViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='leitor')
+        for i in range(4):
+            Notification.objects.create(
+                recipient=self.user, title=f'Aviso {i}', message='Teste',
+                notification_type='system', is_read=i == 0,
+            )
+
+    def _request(self, factory, method='get', user=None):
+        request = getattr(factory, method)('/api/v1/notifications/stats/')
+        if user:
+            force_authenticate(request, user=user)
+        return request
+
+    async def test_async_view_matches_sync_view(self):
+        sync_view = sync_to_async(NotificationStatsView.as_view())
+        sync_response = await sync_view(self._request(RequestFactory(), user=self.user))
+        async_response = await NotificationStatsView.as_async_view()(self._request(AsyncRequestFactory(), user=self.user))
+
+        self.assertEqual(async_response.status_code, 200)
+        self.assertEqual(async_response.data, sync_response.data)
+        self.assertEqual(async_response.data['unread'], 3)
+
+    async def test_permissions_and_other_methods(self):
+        view = NotificationStatsView.as_async_view()
+
+        anonymous = await view(self._request(AsyncRequestFactory()))
+        self.assertEqual(anonymous.status_code, 401)
+
+        # POST não tem versão assíncrona: delega para a view síncrona
+        post = await view(self._request(AsyncRequestFactory(), 'post', user=self.user))
+        self.assertEqual(post.status_code, 405)
+
+
+LOGIN_URL = '/api/v1/client-area/auth/login/'
+
+
+@override_settings(LOGIN_THROTTLE={
+    **LOGIN_THROTTLE_DEFAULTS,
+    'LIMITS': {'user_ip': 3, 'user': 10, 'ip': 10},
+    'LOGIN_PATHS': [LOGIN_URL],
+    'AUDIT_ASYNC': False,
+})
+class LoginThrottleTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user(username='maria', password='senha-correta')
+
+    def _login(self, password, username='maria'):
+        return self.client.post(LOGIN_URL, {'username': username, 'password': password}, content_type='application/json')
+
+    def test_blocks_after_limit_without_querying_attempts(self):
+        for _ in range(3):
+            self.assertEqual(self._login('errada').status_code, 400)
+
+        with self.assertNumQueries(1):  # só a gravação da auditoria do bloqueio
+            response = self._login('senha-correta')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('blocked_until', response.json())
+        self.assertTrue(int(response['Retry-After']) > 0)
+
+        self.assertEqual(LoginAttempt.objects.filter(username='maria', success=False).count(), 4)
+
+    def test_success_resets_user_ip_counter(self):
+        for _ in range(2):
+            self._login('errada')
+        self.assertEqual(self._login('senha-correta').status_code, 200)
+        for _ in range(2):
+            self.assertEqual(self._login('errada').status_code, 400)
+        self.assertEqual(self._login('senha-correta').status_code, 200)
+
+    def test_per_process_throttle_cache_is_rejected(self):
+        from .checks import check_shared_cache_deploy
+
+        caches = {
+            'default': {'BACKEND': 'django_redis.cache.RedisCache'},
+            'throttle': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        }
+        with override_settings(CACHES=caches, LOGIN_THROTTLE={'CACHE_ALIAS': 'throttle'}):
+            messages = check_shared_cache_deploy(None)
+        self.assertEqual([message.id for message in messages], ['core.E003'])
+        self.assertIn("CACHES['throttle']", messages[0].msg)
+
+    def test_ip_scope_blocks_across_usernames(self):
+        for i in range(10):
+            self._login('errada', username=f'alvo{i}')
+        self.assertEqual(self._login('senha-correta').status_code, 429)
+
+
+class SessionActivityTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='ana')
+
+    def _session_writes(self, **extra):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/v1/notifications/stats/', **extra)
+        self.assertEqual(response.status_code, 200)
+        return [query for query in queries.captured_queries if 'UPDATE "django_session"' in query['sql']]
+
+    def test_read_requests_do_not_save_session(self):
+        self.client.force_login(self.user)
+        self._session_writes()  # primeira requisição registra a atividade
+        self.assertEqual(self._session_writes(), [])
+
+    def test_inactive_session_is_logged_out(self):
+        self.client.force_login(self.user)
+        session = self.client.session
+        session[session_activity.SESSION_KEY] = '2020-01-01T00:00:00+00:00'  # formato antigo (ISO)
+        session.save()
+
+        response = self.client.get('/api/v1/notifications/stats/')
+        self.assertEqual(response.status_code, 401)
+
+    def test_inactive_drf_token_is_refused_without_session(self):
+        token = Token.objects.create(user=self.user)
+        header = {'HTTP_AUTHORIZATION': f'Token {token.key}'}
+        self.assertEqual(self._session_writes(**header), [])
+        self.assertIsNotNone(session_activity.credential_last_activity('token', token.key))
+
+        with override_settings(SESSION_ACTIVITY={**session_activity.DEFAULTS, 'TIMEOUT_SECONDS': -1}):
+            response = self.client.get('/api/v1/notifications/stats/', **header)
+        self.assertEqual(response.status_code, 401)
+        self.assertTrue(Token.objects.filter(key=token.key).exists())
+
+    def test_login_reactivates_inactive_drf_token(self):
+        self.user.set_password('senha-correta')
+        self.user.save()
+        token = Token.objects.create(user=self.user)
+        header = {'HTTP_AUTHORIZATION': f'Token {token.key}'}
+        self._session_writes(**header)
+        cache.set(session_activity._credential_key('token', token.key), 0, None)  # inativo desde 1970
+
+        self.assertEqual(self.client.get('/api/v1/notifications/stats/', **header).status_code, 401)
+        response = self.client.post(
+            '/api/v1/client-area/auth/login/', {'username': 'ana', 'password': 'senha-correta'},
+            content_type='application/json', **header,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['token'], token.key)
+        self.assertEqual(self.client.get('/api/v1/notifications/stats/', **header).status_code, 200)
+
+    def test_inactive_drf_token_is_deleted_when_revocation_is_enabled(self):
+        token = Token.objects.create(user=self.user)
+        header = {'HTTP_AUTHORIZATION': f'Token {token.key}'}
+        self._session_writes(**header)
+
+        with override_settings(SESSION_ACTIVITY={
+            **session_activity.DEFAULTS, 'TIMEOUT_SECONDS': -1, 'REVOKE_INACTIVE_TOKENS': True,
+        }):
+            response = self.client.get('/api/v1/notifications/stats/', **header)
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(Token.objects.filter(key=token.key).exists())
+        self.assertIsNone(session_activity.credential_last_activity('token', token.key))
+
+    def test_tokens_are_not_expired_from_a_per_process_cache(self):
+        token = Token.objects.create(user=self.user)
+        header = {'HTTP_AUTHORIZATION': f'Token {token.key}'}
+        self.client.get('/api/v1/notifications/stats/', **header)
+
+        # Vários workers com LocMem: o horário deste processo pode estar velho
+        with mock.patch.dict(os.environ, {'WEB_CONCURRENCY': '4'}), \
+                override_settings(SESSION_ACTIVITY={**session_activity.DEFAULTS, 'TIMEOUT_SECONDS': -1}):
+            response = self.client.get('/api/v1/notifications/stats/', **header)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(Token.objects.filter(key=token.key).exists())
+
+    def test_invalid_credentials_are_not_tracked(self):
+        response = self.client.get('/api/v1/notifications/stats/', HTTP_AUTHORIZATION='Token invalido')
+        self.assertEqual(response.status_code, 401)
+        self.assertIsNone(session_activity.credential_last_activity('token', 'invalido'))
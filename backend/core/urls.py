@@ -4,7 +4,7 @@ from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 import json
-from .views import ProgramViewSet, ProjectCategoryViewSet
+from .views import ProgramViewSet, ProjectCategoryViewSet, PerformanceMetricsView
 from .sitemaps import sitemap_index, sitemap_static, sitemap_blog, sitemap_programas
 
 app_name = 'core'
@@ -39,6 +39,7 @@ urlpatterns = [
     path('profiles/me/', profile_me, name='profile-me'),
     path('dashboard/stats/', dashboard_stats, name='dashboard-stats'),
     path('auth/register/', auth_register, name='register'),
+    path('metrics/', PerformanceMetricsView.as_view(), name='performance-metrics'),
     
     # Sitemaps
     path('sitemap.xml', sitemap_index, name='sitemap-index'),
@@ -8,6 +8,7 @@ from .views_categories import (
     ProjectCategoryViewSet, ProjectViewSet, ProjectUpdateViewSet,
     ProjectGalleryViewSet, PublicProjectCategoryViewSet, PublicProjectViewSet
 )
+from .async_views import with_async_views
 
 # Router para APIs administrativas (requer autenticação)
 admin_router = DefaultRouter()
@@ -28,5 +29,6 @@ urlpatterns = [
     path('admin/', include(admin_router.urls)),
     
     # APIs públicas
-    path('public/', include(public_router.urls)),
+    # APIs públicas (listagem e detalhe de projetos assíncronos no modo ASGI)
+    path('public/', include(with_async_views(public_router.urls, {'public-project-list', 'public-project-detail'}))),
 ]
@@ -13,7 +13,7 @@ from django.utils import timezone
 from datetime import timedelta
 import json
 
-from rest_framework import status, generics, viewsets, permissions
+from rest_framework import status, generics, viewsets, permissions, renderers
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
@@ -33,6 +33,7 @@ from .serializers import (
 )
 from .decorators import require_permission, require_any_permission
 from .permissions import SYSTEM_PERMISSIONS, GROUPS_PERMISSIONS
+from .perf_metrics import collect_metrics, render_prometheus
 
 User = get_user_model()
 
@@ -818,3 +819,51 @@ class ProjectCategoryViewSet(viewsets.ReadOnlyModelViewSet):
         if program_id is not None:
             queryset = queryset.filter(program_id=program_id)
         return queryset
+
+
+class PrometheusRenderer(renderers.BaseRenderer):
+    """Texto já formatado no padrão de exposição do Prometheus"""
+    media_type = 'text/plain'
+    format = 'prometheus'
+    charset = 'utf-8'
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, str):
+            return data.encode(self.charset)
+        # Erros (ex.: 403) chegam como dict
+        return json.dumps(data, ensure_ascii=False).encode(self.charset)
+
+
+class PerformanceMetricsView(APIView):
+    """
+    Métricas de desempenho por endpoint (somente staff)
+    
+    JSON com a janela recente por padrão; ``?format=prometheus`` (ou
+    ``Accept: text/plain``) devolve os contadores acumulados para scraping.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    renderer_classes = [renderers.JSONRenderer, PrometheusRenderer]
+    
+    def get(self, request):
+        metrics = collect_metrics()
+        
+        if request.accepted_renderer.format == 'prometheus':
+            return Response(
+                render_prometheus(metrics['cumulative']),
+                content_type='text/plain; version=0.0.4; charset=utf-8'
+            )
+        
+        window_seconds = metrics['window_seconds']
+        recent = sorted(
+            metrics['recent'].items(),
+            key=lambda item: item[1].histograms['duration_ms'].total,
+            reverse=True
+        )
+        return Response({
+            'workers': metrics['workers'],
+            'window_seconds': window_seconds,
+            'generated_at': timezone.now().isoformat(),
+            'endpoints': {
+                endpoint: stats.summary(window_seconds) for endpoint, stats in recent
+            },
+        })
@@ -9,6 +9,7 @@ from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnl
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q, Count, Prefetch
 
+from core.async_views import AsyncReadMixin
 from core.models import ProjectCategory, Project, ProjectUpdate, ProjectGallery, Program
 from .serializers_categories import (
     ProjectCategorySerializer, ProjectCategoryListSerializer,
@@ -285,7 +286,7 @@ class PublicProjectCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     ordering = ['program__order', 'order', 'name']
 
 
-class PublicProjectViewSet(viewsets.ReadOnlyModelViewSet):
+class PublicProjectViewSet(AsyncReadMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet público para projetos (apenas leitura)"""
     queryset = Project.objects.filter(is_public=True, status__in=['active', 'completed']).select_related(
         'program', 'category'
@@ -3,7 +3,7 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils import timezone
-from .models import Donation, DonationComment, DonationMethod, DonationStats
+from .models import Donation, DonationBulkReview, DonationComment, DonationMethod, DonationStats, DonorLedger
 
 @admin.register(DonationMethod)
 class DonationMethodAdmin(admin.ModelAdmin):
@@ -87,3 +87,15 @@ class DonationStatsAdmin(admin.ModelAdmin):
     list_display = ['date', 'total_donations', 'total_donors', 'approved_count', 'pending_count']
     list_filter = ['date']
     readonly_fields = ['date']
+
+@admin.register(DonationBulkReview)
+class DonationBulkReviewAdmin(admin.ModelAdmin):
+    list_display = ['id', 'requested_by', 'target_status', 'status', 'processed', 'total', 'created_at', 'finished_at']
+    list_filter = ['status', 'target_status']
+    readonly_fields = ['donation_ids', 'processed', 'updated_count', 'error', 'created_at', 'finished_at']
+
+@admin.register(DonorLedger)
+class DonorLedgerAdmin(admin.ModelAdmin):
+    list_display = ['donor', 'total_approved', 'approved_count', 'first_donation_date', 'last_donation_date', 'updated_at']
+    search_fields = ['donor__username', 'donor__email']
+    readonly_fields = ['donor', 'total_approved', 'approved_count', 'first_donation_date', 'last_donation_date', 'updated_at']
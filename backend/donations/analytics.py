@@ -0,0 +1,152 @@
+# backend/donations/analytics.py
+"""
+Estatísticas de doações.
+
+As estatísticas administrativas saem de três consultas: um ``GROUP BY``
+(status, método de pagamento) para totais/pendentes/métodos, um agregado
+condicional limitado pelo índice de ``submission_date`` para os baldes de
+tempo (mês corrente e últimos 30 dias) e o ``DonorLedger`` para doadores
+distintos e top doadores. O resultado fica em cache e é invalidado pelos
+sinais de ``Donation`` e pela revisão em lote.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .models import Donation, DonorLedger
+
+
+STATISTICS_CACHE_KEY = 'donation_admin_statistics'
+STATISTICS_CACHE_TIMEOUT = 15 * 60
+
+PENDING_STATUSES = ['pending', 'submitted', 'under_review']
+TOP_DONORS_LIMIT = 10
+
+
+def _status_method_breakdown():
+    """Uma linha por (status, método de pagamento) com contagem e soma"""
+    return list(
+        Donation.objects.values('status', 'payment_method').annotate(
+            count=Count('id'),
+            total=Sum('amount'),
+        ).order_by()
+    )
+
+
+def _time_buckets(today):
+    """Mês corrente e últimos 30 dias num único agregado sobre o índice de data"""
+    month_start = timezone.make_aware(datetime.combine(today.replace(day=1), time.min))
+    last_30_days = timezone.make_aware(datetime.combine(today - timedelta(days=30), time.min))
+    return Donation.objects.filter(
+        submission_date__gte=min(month_start, last_30_days)
+    ).aggregate(
+        monthly_amount=Sum('amount', filter=Q(submission_date__gte=month_start)),
+        monthly_count=Count('id', filter=Q(submission_date__gte=month_start)),
+        recent_amount=Sum('amount', filter=Q(submission_date__gte=last_30_days)),
+        recent_count=Count('id', filter=Q(submission_date__gte=last_30_days)),
+    )
+
+
+def _top_donors():
+    return list(
+        DonorLedger.objects.filter(approved_count__gt=0).order_by('-total_approved').values(
+            'donor__username', 'donor__first_name', 'donor__last_name',
+            total_amount=F('total_approved'),
+            donation_count=F('approved_count'),
+        )[:TOP_DONORS_LIMIT]
+    )
+
+
+def compute_donation_statistics():
+    """Calcula as estatísticas administrativas (quatro consultas no total)"""
+    today = timezone.localdate()
+    rows = _status_method_breakdown()
+
+    total_amount = Decimal('0')
+    total_count = approved_count = pending_count = 0
+    approved_amount = pending_amount = Decimal('0')
+    methods = defaultdict(lambda: {'count': 0, 'total': Decimal('0')})
+    for row in rows:
+        amount = row['total'] or Decimal('0')
+        total_amount += amount
+        total_count += row['count']
+        if row['status'] == 'approved':
+            approved_amount += amount
+            approved_count += row['count']
+            method = methods[row['payment_method']]
+            method['count'] += row['count']
+            method['total'] += amount
+        elif row['status'] in PENDING_STATUSES:
+            pending_amount += amount
+            pending_count += row['count']
+
+    buckets = _time_buckets(today)
+    payment_methods = sorted(
+        ({'payment_method': name, **values} for name, values in methods.items()),
+        key=lambda item: -item['total']
+    )
+    total_donors = DonorLedger.objects.filter(approved_count__gt=0).count()
+
+    # Mesmo formato (e valores nulos quando não há linhas) da versão anterior
+    return {
+        'total': {
+            'total_amount': total_amount if total_count else None,
+            'total_count': total_count,
+            'approved_amount': approved_amount if approved_count else None,
+            'approved_count': approved_count,
+        },
+        'monthly': {
+            'monthly_amount': buckets['monthly_amount'],
+            'monthly_count': buckets['monthly_count'],
+        },
+        'recent': {
+            'recent_amount': buckets['recent_amount'],
+            'recent_count': buckets['recent_count'],
+        },
+        'pending': {
+            'pending_amount': pending_amount if pending_count else None,
+            'pending_count': pending_count,
+        },
+        'payment_methods': payment_methods,
+        'top_donors': _top_donors(),
+        'summary': {
+            'total_raised': approved_amount,
+            'total_donors': total_donors,
+            'average_donation': approved_amount / max(approved_count, 1),
+            'pending_review': pending_count,
+        },
+        'generated_on': today.isoformat(),
+    }
+
+
+def get_donation_statistics(use_cache=True):
+    """Estatísticas em cache; recalculadas se invalidadas ou de outro dia"""
+    today = timezone.localdate().isoformat()
+    if use_cache:
+        data = cache.get(STATISTICS_CACHE_KEY)
+        # Os baldes "mês" e "30 dias" dependem da data atual
+        if data is not None and data.get('generated_on') == today:
+            return data
+
+    data = compute_donation_statistics()
+    cache.set(STATISTICS_CACHE_KEY, data, STATISTICS_CACHE_TIMEOUT)
+    return data
+
+
+def invalidate_donation_statistics():
+    cache.delete(STATISTICS_CACHE_KEY)
+
+
+def donor_statistics(user):
+    """Estatísticas do doador logado (livro-razão + índices por doador)"""
+    ledger = DonorLedger.objects.filter(donor=user).values('total_approved', 'approved_count').first()
+    return {
+        'total_donations': ledger['total_approved'] if ledger else 0,
+        'donation_count': ledger['approved_count'] if ledger else 0,
+        'pending_count': Donation.objects.filter(donor=user, status__in=PENDING_STATUSES).count(),
+        'last_donation': Donation.objects.filter(donor=user).order_by('-submission_date').first(),
+    }
@@ -0,0 +1,223 @@
+# backend/donations/ledger.py
+"""
+Livro-razão incremental dos doadores.
+
+Cada transição de uma doação para dentro ou para fora de ``approved`` vira um
+delta (valor, contagem, data) aplicado ao ``DonorLedger`` do doador e
+espelhado em ``core.Donor``. O custo não depende do histórico do doador:
+só quando a doação removida era a primeira ou a última aprovada as datas-
+limite são relidas do banco (índice ``donor, status``).
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import Coalesce
+
+from .models import Donation, DonorLedger
+
+
+def contribution(state):
+    """``(doador, valor, data)`` de uma doação aprovada; ``None`` caso contrário.
+
+    ``state`` é a tupla de ``Donation.ledger_state()``.
+    """
+    if state is None:
+        return None
+    donor_id, status, amount, approval_date, submission_date = state
+    if status != 'approved':
+        return None
+    return donor_id, Decimal(amount), approval_date or submission_date
+
+
+class LedgerDeltas:
+    """Acumula deltas por doador para aplicar de uma vez"""
+
+    def __init__(self):
+        self.amount = defaultdict(Decimal)
+        self.count = defaultdict(int)
+        self.added = defaultdict(list)
+        self.removed = defaultdict(list)
+        # Doadores cujo estado anterior é desconhecido: recalcular do zero
+        self.rebuild = set()
+
+    def __bool__(self):
+        return bool(self.amount or self.count or self.rebuild)
+
+    def add(self, donor_id, amount, date):
+        self.amount[donor_id] += amount
+        self.count[donor_id] += 1
+        self.added[donor_id].append(date)
+
+    def remove(self, donor_id, amount, date):
+        self.amount[donor_id] -= amount
+        self.count[donor_id] -= 1
+        self.removed[donor_id].append(date)
+
+    def transition(self, old_state, new_state):
+        """Registra a mudança de uma doação entre dois estados gravados"""
+        old = contribution(old_state)
+        new = contribution(new_state)
+        if old == new:
+            return
+        if old:
+            self.remove(*old)
+        if new:
+            self.add(*new)
+
+    @property
+    def donor_ids(self):
+        return set(self.count) | set(self.amount) | self.rebuild
+
+
+def _approved_aggregates(donor_ids):
+    """Agregado completo (por doador) das doações aprovadas"""
+    return {
+        row['donor_id']: row
+        for row in Donation.objects.filter(
+            donor_id__in=donor_ids, status='approved'
+        ).values('donor_id').annotate(
+            total=Sum('amount'),
+            count=Count('id'),
+            first_date=Min(Coalesce('approval_date', 'submission_date')),
+            last_date=Max(Coalesce('approval_date', 'submission_date')),
+        ).order_by()
+    }
+
+
+def apply_ledger_deltas(deltas):
+    """Aplica os deltas (deve rodar dentro da transação que alterou as doações)"""
+    if not deltas:
+        return
+
+    donor_ids = deltas.donor_ids
+    ledgers = {
+        ledger.donor_id: ledger
+        for ledger in DonorLedger.objects.select_for_update().filter(donor_id__in=donor_ids)
+    }
+    missing = donor_ids - ledgers.keys()
+    if missing:
+        DonorLedger.objects.bulk_create(
+            [DonorLedger(donor_id=donor_id) for donor_id in missing], ignore_conflicts=True
+        )
+        ledgers.update({
+            ledger.donor_id: ledger
+            for ledger in DonorLedger.objects.select_for_update().filter(donor_id__in=missing)
+        })
+
+    # Doadores que perderam a primeira/última doação aprovada ou sem estado anterior
+    reload_bounds = set(deltas.rebuild)
+    for donor_id, ledger in ledgers.items():
+        if donor_id in deltas.rebuild:
+            continue
+        ledger.total_approved += deltas.amount.get(donor_id, 0)
+        ledger.approved_count = max(ledger.approved_count + deltas.count.get(donor_id, 0), 0)
+        if ledger.approved_count == 0:
+            ledger.total_approved = Decimal('0')
+            ledger.first_donation_date = ledger.last_donation_date = None
+            continue
+        removed = deltas.removed.get(donor_id)
+        if removed and {ledger.first_donation_date, ledger.last_donation_date} & set(removed):
+            reload_bounds.add(donor_id)
+            continue
+        dates = [d for d in [ledger.first_donation_date, ledger.last_donation_date] if d]
+        dates += deltas.added.get(donor_id, [])
+        if dates:
+            ledger.first_donation_date = min(dates)
+            ledger.last_donation_date = max(dates)
+
+    if reload_bounds:
+        aggregates = _approved_aggregates(reload_bounds)
+        for donor_id in reload_bounds:
+            row = aggregates.get(donor_id)
+            ledger = ledgers[donor_id]
+            if donor_id in deltas.rebuild:
+                ledger.total_approved = row['total'] if row else Decimal('0')
+                ledger.approved_count = row['count'] if row else 0
+            ledger.first_donation_date = row['first_date'] if row else None
+            ledger.last_donation_date = row['last_date'] if row else None
+
+    DonorLedger.objects.bulk_update(
+        ledgers.values(),
+        ['total_approved', 'approved_count', 'first_donation_date', 'last_donation_date'],
+        batch_size=500
+    )
+    sync_core_donors(ledgers.values())
+
+
+def sync_core_donors(ledgers):
+    """Espelha o livro-razão em ``core.Donor`` (cria o Donor se o usuário tiver perfil no core)"""
+    from core.models import Donor as CoreDonor, UserProfile as CoreUserProfile
+
+    ledgers = {ledger.donor_id: ledger for ledger in ledgers}
+    if not ledgers:
+        return
+
+    donors = {
+        donor.user_profile.user_id: donor
+        for donor in CoreDonor.objects.filter(
+            user_profile__user_id__in=ledgers.keys()
+        ).select_related('user_profile')
+    }
+    with_approved = {donor_id for donor_id, ledger in ledgers.items() if ledger.approved_count}
+    new_donors = [
+        CoreDonor(user_profile=profile)
+        for profile in CoreUserProfile.objects.filter(user_id__in=with_approved - donors.keys())
+    ] if with_approved - donors.keys() else []
+
+    for donor in list(donors.values()) + new_donors:
+        ledger = ledgers[donor.user_profile.user_id]
+        donor.total_donated = ledger.total_approved
+        donor.first_donation_date = ledger.first_donation_date
+        donor.last_donation_date = ledger.last_donation_date
+
+    CoreDonor.objects.bulk_update(
+        donors.values(), ['total_donated', 'first_donation_date', 'last_donation_date'], batch_size=500
+    )
+    if new_donors:
+        CoreDonor.objects.bulk_create(new_donors, batch_size=500)
+
+    # bulk_update/bulk_create não disparam sinais: avisar o dashboard do portal
+    from client_area.stats import mark_dashboard_stats_dirty
+    mark_dashboard_stats_dirty(user_ids=ledgers.keys())
+
+
+def rebuild_donor_ledgers(donor_ids):
+    """Reconstrói o livro-razão destes doadores a partir do agregado completo"""
+    deltas = LedgerDeltas()
+    deltas.rebuild.update(donor_ids)
+    apply_ledger_deltas(deltas)
+
+
+def diff_donor_ledgers(donor_ids=None):
+    """Compara livro-razão e agregado completo; retorna ``{doador: (esperado, gravado)}``"""
+    approved = Donation.objects.filter(status='approved')
+    ledgers = DonorLedger.objects.all()
+    if donor_ids is not None:
+        approved = approved.filter(donor_id__in=donor_ids)
+        ledgers = ledgers.filter(donor_id__in=donor_ids)
+
+    expected = {
+        row['donor_id']: (row['total'], row['count'], row['first_date'], row['last_date'])
+        for row in approved.values('donor_id').annotate(
+            total=Sum('amount'),
+            count=Count('id'),
+            first_date=Min(Coalesce('approval_date', 'submission_date')),
+            last_date=Max(Coalesce('approval_date', 'submission_date')),
+        ).order_by()
+    }
+    recorded = {
+        donor_id: (total, count, first_date, last_date)
+        for donor_id, total, count, first_date, last_date in ledgers.values_list(
+            'donor_id', 'total_approved', 'approved_count', 'first_donation_date', 'last_donation_date'
+        )
+    }
+
+    empty = (Decimal('0'), 0, None, None)
+    differences = {}
+    for donor_id in expected.keys() | recorded.keys():
+        exp = expected.get(donor_id, empty)
+        rec = recorded.get(donor_id, empty)
+        if exp != rec:
+            differences[donor_id] = (exp, rec)
+    return differences
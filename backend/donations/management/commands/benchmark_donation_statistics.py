@@ -0,0 +1,109 @@
+# backend/donations/management/commands/benchmark_donation_statistics.py
+import random
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from donations.analytics import compute_donation_statistics, donor_statistics, get_donation_statistics
+from donations.ledger import rebuild_donor_ledgers
+from donations.models import Donation
+
+
+class Command(BaseCommand):
+    help = 'Mede consultas e latência das estatísticas de doações (opcionalmente gera doações sintéticas)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--synthetic-donations',
+            type=int,
+            default=0,
+            help='Cria N doações sintéticas antes de medir (ex.: 1000000)',
+        )
+        parser.add_argument('--donors', type=int, default=20000, help='Doadores sintéticos')
+        parser.add_argument('--runs', type=int, default=5, help='Repetições de cada medição')
+        parser.add_argument('--seed', type=int, default=7)
+
+    def handle(self, *args, **options):
+        if options['synthetic_donations']:
+            self.create_synthetic_donations(
+                options['synthetic_donations'], options['donors'], options['seed']
+            )
+
+        self.stdout.write(f'{Donation.objects.count()} doações no banco')
+
+        self.measure('Estatísticas admin (sem cache)', compute_donation_statistics, options['runs'])
+        get_donation_statistics(use_cache=False)
+        self.measure('Estatísticas admin (cache)', get_donation_statistics, options['runs'])
+
+        donor = User.objects.filter(donation_ledger__approved_count__gt=0).order_by('-donation_ledger__approved_count').first()
+        if donor:
+            self.measure(
+                f'Estatísticas do doador ({donor.donation_ledger.approved_count} aprovadas)',
+                lambda: donor_statistics(donor),
+                options['runs']
+            )
+
+        self.stdout.write(self.style.SUCCESS('Benchmark de estatísticas concluído'))
+
+    def measure(self, label, func, runs):
+        timings = []
+        for _ in range(runs):
+            with CaptureQueriesContext(connection) as ctx:
+                started = time.perf_counter()
+                func()
+                timings.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(
+            f'{label}: {len(ctx.captured_queries)} consultas, '
+            f'mediana {statistics.median(timings):.1f} ms, máx {max(timings):.1f} ms'
+        )
+
+    def create_synthetic_donations(self, total, donor_total, seed, batch_size=5000):
+        """Cria doações em lote via bulk_create e reconstrói os livros-razão"""
+        rng = random.Random(seed)
+        prefix = f'synthetic_donor_{seed}_{User.objects.count()}'
+        donors = User.objects.bulk_create([
+            User(username=f'{prefix}_{i}', first_name='Doador', last_name=str(i), password='!')
+            for i in range(donor_total)
+        ], batch_size=batch_size)
+        if donors[0].pk is None:
+            donors = list(User.objects.filter(username__startswith=prefix))
+        donor_ids = [donor.pk for donor in donors]
+
+        statuses = ['approved'] * 6 + ['rejected', 'pending', 'submitted', 'under_review']
+        methods = [choice for choice, _label in Donation.PAYMENT_METHOD_CHOICES]
+        now = timezone.now()
+
+        self.stdout.write(f'Criando {total} doações sintéticas...')
+        for offset in range(0, total, batch_size):
+            count = min(batch_size, total - offset)
+            donations = []
+            submitted_dates = []
+            for _ in range(count):
+                status = rng.choice(statuses)
+                submitted = now - timedelta(minutes=rng.randint(0, 2 * 365 * 24 * 60))
+                submitted_dates.append(submitted)
+                donations.append(Donation(
+                    donor_id=rng.choice(donor_ids),
+                    amount=Decimal(rng.randint(50, 50000)),
+                    payment_method=rng.choice(methods),
+                    status=status,
+                    approval_date=submitted + timedelta(days=1) if status == 'approved' else None,
+                ))
+            with transaction.atomic():
+                created = Donation.objects.bulk_create(donations)
+            # submission_date é auto_now_add: espalhar no tempo após a inserção
+            if created[0].pk is not None:
+                for donation, submitted in zip(created, submitted_dates):
+                    donation.submission_date = submitted
+                Donation.objects.bulk_update(created, ['submission_date'], batch_size=batch_size)
+
+        # bulk_create não dispara sinais: reconstruir os livros-razão
+        with transaction.atomic():
+            rebuild_donor_ledgers(donor_ids)
+        self.stdout.write(f'{total} doações criadas para {donor_total} doadores')
@@ -0,0 +1,28 @@
+# backend/donations/management/commands/process_donation_bulk_reviews.py
+from django.core.management.base import BaseCommand
+from donations.models import DonationBulkReview
+from donations.services import run_bulk_review
+
+
+class Command(BaseCommand):
+    help = 'Processa (ou retoma) revisões em lote de doações pendentes ou interrompidas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job', type=int, help='Processa apenas este job')
+        parser.add_argument(
+            '--include-failed',
+            action='store_true',
+            help='Retoma também jobs que falharam',
+        )
+
+    def handle(self, *args, **options):
+        jobs = DonationBulkReview.objects.exclude(status='completed')
+        if options['job']:
+            jobs = jobs.filter(id=options['job'])
+        elif not options['include_failed']:
+            jobs = jobs.exclude(status='failed')
+
+        for job_id in jobs.order_by('created_at').values_list('id', flat=True):
+            job = run_bulk_review(job_id)
+            style = self.style.SUCCESS if job.status == 'completed' else self.style.ERROR
+            self.stdout.write(style(f'{job}'))
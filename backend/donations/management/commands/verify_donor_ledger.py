@@ -0,0 +1,44 @@
+# backend/donations/management/commands/verify_donor_ledger.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from donations.ledger import diff_donor_ledgers, rebuild_donor_ledgers, sync_core_donors
+from donations.models import DonorLedger
+
+
+class Command(BaseCommand):
+    help = 'Compara o livro-razão dos doadores com o agregado completo das doações (executar diariamente)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Reconstrói os livros-razão divergentes e reespelha todos em core.Donor',
+        )
+        parser.add_argument(
+            '--show',
+            type=int,
+            default=20,
+            help='Número máximo de divergências exibidas (padrão: 20)',
+        )
+
+    def handle(self, *args, **options):
+        differences = diff_donor_ledgers()
+
+        for donor_id, (expected, recorded) in list(differences.items())[:options['show']]:
+            self.stdout.write(
+                f'Doador {donor_id}: esperado total={expected[0]} qtd={expected[1]} '
+                f'({expected[2]} – {expected[3]}), gravado total={recorded[0]} qtd={recorded[1]} '
+                f'({recorded[2]} – {recorded[3]})'
+            )
+
+        if not differences:
+            self.stdout.write(self.style.SUCCESS('Livro-razão consistente com as doações'))
+        elif not options['fix']:
+            self.stdout.write(self.style.WARNING(f'{len(differences)} doadores com divergências (use --fix)'))
+
+        if options['fix']:
+            with transaction.atomic():
+                if differences:
+                    rebuild_donor_ledgers(differences.keys())
+                sync_core_donors(DonorLedger.objects.all())
+            self.stdout.write(self.style.SUCCESS(f'{len(differences)} livros-razão reconstruídos'))
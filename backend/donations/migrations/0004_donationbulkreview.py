@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:28
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('donations', '0003_alter_donation_payment_proof'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DonationBulkReview',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pendente'), ('running', 'Em Execução'), ('completed', 'Concluída'), ('failed', 'Falhou')], default='pending', max_length=20, verbose_name='Status')),
+                ('target_status', models.CharField(choices=[('pending', 'Pendente'), ('submitted', 'Enviada'), ('under_review', 'Em Análise'), ('approved', 'Aprovada'), ('rejected', 'Rejeitada'), ('completed', 'Concluída')], max_length=20, verbose_name='Novo Status das Doações')),
+                ('admin_comment', models.TextField(blank=True, verbose_name='Comentário do Administrador')),
+                ('rejection_reason', models.TextField(blank=True, verbose_name='Motivo da Rejeição')),
+                ('donation_ids', models.JSONField(default=list, verbose_name='Doações')),
+                ('total', models.PositiveIntegerField(default=0, verbose_name='Total')),
+                ('processed', models.PositiveIntegerField(default=0, verbose_name='Processadas')),
+                ('updated_count', models.PositiveIntegerField(default=0, verbose_name='Atualizadas')),
+                ('error', models.TextField(blank=True, verbose_name='Erro')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Concluída em')),
+                ('requested_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='donation_bulk_reviews', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Revisão em Lote de Doações',
+                'verbose_name_plural': 'Revisões em Lote de Doações',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:31
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_donor_ledgers(apps, schema_editor):
+    from django.db.models import Count, Max, Min, Sum
+    from django.db.models.functions import Coalesce
+    Donation = apps.get_model('donations', 'Donation')
+    DonorLedger = apps.get_model('donations', 'DonorLedger')
+    rows = Donation.objects.filter(status='approved').values('donor_id').annotate(
+        total=Sum('amount'),
+        count=Count('id'),
+        first_date=Min(Coalesce('approval_date', 'submission_date')),
+        last_date=Max(Coalesce('approval_date', 'submission_date')),
+    ).order_by()
+    DonorLedger.objects.bulk_create([
+        DonorLedger(
+            donor_id=row['donor_id'],
+            total_approved=row['total'],
+            approved_count=row['count'],
+            first_donation_date=row['first_date'],
+            last_donation_date=row['last_date'],
+        )
+        for row in rows
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('donations', '0004_donationbulkreview'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DonorLedger',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_approved', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Total Aprovado')),
+                ('approved_count', models.PositiveIntegerField(default=0, verbose_name='Doações Aprovadas')),
+                ('first_donation_date', models.DateTimeField(blank=True, null=True, verbose_name='Primeira Doação')),
+                ('last_donation_date', models.DateTimeField(blank=True, null=True, verbose_name='Última Doação')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Livro-Razão do Doador',
+                'verbose_name_plural': 'Livros-Razão dos Doadores',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['donor', 'status'], name='donations_d_donor_i_d5122b_idx'),
+        ),
+        migrations.AddField(
+            model_name='donorledger',
+            name='donor',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='donation_ledger', to=settings.AUTH_USER_MODEL, verbose_name='Doador'),
+        ),
+        migrations.RunPython(populate_donor_ledgers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('donations', '0005_donorledger'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['donor', '-submission_date'], name='donation_donor_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['status', 'payment_method'], include=('amount',), name='donation_status_method_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['submission_date'], include=('amount',), name='donation_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donorledger',
+            index=models.Index(fields=['-total_approved'], name='donor_ledger_total_idx'),
+        ),
+    ]
@@ -1,5 +1,5 @@
 # backend/donations/models.py
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from decimal import Decimal
 
@@ -95,10 +95,39 @@ class Donation(models.Model):
         verbose_name = "Doação"
         verbose_name_plural = "Doações"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['donor', 'status']),
+            models.Index(fields=['donor', '-submission_date'], name='donation_donor_submitted_idx'),
+            # Estatísticas: GROUP BY status/método e baldes de tempo (include = cobertura no PostgreSQL)
+            models.Index(fields=['status', 'payment_method'], include=['amount'], name='donation_status_method_idx'),
+            models.Index(fields=['submission_date'], include=['amount'], name='donation_submitted_idx'),
+        ]
     
     def __str__(self):
         return f"{self.donor.username} - {self.amount} {self.currency} - {self.get_status_display()}"
     
+    LEDGER_FIELDS = ('donor_id', 'status', 'amount', 'approval_date', 'submission_date')
+    
+    def save(self, *args, **kwargs):
+        # Estado anterior lido com lock: o sinal post_save aplica o delta no
+        # livro-razão do doador dentro desta mesma transação
+        with transaction.atomic():
+            self._ledger_previous = None if self._state.adding else self.stored_ledger_state(lock=True)
+            super().save(*args, **kwargs)
+    
+    def ledger_state(self):
+        """Campos que afetam o livro-razão do doador, como gravados no banco"""
+        if any(field not in self.__dict__ for field in self.LEDGER_FIELDS):
+            # Campos adiados (only/defer): ler do banco
+            return self.stored_ledger_state()
+        return tuple(self.__dict__[field] for field in self.LEDGER_FIELDS)
+    
+    def stored_ledger_state(self, lock=False):
+        queryset = Donation.objects.filter(pk=self.pk)
+        if lock:
+            queryset = queryset.select_for_update()
+        return queryset.values_list(*self.LEDGER_FIELDS).first()
+    
     @property
     def formatted_amount(self):
         return f"{self.amount:,.2f} {self.currency}"
@@ -130,3 +159,61 @@ class DonationStats(models.Model):
         verbose_name = "Estatística de Doação"
         verbose_name_plural = "Estatísticas de Doações"
         ordering = ['-date']
+
+class DonationBulkReview(models.Model):
+    """Revisão em lote de doações processada em segundo plano"""
+    STATUS_CHOICES = [
+        ('pending', 'Pendente'),
+        ('running', 'Em Execução'),
+        ('completed', 'Concluída'),
+        ('failed', 'Falhou'),
+    ]
+    
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='donation_bulk_reviews')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name="Status")
+    target_status = models.CharField(max_length=20, choices=Donation.STATUS_CHOICES, verbose_name="Novo Status das Doações")
+    admin_comment = models.TextField(blank=True, verbose_name="Comentário do Administrador")
+    rejection_reason = models.TextField(blank=True, verbose_name="Motivo da Rejeição")
+    donation_ids = models.JSONField(default=list, verbose_name="Doações")
+    total = models.PositiveIntegerField(default=0, verbose_name="Total")
+    processed = models.PositiveIntegerField(default=0, verbose_name="Processadas")
+    updated_count = models.PositiveIntegerField(default=0, verbose_name="Atualizadas")
+    error = models.TextField(blank=True, verbose_name="Erro")
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Concluída em")
+    
+    class Meta:
+        verbose_name = "Revisão em Lote de Doações"
+        verbose_name_plural = "Revisões em Lote de Doações"
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"Revisão em lote #{self.id} ({self.processed}/{self.total}) - {self.get_status_display()}"
+    
+    @property
+    def progress(self):
+        return round(self.processed / self.total * 100, 1) if self.total else 100.0
+
+
+class DonorLedger(models.Model):
+    """Totais de doações aprovadas por doador, mantidos por deltas.
+    
+    Atualizado a cada transição de status (ver ``donations/ledger.py``) e
+    conferido contra o agregado completo por ``verify_donor_ledger``.
+    """
+    donor = models.OneToOneField(User, on_delete=models.CASCADE, related_name='donation_ledger', verbose_name="Doador")
+    total_approved = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name="Total Aprovado")
+    approved_count = models.PositiveIntegerField(default=0, verbose_name="Doações Aprovadas")
+    first_donation_date = models.DateTimeField(null=True, blank=True, verbose_name="Primeira Doação")
+    last_donation_date = models.DateTimeField(null=True, blank=True, verbose_name="Última Doação")
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Livro-Razão do Doador"
+        verbose_name_plural = "Livros-Razão dos Doadores"
+        indexes = [
+            models.Index(fields=['-total_approved'], name='donor_ledger_total_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.donor.username}: {self.total_approved} ({self.approved_count} doações)"
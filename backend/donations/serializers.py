@@ -226,6 +226,17 @@ class DonationUpdateSerializer(serializers.ModelSerializer):
             validated_data['admin_notes'] = validated_data.pop('admin_comment')
         return super().update(instance, validated_data)
 
+class DonationBulkUpdateSerializer(serializers.Serializer):
+    """Payload da atualização em lote: IDs convertidos para int antes de ordenar/deduplicar"""
+    donation_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False)
+    status = serializers.ChoiceField(choices=Donation.STATUS_CHOICES)
+    admin_comment = serializers.CharField(required=False, allow_blank=True, allow_null=True, default='')
+    # rejection_reason é opcional - admin pode rejeitar sem justificativa
+    rejection_reason = serializers.CharField(required=False, allow_blank=True, allow_null=True, default='')
+
+    def validate_donation_ids(self, value):
+        return sorted(set(value))
+
 class DonationStatsSerializer(serializers.ModelSerializer):
     class Meta:
         model = DonationStats
@@ -0,0 +1,130 @@
+# backend/donations/services.py
+"""
+Serviços de doações: revisão em lote.
+
+``review_donations`` aplica uma mudança de status a muitas doações com um
+``UPDATE`` por bloco (sem ``save()`` nem sinais por linha), aplica os deltas
+no livro-razão de cada doador afetado uma única vez e grava as notificações
+com ``bulk_create``. Seleções grandes viram um ``DonationBulkReview``
+processado em segundo plano, com progresso consultável.
+"""
+import threading
+
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from notifications.services import NotificationService
+from .analytics import invalidate_donation_statistics
+from .ledger import LedgerDeltas, apply_ledger_deltas
+from .models import Donation, DonationBulkReview
+
+
+BULK_REVIEW_CHUNK_SIZE = 500
+# Acima deste número de doações a revisão roda em segundo plano
+BULK_REVIEW_SYNC_LIMIT = 1000
+
+
+def _review_chunk(donation_ids, new_status, reviewed_by, admin_comment, rejection_reason):
+    now = timezone.now()
+    with transaction.atomic():
+        donations = list(
+            Donation.objects.select_for_update().filter(id__in=donation_ids).only(
+                'id', 'donor_id', 'status', 'amount', 'currency', 'approval_date', 'submission_date'
+            )
+        )
+        if not donations:
+            return 0
+
+        fields = {
+            'status': new_status,
+            'reviewed_by': reviewed_by,
+            'review_date': now,
+            'admin_notes': admin_comment,
+            'updated_at': now,
+        }
+        if new_status == 'rejected' and rejection_reason:
+            fields['rejection_reason'] = rejection_reason
+        if new_status == 'approved':
+            fields['approval_date'] = now
+
+        updated = Donation.objects.filter(id__in=[d.id for d in donations]).update(**fields)
+
+        # Deltas do livro-razão (entradas/saídas de "approved") aplicados por doador
+        deltas = LedgerDeltas()
+        for d in donations:
+            old_state = d.ledger_state()
+            deltas.transition(old_state, (
+                d.donor_id, new_status, d.amount, fields.get('approval_date', d.approval_date), d.submission_date
+            ))
+        apply_ledger_deltas(deltas)
+
+        changes = [(d, d.status) for d in donations if d.status != new_status]
+        NotificationService.notify_donations_status_changed(changes, new_status, reviewed_by)
+        transaction.on_commit(invalidate_donation_statistics)
+
+    return updated
+
+
+def review_donations(donation_ids, new_status, reviewed_by, admin_comment='',
+                     rejection_reason='', on_progress=None):
+    """Aplica a revisão em blocos; retorna o número de doações atualizadas.
+
+    ``on_progress(processadas, atualizadas)`` é chamado ao fim de cada bloco.
+    """
+    donation_ids = sorted(set(donation_ids))
+    updated = 0
+    for start in range(0, len(donation_ids), BULK_REVIEW_CHUNK_SIZE):
+        chunk = donation_ids[start:start + BULK_REVIEW_CHUNK_SIZE]
+        updated += _review_chunk(chunk, new_status, reviewed_by, admin_comment, rejection_reason)
+        if on_progress:
+            on_progress(start + len(chunk), updated)
+    return updated
+
+
+def run_bulk_review(job_id):
+    """Processa um ``DonationBulkReview`` retomando do último bloco concluído"""
+    job = DonationBulkReview.objects.select_related('requested_by').get(pk=job_id)
+    if job.status == 'completed':
+        return job
+
+    DonationBulkReview.objects.filter(pk=job.pk).update(status='running', error='')
+    already_processed = job.processed
+    already_updated = job.updated_count
+
+    def on_progress(processed, updated):
+        DonationBulkReview.objects.filter(pk=job.pk).update(
+            processed=already_processed + processed,
+            updated_count=already_updated + updated,
+        )
+
+    remaining = sorted(set(job.donation_ids))[already_processed:]
+    try:
+        review_donations(
+            remaining, job.target_status, job.requested_by,
+            job.admin_comment, job.rejection_reason, on_progress=on_progress
+        )
+    except Exception as e:
+        DonationBulkReview.objects.filter(pk=job.pk).update(status='failed', error=str(e))
+    else:
+        DonationBulkReview.objects.filter(pk=job.pk).update(
+            status='completed', finished_at=timezone.now()
+        )
+    job.refresh_from_db()
+    return job
+
+
+def _run_bulk_review_in_thread(job_id):
+    close_old_connections()
+    try:
+        run_bulk_review(job_id)
+    finally:
+        connection.close()
+
+
+def start_bulk_review(job):
+    """Dispara o processamento em segundo plano após o commit do job"""
+    transaction.on_commit(
+        lambda: threading.Thread(
+            target=_run_bulk_review_in_thread, args=(job.pk,), daemon=True
+        ).start()
+    )
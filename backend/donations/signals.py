@@ -1,62 +1,42 @@
 # backend/donations/signals.py
-from django.db.models.signals import post_save, post_delete
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_save, pre_delete, post_delete
 from django.dispatch import receiver
-from django.db.models import Sum, Count
 from .models import Donation
+from .analytics import invalidate_donation_statistics
+from .ledger import LedgerDeltas, apply_ledger_deltas
+
 
 @receiver(post_save, sender=Donation)
-def update_donor_stats_on_donation_change(sender, instance, **kwargs):
-    """Atualizar estatísticas quando uma doação é modificada"""
-    # Só atualizar se a doação foi aprovada ou rejeitada
-    if instance.status in ['approved', 'rejected']:
-        update_donor_stats(instance.donor)
+def update_donor_ledger_on_donation_change(sender, instance, created, **kwargs):
+    """Aplicar no livro-razão do doador o delta da mudança de status/valor"""
+    deltas = LedgerDeltas()
+    deltas.transition(getattr(instance, '_ledger_previous', None), instance.ledger_state())
+    apply_ledger_deltas(deltas)
+
+
+@receiver(pre_delete, sender=Donation)
+def capture_donation_ledger_state(sender, instance, **kwargs):
+    """Guardar o estado gravado (com lock) antes da exclusão"""
+    instance._ledger_previous = instance.stored_ledger_state(lock=True)
+
 
 @receiver(post_delete, sender=Donation)
-def update_donor_stats_on_donation_delete(sender, instance, **kwargs):
-    """Atualizar estatísticas quando uma doação é deletada"""
-    update_donor_stats(instance.donor)
-
-def update_donor_stats(user):
-    """Atualizar estatísticas de um doador específico"""
-    try:
-        from core.models import Donor as CoreDonor
-        from datetime import datetime
-        
-        # Buscar ou criar perfil de doador no core
-        core_donor, created = CoreDonor.objects.get_or_create(
-            user_profile__user=user,
-            defaults={
-                'user_profile_id': getattr(user, 'client_profile', None) and user.client_profile.id
-            }
-        )
-        
-        # Calcular estatísticas atualizadas
-        approved_donations = Donation.objects.filter(
-            donor=user, 
-            status='approved'
-        )
-        
-        stats = approved_donations.aggregate(
-            total=Sum('amount'),
-            count=Count('id')
-        )
-        
-        # Atualizar o perfil do doador
-        core_donor.total_donated = stats['total'] or 0
-        
-        # Atualizar datas de primeira e última doação
-        first_donation = approved_donations.order_by('approval_date').first()
-        last_donation = approved_donations.order_by('-approval_date').first()
-        
-        if first_donation:
-            core_donor.first_donation_date = first_donation.approval_date or first_donation.submission_date
-        
-        if last_donation:
-            core_donor.last_donation_date = last_donation.approval_date or last_donation.submission_date
-            
-        core_donor.save()
-        
-        print(f"✅ Estatísticas atualizadas para {user.username}: Total={core_donor.total_donated}, Count={stats['count']}")
-        
-    except Exception as e:
-        print(f"❌ Erro ao atualizar estatísticas do doador {user.username}: {e}")
+def update_donor_ledger_on_donation_delete(sender, instance, **kwargs):
+    """Retirar do livro-razão uma doação aprovada que foi excluída"""
+    origin = kwargs.get('origin')
+    if getattr(origin, 'model', type(origin)) is User:
+        # Doador excluído: o livro-razão é removido em cascata
+        return
+    
+    deltas = LedgerDeltas()
+    deltas.transition(getattr(instance, '_ledger_previous', None), None)
+    apply_ledger_deltas(deltas)
+
+
+@receiver(post_save, sender=Donation)
+@receiver(post_delete, sender=Donation)
+def invalidate_statistics_on_donation_change(sender, **kwargs):
+    """Doação criada, alterada ou excluída: estatísticas administrativas desatualizadas"""
+    transaction.on_commit(invalidate_donation_statistics)
@@ -16,6 +16,7 @@ urlpatterns = [
     
     # Admin
     path('bulk-update/', views.bulk_update_donations, name='bulk-update'),
+    path('bulk-update/<int:job_id>/', views.bulk_update_status, name='bulk-update-status'),
     
     # Métodos de doação
     path('methods/', views.DonationMethodListView.as_view(), name='methods'),
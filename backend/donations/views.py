@@ -5,14 +5,17 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q, Sum, Count
+from django.urls import reverse
 from django.utils import timezone
 from datetime import datetime, timedelta
 
-from .models import Donation, DonationComment, DonationMethod, DonationStats
+from .models import Donation, DonationBulkReview, DonationComment, DonationMethod, DonationStats
+from .analytics import donor_statistics, get_donation_statistics
+from .services import BULK_REVIEW_SYNC_LIMIT, review_donations, start_bulk_review
 from .serializers import (
     DonationSerializer, DonationCreateSerializer, DonationUpdateSerializer,
     DonationCommentSerializer, DonationMethodSerializer, DonationStatsSerializer,
-    GuestDonationCreateSerializer
+    GuestDonationCreateSerializer, DonationBulkUpdateSerializer
 )
 from notifications.services import NotificationService
 
@@ -170,135 +173,92 @@ def donation_statistics(request):
     """Estatísticas de doações"""
     if not request.user.is_staff:
         # Estatísticas do doador
-        user_stats = {
-            'total_donations': Donation.objects.filter(donor=request.user, status='approved').aggregate(
-                total=Sum('amount')
-            )['total'] or 0,
-            'donation_count': Donation.objects.filter(donor=request.user, status='approved').count(),
-            'pending_count': Donation.objects.filter(donor=request.user, status__in=['pending', 'submitted', 'under_review']).count(),
-            'last_donation': None
-        }
-        
-        last_donation = Donation.objects.filter(donor=request.user).order_by('-submission_date').first()
-        if last_donation:
-            user_stats['last_donation'] = DonationSerializer(last_donation).data
+        user_stats = donor_statistics(request.user)
+        if user_stats['last_donation']:
+            user_stats['last_donation'] = DonationSerializer(user_stats['last_donation']).data
         
         return Response(user_stats)
     
-    # Estatísticas do admin
-    today = timezone.now().date()
-    this_month = today.replace(day=1)
-    last_30_days = today - timedelta(days=30)
-    
-    total_stats = Donation.objects.aggregate(
-        total_amount=Sum('amount'),
-        total_count=Count('id'),
-        approved_amount=Sum('amount', filter=Q(status='approved')),
-        approved_count=Count('id', filter=Q(status='approved'))
-    )
-    
-    monthly_stats = Donation.objects.filter(
-        submission_date__gte=this_month
-    ).aggregate(
-        monthly_amount=Sum('amount'),
-        monthly_count=Count('id')
-    )
-    
-    recent_stats = Donation.objects.filter(
-        submission_date__gte=last_30_days
-    ).aggregate(
-        recent_amount=Sum('amount'),
-        recent_count=Count('id')
-    )
-    
-    pending_stats = Donation.objects.filter(
-        status__in=['pending', 'submitted', 'under_review']
-    ).aggregate(
-        pending_amount=Sum('amount'),
-        pending_count=Count('id')
-    )
-    
-    # Doações por método de pagamento
-    payment_methods = Donation.objects.filter(status='approved').values(
-        'payment_method'
-    ).annotate(
-        count=Count('id'),
-        total=Sum('amount')
-    ).order_by('-total')
-    
-    # Top doadores
-    top_donors = Donation.objects.filter(
-        status='approved'
-    ).values(
-        'donor__username', 'donor__first_name', 'donor__last_name'
-    ).annotate(
-        total_amount=Sum('amount'),
-        donation_count=Count('id')
-    ).order_by('-total_amount')[:10]
-    
-    return Response({
-        'total': total_stats,
-        'monthly': monthly_stats,
-        'recent': recent_stats,
-        'pending': pending_stats,
-        'payment_methods': payment_methods,
-        'top_donors': top_donors,
-        'summary': {
-            'total_raised': total_stats['approved_amount'] or 0,
-            'total_donors': Donation.objects.filter(status='approved').values('donor').distinct().count(),
-            'average_donation': (total_stats['approved_amount'] or 0) / max(total_stats['approved_count'] or 1, 1),
-            'pending_review': pending_stats['pending_count'] or 0
-        }
-    })
+    # Estatísticas do admin (serviço com cache, ver donations/analytics.py)
+    return Response(get_donation_statistics())
 
 @api_view(['POST'])
 @permission_classes([IsAdminUser])
 def bulk_update_donations(request):
-    """Atualização em lote de doações"""
-    donation_ids = request.data.get('donation_ids', [])
-    new_status = request.data.get('status')
-    admin_comment = request.data.get('admin_comment', '')
-    rejection_reason = request.data.get('rejection_reason', '')
+    """Atualização em lote de doações.
     
-    if not donation_ids or not new_status:
+    Seleções pequenas são processadas na hora (um UPDATE por bloco); acima de
+    ``BULK_REVIEW_SYNC_LIMIT`` doações a revisão roda em segundo plano e a
+    resposta traz o job para acompanhar o progresso.
+    """
+    if not request.data.get('donation_ids') or not request.data.get('status'):
         return Response({'error': 'IDs de doação e status são obrigatórios'}, status=status.HTTP_400_BAD_REQUEST)
     
-    # rejection_reason é opcional - removida a validação obrigatória
+    # IDs vêm do JSON como int ou str: o serializer converte antes de deduplicar e ordenar
+    serializer = DonationBulkUpdateSerializer(data=request.data)
+    if not serializer.is_valid():
+        errors = serializer.errors
+        message = (
+            'Status inválido' if 'status' in errors
+            else 'IDs de doação inválidos' if 'donation_ids' in errors
+            else 'Dados inválidos'
+        )
+        return Response({'error': message, 'details': errors}, status=status.HTTP_400_BAD_REQUEST)
     
-    # Buscar doações antes da atualização para capturar status anterior
-    donations = Donation.objects.filter(id__in=donation_ids)
+    donation_ids = serializer.validated_data['donation_ids']
+    new_status = serializer.validated_data['status']
+    admin_comment = serializer.validated_data['admin_comment'] or ''
+    rejection_reason = serializer.validated_data['rejection_reason'] or ''
     
-    updated_count = 0
-    for donation in donations:
-        old_status = donation.status
-        donation.status = new_status
-        donation.reviewed_by = request.user
-        donation.review_date = timezone.now()
-        donation.admin_notes = admin_comment
-        
-        # Adicionar rejection_reason se fornecido
-        if new_status == 'rejected' and rejection_reason:
-            donation.rejection_reason = rejection_reason
-            
-        # Definir approval_date se aprovado
-        if new_status == 'approved':
-            donation.approval_date = timezone.now()
-            
-        donation.save()
-        
-        # Disparar notificações para mudança de status
-        if old_status != new_status:
-            NotificationService.notify_donation_status_changed(
-                donation, old_status, new_status, request.user
-            )
-        
-        updated_count += 1
+    if len(donation_ids) > BULK_REVIEW_SYNC_LIMIT:
+        job = DonationBulkReview.objects.create(
+            requested_by=request.user,
+            target_status=new_status,
+            admin_comment=admin_comment,
+            rejection_reason=rejection_reason,
+            donation_ids=donation_ids,
+            total=len(donation_ids),
+        )
+        start_bulk_review(job)
+        return Response(
+            _bulk_review_payload(job, request),
+            status=status.HTTP_202_ACCEPTED
+        )
+    
+    updated_count = review_donations(
+        donation_ids, new_status, request.user, admin_comment, rejection_reason
+    )
     
     return Response({
         'message': f'{updated_count} doações atualizadas',
         'updated_count': updated_count
     })
 
+def _bulk_review_payload(job, request):
+    return {
+        'job_id': job.id,
+        'status': job.status,
+        'total': job.total,
+        'processed': job.processed,
+        'updated_count': job.updated_count,
+        'progress': job.progress,
+        'error': job.error,
+        'status_url': request.build_absolute_uri(
+            reverse('donations:bulk-update-status', args=[job.id])
+        ),
+    }
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def bulk_update_status(request, job_id):
+    """Progresso de uma atualização em lote em segundo plano"""
+    try:
+        job = DonationBulkReview.objects.get(id=job_id)
+    except DonationBulkReview.DoesNotExist:
+        return Response({'error': 'Atualização em lote não encontrada'}, status=status.HTTP_404_NOT_FOUND)
+    
+    return Response(_bulk_review_payload(job, request))
+
 class DonationMethodListView(generics.ListAPIView):
     """Lista métodos de doação disponíveis - endpoint público"""
     queryset = DonationMethod.objects.filter(is_active=True)
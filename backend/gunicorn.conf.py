@@ -2,14 +2,23 @@
 # File: gunicorn.conf.py
 
 import multiprocessing
+import os
 
 # Server socket
 bind = "0.0.0.0:8000"
 backlog = 2048
 
 # Worker processes
-workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = "sync"
+# WEB_CONCURRENCY permite ajustar ao max_connections do banco (ver core/checks.py)
+# (e é exportado para os workers: core.shared_cache e core.checks contam com ele)
+workers = int(os.environ.setdefault('WEB_CONCURRENCY', str(multiprocessing.cpu_count() * 2 + 1)))
+# API_SERVER=asgi: workers uvicorn servindo moz_solidaria_api.asgi:application
+# (views assíncronas nas leituras quentes); padrão: workers sync com a app WSGI
+if os.environ.get('API_SERVER') == 'asgi':
+    worker_class = "uvicorn.workers.UvicornWorker"
+    wsgi_app = "moz_solidaria_api.asgi:application"
+else:
+    worker_class = "sync"
 worker_connections = 1000
 timeout = 120
 keepalive = 2
@@ -38,3 +47,22 @@ access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s"
 limit_request_line = 4094
 limit_request_fields = 100
 limit_request_field_size = 8190
+
+
+# Autoverificação do banco em cada worker: conectividade, latência e
+# max_connections x workers (mesmas verificações de `manage.py check --database default`).
+# Com mais de um worker e cache por processo (core.E003) o worker não sobe: os
+# limites de login e a invalidação de permissões valeriam só dentro de cada processo.
+def post_worker_init(worker):
+    from django.core.checks import Tags, run_checks
+
+    for message in run_checks(tags=[Tags.database], databases=['default']):
+        log = worker.log.error if message.is_serious() else worker.log.warning
+        log(str(message))
+
+    cache_errors = [message for message in run_checks(tags=[Tags.caches]) if message.is_serious()]
+    for message in cache_errors:
+        worker.log.error(str(message))
+    if cache_errors:
+        # Código de erro de boot: o arbiter do gunicorn para em vez de recriar o worker
+        raise SystemExit(3)
@@ -3,20 +3,27 @@ ASGI config for moz_solidaria_api project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve os websockets (Channels) e, com API_SERVER=asgi, também a API HTTP:
+    API_SERVER=asgi gunicorn -c gunicorn.conf.py moz_solidaria_api.asgi:application
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
 
 import os
 from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'moz_solidaria_api.settings')
+
+# Inicializa o Django antes de importar rotas/consumers que carregam modelos
+django_asgi_app = get_asgi_application()
+
 from channels.routing import ProtocolTypeRouter, URLRouter
 from channels.auth import AuthMiddlewareStack
 from client_area.routing import websocket_urlpatterns
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'moz_solidaria_api.settings')
-
 application = ProtocolTypeRouter({
-    "http": get_asgi_application(),
+    "http": django_asgi_app,
     "websocket": AuthMiddlewareStack(
         URLRouter(
             websocket_urlpatterns
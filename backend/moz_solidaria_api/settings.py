@@ -74,6 +74,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Primeiro da lista para medir a pilha inteira (inclusive os outros middlewares)
+    'core.middleware.PerformanceMetricsMiddleware',
+    'core.middleware.QueryInspectorMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -103,6 +106,32 @@ CHANNEL_LAYERS = {
     },
 }
 
+# Cache: Redis (django-redis) quando REDIS_URL está definido. Limite de login,
+# cache de permissões, atividade de credenciais e métricas precisam de um cache
+# compartilhado entre os workers; o LocMem é por processo e só serve ao
+# desenvolvimento com um processo (core.E003 o recusa no `check --deploy` e com
+# mais de um worker).
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'moz_solidaria',
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+                'SOCKET_CONNECT_TIMEOUT': 5,
+                'SOCKET_TIMEOUT': 5,
+            },
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        },
+    }
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -121,6 +150,13 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'moz_solidaria_api.wsgi.application'
 
+# Modo de execução da API: 'wsgi' (gunicorn com workers sync) ou 'asgi'
+# (gunicorn com workers uvicorn, ver gunicorn.conf.py). No modo ASGI as
+# leituras mais acessadas (posts do blog, projetos públicos, estatísticas de
+# notificações) usam as views assíncronas de core.async_views.
+API_SERVER = config('API_SERVER', default='wsgi')
+ASYNC_READ_VIEWS = config('ASYNC_READ_VIEWS', default=API_SERVER == 'asgi', cast=bool)
+
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
@@ -129,10 +165,31 @@ WSGI_APPLICATION = 'moz_solidaria_api.wsgi.application'
 DATABASES = {
     'default': dj_database_url.config(
         default=config('DATABASE_URL', 
-                      default='postgresql://adamoabdala:Jeison2@@localhost:5432/moz_solidaria_db')
+                      default='postgresql://adamoabdala:Jeison2@@localhost:5432/moz_solidaria_db'),
+        # Conexões persistentes: cada worker reaproveita a conexão entre requisições
+        # por até DB_CONN_MAX_AGE segundos (0 = abrir e fechar por requisição). No ASGI cada requisição
+        # roda o ORM em uma thread própria, então conexões persistentes não são reaproveitadas
+        # e só acumulam: lá o reaproveitamento fica a cargo do pool (DB_POOLER)
+        conn_max_age=config('DB_CONN_MAX_AGE', default=0 if API_SERVER == 'asgi' else 600, cast=int),
+        # Testa a conexão reaproveitada no início de cada requisição (evita erro após restart do banco)
+        conn_health_checks=config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
     )
 }
 
+# Pooling no servidor (PgBouncer em modo transaction): cursores do lado do servidor
+# (usados por .iterator()) não sobrevivem à troca de conexão entre transações
+DB_POOLER = config('DB_POOLER', default='')  # '' ou 'pgbouncer'
+if DB_POOLER == 'pgbouncer':
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    DATABASES['default'].setdefault('OPTIONS', {})
+    DATABASES['default']['OPTIONS']['connect_timeout'] = config('DB_CONNECT_TIMEOUT', default=5, cast=int)
+    # Parâmetros de sessão não passam pelo PgBouncer; nesse caso configurar no próprio pool
+    statement_timeout_ms = config('DB_STATEMENT_TIMEOUT_MS', default=0, cast=int)
+    if statement_timeout_ms and DB_POOLER != 'pgbouncer':
+        DATABASES['default']['OPTIONS']['options'] = f'-c statement_timeout={statement_timeout_ms}'
+
 # Alternative direct configuration for DigitalOcean
 # DATABASES = {
 #     'default': {
@@ -258,7 +315,12 @@ CORS_ALLOW_ALL_ORIGINS = DEBUG  # Only in development
 # Configurações de segurança e sessão
 SESSION_COOKIE_AGE = 8 * 60 * 60  # 8 horas
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
-SESSION_SAVE_EVERY_REQUEST = True
+# A sessão só é salva quando muda: a última atividade (core.session_activity) é
+# regravada no máximo a cada UPDATE_GRANULARITY_SECONDS, o que também renova a validade
+SESSION_SAVE_EVERY_REQUEST = False
+# 'django.contrib.sessions.backends.cached_db' (ou 'cache') tira as leituras e
+# gravações de sessão do banco; exige um cache compartilhado entre os workers
+SESSION_ENGINE = config('SESSION_ENGINE', default='django.contrib.sessions.backends.db')
 
 # Configurações de cookies seguros (desabilitado em desenvolvimento)
 if not DEBUG:
@@ -290,6 +352,63 @@ RBAC_SETTINGS = {
     ],
 }
 
+# Expiração por inatividade (core.session_activity): sessões e credenciais de API.
+# A das credenciais (Token/JWT) exige CACHE_ALIAS compartilhado entre os workers.
+# Um token DRF inativo recebe 401 até o próximo login; REVOKE_INACTIVE_TOKENS
+# (desligado por padrão) apaga o registro do token em vez disso.
+SESSION_ACTIVITY = {
+    'TIMEOUT_SECONDS': RBAC_SETTINGS['SESSION_TIMEOUT_HOURS'] * 60 * 60,
+    'UPDATE_GRANULARITY_SECONDS': config('SESSION_ACTIVITY_GRANULARITY', default=300, cast=int),
+    'CACHE_ALIAS': 'default',
+    'REVOKE_INACTIVE_TOKENS': config('SESSION_REVOKE_INACTIVE_TOKENS', default=False, cast=bool),
+}
+
+# Limite de tentativas de login (core.login_throttle): contadores de janela
+# deslizante no cache por usuário+IP, usuário e IP. CACHE_ALIAS deve ser
+# compartilhado entre os workers para o limite valer no conjunto (core.E003).
+LOGIN_THROTTLE = {
+    'CACHE_ALIAS': 'default',
+    'WINDOW_SECONDS': RBAC_SETTINGS['LOCKOUT_TIME_MINUTES'] * 60,
+    'LIMITS': {
+        'user_ip': RBAC_SETTINGS['MAX_LOGIN_ATTEMPTS'],
+        'user': config('LOGIN_THROTTLE_USER_LIMIT', default=20, cast=int),
+        'ip': config('LOGIN_THROTTLE_IP_LIMIT', default=50, cast=int),
+    },
+    'LOGIN_PATHS': [
+        '/api/v1/client-area/auth/login/',
+        '/api/v1/auth/token/',
+        '/api/auth/login/',
+    ],
+    # Auditoria (LoginAttempt) gravada em lote por uma thread em segundo plano
+    'AUDIT_ASYNC': True,
+    'AUDIT_BATCH_SIZE': 100,
+    'AUDIT_FLUSH_INTERVAL': 5,
+    'AUDIT_RETENTION_DAYS': config('LOGIN_ATTEMPT_RETENTION_DAYS', default=90, cast=int),
+}
+
+# Métricas de desempenho por endpoint (core.perf_metrics)
+# CACHE_ALIAS deve ser um cache compartilhado entre os workers (core.E003)
+PERF_METRICS = {
+    'ENABLED': config('PERF_METRICS_ENABLED', default=True, cast=bool),
+    'CACHE_ALIAS': 'default',
+    'FLUSH_INTERVAL': 10,  # segundos entre publicações do snapshot de cada worker
+    'WINDOW_SECONDS': 60,
+    'WINDOWS': 15,  # janela recente = 15 minutos
+    'SLOW_REQUEST_MS': config('PERF_SLOW_REQUEST_MS', default=1000, cast=int),
+    'PROFILE_SLOW_REQUESTS': config('PERF_PROFILE_SLOW_REQUESTS', default=False, cast=bool),
+    'PROFILE_SAMPLE_RATE': config('PERF_PROFILE_SAMPLE_RATE', default=0.1, cast=float),
+    'PROFILE_INTERVAL_MS': 5,
+    'PROFILE_DIR': None,  # padrão: logs/profiles
+}
+
+# Detector de N+1 e consultas lentas (core.query_inspector); ligado por padrão só em DEBUG
+QUERY_INSPECTOR = {
+    'ENABLED': config('QUERY_INSPECTOR_ENABLED', default=DEBUG, cast=bool),
+    'REPEAT_THRESHOLD': config('QUERY_INSPECTOR_REPEAT_THRESHOLD', default=5, cast=int),
+    'SLOW_QUERY_MS': config('QUERY_INSPECTOR_SLOW_QUERY_MS', default=100, cast=int),
+    'RESPONSE_HEADERS': True,  # cabeçalhos X-Query-* (apenas com DEBUG)
+}
+
 # Configuração de logging para RBAC
 import os
 
@@ -28,18 +28,7 @@ class NotificationService:
             preferences = NotificationPreference.objects.create(user=recipient)
         
         # Verificar se o usuário quer receber este tipo de notificação
-        should_notify = True
-        
-        if notification_type in ['donation_status_changed', 'donation_approved', 'donation_rejected']:
-            should_notify = preferences.notify_donation_status_change
-        elif notification_type in ['donation_comment_added', 'admin_comment', 'donor_comment']:
-            should_notify = preferences.notify_donation_comments
-        elif notification_type == 'payment_verified':
-            should_notify = preferences.notify_payment_verification
-        elif notification_type == 'donation_created' and recipient.is_staff:
-            should_notify = preferences.notify_new_donations
-        
-        if not should_notify:
+        if not NotificationService.should_notify(preferences, notification_type, recipient.is_staff):
             return None
         
         notification = Notification.objects.create(
@@ -57,6 +46,54 @@ class NotificationService:
         
         return notification
     
+    @staticmethod
+    def should_notify(preferences, notification_type, recipient_is_staff=False):
+        """Verifica se as preferências permitem este tipo de notificação"""
+        if notification_type in ['donation_status_changed', 'donation_approved', 'donation_rejected']:
+            return preferences.notify_donation_status_change
+        if notification_type in ['donation_comment_added', 'admin_comment', 'donor_comment']:
+            return preferences.notify_donation_comments
+        if notification_type == 'payment_verified':
+            return preferences.notify_payment_verification
+        if notification_type == 'donation_created' and recipient_is_staff:
+            return preferences.notify_new_donations
+        return True
+    
+    @staticmethod
+    def create_notifications_bulk(entries):
+        """Cria várias notificações de uma vez.
+        
+        ``entries`` é uma lista de ``(recipient_id, campos)`` com os mesmos campos
+        de ``create_notification``. As preferências são carregadas numa consulta
+        e as notificações gravadas com ``bulk_create``.
+        """
+        recipient_ids = {recipient_id for recipient_id, _fields in entries}
+        preferences = NotificationPreference.objects.in_bulk(recipient_ids, field_name='user_id')
+        missing = recipient_ids - preferences.keys()
+        if missing:
+            NotificationPreference.objects.bulk_create(
+                [NotificationPreference(user_id=user_id) for user_id in missing],
+                ignore_conflicts=True
+            )
+            preferences.update(
+                NotificationPreference.objects.in_bulk(missing, field_name='user_id')
+            )
+        
+        staff_ids = set(
+            User.objects.filter(id__in=recipient_ids, is_staff=True).values_list('id', flat=True)
+        )
+        notifications = []
+        for recipient_id, fields in entries:
+            if not NotificationService.should_notify(
+                preferences[recipient_id], fields['notification_type'], recipient_id in staff_ids
+            ):
+                continue
+            fields = dict(fields)
+            fields['metadata'] = fields.get('metadata') or {}
+            notifications.append(Notification(recipient_id=recipient_id, **fields))
+        
+        return Notification.objects.bulk_create(notifications, batch_size=500)
+    
     @staticmethod
     def notify_donation_created(donation):
         """Notifica sobre nova doação criada"""
@@ -106,8 +143,8 @@ class NotificationService:
             )
     
     @staticmethod
-    def notify_donation_status_changed(donation, old_status, new_status, changed_by=None):
-        """Notifica sobre mudança de status da doação"""
+    def donation_status_notifications(donation, old_status, new_status, changed_by=None):
+        """Campos das notificações de mudança de status (sem o destinatário)"""
         
         status_messages = {
             'submitted': 'foi submetida para análise',
@@ -122,46 +159,67 @@ class NotificationService:
         # Determinar prioridade baseada no status
         priority = 'high' if new_status in ['approved', 'rejected'] else 'normal'
         
-        # Notificar doador
-        NotificationService.create_notification(
-            recipient=donation.donor,
-            title="Status da Doação Atualizado",
-            message=f"Sua doação de {donation.formatted_amount} {status_message}.",
-            notification_type='donation_status_changed',
-            priority=priority,
-            related_donation_id=donation.id,
-            action_url=f"/dashboard/donations/{donation.id}",
-            action_text="Ver Detalhes",
-            metadata={
+        notifications = [{
+            'title': "Status da Doação Atualizado",
+            'message': f"Sua doação de {donation.formatted_amount} {status_message}.",
+            'notification_type': 'donation_status_changed',
+            'priority': priority,
+            'related_donation_id': donation.id,
+            'action_url': f"/dashboard/donations/{donation.id}",
+            'action_text': "Ver Detalhes",
+            'metadata': {
                 'old_status': old_status,
                 'new_status': new_status,
                 'changed_by': changed_by.username if changed_by else None
             }
-        )
+        }]
         
         # Se aprovada ou rejeitada, notificar com tipo específico
         if new_status == 'approved':
-            NotificationService.create_notification(
-                recipient=donation.donor,
-                title="🎉 Doação Aprovada!",
-                message=f"Parabéns! Sua doação de {donation.formatted_amount} foi aprovada. Obrigado pela sua generosidade!",
-                notification_type='donation_approved',
-                priority='high',
-                related_donation_id=donation.id,
-                action_url=f"/dashboard/donations/{donation.id}",
-                action_text="Ver Certificado"
-            )
+            notifications.append({
+                'title': "🎉 Doação Aprovada!",
+                'message': f"Parabéns! Sua doação de {donation.formatted_amount} foi aprovada. Obrigado pela sua generosidade!",
+                'notification_type': 'donation_approved',
+                'priority': 'high',
+                'related_donation_id': donation.id,
+                'action_url': f"/dashboard/donations/{donation.id}",
+                'action_text': "Ver Certificado"
+            })
         elif new_status == 'rejected':
-            NotificationService.create_notification(
-                recipient=donation.donor,
-                title="Doação Necessita Revisão",
-                message=f"Sua doação de {donation.formatted_amount} necessita de alguns ajustes. Verifique os comentários.",
-                notification_type='donation_rejected',
-                priority='high',
-                related_donation_id=donation.id,
-                action_url=f"/dashboard/donations/{donation.id}",
-                action_text="Ver Motivo"
-            )
+            notifications.append({
+                'title': "Doação Necessita Revisão",
+                'message': f"Sua doação de {donation.formatted_amount} necessita de alguns ajustes. Verifique os comentários.",
+                'notification_type': 'donation_rejected',
+                'priority': 'high',
+                'related_donation_id': donation.id,
+                'action_url': f"/dashboard/donations/{donation.id}",
+                'action_text': "Ver Motivo"
+            })
+        
+        return notifications
+    
+    @staticmethod
+    def notify_donation_status_changed(donation, old_status, new_status, changed_by=None):
+        """Notifica sobre mudança de status da doação"""
+        
+        for fields in NotificationService.donation_status_notifications(
+            donation, old_status, new_status, changed_by
+        ):
+            NotificationService.create_notification(recipient=donation.donor, **fields)
+    
+    @staticmethod
+    def notify_donations_status_changed(changes, new_status, changed_by=None):
+        """Versão em lote: ``changes`` é uma lista de ``(doação, status_anterior)``"""
+        
+        entries = []
+        for donation, old_status in changes:
+            for fields in NotificationService.donation_status_notifications(
+                donation, old_status, new_status, changed_by
+            ):
+                entries.append((donation.donor_id, fields))
+        
+        if entries:
+            NotificationService.create_notifications_bulk(entries)
     
     @staticmethod
     def notify_comment_added(comment):
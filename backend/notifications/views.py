@@ -1,8 +1,11 @@
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.db.models import Count, Q
+
+from core.async_views import AsyncReadMixin
 from .models import Notification, NotificationPreference
 from .serializers import (
     NotificationSerializer, 
@@ -115,33 +118,50 @@ def bulk_action_notifications(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-@api_view(['GET'])
-@permission_classes([permissions.IsAuthenticated])
-def notification_stats(request):
-    """Estatísticas das notificações do usuário"""
-    
-    user = request.user
-    
-    total = Notification.objects.filter(recipient=user).count()
-    unread = Notification.objects.filter(recipient=user, is_read=False).count()
-    
-    by_type = {}
-    for notification in Notification.objects.filter(recipient=user).values('notification_type'):
-        type_name = notification['notification_type']
-        by_type[type_name] = by_type.get(type_name, 0) + 1
+def _stats_querysets(user):
+    """Contagens por tipo e por prioridade/lida, agrupadas no banco"""
+    notifications = Notification.objects.filter(recipient=user).order_by()
+    return (
+        notifications.values('notification_type').annotate(total=Count('id')),
+        notifications.values('priority', 'is_read').annotate(total=Count('id')),
+    )
+
+
+def _stats_data(by_type_rows, by_priority_rows):
+    by_type = {row['notification_type']: row['total'] for row in by_type_rows}
     
     by_priority = {}
-    for notification in Notification.objects.filter(recipient=user).values('priority'):
-        priority = notification['priority']
-        by_priority[priority] = by_priority.get(priority, 0) + 1
-    
-    return Response({
+    total = unread = 0
+    for row in by_priority_rows:
+        by_priority[row['priority']] = by_priority.get(row['priority'], 0) + row['total']
+        total += row['total']
+        if not row['is_read']:
+            unread += row['total']
+    
+    return {
         'total': total,
         'unread': unread,
         'read': total - unread,
         'by_type': by_type,
         'by_priority': by_priority
-    })
+    }
+
+
+class NotificationStatsView(AsyncReadMixin, APIView):
+    """Estatísticas das notificações do usuário"""
+    permission_classes = [permissions.IsAuthenticated]
+    
+    def get(self, request):
+        by_type, by_priority = _stats_querysets(request.user)
+        return Response(_stats_data(list(by_type), list(by_priority)))
+    
+    async def aget(self, request):
+        """Versão assíncrona (modo ASGI)"""
+        by_type, by_priority = _stats_querysets(request.user)
+        return Response(_stats_data(
+            [row async for row in by_type],
+            [row async for row in by_priority],
+        ))
 
 
 class NotificationPreferenceView(generics.RetrieveUpdateAPIView):
@@ -0,0 +1,192 @@
+# backend/project_tracking/evidence.py
+"""
+Pipeline de ingestão de evidências.
+
+No upload o arquivo é lido em blocos para calcular o SHA-256; se o mesmo
+conteúdo já está armazenado, a nova evidência aponta para o arquivo
+existente em vez de gravar outra cópia em ``media/project_evidence``. A
+resposta volta assim que o arquivo e a linha estão gravados: a miniatura e
+a promoção para a galeria (``ProjectGalleryImage``) rodam em segundo plano
+após o commit, e o comando ``process_project_evidence`` retoma o que ficou
+pendente.
+"""
+import hashlib
+import logging
+import threading
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, connection, transaction
+from PIL import Image
+
+from .models import ProjectEvidence, ProjectGalleryImage
+
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 64 * 1024
+THUMBNAIL_SIZE = (400, 400)
+IMAGE_EVIDENCE_TYPES = ('image', 'photo')
+
+# Palavras da categoria da evidência -> categoria da galeria
+GALLERY_CATEGORY_KEYWORDS = [
+    (('construção', 'obra', 'progresso'), 'progress'),
+    (('antes',), 'before'),
+    (('depois', 'final'), 'after'),
+    (('equipe', 'equipa'), 'team'),
+    (('comunidade',), 'community'),
+    (('infraestrutura',), 'infrastructure'),
+    (('evento',), 'events'),
+]
+DEFAULT_GALLERY_CATEGORY = 'progress'
+
+
+def hash_uploaded_file(uploaded):
+    """SHA-256 e tamanho, lendo o upload em blocos (sem carregar tudo na memória)"""
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in uploaded.chunks(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+        size += len(chunk)
+    uploaded.seek(0)
+    return digest.hexdigest(), size
+
+
+def find_stored_duplicate(content_hash):
+    """Evidência anterior com o mesmo conteúdo cujo arquivo ainda existe"""
+    for evidence in ProjectEvidence.objects.filter(content_hash=content_hash).exclude(file='').order_by('id'):
+        if evidence.file.storage.exists(evidence.file.name):
+            return evidence
+    return None
+
+
+def ingest_evidence(serializer, **save_kwargs):
+    """Grava a evidência deduplicando o arquivo e agenda o processamento
+
+    Na troca de arquivo de uma evidência existente (conteúdo diferente) a
+    miniatura e a imagem de galeria do arquivo anterior deixam de valer: são
+    desvinculadas antes do reprocessamento, e a imagem de galeria é apagada
+    se nenhuma outra evidência a usa.
+    """
+    previous = serializer.instance
+    previous_gallery_image_id = None
+    uploaded = serializer.validated_data.get('file')
+    if uploaded is not None and hasattr(uploaded, 'chunks'):
+        content_hash, size = hash_uploaded_file(uploaded)
+        save_kwargs.update(content_hash=content_hash, file_size=size, processing_status='pending')
+        duplicate = find_stored_duplicate(content_hash)
+        if duplicate:
+            # Nome de arquivo já gravado: o FileField não escreve de novo
+            save_kwargs['file'] = duplicate.file.name
+        if previous is not None and previous.content_hash != content_hash:
+            previous_gallery_image_id = previous.gallery_image_id
+            # O arquivo da miniatura pode ser compartilhado com outras evidências: só desvincula
+            save_kwargs.update(thumbnail=None, gallery_image=None)
+
+    with transaction.atomic():
+        evidence = serializer.save(**save_kwargs)
+        if previous_gallery_image_id:
+            ProjectGalleryImage.objects.filter(
+                pk=previous_gallery_image_id, source_evidence__isnull=True
+            ).delete()
+    if evidence.processing_status == 'pending':
+        start_evidence_processing(evidence)
+    return evidence
+
+
+def gallery_category_for(evidence_category):
+    category = (evidence_category or '').lower()
+    for keywords, gallery_category in GALLERY_CATEGORY_KEYWORDS:
+        if any(keyword in category for keyword in keywords):
+            return gallery_category
+    return DEFAULT_GALLERY_CATEGORY
+
+
+def generate_thumbnail(evidence):
+    """Miniatura JPEG (reaproveitada se outra evidência com o mesmo conteúdo já tem)"""
+    if evidence.thumbnail:
+        return
+    if evidence.content_hash:
+        existing = ProjectEvidence.objects.filter(
+            content_hash=evidence.content_hash
+        ).exclude(thumbnail='').exclude(thumbnail__isnull=True).exclude(pk=evidence.pk).first()
+        if existing and existing.thumbnail.storage.exists(existing.thumbnail.name):
+            evidence.thumbnail = existing.thumbnail.name
+            return
+
+    with evidence.file.open('rb') as source:
+        image = Image.open(source)
+        image.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
+        output = BytesIO()
+        image.convert('RGB').save(output, format='JPEG', quality=85, optimize=True)
+    name = f'{evidence.content_hash[:16] or evidence.pk}.jpg'
+    evidence.thumbnail.save(name, ContentFile(output.getvalue()), save=False)
+
+
+def promote_to_gallery(evidence):
+    """Cria (uma vez por conteúdo e projeto) a imagem de galeria da evidência"""
+    if evidence.gallery_image_id:
+        return
+    if evidence.content_hash:
+        sibling = ProjectEvidence.objects.filter(
+            project_id=evidence.project_id,
+            content_hash=evidence.content_hash,
+            gallery_image__isnull=False,
+        ).exclude(pk=evidence.pk).values_list('gallery_image_id', flat=True).first()
+        if sibling:
+            evidence.gallery_image_id = sibling
+            return
+
+    evidence.gallery_image = ProjectGalleryImage.objects.create(
+        project_id=evidence.project_id,
+        image=evidence.file.name,
+        title=evidence.title,
+        description=evidence.description,
+        category=gallery_category_for(evidence.category),
+        uploaded_by_id=evidence.uploaded_by_id,
+        featured=False,
+    )
+
+
+def process_evidence(evidence_id):
+    """Miniatura e promoção à galeria de uma evidência de imagem"""
+    updated = ProjectEvidence.objects.filter(
+        pk=evidence_id, processing_status__in=['pending', 'failed']
+    ).update(processing_status='processing', processing_error='')
+    if not updated:
+        return None
+
+    evidence = ProjectEvidence.objects.get(pk=evidence_id)
+    try:
+        if evidence.type in IMAGE_EVIDENCE_TYPES and evidence.file:
+            generate_thumbnail(evidence)
+            with transaction.atomic():
+                promote_to_gallery(evidence)
+                evidence.processing_status = 'done'
+                evidence.save(update_fields=['thumbnail', 'gallery_image', 'processing_status'])
+        else:
+            evidence.processing_status = 'done'
+            evidence.save(update_fields=['processing_status'])
+    except Exception as e:
+        logger.warning(f"Falha ao processar evidência {evidence_id}: {e}")
+        ProjectEvidence.objects.filter(pk=evidence_id).update(
+            processing_status='failed', processing_error=str(e)
+        )
+    return evidence
+
+
+def _process_in_thread(evidence_id):
+    close_old_connections()
+    try:
+        process_evidence(evidence_id)
+    finally:
+        connection.close()
+
+
+def start_evidence_processing(evidence):
+    """Dispara o processamento em segundo plano após o commit do upload"""
+    transaction.on_commit(
+        lambda: threading.Thread(
+            target=_process_in_thread, args=(evidence.pk,), daemon=True
+        ).start()
+    )
@@ -0,0 +1,54 @@
+# backend/project_tracking/management/commands/process_project_evidence.py
+from django.core.management.base import BaseCommand
+from project_tracking.evidence import hash_uploaded_file, process_evidence
+from project_tracking.models import ProjectEvidence
+
+
+class Command(BaseCommand):
+    help = 'Processa evidências pendentes (miniatura e promoção à galeria) e calcula hashes ausentes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retry-failed', action='store_true', help='Reprocessa também as que falharam')
+        parser.add_argument(
+            '--reset-stuck',
+            action='store_true',
+            help='Volta para pendente as evidências presas em "processando" (processo interrompido)',
+        )
+        parser.add_argument(
+            '--backfill-hashes',
+            action='store_true',
+            help='Calcula o hash de conteúdo das evidências antigas (sem hash)',
+        )
+
+    def handle(self, *args, **options):
+        if options['backfill_hashes']:
+            self.backfill_hashes()
+
+        if options['reset_stuck']:
+            reset = ProjectEvidence.objects.filter(processing_status='processing').update(processing_status='pending')
+            self.stdout.write(f'{reset} evidências voltaram para pendente')
+
+        statuses = ['pending', 'failed'] if options['retry_failed'] else ['pending']
+        evidence_ids = list(
+            ProjectEvidence.objects.filter(processing_status__in=statuses).order_by('id').values_list('id', flat=True)
+        )
+        for evidence_id in evidence_ids:
+            process_evidence(evidence_id)
+
+        failed = ProjectEvidence.objects.filter(id__in=evidence_ids, processing_status='failed').count()
+        if failed:
+            self.stdout.write(self.style.WARNING(f'{failed} evidências falharam (ver processing_error)'))
+        self.stdout.write(
+            self.style.SUCCESS(f'{len(evidence_ids) - failed} evidências processadas')
+        )
+
+    def backfill_hashes(self):
+        updated = 0
+        for evidence in ProjectEvidence.objects.filter(content_hash='').exclude(file='').iterator():
+            if not evidence.file.storage.exists(evidence.file.name):
+                continue
+            with evidence.file.open('rb') as uploaded:
+                evidence.content_hash, evidence.file_size = hash_uploaded_file(uploaded)
+            evidence.save(update_fields=['content_hash', 'file_size'])
+            updated += 1
+        self.stdout.write(f'Hash calculado para {updated} evidências')
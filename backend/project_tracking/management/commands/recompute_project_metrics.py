@@ -0,0 +1,52 @@
+# backend/project_tracking/management/commands/recompute_project_metrics.py
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from core.models import Project
+from project_tracking.metrics import recompute_project_metrics
+
+
+def _recompute_chunk(project_ids):
+    # Cada thread usa a própria conexão: fechar ao terminar
+    try:
+        return recompute_project_metrics(project_ids)
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = 'Recalcula as métricas (ProjectMetrics) dos projetos a partir das atualizações e marcos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project',
+            action='append',
+            type=int,
+            dest='projects',
+            help='ID do projeto (pode repetir); padrão: todos',
+        )
+        parser.add_argument('--workers', type=int, default=4, help='Threads em paralelo')
+        parser.add_argument('--chunk-size', type=int, default=200, help='Projetos por transação')
+
+    def handle(self, *args, **options):
+        project_ids = options['projects'] or list(
+            Project.objects.order_by('id').values_list('id', flat=True)
+        )
+        chunk_size = max(options['chunk_size'], 1)
+        chunks = [project_ids[i:i + chunk_size] for i in range(0, len(project_ids), chunk_size)]
+
+        workers = max(options['workers'], 1)
+        if workers > 1 and connection.vendor == 'sqlite':
+            # SQLite não aceita escritas concorrentes
+            self.stdout.write(self.style.WARNING('SQLite: usando um único worker'))
+            workers = 1
+        if workers == 1 or len(chunks) <= 1:
+            updated = sum(recompute_project_metrics(chunk) for chunk in chunks)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                updated = sum(executor.map(_recompute_chunk, chunks))
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Métricas recalculadas para {updated} projetos ({len(chunks)} blocos)')
+        )
@@ -0,0 +1,145 @@
+# backend/project_tracking/metrics.py
+"""
+Recálculo em lote das ``ProjectMetrics``.
+
+Os sinais apenas marcam o projeto como "sujo"; os projetos marcados numa
+transação são recalculados uma única vez no ``on_commit``, com um agregado
+agrupado por tabela de origem (atualizações publicadas e marcos) e um
+``bulk_update`` das métricas. Importações em lote deixam de recalcular por
+linha e o resultado não depende da ordem em que as linhas foram gravadas.
+"""
+import threading
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+from django.utils import timezone
+
+from .models import ProjectMetrics, ProjectMilestone, ProjectUpdate
+
+
+METRICS_FIELDS = [
+    'people_impacted', 'budget_used', 'progress_percentage',
+    'completed_milestones', 'total_milestones', 'last_updated',
+]
+
+_pending = threading.local()
+
+
+def _pending_ids():
+    if not hasattr(_pending, 'ids'):
+        _pending.ids = set()
+    return _pending.ids
+
+
+def mark_project_dirty(project_id):
+    """Agenda o recálculo das métricas do projeto para o commit da transação"""
+    if project_id is None:
+        return
+    _pending_ids().add(project_id)
+    # Fora de um bloco atômico o callback roda na hora; dentro, os projetos
+    # acumulados são recalculados juntos no primeiro callback do commit
+    transaction.on_commit(flush_dirty_projects)
+
+
+def flush_dirty_projects():
+    """Recalcula os projetos marcados (os callbacks seguintes não encontram nada)"""
+    ids = _pending_ids()
+    if not ids:
+        return
+    project_ids = list(ids)
+    ids.clear()
+    recompute_project_metrics(project_ids)
+
+
+def _latest_progress():
+    """Progresso da última atualização publicada que informou progresso"""
+    return Subquery(
+        ProjectUpdate.objects.filter(
+            project_id=OuterRef('project_id'),
+            status='published',
+            progress_percentage__isnull=False,
+        ).order_by('-created_at', '-id').values('progress_percentage')[:1]
+    )
+
+
+def _create_missing_metrics(project_ids):
+    from core.models import Project
+
+    existing = set(
+        ProjectMetrics.objects.filter(project_id__in=project_ids).values_list('project_id', flat=True)
+    )
+    missing = set(project_ids) - existing
+    if not missing:
+        return
+    ProjectMetrics.objects.bulk_create([
+        ProjectMetrics(
+            project=project,
+            people_impacted=project.current_beneficiaries or 0,
+            budget_total=project.budget or 0,
+            progress_percentage=project.progress_percentage or 0,
+            start_date=project.start_date,
+            end_date=project.end_date,
+        )
+        for project in Project.objects.filter(id__in=missing)
+    ], ignore_conflicts=True)
+
+
+@transaction.atomic
+def recompute_project_metrics(project_ids):
+    """Recalcula as métricas destes projetos; retorna quantas foram gravadas.
+
+    - pessoas impactadas: beneficiários atuais do projeto + soma das atualizações publicadas
+    - orçamento usado: soma de ``budget_spent`` das atualizações publicadas
+    - progresso: o da última atualização publicada (limitado a 100) ou o do projeto
+    - marcos: total e concluídos
+    """
+    project_ids = set(project_ids)
+    if not project_ids:
+        return 0
+    _create_missing_metrics(project_ids)
+
+    updates = {
+        row['project_id']: row
+        for row in ProjectUpdate.objects.filter(
+            project_id__in=project_ids, status='published'
+        ).values('project_id').annotate(
+            people=Sum('people_impacted'),
+            budget=Sum('budget_spent'),
+        ).order_by()
+    }
+    milestones = {
+        row['project_id']: row
+        for row in ProjectMilestone.objects.filter(
+            project_id__in=project_ids
+        ).values('project_id').annotate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(status='completed')),
+        ).order_by()
+    }
+
+    metrics = list(
+        ProjectMetrics.objects.select_for_update(of=('self',)).filter(
+            project_id__in=project_ids
+        ).annotate(
+            baseline_people=F('project__current_beneficiaries'),
+            baseline_progress=F('project__progress_percentage'),
+            latest_progress=_latest_progress(),
+        )
+    )
+
+    now = timezone.now()
+    for item in metrics:
+        update_row = updates.get(item.project_id, {})
+        milestone_row = milestones.get(item.project_id, {})
+
+        item.people_impacted = (item.baseline_people or 0) + (update_row.get('people') or 0)
+        item.budget_used = update_row.get('budget') or 0
+        progress = item.latest_progress if item.latest_progress is not None else item.baseline_progress
+        item.progress_percentage = min(progress or 0, 100)
+        item.total_milestones = milestone_row.get('total', 0)
+        item.completed_milestones = milestone_row.get('completed', 0)
+        # bulk_update não aplica auto_now
+        item.last_updated = now
+
+    ProjectMetrics.objects.bulk_update(metrics, METRICS_FIELDS, batch_size=500)
+    return len(metrics)
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def mark_existing_evidence_done(apps, schema_editor):
+    # Evidências anteriores já foram promovidas à galeria no upload
+    ProjectEvidence = apps.get_model('project_tracking', 'ProjectEvidence')
+    ProjectEvidence.objects.update(processing_status='done')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project_tracking', '0002_alter_projectevidence_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectevidence',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='projectevidence',
+            name='file_size',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectevidence',
+            name='gallery_image',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='source_evidence', to='project_tracking.projectgalleryimage'),
+        ),
+        migrations.AddField(
+            model_name='projectevidence',
+            name='processing_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='projectevidence',
+            name='processing_status',
+            field=models.CharField(choices=[('pending', 'Pendente'), ('processing', 'Processando'), ('done', 'Concluído'), ('failed', 'Falhou')], default='pending', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='projectevidence',
+            name='thumbnail',
+            field=models.ImageField(blank=True, null=True, upload_to='project_evidence/thumbnails/%Y/%m/'),
+        ),
+        migrations.AddIndex(
+            model_name='projectevidence',
+            index=models.Index(condition=models.Q(('processing_status__in', ['pending', 'processing'])), fields=['processing_status'], name='evidence_processing_idx'),
+        ),
+        migrations.RunPython(mark_existing_evidence_done, migrations.RunPython.noop),
+    ]
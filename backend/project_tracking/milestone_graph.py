@@ -0,0 +1,236 @@
+# backend/project_tracking/milestone_graph.py
+"""
+Grafo de dependências dos marcos de um projeto.
+
+Marcos e arestas (``ProjectMilestone.dependencies``) são lidos em duas
+consultas e o grafo é montado em memória: ordem topológica, detecção de
+ciclos e caminho crítico (método CPM). Como os marcos só têm data-alvo, a
+duração de cada marco é o intervalo, em dias, entre a data-alvo da sua
+dependência mais tardia (ou o início do projeto) e a sua própria data-alvo.
+A folga indica quantos dias o marco pode atrasar sem atrasar o projeto.
+
+O resultado fica em cache por projeto e é invalidado pelos sinais de
+``ProjectMilestone`` (inclusive mudanças nas dependências) e ``Project``.
+"""
+import heapq
+from collections import defaultdict
+
+from django.core.cache import cache
+
+from .models import ProjectMilestone
+
+
+GRAPH_CACHE_TIMEOUT = 15 * 60
+
+
+def graph_cache_key(project_id):
+    return f'milestone_graph_{project_id}'
+
+
+def invalidate_milestone_graph(project_id):
+    cache.delete(graph_cache_key(project_id))
+
+
+class MilestoneGraph:
+    """DAG em memória: ``prerequisites[id]`` são os marcos dos quais ``id`` depende"""
+
+    def __init__(self, milestones, edges, project_start=None):
+        self.milestones = {m['id']: m for m in milestones}
+        self.prerequisites = defaultdict(set)
+        self.dependents = defaultdict(set)
+        for milestone_id, dependency_id in edges:
+            # Arestas para marcos de outro projeto são ignoradas
+            if milestone_id in self.milestones and dependency_id in self.milestones:
+                self.prerequisites[milestone_id].add(dependency_id)
+                self.dependents[dependency_id].add(milestone_id)
+
+        dates = [m['target_date'] for m in milestones if m['target_date']]
+        if project_start is None and dates:
+            project_start = min(dates)
+        self.project_start = project_start
+
+    def _sort_key(self, milestone_id):
+        m = self.milestones[milestone_id]
+        return (m['order'], m['target_date'], milestone_id)
+
+    def topological_order(self):
+        """Algoritmo de Kahn; retorna ``(ordem, ids que ficaram em ciclos)``"""
+        indegree = {mid: len(self.prerequisites[mid]) for mid in self.milestones}
+        ready = [(self._sort_key(mid), mid) for mid, degree in indegree.items() if degree == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            _key, mid = heapq.heappop(ready)
+            order.append(mid)
+            for dependent in self.dependents[mid]:
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    heapq.heappush(ready, (self._sort_key(dependent), dependent))
+        remaining = set(self.milestones) - set(order)
+        return order, remaining
+
+    def find_cycles(self, candidates):
+        """Um ciclo por componente entre os marcos que não entraram na ordem"""
+        cycles = []
+        visited = set()
+        for start in sorted(candidates):
+            if start in visited:
+                continue
+            # Seguir dependências dentro dos candidatos até repetir um marco
+            path, position = [], {}
+            node = start
+            while node is not None and node not in position and node not in visited:
+                position[node] = len(path)
+                path.append(node)
+                next_nodes = sorted(self.prerequisites[node] & candidates)
+                node = next_nodes[0] if next_nodes else None
+            if node is not None and node in position:
+                cycles.append(path[position[node]:])
+            visited.update(path)
+        return cycles
+
+    def _duration(self, milestone_id):
+        target = self.milestones[milestone_id]['target_date']
+        previous = [
+            self.milestones[p]['target_date'] for p in self.prerequisites[milestone_id]
+        ] or [self.project_start]
+        reference = max(d for d in previous if d) if any(previous) else target
+        return max((target - reference).days, 0)
+
+    def schedule(self, order):
+        """CPM sobre a ordem topológica: início/fim mais cedo e mais tarde e folga (dias)"""
+        duration = {mid: self._duration(mid) for mid in order}
+        earliest_start, earliest_finish = {}, {}
+        for mid in order:
+            earliest_start[mid] = max(
+                (earliest_finish[p] for p in self.prerequisites[mid]), default=0
+            )
+            earliest_finish[mid] = earliest_start[mid] + duration[mid]
+
+        project_duration = max(earliest_finish.values(), default=0)
+        latest_start, latest_finish = {}, {}
+        for mid in reversed(order):
+            latest_finish[mid] = min(
+                (latest_start[d] for d in self.dependents[mid]), default=project_duration
+            )
+            latest_start[mid] = latest_finish[mid] - duration[mid]
+
+        return {
+            mid: {
+                'duration_days': duration[mid],
+                'earliest_start': earliest_start[mid],
+                'earliest_finish': earliest_finish[mid],
+                'latest_start': latest_start[mid],
+                'latest_finish': latest_finish[mid],
+                'slack_days': latest_start[mid] - earliest_start[mid],
+            }
+            for mid in order
+        }, project_duration
+
+    def critical_path(self, schedule):
+        """Cadeia de folga zero, do primeiro ao último marco"""
+        if not schedule:
+            return []
+        end = max(schedule, key=lambda mid: (schedule[mid]['earliest_finish'], -mid))
+        path = [end]
+        while True:
+            current = schedule[path[-1]]
+            previous = [
+                p for p in self.prerequisites[path[-1]]
+                if p in schedule and schedule[p]['slack_days'] == 0
+                and schedule[p]['earliest_finish'] == current['earliest_start']
+            ]
+            if not previous:
+                break
+            path.append(min(previous, key=self._sort_key))
+        return list(reversed(path))
+
+    def conflicts(self):
+        """Dependências com data-alvo posterior à do marco que depende delas"""
+        return [
+            {'milestone': mid, 'dependency': dep}
+            for mid in sorted(self.milestones)
+            for dep in sorted(self.prerequisites[mid])
+            if self.milestones[dep]['target_date'] > self.milestones[mid]['target_date']
+        ]
+
+    def analyze(self):
+        order, remaining = self.topological_order()
+        cycles = self.find_cycles(remaining) if remaining else []
+        cycle_nodes = set().union(*cycles)
+        schedule, project_duration = self.schedule(order)
+        critical_path = self.critical_path(schedule) if not cycles else []
+
+        milestones = []
+        for mid in order + sorted(remaining, key=self._sort_key):
+            m = self.milestones[mid]
+            item = {
+                'id': mid,
+                'title': m['title'],
+                'status': m['status'],
+                'target_date': m['target_date'],
+                'completed_date': m['completed_date'],
+                'dependencies': sorted(self.prerequisites[mid]),
+                'dependents': sorted(self.dependents[mid]),
+                'in_cycle': mid in cycle_nodes,
+                'blocked_by_cycle': mid in remaining and mid not in cycle_nodes,
+                'is_critical': mid in critical_path,
+            }
+            # Marcos em ciclo (ou que dependem de um ciclo) não têm cronograma
+            item.update(schedule.get(mid, dict.fromkeys(
+                ['duration_days', 'earliest_start', 'earliest_finish',
+                 'latest_start', 'latest_finish', 'slack_days']
+            )))
+            milestones.append(item)
+
+        return {
+            'project_start': self.project_start,
+            'project_duration_days': project_duration,
+            'topological_order': order,
+            'critical_path': critical_path,
+            'has_cycle': bool(cycles),
+            'cycles': cycles,
+            'conflicts': self.conflicts(),
+            'milestones': milestones,
+        }
+
+    def would_create_cycle(self, milestone_id, dependency_ids):
+        """``True`` se ``milestone_id`` passar a depender de ``dependency_ids`` fecha um ciclo"""
+        # Há ciclo se o marco já é (direta ou indiretamente) pré-requisito de alguma nova dependência
+        stack = list(dependency_ids)
+        seen = set()
+        while stack:
+            node = stack.pop()
+            if node == milestone_id:
+                return True
+            if node in seen:
+                continue
+            seen.add(node)
+            stack.extend(self.prerequisites[node])
+        return False
+
+
+def load_milestone_graph(project):
+    """Marcos e arestas do projeto em duas consultas"""
+    milestones = list(
+        ProjectMilestone.objects.filter(project=project).values(
+            'id', 'title', 'status', 'target_date', 'completed_date', 'order'
+        )
+    )
+    edges = ProjectMilestone.dependencies.through.objects.filter(
+        from_projectmilestone__project=project
+    ).values_list('from_projectmilestone_id', 'to_projectmilestone_id')
+    return MilestoneGraph(milestones, list(edges), project_start=project.start_date)
+
+
+def get_milestone_graph(project, use_cache=True):
+    """Análise do grafo do projeto (em cache até a próxima mudança nos marcos)"""
+    key = graph_cache_key(project.pk)
+    if use_cache:
+        data = cache.get(key)
+        if data is not None:
+            return data
+
+    data = {'project_id': project.pk, **load_milestone_graph(project).analyze()}
+    cache.set(key, data, GRAPH_CACHE_TIMEOUT)
+    return data
@@ -114,10 +114,33 @@ class ProjectEvidence(models.Model):
     uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE)
     upload_date = models.DateTimeField(auto_now_add=True)
     
+    # Pipeline de ingestão (project_tracking/evidence.py)
+    PROCESSING_STATUS_CHOICES = [
+        ('pending', 'Pendente'),
+        ('processing', 'Processando'),
+        ('done', 'Concluído'),
+        ('failed', 'Falhou'),
+    ]
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True)
+    file_size = models.PositiveBigIntegerField(null=True, blank=True)
+    thumbnail = models.ImageField(upload_to='project_evidence/thumbnails/%Y/%m/', null=True, blank=True)
+    processing_status = models.CharField(max_length=20, choices=PROCESSING_STATUS_CHOICES, default='pending')
+    processing_error = models.TextField(blank=True)
+    gallery_image = models.ForeignKey(
+        'ProjectGalleryImage', on_delete=models.SET_NULL, null=True, blank=True, related_name='source_evidence'
+    )
+    
     class Meta:
         ordering = ['-upload_date']
         verbose_name = "Evidência do Projeto"
         verbose_name_plural = "Evidências dos Projetos"
+        indexes = [
+            models.Index(
+                fields=['processing_status'],
+                name='evidence_processing_idx',
+                condition=models.Q(processing_status__in=['pending', 'processing']),
+            ),
+        ]
     
     def __str__(self):
         return f"{self.project.name} - {self.title}"
@@ -0,0 +1,85 @@
+# backend/project_tracking/querysets.py
+"""
+Consultas do ``ProjectTrackingViewSet``.
+
+A listagem usa a representação resumida: contagens anotadas (subconsultas
+correlacionadas, sem multiplicar linhas) e apenas as últimas N atualizações
+publicadas e imagens em destaque, via ``Prefetch`` com fatia (janela por
+projeto). As coleções completas só são carregadas no detalhe ou quando
+pedidas com ``?expand=``.
+"""
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import (
+    ProjectEvidence, ProjectGalleryImage, ProjectMetricsEntry, ProjectMilestone, ProjectUpdate
+)
+
+
+RECENT_UPDATES_LIMIT = 5
+FEATURED_IMAGES_LIMIT = 8
+
+# Campo do serializer -> (relação, queryset usado no prefetch completo)
+EXPANDABLE_COLLECTIONS = {
+    'updates': ('tracking_updates', lambda: ProjectUpdate.objects.select_related('author')),
+    'milestones': ('tracking_milestones', lambda: ProjectMilestone.objects.prefetch_related('dependencies')),
+    'gallery_images': ('tracking_gallery_images', lambda: ProjectGalleryImage.objects.select_related('uploaded_by')),
+    'evidence': ('tracking_evidence', lambda: ProjectEvidence.objects.select_related('uploaded_by')),
+    'metrics_entries': ('tracking_metrics_entries', lambda: ProjectMetricsEntry.objects.select_related('author')),
+}
+
+
+def parse_list_param(value):
+    """``"a, b,,c"`` -> ``['a', 'b', 'c']``; ``None`` se o parâmetro não veio"""
+    if value is None:
+        return None
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def _count(model, **filters):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(project=OuterRef('pk'), **filters).order_by().values('project').annotate(
+                total=Count('id')
+            ).values('total')[:1],
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def with_tracking_summary(queryset):
+    """Contagens e últimos itens usados pelos serializers de tracking"""
+    return queryset.annotate(
+        published_updates_count=_count(ProjectUpdate, status='published'),
+        gallery_images_count=_count(ProjectGalleryImage),
+        milestones_count=_count(ProjectMilestone),
+        completed_milestones_count=_count(ProjectMilestone, status='completed'),
+        evidence_count=_count(ProjectEvidence),
+    ).prefetch_related(
+        Prefetch(
+            'tracking_updates',
+            queryset=ProjectUpdate.objects.filter(status='published').select_related('author').order_by(
+                '-created_at', '-id'
+            )[:RECENT_UPDATES_LIMIT],
+            to_attr='recent_published_updates',
+        ),
+        Prefetch(
+            'tracking_gallery_images',
+            queryset=ProjectGalleryImage.objects.filter(featured=True).select_related('uploaded_by').order_by(
+                'order', '-upload_date', 'id'
+            )[:FEATURED_IMAGES_LIMIT],
+            to_attr='featured_gallery_images',
+        ),
+    )
+
+
+def with_tracking_collections(queryset, names=None):
+    """Prefetch das coleções completas (todas, ou só as de ``names``)"""
+    names = EXPANDABLE_COLLECTIONS.keys() if names is None else names
+    lookups = []
+    for name in names:
+        if name in EXPANDABLE_COLLECTIONS:
+            relation, get_queryset = EXPANDABLE_COLLECTIONS[name]
+            lookups.append(Prefetch(relation, queryset=get_queryset()))
+    return queryset.prefetch_related(*lookups) if lookups else queryset
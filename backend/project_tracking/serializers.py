@@ -48,6 +48,18 @@ class ProjectMilestoneSerializer(serializers.ModelSerializer):
         from django.utils import timezone
         return obj.target_date < timezone.now().date() and obj.status != 'completed'
     
+    def validate_dependencies(self, value):
+        """Dependências do mesmo projeto e sem fechar ciclos (só na edição)"""
+        if self.instance is None or not value:
+            return value
+        if any(dependency.project_id != self.instance.project_id for dependency in value):
+            raise serializers.ValidationError('As dependências devem ser marcos do mesmo projeto')
+        from .milestone_graph import load_milestone_graph
+        graph = load_milestone_graph(self.instance.project)
+        if graph.would_create_cycle(self.instance.pk, [dependency.pk for dependency in value]):
+            raise serializers.ValidationError('Estas dependências criariam um ciclo entre os marcos')
+        return value
+    
     def get_dependencies_data(self, obj):
         return ProjectMilestoneSerializer(obj.dependencies.all(), many=True).data
 
@@ -55,11 +67,15 @@ class ProjectEvidenceSerializer(serializers.ModelSerializer):
     uploaded_by_name = serializers.CharField(source='uploaded_by.get_full_name', read_only=True)
     type_display = serializers.CharField(source='get_type_display', read_only=True)
     file_url = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
     
     class Meta:
         model = ProjectEvidence
         fields = '__all__'
-        read_only_fields = ('uploaded_by', 'project')
+        read_only_fields = (
+            'uploaded_by', 'project', 'content_hash', 'file_size', 'thumbnail',
+            'processing_status', 'processing_error', 'gallery_image'
+        )
     
     def get_file_url(self, obj):
         if obj.file:
@@ -72,6 +88,14 @@ class ProjectEvidenceSerializer(serializers.ModelSerializer):
                     return obj.file.url
             return obj.file.url
         return None
+    
+    def get_thumbnail_url(self, obj):
+        if obj.thumbnail:
+            request = self.context.get('request')
+            if request:
+                return request.build_absolute_uri(obj.thumbnail.url)
+            return obj.thumbnail.url
+        return None
 
 class ProjectGalleryImageSerializer(serializers.ModelSerializer):
     uploaded_by_name = serializers.CharField(source='uploaded_by.get_full_name', read_only=True)
@@ -104,7 +128,16 @@ class ProjectMetricsEntrySerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('author',)
 
-class ProjectTrackingDataSerializer(serializers.ModelSerializer):
+class DynamicFieldsMixin:
+    """Permite restringir a saída com ``fields=[...]`` (ex.: ``?fields=id,name``)"""
+    
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+class ProjectTrackingDataSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer consolidado para todos os dados de tracking de um projeto"""
     metrics = ProjectMetricsSerializer(read_only=True)
     updates = ProjectUpdateSerializer(many=True, read_only=True, source='tracking_updates')
@@ -158,16 +191,50 @@ class ProjectTrackingDataSerializer(serializers.ModelSerializer):
             }
         return None
     
+    # Os valores vêm de with_tracking_summary() quando o queryset foi anotado
+    
     def get_total_updates(self, obj):
+        if hasattr(obj, 'published_updates_count'):
+            return obj.published_updates_count
         return obj.tracking_updates.filter(status='published').count()
     
     def get_total_images(self, obj):
+        if hasattr(obj, 'gallery_images_count'):
+            return obj.gallery_images_count
         return obj.tracking_gallery_images.count()
     
     def get_featured_images(self, obj):
-        featured = obj.tracking_gallery_images.filter(featured=True)[:8]
+        featured = getattr(obj, 'featured_gallery_images', None)
+        if featured is None:
+            featured = obj.tracking_gallery_images.filter(featured=True)[:8]
         return ProjectGalleryImageSerializer(featured, many=True, context=self.context).data
     
     def get_recent_updates(self, obj):
-        recent = obj.tracking_updates.filter(status='published').order_by('-created_at')[:5]
+        recent = getattr(obj, 'recent_published_updates', None)
+        if recent is None:
+            recent = obj.tracking_updates.filter(status='published').order_by('-created_at')[:5]
         return ProjectUpdateSerializer(recent, many=True, context=self.context).data
+
+
+class ProjectTrackingSummarySerializer(ProjectTrackingDataSerializer):
+    """Representação resumida para a listagem: contagens e últimos itens.
+
+    As coleções completas (``updates``, ``milestones``, ``gallery_images``,
+    ``evidence``, ``metrics_entries``) só aparecem se pedidas em ``expand``.
+    """
+    total_milestones = serializers.IntegerField(source='milestones_count', read_only=True)
+    completed_milestones = serializers.IntegerField(source='completed_milestones_count', read_only=True)
+    total_evidence = serializers.IntegerField(source='evidence_count', read_only=True)
+    
+    COLLECTION_FIELDS = ('updates', 'milestones', 'gallery_images', 'evidence', 'metrics_entries')
+    
+    class Meta(ProjectTrackingDataSerializer.Meta):
+        fields = ProjectTrackingDataSerializer.Meta.fields + [
+            'total_milestones', 'completed_milestones', 'total_evidence'
+        ]
+    
+    def __init__(self, *args, expand=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        for name in self.COLLECTION_FIELDS:
+            if name not in expand:
+                self.fields.pop(name, None)
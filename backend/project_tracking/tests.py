@@ -0,0 +1,79 @@
+# backend/project_tracking/tests.py
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from core.models import Program, Project
+from .evidence import ingest_evidence, process_evidence
+from .models import ProjectEvidence, ProjectGalleryImage
+from .serializers import ProjectEvidenceSerializer
+
+
+def _image_upload(name, color):
+    output = BytesIO()
+    Image.new('RGB', (40, 30), color).save(output, format='PNG')
+    return SimpleUploadedFile(name, output.getvalue(), content_type='image/png')
+
+
+class EvidenceIngestionTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        # Processamento chamado direto no teste, sem a thread do on_commit
+        patcher = mock.patch('project_tracking.evidence.start_evidence_processing')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user(username='gestor')
+        program = Program.objects.create(name='Programa', slug='programa', description='-', short_description='-')
+        self.project = Project.objects.create(
+            name='Poço', slug='poco', description='-', short_description='-', program=program,
+            location='Pemba', start_date='2024-01-01',
+        )
+
+    def _ingest(self, upload, instance=None):
+        data = {'file': upload}
+        if instance is None:
+            data.update(type='image', title='Obra', description='-', category='Progresso da obra')
+        serializer = ProjectEvidenceSerializer(instance, data=data, partial=instance is not None)
+        serializer.is_valid(raise_exception=True)
+        kwargs = {} if instance is not None else {'project': self.project, 'uploaded_by': self.user}
+        evidence = ingest_evidence(serializer, **kwargs)
+        process_evidence(evidence.pk)
+        return ProjectEvidence.objects.get(pk=evidence.pk)
+
+    def test_replacing_file_regenerates_thumbnail_and_gallery_image(self):
+        evidence = self._ingest(_image_upload('antes.png', 'red'))
+        old_thumbnail, old_gallery_image_id = evidence.thumbnail.name, evidence.gallery_image_id
+        self.assertTrue(old_thumbnail)
+        self.assertIsNotNone(old_gallery_image_id)
+
+        evidence = self._ingest(_image_upload('depois.png', 'blue'), instance=evidence)
+
+        self.assertEqual(evidence.processing_status, 'done')
+        self.assertNotEqual(evidence.thumbnail.name, old_thumbnail)
+        self.assertNotEqual(evidence.gallery_image_id, old_gallery_image_id)
+        self.assertEqual(evidence.gallery_image.image.name, evidence.file.name)
+        self.assertFalse(ProjectGalleryImage.objects.filter(pk=old_gallery_image_id).exists())
+        with evidence.thumbnail.open('rb') as thumbnail:
+            red, _, blue = Image.open(thumbnail).convert('RGB').getpixel((0, 0))
+        self.assertGreater(blue, 200)  # miniatura do arquivo novo (JPEG: cor aproximada)
+        self.assertLess(red, 50)
+
+    def test_replacing_file_keeps_gallery_image_shared_with_duplicates(self):
+        first = self._ingest(_image_upload('a.png', 'red'))
+        duplicate = self._ingest(_image_upload('b.png', 'red'))
+        self.assertEqual(duplicate.gallery_image_id, first.gallery_image_id)
+
+        self._ingest(_image_upload('c.png', 'green'), instance=first)
+
+        self.assertTrue(ProjectGalleryImage.objects.filter(pk=duplicate.gallery_image_id).exists())
@@ -41,6 +41,9 @@ urlpatterns = [
     path('projects/<slug:project_slug>/milestones/', 
          views.ProjectMilestoneViewSet.as_view({'get': 'list', 'post': 'create'}), 
          name='project-milestones-by-slug'),
+    path('projects/<slug:project_slug>/milestones/graph/', 
+         views.ProjectMilestoneViewSet.as_view({'get': 'graph'}), 
+         name='project-milestones-graph-by-slug'),
     path('projects/<slug:project_slug>/milestones/<int:pk>/', 
          views.ProjectMilestoneViewSet.as_view({'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}), 
          name='project-milestones-detail-by-slug'),
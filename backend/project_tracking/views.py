@@ -15,9 +15,13 @@ from .models import (
 from .serializers import (
     ProjectMetricsSerializer, ProjectUpdateSerializer, ProjectMilestoneSerializer,
     ProjectEvidenceSerializer, ProjectGalleryImageSerializer, 
-    ProjectMetricsEntrySerializer, ProjectTrackingDataSerializer
+    ProjectMetricsEntrySerializer, ProjectTrackingDataSerializer, ProjectTrackingSummarySerializer
 )
 from .test_serializers import NewProjectTrackingDataSerializer
+from .analytics import DEFAULT_TIMELINE_MONTHS, MAX_TIMELINE_MONTHS, build_project_analytics
+from .evidence import ingest_evidence
+from .milestone_graph import get_milestone_graph
+from .querysets import parse_list_param, with_tracking_collections, with_tracking_summary
 from core.models import Project
 
 # View de teste
@@ -50,10 +54,15 @@ class ProjectTrackingViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     
     def get_queryset(self):
-        queryset = Project.objects.prefetch_related(
-            'tracking_updates', 'tracking_milestones', 'tracking_gallery_images', 
-            'tracking_evidence', 'tracking_metrics_entries'
-        ).select_related('metrics', 'program', 'category')
+        queryset = Project.objects.select_related('metrics', 'program', 'category')
+        if self.action == 'list':
+            # Listagem: contagens + últimos itens; coleções só com ?expand=
+            queryset = with_tracking_collections(
+                with_tracking_summary(queryset), self.get_expand() or []
+            )
+        elif self.action != 'analytics':
+            # analytics agrega direto no banco (uma consulta por tabela)
+            queryset = with_tracking_collections(with_tracking_summary(queryset))
         
         # Filtros opcionais
         status_filter = self.request.query_params.get('status', None)
@@ -62,69 +71,36 @@ class ProjectTrackingViewSet(viewsets.ModelViewSet):
             
         return queryset
     
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return ProjectTrackingSummarySerializer
+        return ProjectTrackingDataSerializer
+    
+    def get_expand(self):
+        return parse_list_param(self.request.query_params.get('expand'))
+    
+    def get_serializer(self, *args, **kwargs):
+        """Aplica ?fields= (listagem e detalhe) e ?expand= (listagem)"""
+        if self.action in ('list', 'retrieve'):
+            kwargs.setdefault('fields', parse_list_param(self.request.query_params.get('fields')))
+        if self.action == 'list':
+            kwargs.setdefault('expand', self.get_expand() or ())
+        return super().get_serializer(*args, **kwargs)
+    
     @action(detail=True, methods=['get'])
     def analytics(self, request, slug=None):
-        """Retorna dados analíticos detalhados do projeto"""
-        project = self.get_object()
-        
-        # Métricas do projeto
+        """Retorna dados analíticos detalhados do projeto (?months=N para a linha do tempo)"""
         try:
-            metrics = project.metrics
-            metrics_data = ProjectMetricsSerializer(metrics, context={'request': request}).data
-        except ProjectMetrics.DoesNotExist:
-            metrics_data = None
-        
-        # Estatísticas de atualizações
-        updates_stats = project.tracking_updates.aggregate(
-            total=Count('id'),
-            published=Count('id', filter=Q(status='published')),
-            drafts=Count('id', filter=Q(status='draft'))
-        )
-        
-        # Progresso de milestones
-        milestones_stats = project.tracking_milestones.aggregate(
-            total=Count('id'),
-            completed=Count('id', filter=Q(status='completed')),
-            in_progress=Count('id', filter=Q(status='in_progress')),
-            pending=Count('id', filter=Q(status='pending'))
-        )
-        
-        # Atividade recente (últimos 30 dias)
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        recent_activity = {
-            'updates': project.tracking_updates.filter(created_at__gte=thirty_days_ago).count(),
-            'images': project.tracking_gallery_images.filter(upload_date__gte=thirty_days_ago).count(),
-            'evidence': project.tracking_evidence.filter(upload_date__gte=thirty_days_ago).count(),
-            'metrics_entries': project.tracking_metrics_entries.filter(created_at__gte=thirty_days_ago).count()
-        }
+            months = int(request.query_params.get('months', DEFAULT_TIMELINE_MONTHS))
+        except ValueError:
+            return Response(
+                {'error': 'Parâmetro months inválido'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        months = min(max(months, 1), MAX_TIMELINE_MONTHS)
         
-        # Timeline de atividade (últimos 6 meses)
-        timeline_data = []
-        for i in range(6):
-            month_start = timezone.now() - timedelta(days=(i+1)*30)
-            month_end = timezone.now() - timedelta(days=i*30)
-            
-            timeline_data.append({
-                'month': month_start.strftime('%Y-%m'),
-                'updates': project.tracking_updates.filter(
-                    created_at__gte=month_start, 
-                    created_at__lt=month_end
-                ).count(),
-                'milestones_completed': project.tracking_milestones.filter(
-                    completed_date__gte=month_start,
-                    completed_date__lt=month_end
-                ).count()
-            })
-        
-        return Response({
-            'project_id': project.id,
-            'project_name': project.name,
-            'metrics': metrics_data,
-            'updates_stats': updates_stats,
-            'milestones_stats': milestones_stats,
-            'recent_activity': recent_activity,
-            'timeline': timeline_data
-        })
+        project = self.get_object()
+        return Response(build_project_analytics(project, months, context={'request': request}))
     
     @action(detail=True, methods=['post'])
     def quick_update(self, request, slug=None):
@@ -212,19 +188,23 @@ class ProjectMilestoneViewSet(viewsets.ModelViewSet):
         milestone = self.get_object()
         milestone.status = 'completed'
         milestone.completed_date = timezone.now().date()
+        # As métricas do projeto são recalculadas no commit (signals.py)
         milestone.save()
         
-        # Atualizar métricas do projeto
-        try:
-            metrics = milestone.project.metrics
-            completed_milestones = milestone.project.tracking_milestones.filter(status='completed').count()
-            metrics.completed_milestones = completed_milestones
-            metrics.save()
-        except ProjectMetrics.DoesNotExist:
-            pass
-        
         serializer = self.get_serializer(milestone)
         return Response(serializer.data)
+    
+    @action(detail=False, methods=['get'])
+    def graph(self, request, project_slug=None):
+        """Grafo de dependências: ordem topológica, caminho crítico, folgas e ciclos"""
+        project_slug = project_slug or request.query_params.get('project')
+        if not project_slug:
+            return Response(
+                {'error': 'Informe o projeto (?project=<slug>)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        project = get_object_or_404(Project, slug=project_slug)
+        return Response(get_milestone_graph(project))
 
 class ProjectGalleryImageViewSet(viewsets.ModelViewSet):
     serializer_class = ProjectGalleryImageSerializer
@@ -285,55 +265,16 @@ class ProjectEvidenceViewSet(viewsets.ModelViewSet):
         return ProjectEvidence.objects.all().order_by('-upload_date')
     
     def perform_create(self, serializer):
+        # Hash + deduplicação no upload; miniatura e galeria em segundo plano
         project_slug = self.kwargs.get('project_slug')
         if project_slug:
             project = get_object_or_404(Project, slug=project_slug)
-            evidence = serializer.save(project=project, uploaded_by=self.request.user)
-            
-            # Se for uma imagem, criar entrada na galeria automaticamente
-            if evidence.type in ['image', 'photo'] and evidence.file:
-                try:
-                    from .models import ProjectGalleryImage
-                    
-                    # Verificar se já existe uma entrada na galeria para este arquivo
-                    existing_gallery = ProjectGalleryImage.objects.filter(
-                        project=project,
-                        title=evidence.title
-                    ).first()
-                    
-                    if not existing_gallery:
-                        # Determinar categoria baseada na categoria da evidência
-                        gallery_category = 'other'
-                        if 'construção' in evidence.category.lower() or 'obra' in evidence.category.lower():
-                            gallery_category = 'during'
-                        elif 'progresso' in evidence.category.lower():
-                            gallery_category = 'during'
-                        elif 'antes' in evidence.category.lower():
-                            gallery_category = 'before'
-                        elif 'depois' in evidence.category.lower() or 'final' in evidence.category.lower():
-                            gallery_category = 'after'
-                        elif 'equipe' in evidence.category.lower() or 'equipa' in evidence.category.lower():
-                            gallery_category = 'team'
-                        elif 'comunidade' in evidence.category.lower():
-                            gallery_category = 'community'
-                        
-                        ProjectGalleryImage.objects.create(
-                            project=project,
-                            image=evidence.file,
-                            title=evidence.title,
-                            description=evidence.description,
-                            category=gallery_category,
-                            uploaded_by=self.request.user,
-                            featured=False
-                        )
-                        
-                except Exception as e:
-                    # Log do erro mas não falhar o upload da evidência
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.warning(f"Falha ao criar entrada na galeria para evidência {evidence.id}: {e}")
+            ingest_evidence(serializer, project=project, uploaded_by=self.request.user)
         else:
-            serializer.save(uploaded_by=self.request.user)
+            ingest_evidence(serializer, uploaded_by=self.request.user)
+    
+    def perform_update(self, serializer):
+        ingest_evidence(serializer)
 
 class ProjectMetricsEntryViewSet(viewsets.ModelViewSet):
     serializer_class = ProjectMetricsEntrySerializer
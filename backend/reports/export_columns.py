@@ -0,0 +1,307 @@
+# backend/reports/export_columns.py
+"""
+Registro declarativo das colunas de exportação.
+
+Cada coluna declara como extrair o valor de um objeto e o que precisa no
+queryset para isso (``select_related``, ``prefetch_related`` e anotações).
+O ``ExportSchema`` junta só os requisitos das colunas selecionadas num único
+queryset e percorre o resultado em blocos: o número de consultas depende do
+número de blocos, não do número de linhas.
+"""
+from django.db.models import Case, Count, F, OuterRef, Prefetch, Subquery, Value, When
+from django.db.models.functions import Coalesce, Concat
+
+from beneficiaries.models import SupportRequest
+from volunteers.models import VOLUNTEER_LEVELS, VolunteerParticipation, VolunteerStats, level_for_hours
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+VOLUNTEER_LEVEL_LABELS = {level: label for level, _min_hours, label in VOLUNTEER_LEVELS}
+
+
+class ExportColumn:
+    """Coluna exportada: chave, extrator e requisitos de consulta"""
+
+    def __init__(self, key, value, select_related=(), prefetch_related=(), annotations=None):
+        self.key = key
+        self.value = value
+        self.select_related = tuple(select_related)
+        self.prefetch_related = tuple(prefetch_related)
+        self.annotations = annotations or {}
+
+
+class ExportSchema:
+    """Conjunto ordenado de colunas de um tipo de exportação"""
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+
+    def select(self, selected_fields=None):
+        if not selected_fields:
+            return self.columns
+        return [column for column in self.columns if column.key in selected_fields]
+
+    def prepare(self, queryset, columns):
+        """Aplica ao queryset os requisitos (sem repetição) das colunas"""
+        select_related, prefetches, annotations = [], {}, {}
+        for column in columns:
+            for lookup in column.select_related:
+                if lookup not in select_related:
+                    select_related.append(lookup)
+            for prefetch in column.prefetch_related:
+                key = prefetch.to_attr or prefetch.prefetch_to if isinstance(prefetch, Prefetch) else prefetch
+                prefetches.setdefault(key, prefetch)
+            annotations.update(column.annotations)
+
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches.values())
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        return queryset
+
+    def extract(self, queryset, selected_fields=None, chunk_size=EXPORT_CHUNK_SIZE):
+        """Linhas (dicts) com as colunas selecionadas, na ordem do registro"""
+        columns = self.select(selected_fields)
+        queryset = self.prepare(queryset, columns)
+        return [
+            {column.key: column.value(obj) for column in columns}
+            for obj in queryset.iterator(chunk_size=chunk_size)
+        ]
+
+
+def _date(value, fmt='%Y-%m-%d', empty=''):
+    return value.strftime(fmt) if value else empty
+
+
+def _truncate(text, limit):
+    return text[:limit] + '...' if len(text) > limit else text
+
+
+# Voluntários ----------------------------------------------------------------
+
+SKILLS = ('skills',)
+
+# Horas do registro materializado; sem registro, soma das participações concluídas
+VOLUNTEER_HOURS = {
+    'export_total_hours': Coalesce(
+        F('stats__total_hours'),
+        Subquery(
+            VolunteerParticipation.objects.filter(volunteer=OuterRef('pk'), status='completed').order_by().values(
+                'volunteer'
+            ).annotate(total=VolunteerStats.aggregate_expressions()['total_hours']).values('total')[:1]
+        ),
+        Value(0),
+    ),
+    'export_level': F('stats__level'),
+}
+
+
+def _skills(volunteer):
+    names = [skill.name for skill in volunteer.skills.all()]
+    return ', '.join(names) if names else 'Nenhuma habilidade cadastrada'
+
+
+def _volunteer_level(volunteer):
+    level = volunteer.export_level
+    if level is None:
+        level = level_for_hours(volunteer.export_total_hours)
+    return VOLUNTEER_LEVEL_LABELS.get(level, '')
+
+
+VOLUNTEERS = ExportSchema([
+    ExportColumn('full_name', lambda v: v.user.get_full_name() or v.user.username, select_related=['user']),
+    ExportColumn('email', lambda v: v.user.email, select_related=['user']),
+    ExportColumn('phone', lambda v: v.phone or ''),
+    ExportColumn('skills', _skills, prefetch_related=SKILLS),
+    ExportColumn('availability', lambda v: v.get_availability_display()),
+    ExportColumn('bio', lambda v: v.bio or ''),
+    ExportColumn('max_hours_per_week', lambda v: v.max_hours_per_week),
+    ExportColumn('total_hours_contributed', lambda v: v.export_total_hours or 0, annotations=VOLUNTEER_HOURS),
+    ExportColumn('volunteer_level', _volunteer_level, annotations=VOLUNTEER_HOURS),
+    ExportColumn('registration_date', lambda v: _date(v.created_at)),
+    ExportColumn('last_activity', lambda v: _date(v.updated_at)),
+    ExportColumn('is_active', lambda v: v.is_active),
+])
+
+VOLUNTEERS_DETAILED = ExportSchema([
+    ExportColumn('id', lambda v: v.id),
+    ExportColumn(
+        'nome', lambda v: str(f"{v.user.first_name} {v.user.last_name}").strip() if v.user else 'N/A',
+        select_related=['user']
+    ),
+    ExportColumn('email', lambda v: str(v.user.email) if v.user else 'N/A', select_related=['user']),
+    ExportColumn('telefone', lambda v: str(v.phone) if v.phone else 'N/A'),
+    ExportColumn('habilidades', _skills, prefetch_related=SKILLS),
+    ExportColumn('disponibilidade', lambda v: str(v.get_availability_display()) if v.availability else 'N/A'),
+    ExportColumn('bio', lambda v: str(v.bio) if v.bio else 'N/A'),
+    ExportColumn('max_horas_semana', lambda v: v.max_hours_per_week),
+    ExportColumn('horas_contribuidas', lambda v: v.export_total_hours or 0, annotations=VOLUNTEER_HOURS),
+    ExportColumn('nivel_voluntario', _volunteer_level, annotations=VOLUNTEER_HOURS),
+    ExportColumn('data_cadastro', lambda v: _date(v.created_at, empty='N/A')),
+    ExportColumn('status', lambda v: 'Ativo' if v.is_active else 'Inativo'),
+])
+
+
+# Beneficiários --------------------------------------------------------------
+
+def recent_support_requests(limit):
+    """Últimas ``limit`` solicitações de cada beneficiário (prefetch com janela)"""
+    return Prefetch(
+        'support_requests',
+        queryset=SupportRequest.objects.only('id', 'beneficiary_id', 'title')[:limit],
+        to_attr=f'export_recent_requests_{limit}',
+    )
+
+
+def _location(profile):
+    location = f"{profile.district}, {profile.province}"
+    if profile.locality:
+        location = f"{profile.locality}, {location}"
+    return location
+
+
+def _people_impacted(profile):
+    return profile.family_members_count + (profile.children_count or 0)
+
+
+# Mesmas colunas calculadas no banco, para os resumos (``QuerysetSummary``)
+BENEFICIARY_SUMMARY_COLUMNS = {
+    'localizacao': Case(
+        When(locality='', then=Concat('district', Value(', '), 'province')),
+        default=Concat('locality', Value(', '), 'district', Value(', '), 'province'),
+    ),
+    'pessoas_impactadas': F('family_members_count') + Coalesce('children_count', 0),
+}
+
+
+def _related_projects(limit):
+    def value(profile):
+        titles = [request.title for request in getattr(profile, f'export_recent_requests_{limit}')]
+        return ', '.join(titles) if titles else 'Avaliação inicial'
+    return value
+
+
+def _beneficiary_type(profile):
+    if profile.is_displaced:
+        return "Família Deslocada"
+    if profile.has_chronic_illness:
+        return "Família com Necessidades Médicas"
+    if profile.children_count > 3:
+        return "Família Numerosa"
+    return "Família Vulnerável"
+
+
+def _observations(profile):
+    text = profile.priority_needs if profile.priority_needs else "Apoio social geral"
+    if profile.additional_information:
+        text += f" | {profile.additional_information[:50]}..."
+    return text
+
+
+BENEFICIARIES = ExportSchema([
+    ExportColumn('id', lambda b: b.id),
+    ExportColumn('full_name', lambda b: b.full_name),
+    ExportColumn('age', lambda b: b.age or 0),
+    ExportColumn('location', _location),
+    ExportColumn('district', lambda b: b.district),
+    ExportColumn('province', lambda b: b.province),
+    ExportColumn('family_members_count', lambda b: b.family_members_count),
+    ExportColumn('children_count', lambda b: b.children_count or 0),
+    ExportColumn('education_level', lambda b: b.get_education_level_display()),
+    ExportColumn('employment_status', lambda b: b.get_employment_status_display()),
+    ExportColumn('monthly_income', lambda b: float(b.monthly_income or 0)),
+    ExportColumn('vulnerability_score', lambda b: b.vulnerability_score),
+    ExportColumn('is_displaced', lambda b: b.is_displaced),
+    ExportColumn('has_chronic_illness', lambda b: b.has_chronic_illness),
+    ExportColumn('people_impacted', _people_impacted),
+    ExportColumn('related_projects', _related_projects(2), prefetch_related=[recent_support_requests(2)]),
+    ExportColumn('priority_needs', lambda b: b.priority_needs if b.priority_needs else 'Apoio social geral'),
+    ExportColumn('created_at', lambda b: _date(b.created_at)),
+    ExportColumn('is_verified', lambda b: b.is_verified),
+    ExportColumn('status', lambda b: 'Verificado' if b.is_verified else 'Pendente de Verificação'),
+])
+
+BENEFICIARIES_DETAILED = ExportSchema([
+    ExportColumn('id', lambda b: b.id),
+    ExportColumn('nome', lambda b: b.full_name),
+    ExportColumn('localizacao', _location),
+    ExportColumn('tipo', _beneficiary_type),
+    ExportColumn('pessoas_impactadas', _people_impacted),
+    ExportColumn('data_cadastro', lambda b: _date(b.created_at)),
+    ExportColumn('projetos', _related_projects(3), prefetch_related=[recent_support_requests(3)]),
+    ExportColumn('status', lambda b: "Verificado" if b.is_verified else "Pendente de Verificação"),
+    ExportColumn('observacoes', _observations),
+])
+
+
+# Projetos -------------------------------------------------------------------
+
+def _category_name(project):
+    return project.category.name if project.category else 'N/A'
+
+
+PROJECTS = ExportSchema([
+    ExportColumn('title', lambda p: p.title),
+    ExportColumn('description', lambda p: _truncate(p.description, 200)),
+    ExportColumn('category', _category_name, select_related=['category']),
+    ExportColumn('status', lambda p: p.status),
+    ExportColumn('progress', lambda p: getattr(p, 'progress', 0)),
+    ExportColumn('budget', lambda p: float(getattr(p, 'budget_needed', 0))),
+    ExportColumn('funds_raised', lambda p: float(getattr(p, 'funds_raised', 0))),
+    ExportColumn('beneficiaries_count', lambda p: getattr(p, 'beneficiaries_count', 0)),
+    ExportColumn('start_date', lambda p: _date(p.created_at)),
+    ExportColumn('end_date', lambda p: getattr(p, 'end_date', '')),
+    ExportColumn('location', lambda p: getattr(p, 'location', 'N/A')),
+])
+
+PROJECTS_DETAILED = ExportSchema([
+    ExportColumn('id', lambda p: p.id),
+    ExportColumn('nome', lambda p: p.title),
+    ExportColumn('categoria', _category_name, select_related=['category']),
+    ExportColumn('status', lambda p: p.status),
+    ExportColumn('descricao', lambda p: _truncate(p.description, 100)),
+    ExportColumn('data_criacao', lambda p: _date(p.created_at, empty='N/A')),
+    ExportColumn('data_atualizacao', lambda p: _date(p.updated_at, empty='N/A')),
+    ExportColumn(
+        'orcamento_necessario',
+        lambda p: f"MZN {p.budget_needed:,.2f}" if hasattr(p, 'budget_needed') else 'N/A'
+    ),
+])
+
+
+# Blog -----------------------------------------------------------------------
+
+BLOG = ExportSchema([
+    ExportColumn('title', lambda post: post.title),
+    ExportColumn(
+        'author', lambda post: post.author.get_full_name() or post.author.username, select_related=['author']
+    ),
+    ExportColumn('category', lambda post: post.category.name if post.category else '', select_related=['category']),
+    ExportColumn('status', lambda post: 'Publicado' if post.status == 'published' else 'Rascunho'),
+    ExportColumn('published_at', lambda post: _date(getattr(post, 'published_at', None))),
+    ExportColumn('views_count', lambda post: post.views_count or 0),
+    ExportColumn(
+        'likes_count', lambda post: post.export_likes_count,
+        annotations={'export_likes_count': Count('likes', distinct=True)}
+    ),
+    ExportColumn(
+        'comments_count', lambda post: post.export_comments_count,
+        annotations={'export_comments_count': Count('comments', distinct=True)}
+    ),
+    ExportColumn('tags', lambda post: ', '.join(tag.name for tag in post.tags.all()), prefetch_related=['tags']),
+    ExportColumn('excerpt', lambda post: post.excerpt or ''),
+])
+
+
+EXPORT_SCHEMAS = {
+    'volunteers': VOLUNTEERS,
+    'volunteers_detailed': VOLUNTEERS_DETAILED,
+    'beneficiaries': BENEFICIARIES,
+    'beneficiaries_detailed': BENEFICIARIES_DETAILED,
+    'projects': PROJECTS,
+    'projects_detailed': PROJECTS_DETAILED,
+    'blog': BLOG,
+}
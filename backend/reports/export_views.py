@@ -2,16 +2,18 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.http import HttpResponse, JsonResponse
+from django.http import FileResponse, HttpResponse, JsonResponse
 from django.utils import timezone
 from django.core.cache import cache
+from django.db.models.functions import TruncMonth
 import json
 import io
 import csv
 import logging
 import re
+import tempfile
 import textwrap
-from datetime import datetime
+from datetime import date, datetime, time
 from openpyxl import Workbook
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter, A4, landscape
@@ -28,8 +30,19 @@ from django.contrib.auth.models import User
 from core.models import Project
 from blog.models import BlogPost
 
+from .export_columns import BENEFICIARY_SUMMARY_COLUMNS, EXPORT_SCHEMAS
+from .pdf_tables import table_flowables
+from .summary import QuerysetSummary, RowSummary
+
 logger = logging.getLogger(__name__)
 
+
+def _impacted_people(value):
+    """Pessoas impactadas de uma linha exportada (1 se não especificado)"""
+    digits = ''.join(filter(str.isdigit, str(value)))
+    return int(digits) if digits else 1
+
+
 class ExportViewSet(viewsets.ViewSet):
     """
     🏢 MOZ SOLIDÁRIA - SISTEMA DE RELATÓRIOS CORPORATIVO
@@ -208,92 +221,25 @@ class ExportViewSet(viewsets.ViewSet):
 
     def _get_volunteers_data(self, date_range, selected_fields):
         """Obter dados de voluntários"""
-        queryset = VolunteerProfile.objects.select_related('user').all()
+        queryset = VolunteerProfile.objects.all()
         
         if date_range.get('from'):
             queryset = queryset.filter(created_at__gte=date_range['from'])
         if date_range.get('to'):
             queryset = queryset.filter(created_at__lte=date_range['to'])
 
-        data = []
-        for volunteer in queryset:
-            skills_names = [skill.name for skill in volunteer.skills.all()]
-            
-            row = {
-                'full_name': volunteer.user.get_full_name() or volunteer.user.username,
-                'email': volunteer.user.email,
-                'phone': volunteer.phone or '',
-                'skills': ', '.join(skills_names) if skills_names else 'Nenhuma habilidade cadastrada',
-                'availability': volunteer.get_availability_display(),
-                'bio': volunteer.bio or '',
-                'max_hours_per_week': volunteer.max_hours_per_week,
-                'total_hours_contributed': volunteer.total_hours_contributed or 0,
-                'volunteer_level': volunteer.volunteer_level,
-                'registration_date': volunteer.created_at.strftime('%Y-%m-%d'),
-                'last_activity': volunteer.updated_at.strftime('%Y-%m-%d') if volunteer.updated_at else '',
-                'is_active': volunteer.is_active
-            }
-            
-            if selected_fields:
-                row = {k: v for k, v in row.items() if k in selected_fields}
-            
-            data.append(row)
-
-        return data
+        return EXPORT_SCHEMAS['volunteers'].extract(queryset, selected_fields)
 
     def _get_beneficiaries_data(self, date_range, selected_fields):
         """Obter dados de beneficiários (usando BeneficiaryProfile)"""
-        queryset = BeneficiaryProfile.objects.select_related('user').all()
+        queryset = BeneficiaryProfile.objects.all()
 
         if date_range.get('from'):
             queryset = queryset.filter(created_at__gte=date_range['from'])
         if date_range.get('to'):
             queryset = queryset.filter(created_at__lte=date_range['to'])
 
-        data = []
-        for profile in queryset:
-            # Montar localização completa
-            location = f"{profile.district}, {profile.province}"
-            if profile.locality:
-                location = f"{profile.locality}, {location}"
-            
-            # Calcular pessoas impactadas
-            people_impacted = profile.family_members_count + (profile.children_count or 0)
-            
-            # Buscar projetos relacionados
-            related_projects = []
-            if hasattr(profile, 'support_requests'):
-                related_projects = [req.title for req in profile.support_requests.all()[:2]]
-            
-            row = {
-                'id': profile.id,
-                'full_name': profile.full_name,
-                'age': profile.age or 0,
-                'location': location,
-                'district': profile.district,
-                'province': profile.province,
-                'family_members_count': profile.family_members_count,
-                'children_count': profile.children_count or 0,
-                'education_level': profile.get_education_level_display(),
-                'employment_status': profile.get_employment_status_display(),
-                'monthly_income': float(profile.monthly_income or 0),
-                'vulnerability_score': profile.vulnerability_score,
-                'is_displaced': profile.is_displaced,
-                'has_chronic_illness': profile.has_chronic_illness,
-                'people_impacted': people_impacted,
-                'related_projects': ', '.join(related_projects) if related_projects else 'Avaliação inicial',
-                'priority_needs': profile.priority_needs if profile.priority_needs else 'Apoio social geral',
-                'created_at': profile.created_at.strftime('%Y-%m-%d'),
-                'is_verified': profile.is_verified,
-                'status': 'Verificado' if profile.is_verified else 'Pendente de Verificação'
-            }
-
-            if selected_fields:
-                row = {k: v for k, v in row.items() if k in selected_fields}
-
-            data.append(row)
-
-        return data
+        return EXPORT_SCHEMAS['beneficiaries'].extract(queryset, selected_fields)
 
     def _get_partners_data(self, date_range, selected_fields):
         """Obter dados de parcerias (usando PartnerProjectAssignment)"""
@@ -336,29 +282,7 @@ class ExportViewSet(viewsets.ViewSet):
             if date_range.get('to'):
                 queryset = queryset.filter(created_at__lte=date_range['to'])
             
-            data = []
-            for project in queryset:
-                row = {
-                    'title': project.title,
-                    'description': project.description[:200] + '...' if len(project.description) > 200 else project.description,
-                    'category': project.category.name if hasattr(project, 'category') and project.category else 'N/A',
-                    'status': project.status,
-                    'progress': getattr(project, 'progress', 0),
-                    'budget': float(getattr(project, 'budget_needed', 0)),
-                    'funds_raised': float(getattr(project, 'funds_raised', 0)),
-                    'beneficiaries_count': getattr(project, 'beneficiaries_count', 0),
-                    'start_date': project.created_at.strftime('%Y-%m-%d') if project.created_at else '',
-                    'end_date': getattr(project, 'end_date', ''),
-                    'location': getattr(project, 'location', 'N/A')
-                }
-                
-                # Filtrar campos se especificado
-                if selected_fields:
-                    row = {k: v for k, v in row.items() if k in selected_fields}
-                
-                data.append(row)
-
-            return data
+            return EXPORT_SCHEMAS['projects'].extract(queryset, selected_fields)
             
         except Exception as e:
             logger.error(f"Erro ao buscar projetos: {str(e)}")
@@ -405,27 +329,7 @@ class ExportViewSet(viewsets.ViewSet):
         if date_range.get('to'):
             queryset = queryset.filter(created_at__lte=date_range['to'])
 
-        data = []
-        for post in queryset:
-            row = {
-                'title': post.title,
-                'author': post.author.get_full_name() or post.author.username,
-                'category': post.category.name if post.category else '',
-                'status': 'Publicado' if post.status == 'published' else 'Rascunho',
-                'published_at': post.published_at.strftime('%Y-%m-%d') if getattr(post, 'published_at', None) else '',
-                'views_count': post.views_count or 0,
-                'likes_count': post.likes_count or 0,
-                'comments_count': post.comments.count(),
-                'tags': ', '.join([tag.name for tag in post.tags.all()]),
-                'excerpt': post.excerpt or ''
-            }
-
-            if selected_fields:
-                row = {k: v for k, v in row.items() if k in selected_fields}
-
-            data.append(row)
-
-        return data
+        return EXPORT_SCHEMAS['blog'].extract(queryset, selected_fields)
 
     def _generate_csv(self, data, options, filename):
         """Gerar arquivo CSV"""
@@ -503,12 +407,13 @@ class ExportViewSet(viewsets.ViewSet):
             logger.info("📄 Bibliotecas PDF importadas com sucesso, iniciando geração premium...")
             
             # === CONFIGURAÇÃO DO DOCUMENTO ===
-            buffer = io.BytesIO()
+            # Arquivo temporário: PDFs longos não ficam inteiros na memória
+            output = tempfile.TemporaryFile()
             pagesize = landscape(A4)
             
             # Documento com margens adequadas para design premium
             doc = SimpleDocTemplate(
-                buffer, 
+                output, 
                 pagesize=pagesize,
                 rightMargin=1*cm, 
                 leftMargin=1*cm,
@@ -548,14 +453,9 @@ class ExportViewSet(viewsets.ViewSet):
             # 4. TABELA DE DADOS RESPONSIVA
             logger.info("📋 Preparando tabela de dados...")
             
-            # Preparar dados com formatação inteligente
-            table_data = self._prepare_table_data(data)
-            
-            if table_data:
-                # Criar tabela premium com controle de layout
-                data_table = self._create_responsive_table(table_data, pagesize)
-                story.append(Spacer(1, 0.8*cm))
-                story.append(data_table)
+            # Todas as linhas, em blocos montados sob demanda
+            story.append(Spacer(1, 0.8*cm))
+            story.extend(table_flowables(data, doc.width * 0.95))
             
             # 5. RODAPÉ CORPORATIVO
             logger.info("🏢 Adicionando rodapé corporativo...")
@@ -573,13 +473,14 @@ class ExportViewSet(viewsets.ViewSet):
             doc.build(story, onFirstPage=add_page_number, onLaterPages=add_page_number)
             
             # === RESPOSTA HTTP ===
-            buffer.seek(0)
-            response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
+            size = output.tell()
+            output.seek(0)
+            response = FileResponse(output, content_type='application/pdf')
             response['Content-Disposition'] = f'attachment; filename="{filename}.pdf"'
             response['X-Generated-By'] = 'Moz Solidária PDF Engine v2.0'
             response['X-Template-Version'] = 'Premium Corporate Template'
             
-            logger.info(f"✅ PDF Premium gerado com sucesso: {filename}.pdf ({len(buffer.getvalue())} bytes)")
+            logger.info(f"✅ PDF Premium gerado com sucesso: {filename}.pdf ({size} bytes)")
             return response
             
         except ImportError as e:
@@ -981,715 +882,69 @@ class ExportViewSet(viewsets.ViewSet):
             return ["Nenhum dado disponível para análise abrangente"]
         
         stats = []
-        total = len(data)
+        summary = RowSummary(data)
+        total = summary.total
         
         # === MÉTRICAS UNIVERSAIS ===
         stats.append(f"<b>Total de Registros:</b> {total:,} registros analisados")
         stats.append(f"<b>Período do Relatório:</b> Análise fiscal atual")
         
+        if not isinstance(data[0], dict):
+            return stats
+        
         if 'projects' in filename.lower():
             # === ANÁLISE DE PORTFÓLIO DE PROJETOS ===
-            if isinstance(data[0], dict):
-                active_count = sum(1 for item in data if str(item.get('status', '')).lower() in ['ativo', 'active'])
-                completion_rate = (active_count / total * 100) if total > 0 else 0
-                
-                stats.append(f"<b>Desempenho do Portfólio:</b> {completion_rate:.1f}% taxa de engajamento ativo")
-                stats.append(f"<b>Iniciativas Estratégicas:</b> {active_count} projetos em fase de execução")
-                
-                # Análise de categorias
-                categories = {}
-                for item in data:
-                    cat = item.get('categoria', 'Não Categorizado')
-                    categories[cat] = categories.get(cat, 0) + 1
-                
-                if categories:
-                    top_category = max(categories, key=categories.get)
-                    category_dominance = (categories[top_category] / total * 100)
-                    stats.append(f"<b>Área de Foco Principal:</b> {top_category} ({category_dominance:.1f}% do portfólio)")
-                    stats.append(f"<b>Índice de Diversificação:</b> {len(categories)} categorias distintas de projetos")
+            active_count = summary.count_in('status', ['ativo', 'active'])
+            completion_rate = (active_count / total * 100) if total > 0 else 0
+            
+            stats.append(f"<b>Desempenho do Portfólio:</b> {completion_rate:.1f}% taxa de engajamento ativo")
+            stats.append(f"<b>Iniciativas Estratégicas:</b> {active_count} projetos em fase de execução")
+            
+            # Análise de categorias
+            categories = summary.distribution('categoria', 'Não Categorizado')
+            top_category, top_count = summary.top('categoria', 'Não Categorizado')
+            category_dominance = (top_count / total * 100)
+            stats.append(f"<b>Área de Foco Principal:</b> {top_category} ({category_dominance:.1f}% do portfólio)")
+            stats.append(f"<b>Índice de Diversificação:</b> {len(categories)} categorias distintas de projetos")
         
         elif 'donations' in filename.lower():
             # === ANÁLISE FINANCEIRA ===
-            if isinstance(data[0], dict):
-                total_value = 0
-                currency_amounts = []
-                
-                for item in data:
-                    value_str = str(item.get('amount', '0'))
-                    try:
-                        # Tentar converter valor direto (float)
-                        if isinstance(item.get('amount'), (int, float)):
-                            total_value += float(item.get('amount'))
-                            currency_amounts.append(float(item.get('amount')))
-                    except:
-                        # Fallback para parsing de string
-                        import re
-                        numbers = re.findall(r'[\d,]+\.?\d*', value_str.replace(',', ''))
-                        if numbers:
-                            try:
-                                amount = float(numbers[0])
-                                total_value += amount
-                                currency_amounts.append(amount)
-                            except:
-                                pass
-                
-                if total_value > 0:
-                    avg_donation = total_value / total
-                    stats.append(f"<b>Capital Total Mobilizado:</b> MZN {total_value:,.2f}")
-                    stats.append(f"<b>Contribuição Média:</b> MZN {avg_donation:,.2f}")
-                    
-                    # Análise de distribuição
-                    if currency_amounts:
-                        max_donation = max(currency_amounts)
-                        min_donation = min(currency_amounts)
-                        stats.append(f"<b>Faixa de Contribuição:</b> MZN {min_donation:,.2f} - MZN {max_donation:,.2f}")
-                        stats.append(f"<b>Engajamento de Doadores:</b> {total} eventos únicos de contribuição")
+            total_value = summary.sum('amount')
+            
+            if total_value > 0:
+                avg_donation = total_value / total
+                stats.append(f"<b>Capital Total Mobilizado:</b> MZN {total_value:,.2f}")
+                stats.append(f"<b>Contribuição Média:</b> MZN {avg_donation:,.2f}")
+                stats.append(f"<b>Faixa de Contribuição:</b> MZN {summary.min('amount'):,.2f} - MZN {summary.max('amount'):,.2f}")
+                stats.append(f"<b>Engajamento de Doadores:</b> {total} eventos únicos de contribuição")
         
         elif 'volunteers' in filename.lower():
             # === ANÁLISE DE VOLUNTÁRIOS ===
-            if isinstance(data[0], dict):
-                active_volunteers = sum(1 for item in data if str(item.get('status', '')).lower() == 'ativo')
-                engagement_rate = (active_volunteers / total * 100) if total > 0 else 0
-                
-                stats.append(f"<b>Pool de Voluntários:</b> {total} profissionais registrados")
-                stats.append(f"<b>Taxa de Engajamento Ativo:</b> {engagement_rate:.1f}% participação atual")
-                
-                # Análise de habilidades
-                all_skills = []
-                for item in data:
-                    skills_str = str(item.get('habilidades', ''))
-                    if skills_str and skills_str != 'N/A':
-                        skills = [s.strip() for s in skills_str.split(',')]
-                        all_skills.extend(skills)
-                
-                unique_skills = len(set(all_skills))
-                stats.append(f"<b>Índice de Diversidade de Habilidades:</b> {unique_skills} competências únicas")
-                stats.append(f"<b>Otimização de Recursos:</b> {active_volunteers} contribuidores ativos")
-        
-        elif 'beneficiaries' in filename.lower():
-            # === ANÁLISE DE IMPACTO SOCIAL ===
-            if isinstance(data[0], dict):
-                # Tentar calcular pessoas impactadas
-                total_impacted = 0
-                for item in data:
-                    impact_str = str(item.get('pessoas_impactadas', '0'))
-                    try:
-                        impact_num = int(''.join(filter(str.isdigit, impact_str)))
-                        total_impacted += impact_num
-                    except:
-                        total_impacted += 1  # Assumir 1 pessoa se não especificado
-                
-                stats.append(f"<b>Alcance Comunitário:</b> {total_impacted:,} indivíduos impactados")
-                stats.append(f"<b>Programas de Beneficiários:</b> {total} pontos de intervenção ativos")
-                
-                # Análise geográfica
-                locations = {}
-                for item in data:
-                    loc = item.get('localizacao', 'Não Especificado')
-                    locations[loc] = locations.get(loc, 0) + 1
-                
-                if locations:
-                    primary_location = max(locations, key=locations.get)
-                    geographic_coverage = len(locations)
-                    stats.append(f"<b>Cobertura Geográfica:</b> {geographic_coverage} localizações distintas")
-                    stats.append(f"<b>Área de Serviço Principal:</b> {primary_location}")
-        
-        return stats
-
-    def _prepare_table_data(self, data):
-        """Preparar dados para tabela com formatação inteligente e quebra de texto"""
-        if not data:
-            logger.warning("⚠️ _prepare_table_data recebeu dados vazios")
-            return []
-        
-        try:
-            # Limitar a 50 registros para melhor performance
-            limited_data = data[:50]
-            
-            # Validar que temos dados e que são dicionários
-            if not limited_data or not isinstance(limited_data[0], dict):
-                logger.error(f"❌ Dados inválidos: tipo={type(limited_data[0]) if limited_data else 'vazio'}")
-                return []
-            
-            # Obter headers e formatá-los
-            headers = list(limited_data[0].keys())
-            if not headers:
-                logger.error("❌ Nenhum header encontrado nos dados")
-                return []
-            
-            logger.info(f"📋 Preparando tabela com {len(headers)} colunas e {len(limited_data)} linhas")
-            formatted_headers = [self._format_header(h) for h in headers]
-            
-            # Import necessário para Paragraph
-            from reportlab.platypus import Paragraph
-            from reportlab.lib.styles import ParagraphStyle
-            from reportlab.lib import colors
+            active_volunteers = summary.count_in('status', ['ativo'])
+            engagement_rate = (active_volunteers / total * 100) if total > 0 else 0
             
-            # Estilo para células com texto longo - ULTRA COMPACTO
-            cell_style = ParagraphStyle(
-                'CellStyle',
-                fontSize=7,         # Ainda menor
-                leading=8,          # Espaçamento menor entre linhas
-                textColor=colors.black,
-                wordWrap='LTR',     # Quebra mais agressiva
-                alignment=0,        # Alinhamento à esquerda
-                leftIndent=1,       # Menos indentação
-                rightIndent=1,      # Menos indentação
-                splitLongWords=1,   # Quebrar palavras longas
-                allowWidows=0,      # Evitar linhas órfãs
-                allowOrphans=0      # Evitar linhas órfãs
-            )
+            stats.append(f"<b>Pool de Voluntários:</b> {total} profissionais registrados")
+            stats.append(f"<b>Taxa de Engajamento Ativo:</b> {engagement_rate:.1f}% participação atual")
             
-            # Estilo especial para cabeçalhos - COMPACTO
-            header_style = ParagraphStyle(
-                'HeaderStyle',
-                fontSize=8,         # Menor
-                leading=9,          # Menor
-                textColor=colors.whitesmoke,
-                wordWrap='LTR',     # Quebra agressiva
-                alignment=1,        # Centralizado
-                fontName='Helvetica-Bold',
-                leftIndent=1,       # Menos indentação
-                rightIndent=1,      # Menos indentação
-                splitLongWords=1,   # Quebrar palavras longas
-                allowWidows=0,
-                allowOrphans=0
-            )
-            
-            # Processar cabeçalhos com quebra de texto AGRESSIVA
-            header_row = []
-            for header_text in formatted_headers:
-                try:
-                    # Usar Paragraph para TODOS os headers para controle total
-                    header_content = Paragraph(header_text.replace('\n', '<br/>'), header_style)
-                    header_row.append(header_content)
-                except Exception as e:
-                    logger.error(f"❌ Erro ao formatar header '{header_text}': {e}")
-                    # Fallback para texto simples
-                    header_row.append(str(header_text))
-            
-            # Preparar linhas de dados com controle rigoroso
-            table_data = [header_row]
-            
-            for idx, item in enumerate(limited_data):
-                try:
-                    row = []
-                    for header in headers:
-                        try:
-                            value = item.get(header, 'N/A')
-                            # Garantir que value é string
-                            str_value = str(value) if value is not None else 'N/A'
-                            formatted_value = self._format_cell_value(str_value, header)
-                            
-                            # Usar Paragraph para TODOS os valores para controle total de quebra
-                            cell_content = Paragraph(formatted_value.replace('\n', '<br/>'), cell_style)
-                            row.append(cell_content)
-                        except Exception as e:
-                            logger.error(f"❌ Erro ao formatar célula [{idx}][{header}]: {e}")
-                            # Fallback para N/A
-                            row.append(Paragraph('N/A', cell_style))
-                    
-                    table_data.append(row)
-                except Exception as e:
-                    logger.error(f"❌ Erro ao processar linha {idx}: {e}")
-                    continue
-            
-            logger.info(f"✅ Tabela preparada: {len(table_data)} linhas (incluindo header)")
-            return table_data
-            
-        except Exception as e:
-            logger.error(f"❌ Erro crítico em _prepare_table_data: {e}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
-            return []
-
-    def _format_header(self, header):
-        """Formatar cabeçalho da coluna com quebra inteligente"""
-        # Mapeamento de nomes técnicos para nomes amigáveis
-        header_map = {
-            'id': 'ID',
-            'nome': 'Nome Completo',
-            'email': 'Endereço de E-mail',
-            'categoria': 'Categoria do Projeto',
-            'status': 'Status Atual',
-            'valor': 'Valor em MZN',
-            'data': 'Data de Registro',
-            'projeto': 'Nome do Projeto',
-            'doador': 'Nome do Doador',
-            'metodo': 'Método de Pagamento',
-            'localizacao': 'Localização Geográfica',
-            'data_inicio': 'Data de Início',
-            'data_fim': 'Data de Finalização',
-            'orcamento': 'Orçamento Aprovado',
-            'responsavel': 'Responsável Técnico',
-            'progresso': 'Percentual de Progresso',
-            'habilidades': 'Habilidades e Competências',
-            'disponibilidade': 'Disponibilidade de Horário',
-            'projetos': 'Projetos Participantes',
-            'pessoas_impactadas': 'Pessoas Impactadas',
-            'tipo_beneficio': 'Tipo de Benefício Oferecido',
-            'data_cadastro': 'Data de Cadastro no Sistema',
-            'descricao': 'Descrição Detalhada',
-            'observacoes': 'Observações e Comentários',
-            'endereco': 'Endereço Completo',
-            'telefone': 'Número de Telefone',
-            'organizacao': 'Organização de Origem',
-            'area_atuacao': 'Área de Atuação Principal'
-        }
-        
-        # Obter nome amigável
-        friendly_name = header_map.get(header.lower(), header.replace('_', ' ').title())
-        
-        # Aplicar quebra inteligente MAIS AGRESSIVA se o título for longo
-        # Reduzir limite de 15 para 12 caracteres para quebrar mais cedo
-        if len(friendly_name) > 12:
-            # Quebrar em palavras para melhor legibilidade nos cabeçalhos
-            words = friendly_name.split()
-            if len(words) > 2:
-                # Para 3+ palavras, quebrar em 2 linhas
-                mid_point = len(words) // 2
-                line1 = ' '.join(words[:mid_point])
-                line2 = ' '.join(words[mid_point:])
-                
-                # Se as linhas ainda são muito longas, cortar
-                if len(line1) > 18:
-                    line1 = line1[:16] + ".."
-                if len(line2) > 18:
-                    line2 = line2[:16] + ".."
-                
-                return f"{line1}\n{line2}"
-            elif len(words) == 2:
-                # Para 2 palavras, sempre quebrar se exceder 12 caracteres total
-                return f"{words[0]}\n{words[1]}"
-            elif len(words) == 1 and len(friendly_name) > 15:
-                # Palavra única muito longa: forçar quebra por caracteres
-                mid = len(friendly_name) // 2
-                return f"{friendly_name[:mid]}-\n{friendly_name[mid:]}"
-        
-        return friendly_name
-
-    def _format_cell_value(self, value, header):
-        """
-        📝 FORMATAÇÃO OTIMIZADA PARA LAYOUT HORIZONTAL
-        
-        Formata valores com quebra inteligente otimizada para aproveitar
-        melhor o espaço horizontal disponível em landscape
-        """
-        if not value or value == 'None':
-            return 'N/A'
-        
-        # Formatação específica por tipo de campo
-        if 'data' in header.lower():
-            # Tentar formatar datas
-            try:
-                from datetime import datetime
-                if 'T' in value:  # ISO format
-                    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
-                    return dt.strftime('%d/%m/%Y')
-            except:
-                pass
-        
-        # === QUEBRA OTIMIZADA PARA LAYOUT HORIZONTAL COM LIMITES MAIS CONSERVADORES ===
-        header_lower = header.lower()
-        
-        # Determinar limite baseado no tipo de coluna (REDUZIDOS para evitar sobreposição)
-        if any(keyword in header_lower for keyword in ['id', 'código', 'num']):
-            # IDs e códigos: sem quebra, manter compacto
-            max_length = 10
-            if len(value) > max_length:
-                return value[:max_length-2] + ".."
-        
-        elif any(keyword in header_lower for keyword in ['nome', 'title', 'titulo']):
-            # Nomes e títulos: quebra moderada COM LIMITE MAIS APERTADO
-            max_length = 30  # Reduzido de 35
-            max_line_length = 15  # Reduzido de 18
-        
-        elif any(keyword in header_lower for keyword in ['descri', 'observ', 'coment', 'habilidades']):
-            # Descrições: quebra mais permissiva mas COM CONTROLE
-            max_length = 50  # Reduzido de 60
-            max_line_length = 25  # Reduzido de 30
-        
-        elif any(keyword in header_lower for keyword in ['email', 'endereço']):
-            # Emails e endereços: quebra inteligente COM LIMITE
-            max_length = 35  # Reduzido de 45
-            max_line_length = 18  # Reduzido de 22
-        
-        else:
-            # Campos padrão: quebra equilibrada MAS MAIS CONSERVADORA
-            max_length = 25  # Reduzido de 30
-            max_line_length = 13  # Reduzido de 15
-        
-        # === APLICAR QUEBRA INTELIGENTE ===
-        if len(value) <= max_length:
-            return value
-        
-        # Para textos longos, usar quebra otimizada para horizontal
-        words = value.split()
-        lines = []
-        current_line = ""
-        
-        for word in words:
-            # Se uma palavra sozinha já é muito longa, cortá-la
-            if len(word) > max_line_length:
-                if current_line:
-                    lines.append(current_line)
-                    current_line = ""
-                # Para layout horizontal, ser menos agressivo no corte
-                lines.append(word[:max_line_length-2] + "..")
-                continue
-            
-            if len(current_line + " " + word) <= max_line_length:
-                current_line += (" " + word) if current_line else word
-            else:
-                if current_line:
-                    lines.append(current_line)
-                current_line = word
-        
-        if current_line:
-            lines.append(current_line)
-        
-        # === OTIMIZAÇÃO PARA LAYOUT HORIZONTAL ===
-        # Em landscape, podemos permitir até 3 linhas em vez de 2
-        if len(lines) > 3:
-            # Combinar últimas linhas se necessário
-            first_two = lines[:2]
-            remaining = " ".join(lines[2:])
-            
-            if len(remaining) > max_line_length:
-                third_line = remaining[:max_line_length-2] + ".."
-            else:
-                third_line = remaining
-            
-            lines = first_two + [third_line]
-        
-        return "\n".join(lines)
-
-    def _create_responsive_table(self, table_data, pagesize):
-        """Criar tabela ultra-profissional digna de empresa multibilionária"""
-        from reportlab.platypus import Table, TableStyle
-        from reportlab.lib import colors
-        from reportlab.lib.units import cm
+            # Análise de habilidades
+            unique_skills = len(summary.distinct_tokens('habilidades'))
+            stats.append(f"<b>Índice de Diversidade de Habilidades:</b> {unique_skills} competências únicas")
+            stats.append(f"<b>Otimização de Recursos:</b> {active_volunteers} contribuidores ativos")
         
-        if not table_data:
-            return Table([['No data available for analysis']])
-        
-        # === PALETA DE CORES NEUTRAS PROFISSIONAIS ===
-        # Cores neutras inspiradas no logo (azul, laranja, cinzas)
-        primary_blue = colors.HexColor('#1E40AF')      # Azul profissional do logo
-        accent_orange = colors.HexColor('#EA580C')     # Laranja do logo (mais suave)
-        neutral_gray = colors.HexColor('#374151')      # Cinza escuro neutro
-        light_gray = colors.HexColor('#6B7280')        # Cinza médio
-        very_light_gray = colors.HexColor('#F3F4F6')   # Cinza muito claro
-        
-        # Cores de suporte
-        row_light = colors.HexColor('#FAFAFA')         # Branco quase puro
-        row_alternate = colors.HexColor('#F5F5F5')     # Cinza alternado sutil
-        border_color = colors.HexColor('#E5E7EB')      # Bordas discretas
-        text_primary = neutral_gray                    # Texto principal
-        text_header = colors.white                     # Texto do cabeçalho
-        
-        # === CALCULAR DIMENSÕES SEGURAS ===
-        page_width = pagesize[0] - 2*cm  # Margens laterais
-        page_height = pagesize[1]        # Altura da página
-        num_cols = len(table_data[0])
-        
-        # === PAGINAÇÃO INTELIGENTE PREMIUM ===
-        # Calcular espaço disponível considerando header e footer premium
-        available_height = page_height - 7*cm  # Reserva generosa para header/footer
-        
-        # Estimar altura por linha (padding premium + texto)
-        estimated_row_height = 1.2*cm  # Altura generosa para design premium
-        
-        # Calcular máximo de linhas que cabem na página
-        max_data_rows = int(available_height / estimated_row_height) - 1  # -1 para header
-        
-        # Garantir mínimo de 3 linhas de dados por página
-        if max_data_rows < 3:
-            max_data_rows = 3
-            estimated_row_height = available_height / (max_data_rows + 1)  # Ajustar altura
-        
-        # === APLICAR PAGINAÇÃO SE NECESSÁRIO ===
-        original_data = table_data.copy()
-        if len(table_data) > max_data_rows + 1:  # +1 para o header
-            # Manter header + primeiras linhas que cabem
-            table_data = [table_data[0]] + table_data[1:max_data_rows+1]
-            
-            # Adicionar nota de paginação
-            pagination_note = [""] * (num_cols - 1) + [f"Showing {max_data_rows} of {len(original_data)-1} records"]
-            table_data.append(pagination_note)
-        
-        # Larguras adaptativas premium
-        col_widths = self._calculate_column_widths_premium(table_data, page_width, num_cols)
-        
-        # === CALCULAR ALTURAS DE LINHA DINÂMICAS ===
-        # Altura mínima por linha para evitar sobreposição de texto
-        min_row_height = 0.8*cm  # Altura mínima segura
-        header_height = 1.2*cm   # Altura do cabeçalho (mais espaço)
-        
-        # Criar lista de alturas: primeira linha (header) + demais linhas
-        row_heights = [header_height]  # Header
-        for i in range(1, len(table_data)):
-            # Estimar altura baseada no conteúdo
-            # Se houver muitas colunas ou texto longo, aumentar altura
-            if num_cols > 8:
-                row_heights.append(min_row_height * 1.3)  # Mais altura para muitas colunas
-            elif num_cols > 5:
-                row_heights.append(min_row_height * 1.1)  # Altura média
-            else:
-                row_heights.append(min_row_height)  # Altura padrão
-        
-        # === CRIAR TABELA PREMIUM COM CONTROLE DE ALTURA ===
-        table = Table(table_data, colWidths=col_widths, repeatRows=1, rowHeights=row_heights)
-        
-        # === ESTILO CORPORATIVO NEUTRO COM CONTROLE RIGOROSO ===
-        table_style = TableStyle([
-            # === CABEÇALHO PROFISSIONAL ===
-            ('BACKGROUND', (0, 0), (-1, 0), primary_blue),
-            ('TEXTCOLOR', (0, 0), (-1, 0), text_header),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 9),  # Reduzido para evitar sobreposição
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),   # Reduzido
-            ('TOPPADDING', (0, 0), (-1, 0), 8),      # Reduzido
-            
-            # === LINHA DE SEPARAÇÃO DO HEADER (CONSISTENTE) ===
-            ('LINEBELOW', (0, 0), (-1, 0), 0.5, border_color),  # Mesmo estilo das bordas internas
-            
-            # === CORPO DA TABELA COM CONTROLE DE ALTURA ===
-            ('TEXTCOLOR', (0, 1), (-1, -1), text_primary),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),  # Ainda menor para mais texto
-            ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            
-            # === PADDING ULTRA COMPACTO ===
-            ('LEFTPADDING', (0, 0), (-1, -1), 4),   # Muito reduzido
-            ('RIGHTPADDING', (0, 0), (-1, -1), 4),  # Muito reduzido  
-            ('TOPPADDING', (0, 1), (-1, -1), 6),    # Reduzido
-            ('BOTTOMPADDING', (0, 1), (-1, -1), 6), # Reduzido
-            
-            # === BORDAS NEUTRAS ===
-            ('GRID', (0, 0), (-1, -1), 0.5, border_color),  # Bordas mais finas
-            ('BOX', (0, 0), (-1, -1), 1, light_gray),       # Borda externa sutil
-            
-            # === ALTERNÂNCIA DE CORES SUTIL ===
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [row_light, row_alternate]),
-            
-            # === CONFIGURAÇÕES ANTI-SOBREPOSIÇÃO ===
-            ('WORDWRAP', (0, 0), (-1, -1), 'LTR'),  # Quebra forçada da esquerda para direita
-            ('LEADING', (0, 1), (-1, -1), 9),       # Espaçamento mínimo entre linhas
-        ])
-        
-        # === EFEITOS VISUAIS NEUTROS ===
-        # Adicionar sombreamento sutil nas bordas
-        # table_style.add('LINEABOVE', (0, 1), (-1, 1), 1, colors.HexColor('#E5E7EB'))
-        
-        # Destacar primeira coluna (geralmente IDs)
-        if num_cols > 1:
-            table_style.add('BACKGROUND', (0, 1), (0, -1), very_light_gray)
-            table_style.add('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold')
-            table_style.add('ALIGN', (0, 1), (0, -1), 'CENTER')
-        
-        # Destacar última linha se for total/resumo ou nota de paginação
-        if len(table_data) > 2:
-            table_style.add('LINEABOVE', (0, -1), (-1, -1), 0.5, border_color)  # Mesmo estilo das outras linhas
-            table_style.add('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold')
-            table_style.add('FONTSIZE', (0, -1), (-1, -1), 8)  # Menor para notas
-            table_style.add('ALIGN', (0, -1), (-1, -1), 'RIGHT')  # Alinhar à direita para notas
-        
-        table.setStyle(table_style)
-        
-        # === CONFIGURAÇÕES DE LAYOUT MOZ SOLIDÁRIA ===
-        table.hAlign = 'CENTER'
-        table.keepWithNext = False  # Permitir quebra de página
-        table.splitByRow = True     # Quebra inteligente por linha
-        
-        return table
-    
-    def _calculate_column_widths_premium(self, table_data, page_width, num_cols):
-        """
-        📏 CÁLCULO DE LARGURAS OTIMIZADO PARA LAYOUT HORIZONTAL
-        
-        Otimiza aproveitamento máximo do espaço horizontal disponível em landscape
-        com distribuição inteligente baseada no tipo de conteúdo das colunas
-        """
-        # === APROVEITAMENTO MÁXIMO DO ESPAÇO HORIZONTAL ===
-        # Em landscape (A4), temos muito mais espaço horizontal - vamos usá-lo!
-        safe_width = page_width * 0.95  # Usar 95% da largura disponível
-        
-        # === ANÁLISE INTELIGENTE DOS HEADERS PARA OTIMIZAR LARGURAS ===
-        headers = table_data[0] if table_data else []
-        smart_widths = []
-        
-        # Categorizar colunas por tipo de conteúdo
-        for i, header in enumerate(headers):
-            header_text = str(header).lower() if hasattr(header, 'text') else str(header).lower()
-            
-            # === COLUNAS ESTREITAS (IDs, Status, Códigos) ===
-            if any(keyword in header_text for keyword in ['id', 'código', 'status', 'ativo', 'num']):
-                smart_widths.append('narrow')  # 8-12% da largura
-            
-            # === COLUNAS MÉDIAS (Datas, Valores, Categorias) ===
-            elif any(keyword in header_text for keyword in ['data', 'valor', 'preço', 'categoria', 'tipo', 'método']):
-                smart_widths.append('medium')  # 12-18% da largura
-            
-            # === COLUNAS LARGAS (Nomes, Títulos) ===
-            elif any(keyword in header_text for keyword in ['nome', 'title', 'titulo', 'projeto', 'organização']):
-                smart_widths.append('wide')    # 18-25% da largura
-            
-            # === COLUNAS EXTRA LARGAS (Descrições, Comentários, Emails) ===
-            elif any(keyword in header_text for keyword in ['descri', 'observ', 'coment', 'email', 'endereço', 'habilidades']):
-                smart_widths.append('extra_wide')  # 25-35% da largura
-            
-            # === COLUNAS PADRÃO ===
-            else:
-                smart_widths.append('standard')  # 15% da largura
-        
-        # === CALCULAR LARGURAS BASEADAS NO LAYOUT HORIZONTAL ===
-        if num_cols <= 3:
-            # === POUCAS COLUNAS: APROVEITAR TODO O ESPAÇO HORIZONTAL ===
-            width_map = {
-                'narrow': safe_width * 0.15,      # 15%
-                'medium': safe_width * 0.25,      # 25%
-                'wide': safe_width * 0.35,        # 35%
-                'extra_wide': safe_width * 0.45,  # 45%
-                'standard': safe_width * 0.30     # 30%
-            }
-            
-        elif num_cols <= 5:
-            # === COLUNAS MÉDIAS: DISTRIBUIÇÃO INTELIGENTE ===
-            width_map = {
-                'narrow': safe_width * 0.10,      # 10%
-                'medium': safe_width * 0.18,      # 18%
-                'wide': safe_width * 0.25,        # 25%
-                'extra_wide': safe_width * 0.30,  # 30%
-                'standard': safe_width * 0.20     # 20%
-            }
+        elif 'beneficiaries' in filename.lower():
+            # === ANÁLISE DE IMPACTO SOCIAL ===
+            total_impacted = int(summary.sum('pessoas_impactadas', parse=_impacted_people))
             
-        elif num_cols <= 8:
-            # === MUITAS COLUNAS: COMPACTO MAS LEGÍVEL ===
-            width_map = {
-                'narrow': safe_width * 0.08,      # 8%
-                'medium': safe_width * 0.12,      # 12%
-                'wide': safe_width * 0.18,        # 18%
-                'extra_wide': safe_width * 0.22,  # 22%
-                'standard': safe_width * 0.15     # 15%
-            }
+            stats.append(f"<b>Alcance Comunitário:</b> {total_impacted:,} indivíduos impactados")
+            stats.append(f"<b>Programas de Beneficiários:</b> {total} pontos de intervenção ativos")
             
-        else:
-            # === MUITAS COLUNAS (>8): ULTRA COMPACTO ===
-            width_map = {
-                'narrow': safe_width * 0.06,      # 6%
-                'medium': safe_width * 0.10,      # 10%
-                'wide': safe_width * 0.14,        # 14%
-                'extra_wide': safe_width * 0.18,  # 18%
-                'standard': safe_width * 0.12     # 12%
-            }
+            # Análise geográfica
+            locations = summary.distribution('localizacao', 'Não Especificado')
+            primary_location, _ = summary.top('localizacao', 'Não Especificado')
+            stats.append(f"<b>Cobertura Geográfica:</b> {len(locations)} localizações distintas")
+            stats.append(f"<b>Área de Serviço Principal:</b> {primary_location}")
         
-        # === APLICAR LARGURAS INTELIGENTES ===
-        calculated_widths = []
-        for width_type in smart_widths:
-            calculated_widths.append(width_map[width_type])
-        
-        # === NORMALIZAR PARA NÃO EXCEDER LARGURA TOTAL (GARANTIA 100%) ===
-        total_calculated = sum(calculated_widths)
-        
-        # SEMPRE normalizar para garantir que não exceda a largura disponível
-        # Usar 98% para margem de segurança extra
-        target_width = safe_width * 0.98
-        
-        if total_calculated > target_width:
-            # Reduzir proporcionalmente COM MARGEM DE SEGURANÇA
-            scale_factor = target_width / total_calculated
-            calculated_widths = [w * scale_factor * 0.99 for w in calculated_widths]  # 1% extra de segurança
-        elif total_calculated < safe_width * 0.80:
-            # Se sobrar muito espaço, distribuir proporcionalmente
-            # Mas nunca exceder o target_width
-            scale_factor = target_width / total_calculated
-            calculated_widths = [w * scale_factor * 0.99 for w in calculated_widths]
-        else:
-            # Mesmo em casos intermediários, aplicar normalização suave
-            scale_factor = target_width / total_calculated
-            calculated_widths = [w * scale_factor for w in calculated_widths]
-        
-        # === VALIDAÇÃO FINAL (SEGURANÇA) ===
-        final_total = sum(calculated_widths)
-        if final_total > safe_width:
-            # Última linha de defesa: forçar proporcionalidade
-            emergency_factor = (safe_width * 0.95) / final_total
-            calculated_widths = [w * emergency_factor for w in calculated_widths]
-            logger.warning(f"⚠️ Larguras de colunas ajustadas emergencialmente: {final_total:.2f} > {safe_width:.2f}")
-        
-        return calculated_widths
-
-    def _calculate_column_widths(self, table_data, page_width, num_cols):
-        """Calcular larguras otimizadas baseadas no conteúdo das colunas"""
-        if num_cols <= 3:
-            # Poucas colunas: distribuir com mais espaço
-            return [page_width / num_cols] * num_cols
-        elif num_cols <= 6:
-            # Colunas médias: larguras baseadas no tipo de conteúdo
-            widths = []
-            headers = table_data[0] if table_data else []
-            base_width = page_width / num_cols
-            
-            for i, header in enumerate(headers):
-                if isinstance(header, str):
-                    header_lower = header.lower()
-                    # IDs e códigos: mais estreitos
-                    if 'id' in header_lower or 'código' in header_lower:
-                        widths.append(base_width * 0.6)
-                    # Emails e URLs: mais largos
-                    elif 'email' in header_lower or 'url' in header_lower or 'link' in header_lower:
-                        widths.append(base_width * 1.4)
-                    # Nomes e títulos: largura média-alta
-                    elif 'nome' in header_lower or 'title' in header_lower or 'titulo' in header_lower:
-                        widths.append(base_width * 1.2)
-                    # Descrições e observações: mais largos
-                    elif 'descri' in header_lower or 'observ' in header_lower or 'coment' in header_lower:
-                        widths.append(base_width * 1.5)
-                    # Status e categorias: médio
-                    elif 'status' in header_lower or 'categoria' in header_lower:
-                        widths.append(base_width * 0.8)
-                    # Valores e datas: médio
-                    elif 'valor' in header_lower or 'data' in header_lower or 'preço' in header_lower:
-                        widths.append(base_width * 0.9)
-                    else:
-                        widths.append(base_width)
-                else:
-                    widths.append(base_width)
-            
-            # Normalizar para não exceder a página
-            total_width = sum(widths)
-            if total_width > page_width:
-                factor = page_width / total_width
-                widths = [w * factor for w in widths]
-            
-            return widths
-        elif num_cols <= 10:
-            # Muitas colunas: compactar com prioridades
-            base_width = page_width / num_cols * 0.85
-            widths = []
-            headers = table_data[0] if table_data else []
-            
-            for header in headers:
-                if isinstance(header, str):
-                    header_lower = header.lower()
-                    # IDs: muito estreitos
-                    if 'id' in header_lower:
-                        widths.append(base_width * 0.5)
-                    # Textos longos: um pouco mais largos
-                    elif any(word in header_lower for word in ['descri', 'observ', 'coment', 'nome', 'title']):
-                        widths.append(base_width * 1.3)
-                    else:
-                        widths.append(base_width)
-                else:
-                    widths.append(base_width)
-            
-            return widths
-        else:
-            # Muitas colunas (>10): super compacto
-            return [page_width / num_cols * 0.75] * num_cols
+        return stats
 
     def _create_footer_info(self, total_records):
         """Criar rodapé em português com identidade Moz Solidária"""
@@ -2045,200 +1300,173 @@ class ExportViewSet(viewsets.ViewSet):
 
     # === FUNÇÕES DE ANALYTICS AVANÇADO ===
     
+    def _analytics_queryset(self, model, date_range, **filters):
+        """Queryset base do analytics, respeitando o período solicitado"""
+        queryset = model.objects.filter(**filters)
+        if date_range.get('from'):
+            queryset = queryset.filter(created_at__gte=date_range['from'])
+        if date_range.get('to'):
+            queryset = queryset.filter(created_at__lte=date_range['to'])
+        return queryset
+    
+    def _analytics_summaries(self, date_range):
+        """Resumos calculados no banco para cada área do analytics"""
+        return {
+            'projects': QuerysetSummary(self._analytics_queryset(Project, date_range)),
+            'donations': QuerysetSummary(self._analytics_queryset(Donation, date_range)),
+            'volunteers': QuerysetSummary(self._analytics_queryset(VolunteerProfile, date_range)),
+            'beneficiaries': QuerysetSummary(
+                self._analytics_queryset(BeneficiaryProfile, date_range),
+                columns=BENEFICIARY_SUMMARY_COLUMNS,
+            ),
+        }
+    
     def _generate_consolidated_report(self, date_range):
         """Gerar relatório executivo consolidado com dados de todas as áreas"""
-        try:
-            # Coletar dados de todas as áreas
-            projects_data = self._get_projects_data('all')
-            donations_data = self._get_donations_data_detailed('all')
-            volunteers_data = self._get_volunteers_data_detailed('all')
-            beneficiaries_data = self._get_beneficiaries_data_detailed('all')
-            
-            # Consolidar métricas
-            consolidated_data = [
-                ['Área', 'Total de Registros', 'Status', 'Última Atualização', 'Observações'],
-                ['Projetos Sociais', len(projects_data), 'Ativo', timezone.now().strftime('%Y-%m-%d'), f'{len([p for p in projects_data if p.get("status") == "Ativo"])} projetos ativos'],
-                ['Contribuições', len(donations_data), 'Ativo', timezone.now().strftime('%Y-%m-%d'), f'Volume total processado'],
-                ['Voluntários', len(volunteers_data), 'Ativo', timezone.now().strftime('%Y-%m-%d'), f'{len([v for v in volunteers_data if v.get("status") == "Ativo"])} voluntários ativos'],
-                ['Beneficiários', len(beneficiaries_data), 'Ativo', timezone.now().strftime('%Y-%m-%d'), f'{sum([b.get("pessoas_impactadas", 0) for b in beneficiaries_data])} pessoas impactadas'],
-                ['', '', '', '', ''],
-                ['TOTAIS CONSOLIDADOS', '', '', '', ''],
-                ['Total de Projetos', len(projects_data), '', '', 'Portfólio ativo de iniciativas'],
-                ['Total de Doações', len(donations_data), '', '', 'Contribuições processadas'],
-                ['Total de Voluntários', len(volunteers_data), '', '', 'Força de trabalho voluntária'],
-                ['Total de Beneficiários', len(beneficiaries_data), '', '', 'Famílias assistidas diretamente'],
-                ['Impacto Total', sum([b.get("pessoas_impactadas", 0) for b in beneficiaries_data]), 'pessoas', '', 'Alcance comunitário direto']
-            ]
-            
-            return consolidated_data
-            
-        except Exception as e:
-            logger.error(f"Erro ao gerar relatório consolidado: {str(e)}")
-            return [
-                ['Área', 'Total de Registros', 'Status', 'Última Atualização', 'Observações'],
-                ['Projetos Sociais', '3', 'Ativo', '2024-08-12', '2 projetos ativos'],
-                ['Contribuições', '2', 'Ativo', '2024-08-12', 'Volume total processado'],
-                ['Voluntários', '2', 'Ativo', '2024-08-12', '2 voluntários ativos'],
-                ['Beneficiários', '10', 'Ativo', '2024-08-12', '65 pessoas impactadas'],
-                ['', '', '', '', ''],
-                ['TOTAIS CONSOLIDADOS', '', '', '', ''],
-                ['Total de Projetos', '3', '', '', 'Portfólio ativo de iniciativas'],
-                ['Total de Doações', '2', '', '', 'Contribuições processadas'],
-                ['Total de Voluntários', '2', '', '', 'Força de trabalho voluntária'],
-                ['Total de Beneficiários', '10', '', '', 'Famílias assistidas diretamente'],
-                ['Impacto Total', '65', 'pessoas', '', 'Alcance comunitário direto']
-            ]
+        summaries = self._analytics_summaries(date_range)
+        projects = summaries['projects']
+        donations = summaries['donations']
+        volunteers = summaries['volunteers']
+        beneficiaries = summaries['beneficiaries']
+        
+        today = timezone.now().strftime('%Y-%m-%d')
+        active_projects = projects.distribution('status').get('active', 0)
+        active_volunteers = volunteers.distribution('is_active').get(True, 0)
+        total_impact = beneficiaries.sum('pessoas_impactadas')
+        
+        return [
+            ['Área', 'Total de Registros', 'Status', 'Última Atualização', 'Observações'],
+            ['Projetos Sociais', projects.total, 'Ativo', today, f'{active_projects} projetos ativos'],
+            ['Contribuições', donations.total, 'Ativo', today, f'MZN {donations.sum("amount"):,.2f} processados'],
+            ['Voluntários', volunteers.total, 'Ativo', today, f'{active_volunteers} voluntários ativos'],
+            ['Beneficiários', beneficiaries.total, 'Ativo', today, f'{total_impact} pessoas impactadas'],
+            ['', '', '', '', ''],
+            ['TOTAIS CONSOLIDADOS', '', '', '', ''],
+            ['Total de Projetos', projects.total, '', '', 'Portfólio ativo de iniciativas'],
+            ['Total de Doações', donations.total, '', '', 'Contribuições processadas'],
+            ['Total de Voluntários', volunteers.total, '', '', 'Força de trabalho voluntária'],
+            ['Total de Beneficiários', beneficiaries.total, '', '', 'Famílias assistidas diretamente'],
+            ['Impacto Total', total_impact, 'pessoas', '', 'Alcance comunitário direto']
+        ]
 
     def _generate_impact_analysis(self, date_range):
         """Gerar análise de impacto cross-funcional"""
-        try:
-            beneficiaries_data = self._get_beneficiaries_data_detailed('all')
-            projects_data = self._get_projects_data('all')
-            
-            # Análise de impacto por localização
-            locations = {}
-            for beneficiary in beneficiaries_data:
-                loc = beneficiary.get('localizacao', 'N/A')
-                if loc not in locations:
-                    locations[loc] = {'beneficiarios': 0, 'pessoas_impactadas': 0}
-                locations[loc]['beneficiarios'] += 1
-                locations[loc]['pessoas_impactadas'] += beneficiary.get('pessoas_impactadas', 0)
-            
-            impact_data = [
-                ['Localização', 'Famílias Beneficiárias', 'Pessoas Impactadas', 'Densidade de Impacto', 'Categoria de Prioridade'],
-            ]
-            
-            for loc, data in locations.items():
-                densidade = data['pessoas_impactadas'] / max(data['beneficiarios'], 1)
-                categoria = 'Alta' if densidade > 6 else 'Média' if densidade > 4 else 'Baixa'
-                impact_data.append([
-                    loc,
-                    data['beneficiarios'],
-                    data['pessoas_impactadas'],
-                    f'{densidade:.1f} pessoas/família',
-                    categoria
-                ])
-            
-            return impact_data
-            
-        except Exception as e:
-            logger.error(f"Erro ao gerar análise de impacto: {str(e)}")
-            return [
-                ['Localização', 'Famílias Beneficiárias', 'Pessoas Impactadas', 'Densidade de Impacto', 'Categoria de Prioridade'],
-                ['Pemba, Cabo Delgado', '2', '12', '6.0 pessoas/família', 'Alta'],
-                ['Montepuez, Cabo Delgado', '1', '7', '7.0 pessoas/família', 'Alta'],
-                ['Chiúre, Cabo Delgado', '1', '4', '4.0 pessoas/família', 'Baixa'],
-                ['Mecúfi, Cabo Delgado', '1', '9', '9.0 pessoas/família', 'Alta'],
-                ['Ancuabe, Cabo Delgado', '1', '6', '6.0 pessoas/família', 'Média']
-            ]
+        beneficiaries = self._analytics_summaries(date_range)['beneficiaries']
+        
+        impact_data = [
+            ['Localização', 'Famílias Beneficiárias', 'Pessoas Impactadas', 'Densidade de Impacto', 'Categoria de Prioridade'],
+        ]
+        
+        # Análise de impacto por localização
+        locations = beneficiaries.grouped_sum('localizacao', 'pessoas_impactadas')
+        for loc, (families, people) in sorted(locations.items(), key=lambda item: -item[1][1]):
+            densidade = people / max(families, 1)
+            categoria = 'Alta' if densidade > 6 else 'Média' if densidade > 4 else 'Baixa'
+            impact_data.append([
+                loc,
+                families,
+                people,
+                f'{densidade:.1f} pessoas/família',
+                categoria
+            ])
+        
+        return impact_data
 
     def _generate_performance_metrics(self, date_range):
         """Gerar métricas de performance organizacional"""
-        try:
-            projects_data = self._get_projects_data('all')
-            donations_data = self._get_donations_data_detailed('all')
-            volunteers_data = self._get_volunteers_data_detailed('all')
-            beneficiaries_data = self._get_beneficiaries_data_detailed('all')
-            
-            # Calcular KPIs organizacionais
-            total_projects = len(projects_data)
-            active_projects = len([p for p in projects_data if p.get('status') == 'Ativo'])
-            total_volunteers = len(volunteers_data)
-            active_volunteers = len([v for v in volunteers_data if v.get('status') == 'Ativo'])
-            total_beneficiaries = len(beneficiaries_data)
-            verified_beneficiaries = len([b for b in beneficiaries_data if b.get('status') == 'Verificado'])
-            total_impact = sum([b.get('pessoas_impactadas', 0) for b in beneficiaries_data])
-            
-            performance_data = [
-                ['Métrica', 'Valor Atual', 'Meta', 'Performance (%)', 'Status'],
-                ['Taxa de Projetos Ativos', f'{active_projects}/{total_projects}', '90%', f'{(active_projects/max(total_projects,1)*100):.1f}%', 'Excelente' if active_projects/max(total_projects,1) > 0.8 else 'Bom'],
-                ['Taxa de Voluntários Ativos', f'{active_volunteers}/{total_volunteers}', '85%', f'{(active_volunteers/max(total_volunteers,1)*100):.1f}%', 'Excelente' if active_volunteers/max(total_volunteers,1) > 0.8 else 'Bom'],
-                ['Taxa de Verificação de Beneficiários', f'{verified_beneficiaries}/{total_beneficiaries}', '95%', f'{(verified_beneficiaries/max(total_beneficiaries,1)*100):.1f}%', 'Excelente' if verified_beneficiaries/max(total_beneficiaries,1) > 0.9 else 'Bom'],
-                ['Impacto por Projeto', f'{total_impact/max(total_projects,1):.1f}', '20 pessoas', f'{(total_impact/max(total_projects,1)/20*100):.1f}%', 'Excelente'],
-                ['Eficiência Voluntário/Beneficiário', f'{total_beneficiaries/max(total_volunteers,1):.1f}', '5:1', f'{(total_beneficiaries/max(total_volunteers,1)/5*100):.1f}%', 'Excelente'],
-                ['', '', '', '', ''],
-                ['INDICADORES CONSOLIDADOS', '', '', '', ''],
-                ['Projetos Totais', str(total_projects), '', '', 'Portfolio atual'],
-                ['Voluntários Ativos', str(active_volunteers), '', '', 'Força de trabalho'],
-                ['Beneficiários Verificados', str(verified_beneficiaries), '', '', 'Base qualificada'],
-                ['Pessoas Impactadas', str(total_impact), '', '', 'Alcance direto']
-            ]
-            
-            return performance_data
-            
-        except Exception as e:
-            logger.error(f"Erro ao gerar métricas de performance: {str(e)}")
-            return [
-                ['Métrica', 'Valor Atual', 'Meta', 'Performance (%)', 'Status'],
-                ['Taxa de Projetos Ativos', '2/3', '90%', '66.7%', 'Bom'],
-                ['Taxa de Voluntários Ativos', '2/2', '85%', '100.0%', 'Excelente'],
-                ['Taxa de Verificação de Beneficiários', '8/10', '95%', '80.0%', 'Bom'],
-                ['Impacto por Projeto', '21.7', '20 pessoas', '108.3%', 'Excelente'],
-                ['Eficiência Voluntário/Beneficiário', '5.0', '5:1', '100.0%', 'Excelente']
-            ]
+        summaries = self._analytics_summaries(date_range)
+        
+        # Calcular KPIs organizacionais
+        total_projects = summaries['projects'].total
+        active_projects = summaries['projects'].distribution('status').get('active', 0)
+        total_volunteers = summaries['volunteers'].total
+        active_volunteers = summaries['volunteers'].distribution('is_active').get(True, 0)
+        total_beneficiaries = summaries['beneficiaries'].total
+        verified_beneficiaries = summaries['beneficiaries'].distribution('is_verified').get(True, 0)
+        total_impact = summaries['beneficiaries'].sum('pessoas_impactadas')
+        
+        return [
+            ['Métrica', 'Valor Atual', 'Meta', 'Performance (%)', 'Status'],
+            ['Taxa de Projetos Ativos', f'{active_projects}/{total_projects}', '90%', f'{(active_projects/max(total_projects,1)*100):.1f}%', 'Excelente' if active_projects/max(total_projects,1) > 0.8 else 'Bom'],
+            ['Taxa de Voluntários Ativos', f'{active_volunteers}/{total_volunteers}', '85%', f'{(active_volunteers/max(total_volunteers,1)*100):.1f}%', 'Excelente' if active_volunteers/max(total_volunteers,1) > 0.8 else 'Bom'],
+            ['Taxa de Verificação de Beneficiários', f'{verified_beneficiaries}/{total_beneficiaries}', '95%', f'{(verified_beneficiaries/max(total_beneficiaries,1)*100):.1f}%', 'Excelente' if verified_beneficiaries/max(total_beneficiaries,1) > 0.9 else 'Bom'],
+            ['Impacto por Projeto', f'{total_impact/max(total_projects,1):.1f}', '20 pessoas', f'{(total_impact/max(total_projects,1)/20*100):.1f}%', 'Excelente'],
+            ['Eficiência Voluntário/Beneficiário', f'{total_beneficiaries/max(total_volunteers,1):.1f}', '5:1', f'{(total_beneficiaries/max(total_volunteers,1)/5*100):.1f}%', 'Excelente'],
+            ['', '', '', '', ''],
+            ['INDICADORES CONSOLIDADOS', '', '', '', ''],
+            ['Projetos Totais', str(total_projects), '', '', 'Portfolio atual'],
+            ['Voluntários Ativos', str(active_volunteers), '', '', 'Força de trabalho'],
+            ['Beneficiários Verificados', str(verified_beneficiaries), '', '', 'Base qualificada'],
+            ['Pessoas Impactadas', str(total_impact), '', '', 'Alcance direto']
+        ]
 
     def _generate_trend_analysis(self, date_range):
-        """Gerar análise de tendências temporais"""
-        try:
-            # Simular dados de tendência baseados nos dados atuais
-            from datetime import datetime, timedelta
-            
-            today = datetime.now()
-            months = []
-            for i in range(6):
-                month_date = today - timedelta(days=30*i)
-                months.append(month_date.strftime('%Y-%m'))
-            
-            months.reverse()  # Ordem cronológica
-            
-            trend_data = [
-                ['Período', 'Novos Projetos', 'Novas Doações', 'Novos Voluntários', 'Novos Beneficiários', 'Tendência'],
-            ]
-            
-            # Simular tendências crescentes
-            base_projects = [1, 1, 2, 2, 2, 3]
-            base_donations = [1, 1, 1, 2, 2, 2]
-            base_volunteers = [1, 1, 1, 1, 2, 2]
-            base_beneficiaries = [3, 4, 5, 6, 8, 10]
-            
-            for i, month in enumerate(months):
-                trend = 'Crescimento' if i > 0 and base_beneficiaries[i] > base_beneficiaries[i-1] else 'Estável'
-                trend_data.append([
-                    month,
-                    base_projects[i],
-                    base_donations[i],
-                    base_volunteers[i],
-                    base_beneficiaries[i],
-                    trend
-                ])
-            
-            # Adicionar totais e projeções
-            trend_data.extend([
-                ['', '', '', '', '', ''],
-                ['TOTAIS ACUMULADOS', '', '', '', '', ''],
-                ['Total Projetos', sum(base_projects), '', '', '', 'Portfolio em crescimento'],
-                ['Total Doações', sum(base_donations), '', '', '', 'Financiamento sustentável'],
-                ['Total Voluntários', sum(base_volunteers), '', '', '', 'Equipe em expansão'],
-                ['Total Beneficiários', sum(base_beneficiaries), '', '', '', 'Impacto crescente'],
-                ['', '', '', '', '', ''],
-                ['PROJEÇÃO PRÓXIMO MÊS', '', '', '', '', ''],
-                ['Projetos Esperados', '1 novo', '', '', '', 'Baseado na tendência'],
-                ['Beneficiários Esperados', '12-15', '', '', '', 'Crescimento sustentado']
+        """Gerar análise de tendências temporais (últimos 6 meses)"""
+        today = timezone.localdate()
+        months = []
+        year, month = today.year, today.month
+        for _ in range(6):
+            months.append(date(year, month, 1))
+            year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+        months.reverse()  # Ordem cronológica
+        
+        trend_range = {'from': timezone.make_aware(datetime.combine(months[0], time.min))}
+        if date_range.get('to'):
+            trend_range['to'] = date_range['to']
+        summaries = {
+            area: QuerysetSummary(summary.queryset, columns={'mes': TruncMonth('created_at')})
+            for area, summary in self._analytics_summaries(trend_range).items()
+        }
+        counts = {
+            area: {
+                (value.date() if hasattr(value, 'date') else value): count
+                for value, count in summary.distribution('mes').items() if value
+            }
+            for area, summary in summaries.items()
+        }
+        series = {area: [counts[area].get(month_start, 0) for month_start in months] for area in counts}
+        
+        trend_data = [
+            ['Período', 'Novos Projetos', 'Novas Doações', 'Novos Voluntários', 'Novos Beneficiários', 'Tendência'],
+        ]
+        
+        beneficiaries = series['beneficiaries']
+        for i, month_start in enumerate(months):
+            if i == 0:
+                trend = 'Início'
+            elif beneficiaries[i] > beneficiaries[i-1]:
+                trend = 'Crescimento'
+            elif beneficiaries[i] < beneficiaries[i-1]:
+                trend = 'Queda'
+            else:
+                trend = 'Estável'
+            trend_data.append([
+                month_start.strftime('%Y-%m'),
+                series['projects'][i],
+                series['donations'][i],
+                series['volunteers'][i],
+                beneficiaries[i],
+                trend
             ])
-            
-            return trend_data
-            
-        except Exception as e:
-            logger.error(f"Erro ao gerar análise de tendências: {str(e)}")
-            return [
-                ['Período', 'Novos Projetos', 'Novas Doações', 'Novos Voluntários', 'Novos Beneficiários', 'Tendência'],
-                ['2024-03', '1', '1', '1', '3', 'Início'],
-                ['2024-04', '1', '1', '1', '4', 'Crescimento'],
-                ['2024-05', '2', '1', '1', '5', 'Crescimento'],
-                ['2024-06', '2', '2', '1', '6', 'Crescimento'],
-                ['2024-07', '2', '2', '2', '8', 'Crescimento'],
-                ['2024-08', '3', '2', '2', '10', 'Crescimento']
-            ]
+        
+        # Projeção: média dos últimos 3 meses
+        expected_projects = sum(series['projects'][-3:]) / 3
+        expected_beneficiaries = sum(beneficiaries[-3:]) / 3
+        
+        trend_data.extend([
+            ['', '', '', '', '', ''],
+            ['TOTAIS ACUMULADOS', '', '', '', '', ''],
+            ['Total Projetos', sum(series['projects']), '', '', '', 'Portfolio no período'],
+            ['Total Doações', sum(series['donations']), '', '', '', 'Financiamento no período'],
+            ['Total Voluntários', sum(series['volunteers']), '', '', '', 'Equipe no período'],
+            ['Total Beneficiários', sum(beneficiaries), '', '', '', 'Impacto no período'],
+            ['', '', '', '', '', ''],
+            ['PROJEÇÃO PRÓXIMO MÊS', '', '', '', '', ''],
+            ['Projetos Esperados', f'{expected_projects:.1f}', '', '', '', 'Média dos últimos 3 meses'],
+            ['Beneficiários Esperados', f'{expected_beneficiaries:.1f}', '', '', '', 'Média dos últimos 3 meses']
+        ])
+        
+        return trend_data
 
     # === MANTER FUNÇÕES DE DADOS EXISTENTES ===
     
@@ -2254,20 +1482,7 @@ class ExportViewSet(viewsets.ViewSet):
             elif export_type == 'pending':
                 projects = projects.filter(status='pending')
             
-            projects_data = []
-            for project in projects:
-                projects_data.append({
-                    'id': project.id,
-                    'nome': project.title,
-                    'categoria': project.category.name if hasattr(project, 'category') and project.category else 'N/A',
-                    'status': project.status,
-                    'descricao': project.description[:100] + '...' if len(project.description) > 100 else project.description,
-                    'data_criacao': project.created_at.strftime('%Y-%m-%d') if project.created_at else 'N/A',
-                    'data_atualizacao': project.updated_at.strftime('%Y-%m-%d') if project.updated_at else 'N/A',
-                    'orcamento_necessario': f"MZN {project.budget_needed:,.2f}" if hasattr(project, 'budget_needed') else 'N/A',
-                })
-            
-            return projects_data
+            return EXPORT_SCHEMAS['projects_detailed'].extract(projects)
             
         except Exception as e:
             logger.error(f"Erro ao buscar projetos: {str(e)}")
@@ -2365,7 +1580,7 @@ class ExportViewSet(viewsets.ViewSet):
     def _get_volunteers_data_detailed(self, export_type='all'):
         """Buscar dados detalhados de voluntários"""
         try:
-            volunteers = VolunteerProfile.objects.select_related('user').all()
+            volunteers = VolunteerProfile.objects.all()
             
             if export_type == 'active':
                 volunteers = volunteers.filter(is_active=True)
@@ -2374,27 +1589,7 @@ class ExportViewSet(viewsets.ViewSet):
             elif export_type == 'availability':
                 volunteers = volunteers.exclude(availability__isnull=True)
             
-            volunteers_data = []
-            for volunteer in volunteers:
-                # Converter todos os campos para string para evitar problemas de serialização
-                skills_names = [skill.name for skill in volunteer.skills.all()]
-                
-                volunteers_data.append({
-                    'id': volunteer.id,
-                    'nome': str(f"{volunteer.user.first_name} {volunteer.user.last_name}").strip() if volunteer.user else 'N/A',
-                    'email': str(volunteer.user.email) if volunteer.user else 'N/A',
-                    'telefone': str(volunteer.phone) if volunteer.phone else 'N/A',
-                    'habilidades': ', '.join(skills_names) if skills_names else 'Nenhuma habilidade cadastrada',
-                    'disponibilidade': str(volunteer.get_availability_display()) if volunteer.availability else 'N/A',
-                    'bio': str(volunteer.bio) if volunteer.bio else 'N/A',
-                    'max_horas_semana': volunteer.max_hours_per_week,
-                    'horas_contribuidas': volunteer.total_hours_contributed or 0,
-                    'nivel_voluntario': volunteer.volunteer_level,
-                    'data_cadastro': volunteer.created_at.strftime('%Y-%m-%d') if volunteer.created_at else 'N/A',
-                    'status': 'Ativo' if volunteer.is_active else 'Inativo'
-                })
-            
-            return volunteers_data
+            return EXPORT_SCHEMAS['volunteers_detailed'].extract(volunteers)
             
         except Exception as e:
             logger.error(f"Erro ao buscar voluntários: {str(e)}")
@@ -2433,7 +1628,7 @@ class ExportViewSet(viewsets.ViewSet):
     def _get_beneficiaries_data_detailed(self, export_type='all'):
         """Buscar dados detalhados de beneficiários"""
         try:
-            beneficiaries = BeneficiaryProfile.objects.select_related('user').all()
+            beneficiaries = BeneficiaryProfile.objects.all()
             
             if export_type == 'location':
                 beneficiaries = beneficiaries.exclude(district__isnull=True)
@@ -2444,51 +1639,7 @@ class ExportViewSet(viewsets.ViewSet):
                 # Para impacto, podemos usar o vulnerability_score
                 beneficiaries = beneficiaries.exclude(vulnerability_score=0)
             
-            beneficiaries_data = []
-            for beneficiary in beneficiaries:
-                # Buscar projetos relacionados através de support_requests
-                projetos_relacionados = []
-                if hasattr(beneficiary, 'support_requests'):
-                    projetos_relacionados = [req.title for req in beneficiary.support_requests.all()[:3]]  # Limitar a 3
-                
-                # Calcular pessoas impactadas baseado na família
-                pessoas_impactadas = beneficiary.family_members_count + (beneficiary.children_count or 0)
-                
-                # Montar localização completa
-                localizacao_completa = f"{beneficiary.district}, {beneficiary.province}"
-                if beneficiary.locality:
-                    localizacao_completa = f"{beneficiary.locality}, {localizacao_completa}"
-                
-                # Tipo baseado na situação de vulnerabilidade
-                tipo_beneficiario = "Família Vulnerável"
-                if beneficiary.is_displaced:
-                    tipo_beneficiario = "Família Deslocada"
-                elif beneficiary.has_chronic_illness:
-                    tipo_beneficiario = "Família com Necessidades Médicas"
-                elif beneficiary.children_count > 3:
-                    tipo_beneficiario = "Família Numerosa"
-                
-                # Status baseado na verificação
-                status_atual = "Verificado" if beneficiary.is_verified else "Pendente de Verificação"
-                
-                # Observações baseadas nas necessidades prioritárias
-                observacoes_texto = beneficiary.priority_needs if beneficiary.priority_needs else "Apoio social geral"
-                if beneficiary.additional_information:
-                    observacoes_texto += f" | {beneficiary.additional_information[:50]}..."
-                
-                beneficiaries_data.append({
-                    'id': beneficiary.id,
-                    'nome': beneficiary.full_name,
-                    'localizacao': localizacao_completa,
-                    'tipo': tipo_beneficiario,
-                    'pessoas_impactadas': pessoas_impactadas,
-                    'data_cadastro': beneficiary.created_at.strftime('%Y-%m-%d'),
-                    'projetos': ', '.join(projetos_relacionados) if projetos_relacionados else 'Avaliação inicial',
-                    'status': status_atual,
-                    'observacoes': observacoes_texto
-                })
-            
-            return beneficiaries_data
+            return EXPORT_SCHEMAS['beneficiaries_detailed'].extract(beneficiaries)
             
         except Exception as e:
             logger.error(f"Erro ao buscar beneficiários: {str(e)}")
@@ -0,0 +1,226 @@
+# backend/reports/management/commands/benchmark_exports.py
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+
+import django
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from beneficiaries.models import BeneficiaryProfile
+from blog.models import BlogPost
+from blog.views import BlogPostViewSet
+from core.models import Project
+from donations.models import Donation
+from volunteers.models import VolunteerProfile
+from reports import export_views, views
+
+
+EXPORT_TYPES = ['blog', 'projects', 'donations', 'volunteers', 'beneficiaries', 'partners']
+EXPORT_FORMATS = ['pdf', 'excel', 'csv', 'json']
+ANALYTICS_TYPES = ['consolidated', 'impact_analysis', 'performance_metrics', 'trend_analysis']
+
+
+def _consume(response):
+    """Renderiza/percorre a resposta como o servidor faria e devolve o tamanho em bytes"""
+    if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+        response.render()
+    if response.streaming:
+        size = sum(len(chunk) for chunk in response.streaming_content)
+    else:
+        size = len(response.content)
+    response.close()
+    return size
+
+
+class BenchmarkCase:
+    """Chamada a uma view DRF com a requisição já montada"""
+
+    def __init__(self, name, view, method, path, data=None, before=None):
+        self.name = name
+        self.view = view
+        self.method = method
+        self.path = path
+        self.data = data
+        self.before = before
+
+    def __call__(self, factory, user):
+        if self.before:
+            self.before(user)
+        if self.method == 'post':
+            request = factory.post(self.path, self.data, format='json')
+        else:
+            request = factory.get(self.path, self.data)
+        force_authenticate(request, user=user)
+        response = self.view(request)
+        return response.status_code, _consume(response)
+
+
+def _clear_dashboard_cache(user):
+    cache.delete(f'executive_dashboard_{user.id}')
+
+
+def build_cases():
+    generate = export_views.ExportViewSet.as_view({'post': 'generate'})
+    analytics = export_views.ExportViewSet.as_view({'post': 'advanced_analytics'})
+    cases = [
+        BenchmarkCase(
+            f'exports.{export_type}.{export_format}', generate, 'post', '/api/v1/reports/exports/generate/',
+            {'type': export_type, 'format': export_format, 'filename': f'benchmark_{export_type}'},
+        )
+        for export_type in EXPORT_TYPES
+        for export_format in EXPORT_FORMATS
+    ]
+    cases += [
+        BenchmarkCase(
+            f'analytics.{analytics_type}', analytics, 'post', '/api/v1/reports/exports/advanced_analytics/',
+            {'analytics_type': analytics_type, 'format': 'json'},
+        )
+        for analytics_type in ANALYTICS_TYPES
+    ]
+    cases += [
+        BenchmarkCase(
+            'reports.advanced_stats', views.ReportViewSet.as_view({'get': 'advanced_stats'}),
+            'get', '/api/v1/reports/reports/advanced_stats/', {'range': '6months'},
+        ),
+        BenchmarkCase(
+            'reports.executive_dashboard', views.ReportViewSet.as_view({'get': 'executive_dashboard'}),
+            'get', '/api/v1/reports/reports/executive_dashboard/', before=_clear_dashboard_cache,
+        ),
+        BenchmarkCase(
+            'blog.list', BlogPostViewSet.as_view({'get': 'list'}), 'get', '/api/v1/blog/posts/',
+        ),
+    ]
+    return cases
+
+
+class Command(BaseCommand):
+    help = 'Mede tempo, consultas SQL e pico de memória das exportações e relatórios e grava/compara uma baseline JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3, help='Repetições cronometradas de cada caso')
+        parser.add_argument('--only', nargs='+', default=[], help='Só casos cujo nome contém um destes trechos')
+        parser.add_argument('--username', help='Usuário autenticado nas requisições (padrão: primeiro superusuário)')
+        parser.add_argument('--output', default='export_benchmark.json', help='Arquivo JSON de resultados')
+        parser.add_argument('--compare', help='Baseline JSON anterior para comparação')
+        parser.add_argument(
+            '--tolerance', type=float, default=0.2,
+            help='Piora relativa aceita no tempo e na memória antes de acusar regressão (0.2 = 20%%)',
+        )
+        parser.add_argument('--fail-on-regression', action='store_true')
+
+    def handle(self, *args, **options):
+        user = self.get_user(options['username'])
+        factory = APIRequestFactory()
+        cases = [
+            case for case in build_cases()
+            if not options['only'] or any(part in case.name for part in options['only'])
+        ]
+        if not cases:
+            raise CommandError('Nenhum caso de benchmark corresponde a --only')
+
+        results = {}
+        for case in cases:
+            results[case.name] = self.measure(case, factory, user, options['runs'])
+
+        baseline = {
+            'generated_at': timezone.now().isoformat(),
+            'environment': {
+                'database': connection.vendor,
+                'django': django.get_version(),
+                'python': platform.python_version(),
+                'runs': options['runs'],
+            },
+            'dataset': {
+                'donations': Donation.objects.count(),
+                'volunteers': VolunteerProfile.objects.count(),
+                'beneficiaries': BeneficiaryProfile.objects.count(),
+                'projects': Project.objects.count(),
+                'posts': BlogPost.objects.count(),
+            },
+            'results': results,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            json.dump(baseline, output, indent=2, ensure_ascii=False)
+        self.stdout.write(f"Resultados gravados em {options['output']}")
+
+        if options['compare']:
+            regressions = self.compare(options['compare'], results, options['tolerance'])
+            if regressions and options['fail_on_regression']:
+                raise CommandError(f'{len(regressions)} regressões de desempenho: {", ".join(regressions)}')
+
+        self.stdout.write(self.style.SUCCESS(f'Benchmark concluído: {len(results)} casos'))
+
+    def get_user(self, username):
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f'Usuário "{username}" não encontrado')
+        user = User.objects.filter(is_superuser=True, is_active=True).order_by('id').first()
+        if user is None:
+            user = User.objects.create_superuser('benchmark_admin', 'benchmark@exemplo.org', None)
+        return user
+
+    def measure(self, case, factory, user, runs):
+        # Primeira execução: consultas e pico de memória (também aquece caches de import/estilos)
+        tracemalloc.start()
+        with CaptureQueriesContext(connection) as queries:
+            status_code, size = case(factory, user)
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        # Execuções cronometradas sem tracemalloc, que distorce o tempo
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            case(factory, user)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        result = {
+            'status': status_code,
+            'bytes': size,
+            'queries': len(queries.captured_queries),
+            'peak_memory_kib': round(peak / 1024, 1),
+            'wall_time_ms': round(statistics.median(timings), 2) if timings else None,
+            'wall_time_ms_runs': [round(timing, 2) for timing in timings],
+        }
+        self.stdout.write(
+            f"{case.name:<34} {status_code:>3}  {result['wall_time_ms'] or 0:>10.1f} ms  "
+            f"{result['queries']:>5} consultas  {result['peak_memory_kib']:>10.1f} KiB"
+        )
+        return result
+
+    def compare(self, path, results, tolerance):
+        try:
+            with open(path, encoding='utf-8') as baseline_file:
+                previous = json.load(baseline_file)['results']
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f'Baseline inválida ({path}): {e}')
+
+        regressions = []
+        self.stdout.write(f'Comparação com {path}:')
+        for name, current in results.items():
+            before = previous.get(name)
+            if before is None:
+                self.stdout.write(f'  {name}: sem baseline')
+                continue
+            problems = []
+            if current['queries'] > before['queries']:
+                problems.append(f"consultas {before['queries']} → {current['queries']}")
+            for metric, label in (('wall_time_ms', 'tempo'), ('peak_memory_kib', 'memória')):
+                if before.get(metric) and current.get(metric) and current[metric] > before[metric] * (1 + tolerance):
+                    problems.append(f'{label} {current[metric] / before[metric]:.2f}x')
+            if problems:
+                regressions.append(name)
+                self.stdout.write(self.style.WARNING(f"  {name}: {', '.join(problems)}"))
+        if not regressions:
+            self.stdout.write('  Nenhuma regressão')
+        return regressions
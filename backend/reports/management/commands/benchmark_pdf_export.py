@@ -0,0 +1,77 @@
+# backend/reports/management/commands/benchmark_pdf_export.py
+import random
+import statistics
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from reports.export_views import ExportViewSet
+
+
+DISTRICTS = ['Pemba', 'Montepuez', 'Chiúre', 'Mecúfi', 'Ancuabe', 'Balama', 'Namuno', 'Mueda']
+SKILLS = ['Design', 'Marketing', 'Programação', 'Saúde', 'Educação', 'Construção', 'Gestão de Projetos']
+
+
+def synthetic_rows(count, seed):
+    """Linhas no formato da exportação detalhada de voluntários"""
+    rng = random.Random(seed)
+    return [
+        {
+            'id': i + 1,
+            'nome': f'Voluntário Sintético {i + 1}',
+            'email': f'voluntario{i + 1}@exemplo.org',
+            'telefone': f'+258 84 {rng.randint(1000000, 9999999)}',
+            'habilidades': ', '.join(rng.sample(SKILLS, k=rng.randint(1, 4))),
+            'localizacao': f'{rng.choice(DISTRICTS)}, Cabo Delgado',
+            'horas_contribuidas': rng.randint(0, 600),
+            'data_cadastro': f'2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+            'status': rng.choice(['Ativo', 'Inativo']),
+        }
+        for i in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Mede tempo e pico de memória da exportação PDF para tabelas de tamanhos crescentes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000])
+        parser.add_argument('--seed', type=int, default=7)
+        parser.add_argument('--runs', type=int, default=3, help='Execuções cronometradas por tamanho (mediana)')
+
+    def handle(self, *args, **options):
+        view = ExportViewSet()
+        results = []
+        for count in options['rows']:
+            data = synthetic_rows(count, options['seed'])
+
+            # Primeira execução: só o pico de memória (com o tracemalloc a geração fica ~10x mais lenta)
+            tracemalloc.start()
+            response = view._generate_pdf(data, {}, f'benchmark_volunteers_{count}')
+            _current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            if response.status_code != 200:
+                self.stdout.write(self.style.ERROR(f'{count} linhas: falhou ({response.status_code})'))
+                return
+            size = int(response['Content-Length'])
+            response.close()
+
+            # Execuções cronometradas sem tracemalloc
+            timings = []
+            for _ in range(max(options['runs'], 1)):
+                started = time.perf_counter()
+                view._generate_pdf(data, {}, f'benchmark_volunteers_{count}').close()
+                timings.append(time.perf_counter() - started)
+            elapsed = statistics.median(timings)
+            results.append((count, elapsed))
+            self.stdout.write(
+                f'{count:>7} linhas: {elapsed:7.2f} s, {elapsed / count * 1e6:6.0f} µs/linha, '
+                f'pico {peak / 2**20:6.1f} MiB, PDF {size / 2**20:6.1f} MiB'
+            )
+
+        if len(results) > 1:
+            (first_count, first_time), (last_count, last_time) = results[0], results[-1]
+            ratio = (last_time / last_count) / (first_time / first_count)
+            self.stdout.write(f'Custo por linha ({last_count} vs {first_count}): {ratio:.2f}x')
+        self.stdout.write(self.style.SUCCESS('Benchmark de exportação PDF concluído'))
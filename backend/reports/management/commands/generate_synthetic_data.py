@@ -0,0 +1,345 @@
+# backend/reports/management/commands/generate_synthetic_data.py
+import math
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+
+from beneficiaries.models import BeneficiaryProfile
+from blog.models import BlogPost, Category, Tag
+from core.models import Program, Project, ProjectCategory
+from donations.ledger import rebuild_donor_ledgers
+from donations.models import Donation
+from volunteers.models import VolunteerProfile, VolunteerSkill
+
+
+# Distritos de Cabo Delgado com peso aproximado da população atendida
+DISTRICTS = [
+    ('Pemba', 18), ('Montepuez', 12), ('Mocímboa da Praia', 10), ('Chiúre', 9),
+    ('Metuge', 9), ('Ancuabe', 7), ('Macomia', 7), ('Mueda', 6), ('Palma', 6),
+    ('Quissanga', 4), ('Balama', 4), ('Namuno', 3), ('Meluco', 2), ('Nangade', 2),
+]
+LOCALITIES = ['Sede', 'Cimento', 'Natite', 'Paquitequete', 'Ingonane', 'Muxara', '']
+PRIORITY_NEEDS = [
+    'Alimentação', 'Abrigo', 'Saúde', 'Educação das crianças', 'Água potável',
+    'Documentação', 'Apoio psicossocial', 'Formação profissional',
+]
+PROJECT_WORDS = [
+    'Escola', 'Poço', 'Horta Comunitária', 'Centro de Saúde', 'Formação', 'Cozinha Solidária',
+    'Abrigo', 'Biblioteca', 'Saneamento', 'Microcrédito',
+]
+POST_WORDS = [
+    'Solidariedade', 'Cabo Delgado', 'Educação', 'Saúde', 'Voluntariado', 'Reconstrução',
+    'Comunidade', 'Esperança', 'Água', 'Nutrição',
+]
+
+
+def _weighted(pairs):
+    values, weights = zip(*pairs)
+    return list(values), list(weights)
+
+
+def _recent_datetime(rng, now, days):
+    """Data no período, mais densa perto do presente (crescimento da organização)"""
+    return now - timedelta(minutes=int(rng.triangular(0, days, 0) * 24 * 60))
+
+
+def _amount(rng):
+    """Valor de doação com cauda longa (log-normal em torno de ~1.100 MZN)"""
+    return Decimal(min(max(round(rng.lognormvariate(7, 1.2)), 50), 500000))
+
+
+class Command(BaseCommand):
+    help = 'Gera dados sintéticos em escala (doadores, doações, voluntários, beneficiários, projetos e posts) para benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--donors', type=int, default=1000)
+        parser.add_argument('--donations', type=int, default=10000)
+        parser.add_argument('--volunteers', type=int, default=2000)
+        parser.add_argument('--beneficiaries', type=int, default=5000)
+        parser.add_argument('--projects', type=int, default=200)
+        parser.add_argument('--posts', type=int, default=500)
+        parser.add_argument('--days', type=int, default=730, help='Período coberto pelas datas geradas')
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=7)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.now = timezone.now()
+        self.days = options['days']
+        self.batch_size = options['batch_size']
+        self.prefix = f"synthetic_{options['seed']}_{User.objects.count()}"
+
+        donor_ids = self.create_donors(options['donors'])
+        if donor_ids and options['donations']:
+            self.create_donations(options['donations'], donor_ids)
+        if options['volunteers']:
+            self.create_volunteers(options['volunteers'])
+        if options['beneficiaries']:
+            self.create_beneficiaries(options['beneficiaries'])
+        if options['projects']:
+            self.create_projects(options['projects'])
+        if options['posts']:
+            self.create_posts(options['posts'], donor_ids)
+
+        # bulk_create não dispara save()/sinais: recalcular os dados derivados
+        if donor_ids and options['donations']:
+            with transaction.atomic():
+                rebuild_donor_ledgers(donor_ids)
+        if options['beneficiaries']:
+            call_command('recompute_vulnerability_scores', stdout=self.stdout)
+        if options['volunteers']:
+            call_command('recompute_volunteer_stats', batch_size=self.batch_size, stdout=self.stdout)
+
+        self.stdout.write(self.style.SUCCESS('Dados sintéticos gerados com sucesso!'))
+
+    def batches(self, total):
+        for offset in range(0, total, self.batch_size):
+            yield offset, min(self.batch_size, total - offset)
+
+    def create_users(self, kind, offset, count, first_name):
+        users = User.objects.bulk_create([
+            User(
+                username=f'{self.prefix}_{kind}_{offset + i}',
+                email=f'{kind}{offset + i}@{self.prefix}.exemplo.org',
+                first_name=first_name,
+                last_name=str(offset + i),
+                password='!',
+                date_joined=_recent_datetime(self.rng, self.now, self.days),
+            )
+            for i in range(count)
+        ])
+        if users[0].pk is None:
+            users = list(User.objects.filter(
+                username__in=[user.username for user in users]
+            ).order_by('id'))
+        return users
+
+    def backdate(self, model, objects, field='created_at'):
+        """Espalha ``created_at`` (auto_now_add) no período após a inserção"""
+        if not objects or objects[0].pk is None:
+            return
+        for obj in objects:
+            setattr(obj, field, _recent_datetime(self.rng, self.now, self.days))
+        model.objects.bulk_update(objects, [field], batch_size=self.batch_size)
+
+    def create_donors(self, total):
+        donor_ids = []
+        for offset, count in self.batches(total):
+            with transaction.atomic():
+                donor_ids.extend(user.pk for user in self.create_users('donor', offset, count, 'Doador'))
+        self.stdout.write(f'  ✓ {total} doadores')
+        return donor_ids
+
+    def create_donations(self, total, donor_ids):
+        # Poucos doadores recorrentes concentram a maior parte das doações (Pareto)
+        weights = [1.0 / (rank + 1) ** 0.8 for rank in range(len(donor_ids))]
+        statuses, status_weights = _weighted([
+            ('approved', 60), ('completed', 5), ('pending', 12), ('submitted', 10),
+            ('under_review', 8), ('rejected', 5),
+        ])
+        methods = [choice for choice, _label in Donation.PAYMENT_METHOD_CHOICES]
+
+        for offset, count in self.batches(total):
+            donations = []
+            for donor_id in self.rng.choices(donor_ids, weights=weights, k=count):
+                status = self.rng.choices(statuses, weights=status_weights)[0]
+                donations.append(Donation(
+                    donor_id=donor_id,
+                    amount=_amount(self.rng),
+                    payment_method=self.rng.choice(methods),
+                    status=status,
+                    purpose=self.rng.choice(['', 'Educação', 'Saúde', 'Emergência', 'Alimentação']),
+                    is_anonymous=self.rng.random() < 0.1,
+                ))
+            with transaction.atomic():
+                created = Donation.objects.bulk_create(donations)
+                self.backdate(Donation, created)
+                for donation in created:
+                    donation.submission_date = donation.created_at
+                    if donation.status in ('approved', 'completed'):
+                        donation.approval_date = donation.created_at + timedelta(days=self.rng.randint(0, 5))
+                if created[0].pk is not None:
+                    Donation.objects.bulk_update(
+                        created, ['submission_date', 'approval_date'], batch_size=self.batch_size
+                    )
+        self.stdout.write(f'  ✓ {total} doações')
+
+    def create_volunteers(self, total):
+        skill_ids = list(VolunteerSkill.objects.values_list('id', flat=True))
+        if not skill_ids:
+            skill_ids = [
+                VolunteerSkill.objects.create(name=name, category=category).pk
+                for name, category in [
+                    ('Ensino', 'education'), ('Enfermagem', 'healthcare'), ('Construção', 'construction'),
+                    ('Programação', 'technical'), ('Administração', 'administrative'), ('Culinária', 'other'),
+                ]
+            ]
+        # Poucas habilidades muito comuns (Zipf)
+        skill_weights = [1.0 / (rank + 1) for rank in range(len(skill_ids))]
+        districts, district_weights = _weighted(DISTRICTS)
+        SkillLink = VolunteerProfile.skills.through
+
+        for offset, count in self.batches(total):
+            with transaction.atomic():
+                users = self.create_users('volunteer', offset, count, 'Voluntário')
+                profiles = VolunteerProfile.objects.bulk_create([
+                    VolunteerProfile(
+                        user=user,
+                        phone=f'+258 84 {self.rng.randint(1000000, 9999999)}',
+                        address=f'{self.rng.choices(districts, weights=district_weights)[0]}, Cabo Delgado',
+                        availability=self.rng.choice(['weekdays', 'weekends', 'evenings', 'flexible']),
+                        max_hours_per_week=self.rng.randint(2, 30),
+                        is_active=self.rng.random() < 0.85,
+                    )
+                    for user in users
+                ])
+                if profiles[0].pk is None:
+                    profiles = list(VolunteerProfile.objects.filter(user__in=users).order_by('id'))
+                self.backdate(VolunteerProfile, profiles)
+                links = []
+                for profile in profiles:
+                    chosen = set(self.rng.choices(skill_ids, weights=skill_weights, k=self.rng.randint(0, 5)))
+                    links.extend(
+                        SkillLink(volunteerprofile_id=profile.pk, volunteerskill_id=skill_id)
+                        for skill_id in chosen
+                    )
+                SkillLink.objects.bulk_create(links)
+        self.stdout.write(f'  ✓ {total} voluntários')
+
+    def create_beneficiaries(self, total):
+        districts, district_weights = _weighted(DISTRICTS)
+        genders, gender_weights = _weighted([('F', 55), ('M', 43), ('O', 1), ('N', 1)])
+        education = [choice for choice, _label in BeneficiaryProfile.EDUCATION_CHOICES]
+        employment = [choice for choice, _label in BeneficiaryProfile.EMPLOYMENT_CHOICES]
+        family_status = [choice for choice, _label in BeneficiaryProfile.FAMILY_STATUS_CHOICES]
+        today = date.today()
+
+        for offset, count in self.batches(total):
+            with transaction.atomic():
+                users = self.create_users('beneficiary', offset, count, 'Beneficiário')
+                profiles = []
+                for user in users:
+                    district = self.rng.choices(districts, weights=district_weights)[0]
+                    # Famílias de 1 a ~15 membros, média perto de 6
+                    members = max(1, min(15, round(self.rng.gauss(6, 2.5))))
+                    children = self.rng.randint(0, max(0, members - 1))
+                    displaced = self.rng.random() < 0.35
+                    profiles.append(BeneficiaryProfile(
+                        user=user,
+                        full_name=f'Beneficiário Sintético {user.last_name}',
+                        date_of_birth=today - timedelta(days=self.rng.randint(18 * 365, 75 * 365)),
+                        gender=self.rng.choices(genders, weights=gender_weights)[0],
+                        phone_number=f'+258 86 {self.rng.randint(1000000, 9999999)}',
+                        district=district,
+                        administrative_post=f'{district} Sede',
+                        locality=self.rng.choice(LOCALITIES),
+                        education_level=self.rng.choice(education),
+                        employment_status=self.rng.choice(employment),
+                        monthly_income=Decimal(self.rng.randint(0, 15000)) if self.rng.random() < 0.6 else None,
+                        family_status=self.rng.choice(family_status),
+                        family_members_count=members,
+                        children_count=children,
+                        elderly_count=self.rng.randint(0, 2),
+                        disabled_count=1 if self.rng.random() < 0.08 else 0,
+                        is_displaced=displaced,
+                        displacement_reason='Conflito armado' if displaced else '',
+                        has_chronic_illness=self.rng.random() < 0.15,
+                        priority_needs=', '.join(self.rng.sample(PRIORITY_NEEDS, k=self.rng.randint(1, 3))),
+                        is_verified=self.rng.random() < 0.6,
+                    ))
+                profiles = BeneficiaryProfile.objects.bulk_create(profiles)
+                self.backdate(BeneficiaryProfile, profiles)
+        self.stdout.write(f'  ✓ {total} beneficiários')
+
+    def create_projects(self, total):
+        program = Program.objects.first() or Program.objects.create(
+            name='Programa Sintético', slug=f'{self.prefix}-programa',
+            description='Programa gerado para benchmarks', short_description='Benchmarks',
+        )
+        categories = list(ProjectCategory.objects.all()) or [
+            ProjectCategory.objects.create(name=name, slug=f'{self.prefix}-{slugify(name)}', program=program)
+            for name in ['Educação', 'Saúde', 'Infraestrutura', 'Emergência', 'Meios de Vida']
+        ]
+        statuses, status_weights = _weighted([
+            ('active', 45), ('planning', 20), ('completed', 30), ('suspended', 5),
+        ])
+        districts, district_weights = _weighted(DISTRICTS)
+
+        for offset, count in self.batches(total):
+            projects = []
+            for i in range(offset, offset + count):
+                name = f'{self.rng.choice(PROJECT_WORDS)} Sintético {i}'
+                district = self.rng.choices(districts, weights=district_weights)[0]
+                target = self.rng.randint(50, 5000)
+                budget = Decimal(round(self.rng.lognormvariate(13, 1)))
+                projects.append(Project(
+                    name=name,
+                    slug=f'{self.prefix}-projeto-{i}',
+                    description=f'Projeto {name} em {district}',
+                    short_description=f'Projeto em {district}',
+                    meta_title=name,
+                    program=program,
+                    category=self.rng.choice(categories),
+                    location=f'{district}, Cabo Delgado',
+                    district=district,
+                    province='Cabo Delgado',
+                    status=self.rng.choices(statuses, weights=status_weights)[0],
+                    priority=self.rng.choice(['low', 'medium', 'high', 'urgent']),
+                    start_date=(self.now - timedelta(days=self.rng.randint(0, self.days))).date(),
+                    progress_percentage=self.rng.randint(0, 100),
+                    target_beneficiaries=target,
+                    current_beneficiaries=self.rng.randint(0, target),
+                    budget=budget,
+                    raised_amount=(budget * Decimal(self.rng.random())).quantize(Decimal('0.01')),
+                ))
+            with transaction.atomic():
+                self.backdate(Project, Project.objects.bulk_create(projects))
+        self.stdout.write(f'  ✓ {total} projetos')
+
+    def create_posts(self, total, author_ids):
+        author_ids = list(
+            User.objects.filter(is_staff=True).values_list('id', flat=True)[:5]
+        ) or author_ids[:5] or [self.create_users('author', 0, 1, 'Autor')[0].pk]
+        categories = [
+            Category.objects.get_or_create(name=name, defaults={'slug': slugify(name)})[0]
+            for name in ['Notícias', 'Histórias', 'Projetos', 'Eventos']
+        ]
+        tags = list(Tag.objects.all()[:20])
+        statuses, status_weights = _weighted([('published', 80), ('draft', 15), ('archived', 5)])
+        TagLink = BlogPost.tags.through
+
+        for offset, count in self.batches(total):
+            posts = []
+            for i in range(offset, offset + count):
+                title = ' '.join(self.rng.sample(POST_WORDS, k=3)) + f' {i}'
+                words = self.rng.randint(300, 2000)
+                status = self.rng.choices(statuses, weights=status_weights)[0]
+                posts.append(BlogPost(
+                    title=title,
+                    slug=f'{self.prefix}-post-{i}',
+                    excerpt=f'Resumo de {title}',
+                    content=' '.join(self.rng.choices(POST_WORDS, k=words)),
+                    author_id=self.rng.choice(author_ids),
+                    category=self.rng.choice(categories),
+                    status=status,
+                    published_at=_recent_datetime(self.rng, self.now, self.days) if status == 'published' else None,
+                    views_count=int(self.rng.paretovariate(1.2) * 20),
+                    read_time=math.ceil(words / 200),
+                ))
+            with transaction.atomic():
+                posts = BlogPost.objects.bulk_create(posts)
+                self.backdate(BlogPost, posts)
+                if tags and posts[0].pk is not None:
+                    TagLink.objects.bulk_create([
+                        TagLink(blogpost_id=post.pk, tag_id=tag.pk)
+                        for post in posts
+                        for tag in self.rng.sample(tags, k=min(len(tags), self.rng.randint(0, 3)))
+                    ])
+        self.stdout.write(f'  ✓ {total} posts')
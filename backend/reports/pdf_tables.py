@@ -0,0 +1,316 @@
+# backend/reports/pdf_tables.py
+"""
+Motor de tabelas PDF das exportações.
+
+A tabela é dividida em blocos de tamanho fixo (``ROWS_PER_CHUNK`` linhas),
+cada um montado só quando o ``reportlab`` chega nele e descartado depois de
+desenhado: o custo de quebra de página fica limitado ao bloco e a memória
+não cresce com o número de linhas. As larguras das colunas são calculadas
+uma vez, a partir de uma amostra dos dados; células que cabem numa linha
+viram texto simples e só as demais usam ``Paragraph`` (com estilo em cache).
+"""
+from datetime import datetime
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import Flowable, Paragraph, Table, TableStyle
+
+
+ROWS_PER_CHUNK = 100
+WIDTH_SAMPLE_SIZE = 200
+MIN_COLUMN_WIDTH = 1.2 * cm
+
+CELL_FONT = 'Helvetica'
+CELL_FONT_SIZE = 7
+HEADER_FONT = 'Helvetica-Bold'
+HEADER_FONT_SIZE = 8
+CELL_PADDING = 4
+
+# Mapeamento de nomes técnicos para nomes amigáveis
+HEADER_MAP = {
+    'id': 'ID',
+    'nome': 'Nome Completo',
+    'email': 'Endereço de E-mail',
+    'categoria': 'Categoria do Projeto',
+    'status': 'Status Atual',
+    'valor': 'Valor em MZN',
+    'data': 'Data de Registro',
+    'projeto': 'Nome do Projeto',
+    'doador': 'Nome do Doador',
+    'metodo': 'Método de Pagamento',
+    'localizacao': 'Localização Geográfica',
+    'data_inicio': 'Data de Início',
+    'data_fim': 'Data de Finalização',
+    'orcamento': 'Orçamento Aprovado',
+    'responsavel': 'Responsável Técnico',
+    'progresso': 'Percentual de Progresso',
+    'habilidades': 'Habilidades e Competências',
+    'disponibilidade': 'Disponibilidade de Horário',
+    'projetos': 'Projetos Participantes',
+    'pessoas_impactadas': 'Pessoas Impactadas',
+    'tipo_beneficio': 'Tipo de Benefício Oferecido',
+    'data_cadastro': 'Data de Cadastro no Sistema',
+    'descricao': 'Descrição Detalhada',
+    'observacoes': 'Observações e Comentários',
+    'endereco': 'Endereço Completo',
+    'telefone': 'Número de Telefone',
+    'organizacao': 'Organização de Origem',
+    'area_atuacao': 'Área de Atuação Principal'
+}
+
+
+@lru_cache(maxsize=None)
+def format_header(header):
+    """Nome amigável da coluna, quebrado em até duas linhas"""
+    friendly_name = HEADER_MAP.get(header.lower(), header.replace('_', ' ').title())
+
+    if len(friendly_name) > 12:
+        words = friendly_name.split()
+        if len(words) > 2:
+            mid_point = len(words) // 2
+            line1 = ' '.join(words[:mid_point])
+            line2 = ' '.join(words[mid_point:])
+            if len(line1) > 18:
+                line1 = line1[:16] + ".."
+            if len(line2) > 18:
+                line2 = line2[:16] + ".."
+            return f"{line1}\n{line2}"
+        elif len(words) == 2:
+            return f"{words[0]}\n{words[1]}"
+        elif len(words) == 1 and len(friendly_name) > 15:
+            mid = len(friendly_name) // 2
+            return f"{friendly_name[:mid]}-\n{friendly_name[mid:]}"
+
+    return friendly_name
+
+
+class ColumnFormat:
+    """Regras de formatação de uma coluna, derivadas do nome uma única vez"""
+
+    __slots__ = ('is_date', 'truncate_only', 'max_length', 'max_line_length')
+
+    def __init__(self, header):
+        header_lower = header.lower()
+        self.is_date = 'data' in header_lower
+        self.truncate_only = False
+        self.max_line_length = None
+        if any(keyword in header_lower for keyword in ['id', 'código', 'num']):
+            # IDs e códigos: sem quebra, manter compacto
+            self.truncate_only = True
+            self.max_length = 10
+        elif any(keyword in header_lower for keyword in ['nome', 'title', 'titulo']):
+            self.max_length, self.max_line_length = 30, 15
+        elif any(keyword in header_lower for keyword in ['descri', 'observ', 'coment', 'habilidades']):
+            self.max_length, self.max_line_length = 50, 25
+        elif any(keyword in header_lower for keyword in ['email', 'endereço']):
+            self.max_length, self.max_line_length = 35, 18
+        else:
+            self.max_length, self.max_line_length = 25, 13
+
+    def format(self, value):
+        """Texto da célula, com até três linhas"""
+        if not value or value == 'None':
+            return 'N/A'
+
+        if self.is_date and 'T' in value:
+            try:
+                return datetime.fromisoformat(value.replace('Z', '+00:00')).strftime('%d/%m/%Y')
+            except ValueError:
+                pass
+
+        if len(value) <= self.max_length:
+            return value
+        if self.truncate_only:
+            return value[:self.max_length - 2] + ".."
+
+        max_line_length = self.max_line_length
+        lines = []
+        current_line = ""
+        for word in value.split():
+            # Palavra sozinha maior que a linha é cortada
+            if len(word) > max_line_length:
+                if current_line:
+                    lines.append(current_line)
+                    current_line = ""
+                lines.append(word[:max_line_length - 2] + "..")
+                continue
+            if len(current_line + " " + word) <= max_line_length:
+                current_line += (" " + word) if current_line else word
+            else:
+                if current_line:
+                    lines.append(current_line)
+                current_line = word
+        if current_line:
+            lines.append(current_line)
+
+        if len(lines) > 3:
+            remaining = " ".join(lines[2:])
+            if len(remaining) > max_line_length:
+                remaining = remaining[:max_line_length - 2] + ".."
+            lines = lines[:2] + [remaining]
+        return "\n".join(lines)
+
+
+@lru_cache(maxsize=None)
+def cell_style():
+    return ParagraphStyle(
+        'ExportCellStyle',
+        fontName=CELL_FONT,
+        fontSize=CELL_FONT_SIZE,
+        leading=8,
+        textColor=colors.HexColor('#374151'),
+        wordWrap='LTR',
+        alignment=0,
+        splitLongWords=1,
+        allowWidows=0,
+        allowOrphans=0
+    )
+
+
+@lru_cache(maxsize=None)
+def table_style(highlight_first_column):
+    """Estilo corporativo da tabela (compartilhado por todos os blocos)"""
+    primary_blue = colors.HexColor('#1E40AF')
+    light_gray = colors.HexColor('#6B7280')
+    border_color = colors.HexColor('#E5E7EB')
+    style = TableStyle([
+        # Cabeçalho
+        ('BACKGROUND', (0, 0), (-1, 0), primary_blue),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), HEADER_FONT),
+        ('FONTSIZE', (0, 0), (-1, 0), HEADER_FONT_SIZE),
+        ('LEADING', (0, 0), (-1, 0), 9),
+        ('TOPPADDING', (0, 0), (-1, 0), 6),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+        # Corpo
+        ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor('#374151')),
+        ('FONTNAME', (0, 1), (-1, -1), CELL_FONT),
+        ('FONTSIZE', (0, 1), (-1, -1), CELL_FONT_SIZE),
+        ('LEADING', (0, 1), (-1, -1), 8),
+        ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+        ('LEFTPADDING', (0, 0), (-1, -1), CELL_PADDING),
+        ('RIGHTPADDING', (0, 0), (-1, -1), CELL_PADDING),
+        ('TOPPADDING', (0, 1), (-1, -1), 4),
+        ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
+        # Bordas e alternância de cores
+        ('GRID', (0, 0), (-1, -1), 0.5, border_color),
+        ('BOX', (0, 0), (-1, -1), 1, light_gray),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.HexColor('#FAFAFA'), colors.HexColor('#F5F5F5')]),
+    ])
+    if highlight_first_column:
+        style.add('BACKGROUND', (0, 1), (0, -1), colors.HexColor('#F3F4F6'))
+        style.add('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold')
+        style.add('ALIGN', (0, 1), (0, -1), 'CENTER')
+    return style
+
+
+def _text_width(text, font, size):
+    return max(stringWidth(line, font, size) for line in text.split('\n'))
+
+
+def _fit_widths(natural, minimum, available):
+    """Ajusta as larguras à página: sobra é distribuída, falta sai do que excede o mínimo"""
+    total = sum(natural)
+    if total <= available:
+        return [width * available / total for width in natural]
+    floor = sum(minimum)
+    if floor >= available:
+        return [width * available / floor for width in minimum]
+    ratio = (available - floor) / (total - floor)
+    return [low + (width - low) * ratio for width, low in zip(natural, minimum)]
+
+
+class TableLayout:
+    """Colunas, formatação e larguras da tabela, calculadas uma vez por exportação"""
+
+    def __init__(self, headers, rows, available_width, sample_size=WIDTH_SAMPLE_SIZE):
+        self.headers = list(headers)
+        self.formats = [ColumnFormat(header) for header in self.headers]
+        self.header_row = [format_header(header) for header in self.headers]
+        self.widths = self._measure(rows, available_width, sample_size)
+        self.text_limits = [width - 2 * CELL_PADDING for width in self.widths]
+        self.style = table_style(len(self.headers) > 1)
+
+    def _measure(self, rows, available_width, sample_size):
+        # Amostra espaçada ao longo dos dados
+        step = max(len(rows) // sample_size, 1)
+        sample = rows[::step][:sample_size]
+        natural, minimum = [], []
+        for index, header in enumerate(self.headers):
+            header_width = _text_width(self.header_row[index], HEADER_FONT, HEADER_FONT_SIZE)
+            widths = sorted(
+                _text_width(self.format_value(index, row.get(header, 'N/A')), CELL_FONT, CELL_FONT_SIZE)
+                for row in sample
+            )
+            # Percentil 90: um valor muito longo não alarga a coluna inteira
+            content_width = widths[int((len(widths) - 1) * 0.9)] if widths else 0
+            low = max(header_width, MIN_COLUMN_WIDTH) + 2 * CELL_PADDING
+            minimum.append(low)
+            natural.append(max(content_width + 2 * CELL_PADDING, low))
+        return _fit_widths(natural, minimum, available_width)
+
+    def format_value(self, index, value):
+        return self.formats[index].format(str(value) if value is not None else 'N/A')
+
+    def cell(self, index, value):
+        text = self.format_value(index, value)
+        if '\n' not in text and stringWidth(text, CELL_FONT, CELL_FONT_SIZE) <= self.text_limits[index]:
+            return text
+        return Paragraph(escape(text).replace('\n', '<br/>'), cell_style())
+
+    def build_table(self, rows):
+        data = [self.header_row]
+        for row in rows:
+            data.append([self.cell(index, row.get(header, 'N/A')) for index, header in enumerate(self.headers)])
+        table = Table(data, colWidths=self.widths, repeatRows=1)
+        table.setStyle(self.style)
+        table.hAlign = 'CENTER'
+        return table
+
+
+class TableChunk(Flowable):
+    """Bloco de linhas montado sob demanda e liberado após o desenho"""
+
+    def __init__(self, layout, rows, start, stop):
+        super().__init__()
+        self.layout = layout
+        self.rows = rows
+        self.start = start
+        self.stop = stop
+        self.hAlign = 'CENTER'
+        self._table = None
+
+    def _get_table(self):
+        if self._table is None:
+            self._table = self.layout.build_table(self.rows[self.start:self.stop])
+        return self._table
+
+    def wrap(self, available_width, available_height):
+        return self._get_table().wrap(available_width, available_height)
+
+    def split(self, available_width, available_height):
+        # As partes substituem o bloco na história; a tabela inteira não é mais necessária
+        table = self._get_table()
+        self._table = None
+        return table.split(available_width, available_height)
+
+    def drawOn(self, canvas, x, y, _sW=0):
+        self._get_table().drawOn(canvas, x, y, _sW)
+        self._table = None
+
+
+def table_flowables(rows, available_width, rows_per_chunk=ROWS_PER_CHUNK):
+    """Blocos da tabela de ``rows`` (lista de dicts com as mesmas chaves)"""
+    if not rows or not isinstance(rows[0], dict) or not rows[0]:
+        return []
+    layout = TableLayout(rows[0].keys(), rows, available_width)
+    return [
+        TableChunk(layout, rows, start, min(start + rows_per_chunk, len(rows)))
+        for start in range(0, len(rows), rows_per_chunk)
+    ]
@@ -0,0 +1,184 @@
+# backend/reports/summary.py
+"""
+Motor de resumos das exportações e do analytics avançado.
+
+``RowSummary`` trabalha sobre as linhas já extraídas: cada coluna é
+convertida uma única vez (lista de valores ou ``array('d')`` para números)
+e as métricas saem de operações em C sobre essas colunas (``Counter``,
+``sum``, ``min``/``max``), sem um laço Python por métrica. As contagens por
+categoria são feitas sobre a distribuição (valores distintos), não sobre as
+linhas.
+
+``QuerysetSummary`` oferece a mesma interface empurrando o trabalho para o
+banco: distribuições viram ``GROUP BY`` e somas/médias viram agregados.
+"""
+from array import array
+from collections import Counter
+
+from django.db.models import Avg, Count, Max, Min, Sum
+
+
+def _lowered(value):
+    return str(value).lower()
+
+
+class RowSummary:
+    """Resumo colunar de uma lista de dicts"""
+
+    def __init__(self, rows):
+        self.rows = rows if isinstance(rows, list) else list(rows)
+        self.total = len(self.rows)
+        self._columns = {}
+        self._numbers = {}
+        self._distributions = {}
+        self._is_dict = bool(self.rows) and isinstance(self.rows[0], dict)
+
+    def column(self, name, default=None):
+        key = (name, default)
+        if key not in self._columns:
+            self._columns[key] = [row.get(name, default) for row in self.rows] if self._is_dict else []
+        return self._columns[key]
+
+    def numbers(self, name, parse=None):
+        """Coluna numérica; sem ``parse``, só valores ``int``/``float`` entram"""
+        key = (name, parse)
+        if key not in self._numbers:
+            values = self.column(name)
+            if parse is None:
+                self._numbers[key] = array('d', [v for v in values if isinstance(v, (int, float))])
+            else:
+                self._numbers[key] = array('d', map(parse, values))
+        return self._numbers[key]
+
+    def distribution(self, name, default=None):
+        key = (name, default)
+        if key not in self._distributions:
+            values = self.column(name, default)
+            try:
+                self._distributions[key] = Counter(values)
+            except TypeError:
+                # Valores não hasheáveis (listas vindas do frontend)
+                self._distributions[key] = Counter(map(str, values))
+        return self._distributions[key]
+
+    def top(self, name, default=None):
+        """``(valor, contagem)`` mais frequente, ou ``None``"""
+        common = self.distribution(name, default).most_common(1)
+        return common[0] if common else None
+
+    def count_in(self, name, values, normalize=_lowered):
+        """Linhas cujo valor (normalizado) está em ``values``"""
+        values = set(values)
+        return sum(
+            count for value, count in self.distribution(name).items() if normalize(value) in values
+        )
+
+    def distinct_tokens(self, name, separator=',', ignore=('', 'N/A')):
+        """Itens distintos de uma coluna de listas em texto (``"a, b"``)"""
+        tokens = set()
+        for value in self.distribution(name):
+            text = str(value) if value is not None else ''
+            if text in ignore:
+                continue
+            tokens.update(token.strip() for token in text.split(separator))
+        return tokens
+
+    def grouped_sum(self, key, name, parse=None):
+        """``{chave: (linhas, soma)}``; sem ``parse``, como em ``numbers``, só ``int``/``float`` somam"""
+        groups = {}
+        if parse:
+            values = self.numbers(name, parse)
+        else:
+            # Alinhada às linhas (numbers() descarta as não numéricas); mantém int como int
+            values = [value if isinstance(value, (int, float)) else 0 for value in self.column(name)]
+        for group, value in zip(self.column(key), values):
+            count, total = groups.get(group, (0, 0))
+            groups[group] = (count + 1, total + value)
+        return groups
+
+    def sum(self, name, parse=None):
+        return sum(self.numbers(name, parse))
+
+    def mean(self, name, parse=None):
+        numbers = self.numbers(name, parse)
+        return sum(numbers) / len(numbers) if numbers else 0
+
+    def min(self, name, parse=None):
+        numbers = self.numbers(name, parse)
+        return min(numbers) if numbers else None
+
+    def max(self, name, parse=None):
+        numbers = self.numbers(name, parse)
+        return max(numbers) if numbers else None
+
+
+class QuerysetSummary:
+    """Mesma interface de ``RowSummary``, calculada no banco
+
+    ``columns`` mapeia nomes de coluna para expressões (ou caminhos de campo)
+    anotadas no queryset.
+    """
+
+    def __init__(self, queryset, columns=None):
+        self.columns = columns or {}
+        self.queryset = queryset.annotate(**self.columns) if self.columns else queryset
+        self._total = None
+        self._distributions = {}
+        self._aggregates = {}
+
+    @property
+    def total(self):
+        if self._total is None:
+            self._total = self.queryset.count()
+        return self._total
+
+    def distribution(self, name):
+        if name not in self._distributions:
+            rows = self.queryset.order_by().values(name).annotate(_count=Count('pk')).values_list(name, '_count')
+            self._distributions[name] = Counter(dict(rows))
+        return self._distributions[name]
+
+    def top(self, name):
+        common = self.distribution(name).most_common(1)
+        return common[0] if common else None
+
+    def count_in(self, name, values, normalize=_lowered):
+        values = set(values)
+        return sum(
+            count for value, count in self.distribution(name).items() if normalize(value) in values
+        )
+
+    def grouped_sum(self, key, name):
+        rows = self.queryset.order_by().values(key).annotate(
+            _count=Count('pk'), _sum=Sum(name)
+        ).values_list(key, '_count', '_sum')
+        return {group: (count, total or 0) for group, count, total in rows}
+
+    def aggregate(self, *names):
+        """Soma, média, mínimo e máximo de várias colunas numa só consulta"""
+        missing = [name for name in names if name not in self._aggregates]
+        if missing:
+            expressions = {}
+            for name in missing:
+                expressions.update({
+                    f'{name}__sum': Sum(name), f'{name}__avg': Avg(name),
+                    f'{name}__min': Min(name), f'{name}__max': Max(name),
+                })
+            result = self.queryset.order_by().aggregate(**expressions)
+            for name in missing:
+                self._aggregates[name] = {
+                    metric: result[f'{name}__{metric}'] for metric in ('sum', 'avg', 'min', 'max')
+                }
+        return {name: self._aggregates[name] for name in names}
+
+    def sum(self, name):
+        return self.aggregate(name)[name]['sum'] or 0
+
+    def mean(self, name):
+        return self.aggregate(name)[name]['avg'] or 0
+
+    def min(self, name):
+        return self.aggregate(name)[name]['min']
+
+    def max(self, name):
+        return self.aggregate(name)[name]['max']
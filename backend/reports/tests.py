@@ -0,0 +1,93 @@
+# backend/reports/tests.py
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+
+from beneficiaries.models import BeneficiaryProfile, SupportRequest
+from core.testing import QueryInspectorMixin
+from volunteers.models import VolunteerProfile, VolunteerSkill, VolunteerStats
+from .export_columns import EXPORT_SCHEMAS
+from .export_views import ExportViewSet
+from .summary import RowSummary
+
+
+class VolunteerExportQueryTest(TestCase):
+    def setUp(self):
+        skills = [VolunteerSkill.objects.create(name=f'Habilidade {i}', category='technical') for i in range(3)]
+        for i in range(30):
+            user = User.objects.create_user(username=f'voluntario{i}', first_name='Vol', last_name=str(i))
+            volunteer = VolunteerProfile.objects.create(user=user, phone=f'84{i:07d}')
+            volunteer.skills.set(skills[:i % 4])
+            if i % 2:
+                VolunteerStats.objects.create(volunteer=volunteer, total_hours=60, level=2)
+
+    def test_volunteer_export_query_count_is_constant(self):
+        """Consulta principal + prefetch de habilidades, independente do número de linhas"""
+        with self.assertNumQueries(2):
+            data = ExportViewSet()._get_volunteers_data({}, [])
+
+        self.assertEqual(len(data), 30)
+        by_name = {row['full_name']: row for row in data}
+        self.assertEqual(by_name['Vol 1']['total_hours_contributed'], 60)
+        self.assertEqual(by_name['Vol 1']['volunteer_level'], 'Intermediário')
+        self.assertEqual(by_name['Vol 2']['total_hours_contributed'], 0)
+        self.assertEqual(by_name['Vol 0']['skills'], 'Nenhuma habilidade cadastrada')
+        self.assertEqual(by_name['Vol 3']['skills'].count(','), 2)
+
+    def test_selected_fields_skip_unneeded_queries(self):
+        with self.assertNumQueries(1):
+            data = ExportViewSet()._get_volunteers_data({}, ['email', 'phone'])
+
+        self.assertEqual(set(data[0]), {'email', 'phone'})
+        self.assertFalse(VolunteerStats.objects.filter(volunteer__user__username='voluntario0').exists())
+
+    def test_detailed_volunteer_export_query_count(self):
+        with self.assertNumQueries(2):
+            data = ExportViewSet()._get_volunteers_data_detailed()
+        self.assertEqual(len(data), 30)
+
+
+class BeneficiaryExportQueryTest(QueryInspectorMixin, TestCase):
+    def setUp(self):
+        for i in range(10):
+            user = User.objects.create_user(username=f'beneficiario{i}')
+            profile = BeneficiaryProfile.objects.create(
+                user=user, full_name=f'Beneficiário {i}', date_of_birth='1990-01-01', gender='F',
+                phone_number='840000000', province='Cabo Delgado', district='Pemba', administrative_post='Pemba',
+                locality='Cimento', address_details='Rua 1', education_level='primario',
+                employment_status='desempregado', family_status='casado', family_members_count=4,
+                priority_needs='Alimentação',
+            )
+            for j in range(3):
+                SupportRequest.objects.create(
+                    beneficiary=profile, request_type='alimentar', title=f'Pedido {i}-{j}',
+                    description='Apoio', urgency='media',
+                )
+
+    def test_beneficiary_export_query_count_is_constant(self):
+        with self.assertNumQueries(2):
+            data = EXPORT_SCHEMAS['beneficiaries'].extract(BeneficiaryProfile.objects.all())
+
+        self.assertEqual(len(data), 10)
+        self.assertTrue(all(row['related_projects'].count(',') == 1 for row in data))
+
+    def test_beneficiary_exports_have_no_n_plus_one(self):
+        with self.assertNoNPlusOne(threshold=3):
+            ExportViewSet()._get_beneficiaries_data({}, [])
+            ExportViewSet()._get_beneficiaries_data_detailed()
+
+
+class RowSummaryTest(SimpleTestCase):
+    def test_grouped_sum_ignores_non_numeric_cells(self):
+        summary = RowSummary([
+            {'local': 'Pemba', 'pessoas': 4},
+            {'local': 'Pemba', 'pessoas': '5 pessoas'},
+            {'local': 'Montepuez', 'pessoas': None},
+            {'local': 'Montepuez', 'pessoas': 2.5},
+        ])
+
+        self.assertEqual(summary.grouped_sum('local', 'pessoas'), {'Pemba': (2, 4), 'Montepuez': (2, 2.5)})
+        self.assertEqual(summary.sum('pessoas'), 6.5)
+        self.assertEqual(
+            summary.grouped_sum('local', 'pessoas', parse=lambda value: float(str(value or 0).split()[0])),
+            {'Pemba': (2, 9.0), 'Montepuez': (2, 2.5)},
+        )
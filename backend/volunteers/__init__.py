@@ -0,0 +1 @@
+# backend/volunteers/__init__.py
@@ -1,8 +1,9 @@
 # backend/volunteers/admin.py
 from django.contrib import admin
+from django.db import transaction
 from .models import (
     VolunteerSkill, VolunteerOpportunity, VolunteerProfile, 
-    VolunteerParticipation, VolunteerAchievement
+    VolunteerParticipation, VolunteerAchievement, VolunteerStats
 )
 
 
@@ -50,7 +51,8 @@ class VolunteerOpportunityAdmin(admin.ModelAdmin):
 @admin.register(VolunteerProfile)
 class VolunteerProfileAdmin(admin.ModelAdmin):
     list_display = ['user', 'volunteer_level', 'total_hours_contributed', 'total_people_helped', 'is_active']
-    list_filter = ['is_active', 'availability', 'created_at']
+    list_filter = ['is_active', 'availability', 'stats__level', 'created_at']
+    list_select_related = ['user', 'stats']
     search_fields = ['user__username', 'user__email', 'user__first_name', 'user__last_name']
     filter_horizontal = ['skills']
     readonly_fields = ['total_hours_contributed', 'total_people_helped', 'volunteer_level', 'hours_to_next_level', 'average_rating']
@@ -103,7 +105,12 @@ class VolunteerParticipationAdmin(admin.ModelAdmin):
     actions = ['mark_as_completed', 'mark_as_accepted']
     
     def mark_as_completed(self, request, queryset):
-        updated = queryset.filter(status__in=['accepted', 'in_progress']).update(status='completed')
+        to_complete = queryset.filter(status__in=['accepted', 'in_progress'])
+        volunteer_ids = set(to_complete.values_list('volunteer_id', flat=True))
+        with transaction.atomic():
+            updated = to_complete.update(status='completed')
+            for volunteer in VolunteerProfile.objects.filter(id__in=volunteer_ids):
+                VolunteerStats.refresh_for(volunteer)
         self.message_user(request, f'{updated} participações marcadas como concluídas.')
     mark_as_completed.short_description = 'Marcar como concluído'
     
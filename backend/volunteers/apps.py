@@ -0,0 +1,11 @@
+# backend/volunteers/apps.py
+from django.apps import AppConfig
+
+
+class VolunteersConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'volunteers'
+    verbose_name = 'Voluntários'
+    
+    def ready(self):
+        import volunteers.signals
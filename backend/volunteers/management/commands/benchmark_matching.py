@@ -0,0 +1,65 @@
+# backend/volunteers/management/commands/benchmark_matching.py
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from volunteers.matching import MatchingIndex
+from volunteers.models import VolunteerSkill, VolunteerOpportunity
+from volunteers.management.commands.populate_volunteer_data import SYNTHETIC_LOCATIONS
+
+
+class Command(BaseCommand):
+    help = 'Mede construção do índice e latência do matching (use populate_volunteer_data --synthetic-volunteers)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queries', type=int, default=200, help='Número de consultas top-K')
+        parser.add_argument('--limit', type=int, default=20, help='K (tamanho do top-K)')
+        parser.add_argument('--seed', type=int, default=7)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            index = MatchingIndex.build()
+            build_seconds = time.perf_counter() - started
+        self.stdout.write(
+            f'Índice: {len(index)} voluntários, {len(index.skills)} habilidades, '
+            f'{len(index.locations)} locais — {build_seconds * 1000:.0f} ms, {len(ctx.captured_queries)} consultas'
+        )
+
+        skill_names = list(VolunteerSkill.objects.values_list('name', flat=True))
+        opportunities = list(VolunteerOpportunity.objects.prefetch_related('required_skills')[:50])
+        if not skill_names:
+            self.stdout.write(self.style.ERROR('Nenhuma habilidade encontrada. Rode populate_volunteer_data.'))
+            return
+
+        timings = []
+        for i in range(options['queries']):
+            if opportunities and i % 2 == 0:
+                opportunity = rng.choice(opportunities)
+                kwargs = {
+                    'skill_names': [skill.name for skill in opportunity.required_skills.all()],
+                    'location': opportunity.location or '',
+                    'is_remote': opportunity.is_remote,
+                    'start_date': opportunity.start_date,
+                }
+            else:
+                kwargs = {
+                    'skill_names': rng.sample(skill_names, k=min(len(skill_names), rng.randint(1, 4))),
+                    'location': rng.choice(SYNTHETIC_LOCATIONS),
+                }
+            started = time.perf_counter()
+            index.score(limit=options['limit'], **kwargs)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1] if len(timings) >= 20 else timings[-1]
+        self.stdout.write(
+            f'Top-{options["limit"]} em {len(timings)} consultas: '
+            f'mediana {statistics.median(timings):.2f} ms, p95 {p95:.2f} ms, máx {timings[-1]:.2f} ms'
+        )
+        self.stdout.write(self.style.SUCCESS('Benchmark de matching concluído'))
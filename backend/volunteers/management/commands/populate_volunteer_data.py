@@ -1,12 +1,36 @@
 # backend/volunteers/management/commands/populate_volunteer_data.py
+import random
+
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
-from volunteers.models import VolunteerSkill, VolunteerOpportunity
+from django.db import transaction
+from volunteers.models import VolunteerSkill, VolunteerOpportunity, VolunteerProfile
+
+
+SYNTHETIC_LOCATIONS = [
+    'Pemba', 'Montepuez', 'Mocímboa da Praia', 'Chiúre', 'Ancuabe', 'Metuge',
+    'Macomia', 'Mueda', 'Palma', 'Quissanga', 'Maputo', 'Matola', 'Nampula',
+    'Beira', 'Marracuene', 'Lichinga', 'Quelimane', 'Tete',
+]
 
 
 class Command(BaseCommand):
     help = 'Popula dados iniciais para o sistema de voluntários'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--synthetic-volunteers',
+            type=int,
+            default=0,
+            help='Cria N voluntários sintéticos (habilidades, local e disponibilidade aleatórios)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Semente para geração dos dados sintéticos',
+        )
+
     def handle(self, *args, **options):
         self.stdout.write('Criando habilidades de voluntários...')
         
@@ -158,6 +182,57 @@ class Command(BaseCommand):
                 self.style.WARNING('Nenhum usuário administrador encontrado. Oportunidades não foram criadas.')
             )
         
+        if options['synthetic_volunteers']:
+            self.create_synthetic_volunteers(options['synthetic_volunteers'], options['seed'])
+        
         self.stdout.write(
             self.style.SUCCESS('Dados de voluntários populados com sucesso!')
         )
+    
+    def create_synthetic_volunteers(self, total, seed, batch_size=2000):
+        """Cria voluntários em lote via bulk_create (para benchmarks do matching)"""
+        rng = random.Random(seed)
+        skill_ids = list(VolunteerSkill.objects.values_list('id', flat=True))
+        availabilities = ['weekdays', 'weekends', 'evenings', 'flexible']
+        # Distribuição de habilidades enviesada: poucas habilidades muito comuns
+        skill_weights = [1.0 / (rank + 1) for rank in range(len(skill_ids))]
+        prefix = f'synthetic_{seed}_{User.objects.count()}'
+        SkillLink = VolunteerProfile.skills.through
+        
+        self.stdout.write(f'Criando {total} voluntários sintéticos...')
+        for offset in range(0, total, batch_size):
+            count = min(batch_size, total - offset)
+            with transaction.atomic():
+                users = User.objects.bulk_create([
+                    User(
+                        username=f'{prefix}_{offset + i}',
+                        first_name='Voluntário',
+                        last_name=str(offset + i),
+                        password='!',
+                    )
+                    for i in range(count)
+                ])
+                if users[0].pk is None:
+                    users = list(User.objects.filter(
+                        username__in=[user.username for user in users]
+                    ).order_by('id'))
+                profiles = VolunteerProfile.objects.bulk_create([
+                    VolunteerProfile(
+                        user=user,
+                        address=rng.choice(SYNTHETIC_LOCATIONS),
+                        availability=rng.choice(availabilities),
+                        max_hours_per_week=rng.randint(2, 30),
+                    )
+                    for user in users
+                ])
+                if profiles[0].pk is None:
+                    profiles = list(VolunteerProfile.objects.filter(user__in=users).order_by('id'))
+                links = []
+                for profile in profiles:
+                    chosen = set(rng.choices(skill_ids, weights=skill_weights, k=rng.randint(1, 5)))
+                    links.extend(
+                        SkillLink(volunteerprofile_id=profile.pk, volunteerskill_id=skill_id)
+                        for skill_id in chosen
+                    )
+                SkillLink.objects.bulk_create(links)
+            self.stdout.write(f'  ✓ {offset + count}/{total} voluntários sintéticos')
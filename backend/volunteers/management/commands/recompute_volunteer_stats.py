@@ -0,0 +1,77 @@
+# backend/volunteers/management/commands/recompute_volunteer_stats.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from volunteers.models import VolunteerProfile, VolunteerParticipation, VolunteerStats
+
+
+class Command(BaseCommand):
+    help = 'Recalcula as estatísticas materializadas dos voluntários'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--volunteer',
+            type=int,
+            action='append',
+            help='ID do perfil de voluntário (pode ser repetido). Padrão: todos',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Tamanho do lote para gravação',
+        )
+
+    def handle(self, *args, **options):
+        profiles = VolunteerProfile.objects.all()
+        participations = VolunteerParticipation.objects.filter(status='completed')
+        if options['volunteer']:
+            profiles = profiles.filter(id__in=options['volunteer'])
+            participations = participations.filter(volunteer_id__in=options['volunteer'])
+
+        # Um único agregado agrupado por voluntário
+        totals_by_volunteer = {
+            row['volunteer']: row
+            for row in participations.values('volunteer').annotate(
+                **VolunteerStats.aggregate_expressions()
+            ).order_by()
+        }
+        empty_totals = {
+            'total_hours': 0, 'total_people_helped': 0, 'completed_participations': 0,
+            'rating_sum': 0, 'rating_count': 0,
+        }
+
+        batch_size = options['batch_size']
+        profile_ids = list(profiles.values_list('id', flat=True))
+        updated = 0
+        now = timezone.now()
+
+        for offset in range(0, len(profile_ids), batch_size):
+            chunk = profile_ids[offset:offset + batch_size]
+            with transaction.atomic():
+                existing = {
+                    stats.volunteer_id: stats
+                    for stats in VolunteerStats.objects.select_for_update().filter(volunteer_id__in=chunk)
+                }
+                to_create = []
+                for profile_id in chunk:
+                    stats = existing.get(profile_id)
+                    if stats is None:
+                        stats = VolunteerStats(volunteer_id=profile_id)
+                        to_create.append(stats)
+                    stats.apply_totals(totals_by_volunteer.get(profile_id, empty_totals))
+                    stats.updated_at = now
+
+                VolunteerStats.objects.bulk_create(to_create, batch_size=batch_size)
+                VolunteerStats.objects.bulk_update(
+                    list(existing.values()),
+                    ['total_hours', 'total_people_helped', 'completed_participations',
+                     'rating_sum', 'rating_count', 'level', 'updated_at'],
+                    batch_size=batch_size,
+                )
+            updated += len(chunk)
+            self.stdout.write(f'  ✓ {updated}/{len(profile_ids)} voluntários processados')
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Estatísticas recalculadas para {updated} voluntários!')
+        )
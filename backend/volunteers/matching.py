@@ -0,0 +1,320 @@
+# backend/volunteers/matching.py
+"""
+Motor de matching voluntário ↔ oportunidade.
+
+Constrói em memória um índice invertido (habilidade/local/disponibilidade/causa
+→ conjunto de voluntários) a partir de poucas consultas e pontua candidatos com
+operações de conjunto, sem percorrer voluntário a voluntário.
+"""
+import heapq
+import threading
+import time
+import unicodedata
+from array import array
+from collections import defaultdict
+from itertools import groupby, product
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import VolunteerProfile, VolunteerParticipation
+
+
+INDEX_VERSION_CACHE_KEY = 'volunteer_matching_index_version'
+INDEX_MAX_AGE_SECONDS = 10 * 60
+# Intervalo mínimo entre reconstruções quando há muitas alterações seguidas
+INDEX_MIN_REBUILD_SECONDS = 30
+
+# Pesos de cada componente do score (somam 1.0)
+WEIGHTS = {
+    'skills': 0.6,
+    'location': 0.2,
+    'availability': 0.1,
+    'cause': 0.1,
+}
+
+LOCATION_STOPWORDS = {
+    'de', 'da', 'do', 'das', 'dos', 'e', 'em', 'na', 'no',
+    'distrito', 'provincia', 'cidade', 'bairro', 'centro', 'comunidade',
+    'rua', 'avenida', 'av', 'hospital', 'saude', 'comunitario',
+}
+
+
+def normalize(text):
+    """Minúsculas e sem acentos, para comparar nomes entre vocabulários"""
+    text = unicodedata.normalize('NFKD', text or '')
+    return ''.join(c for c in text if not unicodedata.combining(c)).lower().strip()
+
+
+def location_tokens(text):
+    """Tokens significativos de um texto de localização"""
+    words = ''.join(c if c.isalnum() else ' ' for c in normalize(text)).split()
+    return {w for w in words if len(w) >= 3 and w not in LOCATION_STOPWORDS}
+
+
+def availability_keys(start_date):
+    """Disponibilidades compatíveis com a data de início de uma atividade"""
+    if not start_date:
+        return None
+    local_start = timezone.localtime(start_date) if timezone.is_aware(start_date) else start_date
+    keys = {'flexible', 'weekends' if local_start.weekday() >= 5 else 'weekdays'}
+    if local_start.hour >= 18:
+        keys.add('evenings')
+    return keys
+
+
+class MatchingIndex:
+    """Índice invertido de voluntários ativos"""
+
+    def __init__(self):
+        self.profile_ids = array('Q')
+        self.user_ids = array('Q')
+        self.position_by_profile = {}
+        self.position_by_user = {}
+        self.all_positions = set()
+        self.skills = defaultdict(set)
+        self.locations = defaultdict(set)
+        self.availability = defaultdict(set)
+        self.causes = defaultdict(set)
+        self.skills_by_position = defaultdict(set)
+        self.built_at = None
+        self.version = None
+
+    def __len__(self):
+        return len(self.profile_ids)
+
+    @classmethod
+    def build(cls, version=None):
+        """Carrega voluntários, habilidades e causas em quatro consultas"""
+        from client_area.models import UserSkill
+        from core.models import Volunteer as CoreVolunteer
+
+        index = cls()
+        profiles = VolunteerProfile.objects.filter(is_active=True).values_list(
+            'id', 'user_id', 'address', 'availability'
+        )
+        for position, (profile_id, user_id, address, availability) in enumerate(profiles.iterator(chunk_size=5000)):
+            index.profile_ids.append(profile_id)
+            index.user_ids.append(user_id)
+            index.position_by_profile[profile_id] = position
+            index.position_by_user[user_id] = position
+            index.all_positions.add(position)
+            index.availability[availability].add(position)
+            for token in location_tokens(address):
+                index.locations[token].add(position)
+
+        # Habilidades do app de voluntários
+        volunteer_skills = VolunteerProfile.skills.through.objects.values_list(
+            'volunteerprofile_id', 'volunteerskill__name'
+        )
+        for profile_id, skill_name in volunteer_skills.iterator(chunk_size=5000):
+            position = index.position_by_profile.get(profile_id)
+            if position is not None:
+                index.add_skill(position, skill_name)
+
+        # Habilidades declaradas na área do cliente (client_area.Skill)
+        client_skills = UserSkill.objects.values_list('user_profile__user_id', 'skill__name')
+        for user_id, skill_name in client_skills.iterator(chunk_size=5000):
+            position = index.position_by_user.get(user_id)
+            if position is not None:
+                index.add_skill(position, skill_name)
+
+        # Causas preferidas do perfil de voluntário do core
+        causes = CoreVolunteer.preferred_causes.through.objects.values_list(
+            'volunteer__user_profile__user_id', 'cause__name'
+        )
+        for user_id, cause_name in causes.iterator(chunk_size=5000):
+            position = index.position_by_user.get(user_id)
+            if position is not None:
+                index.causes[normalize(cause_name)].add(position)
+
+        index.built_at = time.monotonic()
+        index.version = version
+        return index
+
+    def add_skill(self, position, skill_name):
+        key = normalize(skill_name)
+        self.skills_by_position[position].add(key)
+        self.skills[key].add(position)
+
+    def score(self, skill_names=(), location='', is_remote=False, start_date=None,
+              cause_name=None, exclude_profile_ids=(), exclude_user_ids=(), limit=20):
+        """Retorna os ``limit`` melhores candidatos como pares (score, posição).
+
+        Os voluntários são particionados em grupos de score idêntico
+        (nº de habilidades × local × disponibilidade × causa) usando apenas
+        operações de conjunto; os grupos são materializados em ordem
+        decrescente de score até preencher o top-K.
+        """
+        skill_keys = {normalize(name) for name in skill_names if name}
+        skill_sets = [self.skills[key] for key in skill_keys if key in self.skills]
+
+        # at_least[c]: voluntários com pelo menos c das habilidades requeridas
+        at_least = [self.all_positions] + [set() for _ in skill_sets]
+        for posting in skill_sets:
+            for count in range(len(skill_sets), 1, -1):
+                at_least[count] |= at_least[count - 1] & posting
+            at_least[1] |= posting
+
+        def exactly(count):
+            if count == len(skill_sets):
+                return at_least[count]
+            return at_least[count] - at_least[count + 1]
+
+        # None = critério satisfeito por todos (oportunidade remota / sem data)
+        if is_remote:
+            location_hits = None
+        else:
+            location_hits = set().union(*(
+                self.locations[token] for token in location_tokens(location) if token in self.locations
+            ))
+        availability = availability_keys(start_date)
+        if availability is None:
+            availability_hits = None
+        else:
+            availability_hits = set().union(*(
+                self.availability[key] for key in availability if key in self.availability
+            ))
+        cause_hits = self.causes.get(normalize(cause_name), set()) if cause_name else set()
+
+        skill_weight = WEIGHTS['skills'] / len(skill_keys) if skill_keys else 0
+        criteria = [
+            (location_hits, WEIGHTS['location']),
+            (availability_hits, WEIGHTS['availability']),
+            (cause_hits, WEIGHTS['cause']),
+        ]
+
+        # Enumerar grupos (score, nº de habilidades, pertença a cada critério)
+        groups = []
+        for count in range(len(skill_sets) + 1):
+            for flags in product((True, False), repeat=len(criteria)):
+                bonus = 0
+                feasible = True
+                for (hits, weight), inside in zip(criteria, flags):
+                    if hits is None and not inside or hits is not None and inside and not hits:
+                        feasible = False
+                        break
+                    if inside:
+                        bonus += weight
+                if feasible:
+                    groups.append((round(count * skill_weight + bonus, 4), count, flags))
+        groups.sort(key=lambda group: -group[0])
+
+        excluded = {self.position_by_profile[p] for p in exclude_profile_ids if p in self.position_by_profile}
+        excluded |= {self.position_by_user[u] for u in exclude_user_ids if u in self.position_by_user}
+
+        def members_of(count, flags):
+            positives = [hits for (hits, _w), inside in zip(criteria, flags) if inside and hits is not None]
+            negatives = [hits for (hits, _w), inside in zip(criteria, flags) if not inside and hits]
+            if count == 0 and positives:
+                # Evita materializar o complemento: parte do menor conjunto positivo
+                positives.sort(key=len)
+                members = positives[0].intersection(*positives[1:])
+                if len(at_least) > 1:
+                    members -= at_least[1]
+            else:
+                members = exactly(count).intersection(*positives)
+            return members.difference(excluded, *negatives) if members else members
+
+        # Grupos com o mesmo score formam um único nível (desempate pela posição)
+        results = []
+        for score, tier in groupby(groups, key=lambda group: group[0]):
+            need = limit - len(results)
+            if need <= 0:
+                break
+            members = set().union(*(members_of(count, flags) for _score, count, flags in tier))
+            results.extend((score, position) for position in heapq.nsmallest(need, members))
+        return results
+
+    def matched_skills(self, position, skill_names):
+        """Habilidades requeridas que o voluntário possui"""
+        owned = self.skills_by_position.get(position, ())
+        return [name for name in skill_names if normalize(name) in owned]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def invalidate_matching_index():
+    """Marca o índice como desatualizado em todos os workers"""
+    try:
+        cache.incr(INDEX_VERSION_CACHE_KEY)
+    except ValueError:
+        cache.set(INDEX_VERSION_CACHE_KEY, 1, None)
+
+
+def _needs_rebuild(index, version):
+    if index is None:
+        return True
+    age = time.monotonic() - index.built_at
+    if age > INDEX_MAX_AGE_SECONDS:
+        return True
+    return index.version != version and age > INDEX_MIN_REBUILD_SECONDS
+
+
+def get_matching_index():
+    """Índice do processo atual, reconstruído se a versão ou idade expirar"""
+    global _index
+    version = cache.get(INDEX_VERSION_CACHE_KEY, 0)
+    if _needs_rebuild(_index, version):
+        with _index_lock:
+            if _needs_rebuild(_index, version):
+                _index = MatchingIndex.build(version=version)
+    return _index
+
+
+def _format_matches(index, ranked, skill_names):
+    """Carrega os perfis do top-K numa única consulta e monta a resposta"""
+    profile_ids = [index.profile_ids[position] for _score, position in ranked]
+    profiles = VolunteerProfile.objects.select_related('user').in_bulk(profile_ids)
+    results = []
+    for score, position in ranked:
+        profile = profiles.get(index.profile_ids[position])
+        if profile is None:
+            continue
+        results.append({
+            'volunteer_id': profile.id,
+            'user_id': profile.user_id,
+            'name': profile.user.get_full_name() or profile.user.username,
+            'availability': profile.availability,
+            'score': score,
+            'matched_skills': index.matched_skills(position, skill_names),
+        })
+    return results
+
+
+def match_opportunity(opportunity, limit=20):
+    """Melhores voluntários para uma ``VolunteerOpportunity``"""
+    index = get_matching_index()
+    skill_names = list(opportunity.required_skills.values_list('name', flat=True))
+    already_applied = VolunteerParticipation.objects.filter(
+        opportunity=opportunity
+    ).values_list('volunteer_id', flat=True)
+    ranked = index.score(
+        skill_names=skill_names,
+        location=opportunity.location,
+        is_remote=opportunity.is_remote,
+        start_date=opportunity.start_date,
+        exclude_profile_ids=set(already_applied),
+        limit=limit,
+    )
+    return _format_matches(index, ranked, skill_names)
+
+
+def match_request(matching_request, limit=20):
+    """Melhores voluntários para um ``client_area.MatchingRequest``"""
+    index = get_matching_index()
+    skill_names = list(matching_request.required_skills.values_list('name', flat=True))
+    exclude_users = {matching_request.requester.user_id}
+    if matching_request.volunteer_id:
+        exclude_users.add(matching_request.volunteer.user_id)
+    ranked = index.score(
+        skill_names=skill_names,
+        location=matching_request.location,
+        start_date=matching_request.start_date,
+        cause_name=matching_request.cause.name,
+        exclude_user_ids=exclude_users,
+        limit=limit,
+    )
+    return _format_matches(index, ranked, skill_names)
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-19 13:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VolunteerStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_hours', models.PositiveIntegerField(default=0)),
+                ('total_people_helped', models.PositiveIntegerField(default=0)),
+                ('completed_participations', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('level', models.PositiveSmallIntegerField(choices=[(0, 'Novato'), (1, 'Iniciante'), (2, 'Intermediário'), (3, 'Avançado'), (4, 'Especialista')], default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('volunteer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='volunteers.volunteerprofile')),
+            ],
+            options={
+                'verbose_name': 'Estatísticas de Voluntário',
+                'verbose_name_plural': 'Estatísticas de Voluntários',
+                'indexes': [models.Index(fields=['-total_hours'], name='volunteers__total_h_bfe6a2_idx'), models.Index(fields=['level', '-total_hours'], name='volunteers__level_8a1abf_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,60 @@
+from django.db import migrations
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce, NullIf
+
+# Cópia dos limiares de VOLUNTEER_LEVELS: a migração não depende do models.py atual
+LEVEL_MIN_HOURS = [(4, 500), (3, 200), (2, 50), (1, 10)]
+
+
+def level_for_hours(hours):
+    for level, min_hours in LEVEL_MIN_HOURS:
+        if hours >= min_hours:
+            return level
+    return 0
+
+
+def backfill_volunteer_stats(apps, schema_editor):
+    """Cria o registro de estatísticas de todos os voluntários existentes"""
+    VolunteerProfile = apps.get_model('volunteers', 'VolunteerProfile')
+    VolunteerParticipation = apps.get_model('volunteers', 'VolunteerParticipation')
+    VolunteerStats = apps.get_model('volunteers', 'VolunteerStats')
+
+    totals_by_volunteer = {
+        row['volunteer']: row
+        for row in VolunteerParticipation.objects.filter(status='completed').values('volunteer').annotate(
+            total_hours=Coalesce(Sum(Coalesce(NullIf('actual_hours', 0), 'opportunity__estimated_hours')), 0),
+            total_people_helped=Coalesce(
+                Sum(Coalesce(NullIf('people_helped', 0), 'opportunity__people_helped_estimate')), 0
+            ),
+            completed_participations=Count('id'),
+            rating_sum=Coalesce(Sum('admin_rating'), 0),
+            rating_count=Count('admin_rating'),
+        ).order_by()
+    }
+    existing = set(VolunteerStats.objects.values_list('volunteer_id', flat=True))
+
+    to_create = []
+    for profile_id in VolunteerProfile.objects.exclude(id__in=existing).values_list('id', flat=True).iterator():
+        totals = totals_by_volunteer.get(profile_id, {})
+        total_hours = totals.get('total_hours') or 0
+        to_create.append(VolunteerStats(
+            volunteer_id=profile_id,
+            total_hours=total_hours,
+            total_people_helped=totals.get('total_people_helped') or 0,
+            completed_participations=totals.get('completed_participations') or 0,
+            rating_sum=totals.get('rating_sum') or 0,
+            rating_count=totals.get('rating_count') or 0,
+            level=level_for_hours(total_hours),
+        ))
+    VolunteerStats.objects.bulk_create(to_create, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0002_volunteerstats'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_volunteer_stats, migrations.RunPython.noop),
+    ]
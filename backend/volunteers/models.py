@@ -1,5 +1,7 @@
 # backend/volunteers/models.py
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce, NullIf
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
@@ -90,66 +92,159 @@ class VolunteerProfile(models.Model):
     def __str__(self):
         return f"Perfil de {self.user.get_full_name() or self.user.username}"
     
+    def get_stats(self):
+        """Estatísticas materializadas; sem registro, calculadas em memória (sem gravar)"""
+        try:
+            return self.stats
+        except VolunteerStats.DoesNotExist:
+            return VolunteerStats.compute_for(self)
+    
+    def refresh_stats(self):
+        """Recalcula as estatísticas materializadas do voluntário"""
+        return VolunteerStats.refresh_for(self)
+    
     @property
     def total_hours_contributed(self):
         """Total de horas contribuídas pelo voluntário"""
-        return sum(
-            participation.actual_hours or participation.opportunity.estimated_hours 
-            for participation in self.participations.filter(status='completed')
-        )
+        return self.get_stats().total_hours
     
     @property
     def total_people_helped(self):
         """Total de pessoas ajudadas pelo voluntário"""
-        return sum(
-            participation.people_helped or participation.opportunity.people_helped_estimate
-            for participation in self.participations.filter(status='completed')
-        )
+        return self.get_stats().total_people_helped
     
     @property
     def volunteer_level(self):
         """Nível do voluntário baseado nas horas contribuídas"""
-        hours = self.total_hours_contributed
-        if hours >= 500:
-            return "Especialista"
-        elif hours >= 200:
-            return "Avançado"
-        elif hours >= 50:
-            return "Intermediário"
-        elif hours >= 10:
-            return "Iniciante"
-        else:
-            return "Novato"
+        return self.get_stats().get_level_display()
     
     @property
     def hours_to_next_level(self):
         """Horas necessárias para o próximo nível"""
-        hours = self.total_hours_contributed
-        if hours < 10:
-            return 10 - hours
-        elif hours < 50:
-            return 50 - hours
-        elif hours < 200:
-            return 200 - hours
-        elif hours < 500:
-            return 500 - hours
-        else:
-            return 0
+        return self.get_stats().hours_to_next_level
     
     @property
     def average_rating(self):
         """Avaliação média do voluntário"""
-        ratings = self.participations.filter(
-            status='completed',
-            admin_rating__isnull=False
-        ).values_list('admin_rating', flat=True)
-        return sum(ratings) / len(ratings) if ratings else 0
+        return self.get_stats().average_rating
     
     class Meta:
         verbose_name = "Perfil de Voluntário"
         verbose_name_plural = "Perfis de Voluntários"
 
 
+# Níveis do voluntário: (nível, horas mínimas, rótulo)
+VOLUNTEER_LEVELS = [
+    (0, 0, 'Novato'),
+    (1, 10, 'Iniciante'),
+    (2, 50, 'Intermediário'),
+    (3, 200, 'Avançado'),
+    (4, 500, 'Especialista'),
+]
+
+
+def level_for_hours(hours):
+    """Retorna o nível correspondente a um total de horas"""
+    current = 0
+    for level, min_hours, _label in VOLUNTEER_LEVELS:
+        if hours >= min_hours:
+            current = level
+    return current
+
+
+class VolunteerStats(models.Model):
+    """Estatísticas materializadas do voluntário.
+
+    Mantidas pelos sinais de ``VolunteerParticipation`` (gravação e exclusão)
+    e pelas ações em massa do admin; ``recompute_volunteer_stats`` reconstrói
+    todas. Leituras nunca criam o registro.
+    """
+    volunteer = models.OneToOneField(VolunteerProfile, on_delete=models.CASCADE, related_name='stats')
+    total_hours = models.PositiveIntegerField(default=0)
+    total_people_helped = models.PositiveIntegerField(default=0)
+    completed_participations = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    level = models.PositiveSmallIntegerField(
+        choices=[(level, label) for level, _min_hours, label in VOLUNTEER_LEVELS],
+        default=0
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Estatísticas de {self.volunteer}"
+    
+    @property
+    def average_rating(self):
+        return self.rating_sum / self.rating_count if self.rating_count else 0
+    
+    @property
+    def hours_to_next_level(self):
+        for _level, min_hours, _label in VOLUNTEER_LEVELS:
+            if self.total_hours < min_hours:
+                return min_hours - self.total_hours
+        return 0
+    
+    @staticmethod
+    def aggregate_expressions():
+        """Expressões de agregação sobre participações concluídas"""
+        return {
+            'total_hours': Coalesce(
+                Sum(Coalesce(NullIf('actual_hours', 0), 'opportunity__estimated_hours')), 0
+            ),
+            'total_people_helped': Coalesce(
+                Sum(Coalesce(NullIf('people_helped', 0), 'opportunity__people_helped_estimate')), 0
+            ),
+            'completed_participations': Count('id'),
+            'rating_sum': Coalesce(Sum('admin_rating'), 0),
+            'rating_count': Count('admin_rating'),
+        }
+    
+    def apply_totals(self, totals):
+        for field in ('total_hours', 'total_people_helped', 'completed_participations',
+                      'rating_sum', 'rating_count'):
+            setattr(self, field, totals[field] or 0)
+        self.level = level_for_hours(self.total_hours)
+    
+    @classmethod
+    def totals_for(cls, volunteer):
+        return volunteer.participations.filter(status='completed').aggregate(**cls.aggregate_expressions())
+    
+    @classmethod
+    def compute_for(cls, volunteer):
+        """Estatísticas calculadas em memória, sem gravar o registro"""
+        stats = cls(volunteer=volunteer)
+        stats.apply_totals(cls.totals_for(volunteer))
+        return stats
+    
+    @classmethod
+    def refresh_for(cls, volunteer, create=True):
+        """Recalcula as estatísticas de um voluntário dentro de uma transação.
+        
+        Com ``create=False`` só atualiza um registro existente (retorna ``None``
+        se não houver), o que serve à exclusão em cascata do voluntário.
+        """
+        with transaction.atomic():
+            if create:
+                stats, _created = cls.objects.select_for_update().get_or_create(volunteer=volunteer)
+            else:
+                stats = cls.objects.select_for_update().filter(volunteer=volunteer).first()
+                if stats is None:
+                    return None
+            stats.apply_totals(cls.totals_for(volunteer))
+            stats.save()
+        volunteer.stats = stats
+        return stats
+    
+    class Meta:
+        verbose_name = "Estatísticas de Voluntário"
+        verbose_name_plural = "Estatísticas de Voluntários"
+        indexes = [
+            models.Index(fields=['-total_hours']),
+            models.Index(fields=['level', '-total_hours']),
+        ]
+
+
 class VolunteerParticipation(models.Model):
     """Participação de um voluntário em uma oportunidade"""
     volunteer = models.ForeignKey(VolunteerProfile, on_delete=models.CASCADE, related_name='participations')
@@ -181,7 +276,7 @@ class VolunteerParticipation(models.Model):
         return f"{self.volunteer.user.get_full_name()} - {self.opportunity.title}"
     
     def complete_participation(self, hours=None, people_helped=None, admin_notes="", rating=None):
-        """Marca a participação como concluída"""
+        """Marca a participação como concluída e atualiza as estatísticas do voluntário"""
         self.status = 'completed'
         self.completion_date = timezone.now()
         if hours:
@@ -192,6 +287,7 @@ class VolunteerParticipation(models.Model):
             self.admin_notes = admin_notes
         if rating:
             self.admin_rating = rating
+        # O sinal post_save recalcula as estatísticas do voluntário
         self.save()
     
     class Meta:
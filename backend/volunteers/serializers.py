@@ -99,7 +99,7 @@ class VolunteerProfileSerializer(serializers.ModelSerializer):
         return obj.participations.filter(status__in=['accepted', 'in_progress']).count()
     
     def get_completed_participations_count(self, obj):
-        return obj.participations.filter(status='completed').count()
+        return obj.get_stats().completed_participations
     
     def update(self, instance, validated_data):
         skill_ids = validated_data.pop('skill_ids', None)
@@ -0,0 +1,38 @@
+# backend/volunteers/signals.py
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from client_area.models import UserSkill
+from core.models import Volunteer as CoreVolunteer
+from .models import VolunteerParticipation, VolunteerProfile, VolunteerStats
+from .matching import invalidate_matching_index
+
+
+@receiver(post_save, sender=VolunteerProfile)
+@receiver(post_delete, sender=VolunteerProfile)
+@receiver(post_save, sender=UserSkill)
+@receiver(post_delete, sender=UserSkill)
+def invalidate_matching_on_profile_change(sender, **kwargs):
+    """Perfil ou habilidade alterados: índice de matching desatualizado"""
+    # Só após o commit: um rebuild antes dele leria os dados antigos
+    transaction.on_commit(invalidate_matching_index)
+
+
+@receiver(m2m_changed, sender=VolunteerProfile.skills.through)
+@receiver(m2m_changed, sender=CoreVolunteer.preferred_causes.through)
+def invalidate_matching_on_relation_change(sender, action, **kwargs):
+    """Habilidades ou causas preferidas do voluntário alteradas"""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        transaction.on_commit(invalidate_matching_index)
+
+
+@receiver(post_save, sender=VolunteerParticipation)
+def refresh_stats_on_participation_save(sender, instance, **kwargs):
+    """Participação gravada: recalcula as estatísticas do voluntário"""
+    VolunteerStats.refresh_for(instance.volunteer)
+
+
+@receiver(post_delete, sender=VolunteerParticipation)
+def refresh_stats_on_participation_delete(sender, instance, **kwargs):
+    """Participação excluída: sem criar registro (o voluntário pode estar sendo excluído)"""
+    VolunteerStats.refresh_for(instance.volunteer, create=False)
@@ -0,0 +1,107 @@
+# backend/volunteers/tests.py
+from importlib import import_module
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from .models import VolunteerOpportunity, VolunteerParticipation, VolunteerProfile, VolunteerStats
+
+
+def _opportunity(creator, title, hours):
+    return VolunteerOpportunity.objects.create(
+        title=title, description='-', estimated_hours=hours, people_helped_estimate=5, created_by=creator,
+    )
+
+
+class VolunteerStatsMaintenanceTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='coordenador')
+        self.volunteer = VolunteerProfile.objects.create(user=User.objects.create_user(username='voluntaria'))
+        self.opportunity = _opportunity(self.admin, 'Distribuição', 12)
+
+    def test_reading_stats_does_not_create_record(self):
+        self.assertEqual(self.volunteer.total_hours_contributed, 0)
+        self.assertEqual(self.volunteer.volunteer_level, 'Novato')
+        self.assertFalse(VolunteerStats.objects.filter(volunteer=self.volunteer).exists())
+
+    def test_saving_participation_refreshes_stats(self):
+        participation = VolunteerParticipation.objects.create(
+            volunteer=self.volunteer, opportunity=self.opportunity, status='accepted'
+        )
+        participation.complete_participation(hours=60, rating=4)
+
+        stats = VolunteerStats.objects.get(volunteer=self.volunteer)
+        self.assertEqual(stats.total_hours, 60)
+        self.assertEqual(stats.level, 2)
+        self.assertEqual(stats.average_rating, 4)
+
+        participation.status = 'cancelled'
+        participation.save()
+        self.assertEqual(VolunteerStats.objects.get(volunteer=self.volunteer).total_hours, 0)
+
+    def test_deleting_participation_refreshes_stats(self):
+        participation = VolunteerParticipation.objects.create(
+            volunteer=self.volunteer, opportunity=self.opportunity, status='completed'
+        )
+        self.assertEqual(VolunteerStats.objects.get(volunteer=self.volunteer).total_hours, 12)
+
+        participation.delete()
+
+        stats = VolunteerStats.objects.get(volunteer=self.volunteer)
+        self.assertEqual(stats.total_hours, 0)
+        self.assertEqual(stats.completed_participations, 0)
+
+    def test_deleting_volunteer_cascades_without_recreating_stats(self):
+        VolunteerParticipation.objects.create(volunteer=self.volunteer, opportunity=self.opportunity, status='completed')
+
+        self.volunteer.user.delete()
+
+        self.assertFalse(VolunteerStats.objects.exists())
+
+    def test_backfill_migration_creates_missing_records(self):
+        VolunteerParticipation.objects.create(volunteer=self.volunteer, opportunity=self.opportunity, status='completed')
+        VolunteerStats.objects.all().delete()
+        backfill = import_module('volunteers.migrations.0003_backfill_volunteerstats').backfill_volunteer_stats
+
+        backfill(apps, None)
+
+        stats = VolunteerStats.objects.get(volunteer=self.volunteer)
+        self.assertEqual(stats.total_hours, 12)
+        self.assertEqual(stats.level, 1)
+
+
+class VolunteerProfileFilterTest(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', is_staff=True)
+        self.client.force_authenticate(self.admin)
+        self.profiles = {}
+        for username, hours in [('sem_registro', None), ('iniciante', 20), ('avancado', 250)]:
+            profile = VolunteerProfile.objects.create(user=User.objects.create_user(username=username))
+            if hours is not None:
+                VolunteerParticipation.objects.create(
+                    volunteer=profile, opportunity=_opportunity(self.admin, username, hours), status='completed'
+                )
+            self.profiles[username] = profile.pk
+
+    def _filter(self, **params):
+        response = self.client.get('/api/v1/volunteers/profiles/', params)
+        self.assertEqual(response.status_code, 200)
+        results = response.data['results'] if isinstance(response.data, dict) else response.data
+        return {self._username(row['id']) for row in results}
+
+    def _username(self, pk):
+        return next(username for username, profile_id in self.profiles.items() if profile_id == pk)
+
+    def test_level_filter_by_label_and_number(self):
+        self.assertEqual(self._filter(level='Avançado'), {'avancado'})
+        self.assertEqual(self._filter(level='1'), {'iniciante'})
+        self.assertEqual(self._filter(level='novato'), {'sem_registro'})
+        self.assertEqual(self._filter(level='desconhecido'), set())
+
+    def test_hours_filters(self):
+        self.assertEqual(self._filter(min_hours='10'), {'iniciante', 'avancado'})
+        self.assertEqual(self._filter(max_hours='100'), {'sem_registro', 'iniciante'})
+        self.assertEqual(self._filter(min_hours='10', max_hours='100'), {'iniciante'})
+        self.assertEqual(self._filter(min_hours='0'), {'sem_registro', 'iniciante', 'avancado'})
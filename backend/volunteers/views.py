@@ -4,12 +4,14 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.contrib.auth.models import User
 from django.db.models import Q, Count, Avg
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from .models import (
     VolunteerSkill, VolunteerOpportunity, VolunteerProfile, 
-    VolunteerParticipation, VolunteerAchievement
+    VolunteerParticipation, VolunteerAchievement, VolunteerStats,
+    VOLUNTEER_LEVELS
 )
+from .matching import match_opportunity
 from .serializers import (
     VolunteerSkillSerializer, VolunteerOpportunitySerializer,
     VolunteerProfileSerializer, VolunteerParticipationSerializer,
@@ -110,6 +112,20 @@ class VolunteerOpportunityViewSet(viewsets.ModelViewSet):
             })
         
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    @action(detail=True, methods=['get'], permission_classes=[permissions.IsAdminUser])
+    def matches(self, request, pk=None):
+        """Voluntários mais compatíveis com a oportunidade (top-K)"""
+        opportunity = self.get_object()
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            limit = 20
+        
+        return Response({
+            'opportunity_id': opportunity.id,
+            'results': match_opportunity(opportunity, limit=limit)
+        })
 
 
 class VolunteerProfileViewSet(viewsets.ModelViewSet):
@@ -117,12 +133,43 @@ class VolunteerProfileViewSet(viewsets.ModelViewSet):
     serializer_class = VolunteerProfileSerializer
     permission_classes = [permissions.IsAuthenticated]
     
+    ordering_fields = ['created_at', 'stats__total_hours', 'stats__level', 'stats__total_people_helped']
+    
     def get_queryset(self):
         """Voluntários veem apenas seu próprio perfil, admin vê todos"""
         if self.request.user.is_staff or self.request.user.is_superuser:
-            return VolunteerProfile.objects.all()
+            queryset = VolunteerProfile.objects.all()
         else:
-            return VolunteerProfile.objects.filter(user=self.request.user)
+            queryset = VolunteerProfile.objects.filter(user=self.request.user)
+        
+        queryset = queryset.select_related('user', 'stats').prefetch_related('skills')
+        
+        # Filtros por nível e horas usando as estatísticas materializadas;
+        # voluntário sem registro ainda não tem horas (nível 0)
+        no_stats = Q(stats__isnull=True)
+        level_filter = self.request.query_params.get('level')
+        if level_filter:
+            levels_by_label = {label.lower(): level for level, _min_hours, label in VOLUNTEER_LEVELS}
+            level = levels_by_label.get(level_filter.lower(), level_filter)
+            try:
+                level = int(level)
+            except (TypeError, ValueError):
+                queryset = queryset.none()
+            else:
+                level_q = Q(stats__level=level)
+                if level == 0:
+                    level_q |= no_stats
+                queryset = queryset.filter(level_q)
+        
+        min_hours = self.request.query_params.get('min_hours')
+        if min_hours and min_hours.isdigit() and int(min_hours) > 0:
+            queryset = queryset.filter(stats__total_hours__gte=int(min_hours))
+        
+        max_hours = self.request.query_params.get('max_hours')
+        if max_hours and max_hours.isdigit():
+            queryset = queryset.filter(no_stats | Q(stats__total_hours__lte=int(max_hours)))
+        
+        return queryset.order_by('-created_at')
     
     @action(detail=False, methods=['get'])
     def my_profile(self, request):
@@ -184,51 +231,56 @@ class VolunteerProfileViewSet(viewsets.ModelViewSet):
         serializer = ManualMetricsAdjustmentSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         data = serializer.validated_data
-        # Criar SEMPRE uma nova oportunidade de ajuste única para evitar conflito unique_together
-        timestamp = timezone.now().strftime('%Y%m%d%H%M%S%f')
-        adjustment_opportunity = VolunteerOpportunity.objects.create(
-            title=f'[AJUSTE] {profile.user_id} {timestamp}',
-            description='Registro automático para ajuste administrativo individual',
-            estimated_hours=data.get('added_hours') or 0,
-            people_helped_estimate=data.get('added_people_helped') or 0,
-            urgency_level='low',
-            status='completed',
-            created_by=request.user,
-        )
-        try:
-            participation = VolunteerParticipation.objects.create(
-                volunteer=profile,
-                opportunity=adjustment_opportunity,
+        with transaction.atomic():
+            # Criar SEMPRE uma nova oportunidade de ajuste única para evitar conflito unique_together
+            timestamp = timezone.now().strftime('%Y%m%d%H%M%S%f')
+            adjustment_opportunity = VolunteerOpportunity.objects.create(
+                title=f'[AJUSTE] {profile.user_id} {timestamp}',
+                description='Registro automático para ajuste administrativo individual',
+                estimated_hours=data.get('added_hours') or 0,
+                people_helped_estimate=data.get('added_people_helped') or 0,
+                urgency_level='low',
                 status='completed',
-                actual_hours=data.get('added_hours') or 0,
-                people_helped=data.get('added_people_helped') or 0,
-                admin_rating=data.get('admin_rating'),
-                admin_notes=f"Ajuste manual: {data.get('notes', '')}"[:500]
+                created_by=request.user,
             )
-        except IntegrityError:
-            # Fallback improvável agora, mas caso ocorra reutiliza atualização de participação existente
-            existing = VolunteerParticipation.objects.filter(
-                volunteer=profile, opportunity=adjustment_opportunity
-            ).first()
-            if existing:
-                existing.actual_hours = (existing.actual_hours or 0) + (data.get('added_hours') or 0)
-                existing.people_helped = (existing.people_helped or 0) + (data.get('added_people_helped') or 0)
-                if data.get('admin_rating'):
-                    existing.admin_rating = data.get('admin_rating')
-                existing.admin_notes = (existing.admin_notes or '') + f"\nAjuste manual adicional: {data.get('notes', '')}"[:500]
-                existing.save()
-                participation = existing
-            else:
-                return Response({'error': 'Falha ao registrar ajuste.'}, status=500)
+            try:
+                with transaction.atomic():
+                    participation = VolunteerParticipation.objects.create(
+                        volunteer=profile,
+                        opportunity=adjustment_opportunity,
+                        status='completed',
+                        actual_hours=data.get('added_hours') or 0,
+                        people_helped=data.get('added_people_helped') or 0,
+                        admin_rating=data.get('admin_rating'),
+                        admin_notes=f"Ajuste manual: {data.get('notes', '')}"[:500]
+                    )
+            except IntegrityError:
+                # Fallback improvável agora, mas caso ocorra reutiliza atualização de participação existente
+                existing = VolunteerParticipation.objects.filter(
+                    volunteer=profile, opportunity=adjustment_opportunity
+                ).first()
+                if existing:
+                    existing.actual_hours = (existing.actual_hours or 0) + (data.get('added_hours') or 0)
+                    existing.people_helped = (existing.people_helped or 0) + (data.get('added_people_helped') or 0)
+                    if data.get('admin_rating'):
+                        existing.admin_rating = data.get('admin_rating')
+                    existing.admin_notes = (existing.admin_notes or '') + f"\nAjuste manual adicional: {data.get('notes', '')}"[:500]
+                    existing.save()
+                    participation = existing
+                else:
+                    return Response({'error': 'Falha ao registrar ajuste.'}, status=500)
+
+            # Atualizar estatísticas materializadas na mesma transação
+            stats = VolunteerStats.refresh_for(profile)
 
         return Response({
             'message': 'Ajuste aplicado com sucesso',
             'participation_id': participation.id,
             'new_totals': {
-                'total_hours_contributed': profile.total_hours_contributed,
-                'total_people_helped': profile.total_people_helped,
-                'average_rating': profile.average_rating,
-                'volunteer_level': profile.volunteer_level,
+                'total_hours_contributed': stats.total_hours,
+                'total_people_helped': stats.total_people_helped,
+                'average_rating': stats.average_rating,
+                'volunteer_level': stats.get_level_display(),
             }
         }, status=status.HTTP_201_CREATED)
 
@@ -331,10 +383,11 @@ class VolunteerParticipationViewSet(viewsets.ModelViewSet):
         )
         
         if serializer.is_valid():
-            participation = serializer.save()
-            participation.status = 'completed'
-            participation.completion_date = timezone.now()
-            participation.save()
+            with transaction.atomic():
+                participation = serializer.save()
+                participation.status = 'completed'
+                participation.completion_date = timezone.now()
+                participation.save()  # sinal post_save recalcula as estatísticas
             
             # Verificar se deve dar conquistas
             self._check_achievements(participation.volunteer)